@@ -0,0 +1,72 @@
+"""Benchmark of offline gazetteer lookups
+
+Builds a gazetteer of synthetic postal code areas, a few per town, then
+times forward lookups by postal code and by town name and reverse lookups
+at random points against a linear scan. Pass --geonames to load a real
+GeoNames postal code file or directory instead.
+
+Usage:
+    python benchmarks/gazetteer_lookup.py --towns 100000 --lookups 20000
+"""
+
+import argparse
+import random
+import time
+
+from homeward.utils.gazetteer import Gazetteer, Place
+from homeward.utils.geo_utils import haversine_km
+
+
+def synthetic_places(towns: int) -> list[Place]:
+    """Towns spread over Europe, each with one to four postal code areas around it"""
+    places = []
+    for town in range(towns):
+        latitude, longitude = random.uniform(36, 60), random.uniform(-10, 30)
+        for area in range(random.randint(1, 4)):
+            places.append(Place(
+                "XX", f"{town:06d}{area}", f"Town {town}", f"Region {town % 50}",
+                latitude + random.uniform(-0.05, 0.05), longitude + random.uniform(-0.05, 0.05),
+            ))
+    return places
+
+
+def timed(label: str, queries: list, lookup) -> None:
+    start = time.perf_counter()
+    found = sum(lookup(query) is not None for query in queries)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / len(queries) * 1e6:10.1f} {found:8d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--towns", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--geonames", help="GeoNames postal code file or directory to load instead")
+    args = parser.parse_args()
+
+    random.seed(7)
+    start = time.perf_counter()
+    if args.geonames:
+        gazetteer = Gazetteer.from_geonames(args.geonames)
+    else:
+        gazetteer = Gazetteer(synthetic_places(args.towns))
+    print(f"{len(gazetteer)} places, {len(gazetteer.tree)} distinct locations, "
+          f"built in {time.perf_counter() - start:.1f} s")
+
+    samples = random.choices(gazetteer.places, k=args.lookups)
+    points = [(random.uniform(36, 60), random.uniform(-10, 30)) for _ in range(args.lookups)]
+    print(f"{'lookup':<28} {'µs/query':>10} {'found':>8}")
+
+    timed("postal code", [place.postal_code for place in samples], lambda code: gazetteer.lookup(postal_code=code))
+    timed("town name", [place.name for place in samples], lambda name: gazetteer.lookup(city=name))
+    timed("nearest place, KD-tree", points, lambda point: gazetteer.nearest(*point))
+
+    # A linear scan is far slower, so it only covers a slice of the points
+    scan = points[:max(1, args.lookups // 1000)]
+    timed("nearest place, linear scan", scan, lambda point: min(
+        gazetteer.places, key=lambda place: haversine_km(*point, place.latitude, place.longitude)
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark of object metadata lookups against a local GCS emulator
+
+Uploads N small objects to an emulator bucket, then times the ways of reading
+their metadata:
+
+- exists() + reload() per object, the previous behaviour
+- get_blob() per object, a cold GCSService cache
+- prefetch_metadata() over one folder, a single prefix listing
+- prefetch_metadata() over scattered folders, JSON API batch requests
+- get_file_info() per object after a prefetch, served from the cache
+
+Start the emulator first, e.g.:
+    docker run -d -p 4443:4443 fsouza/fake-gcs-server -scheme http
+
+Usage:
+    STORAGE_EMULATOR_HOST=http://localhost:4443 python benchmarks/gcs_metadata.py --objects 500
+"""
+
+import argparse
+import os
+import time
+
+from google.cloud import storage
+
+from homeward.config import AppConfig, DataSource
+from homeward.services.gcs_service import GCSService
+
+
+def create_objects(client: storage.Client, bucket_name: str, prefix: str, count: int, per_folder: int) -> list[str]:
+    """Upload count tiny objects, per_folder objects per folder, and return their gs:// URLs"""
+    bucket = client.bucket(bucket_name)
+    if not bucket.exists():
+        bucket = client.create_bucket(bucket_name)
+
+    urls = []
+    for i in range(count):
+        name = f"{prefix}/camera-{i // per_folder:04d}/clip-{i:05d}.mp4"
+        bucket.blob(name).upload_from_string(b"\0" * 64, content_type="video/mp4")
+        urls.append(f"gs://{bucket_name}/{name}")
+    return urls
+
+
+def new_service(client: storage.Client) -> GCSService:
+    config = AppConfig(data_source=DataSource.MOCK, version="benchmark", bigquery_project_id=client.project,
+                       service_account_key_path=None)
+    service = GCSService(config)
+    service.client = client
+    return service
+
+
+def timed(label: str, count: int, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:9.2f} {elapsed / count * 1000:10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=500)
+    parser.add_argument("--bucket", default="homeward-benchmark")
+    args = parser.parse_args()
+
+    if not os.getenv("STORAGE_EMULATOR_HOST"):
+        raise SystemExit("Set STORAGE_EMULATOR_HOST to the GCS emulator, e.g. http://localhost:4443")
+
+    client = storage.Client(project="homeward-benchmark")
+    print(f"Uploading {args.objects} objects to {args.bucket} on {os.environ['STORAGE_EMULATOR_HOST']}")
+    folder_urls = create_objects(client, args.bucket, "folder", args.objects, args.objects)
+    scattered_urls = create_objects(client, args.bucket, "scattered", args.objects, 5)
+
+    def exists_and_reload():
+        bucket = client.bucket(args.bucket)
+        for url in folder_urls:
+            blob = bucket.blob(url.split("/", 3)[3])
+            if blob.exists():
+                blob.reload()
+
+    cold = new_service(client)
+    listed = new_service(client)
+    batched = new_service(client)
+
+    print(f"{'strategy':<36} {'total (s)':>9} {'ms/object':>10}")
+    timed("exists() + reload()", args.objects, exists_and_reload)
+    timed("get_blob() per object", args.objects, lambda: [cold.get_file_info(url) for url in folder_urls])
+    timed("prefetch, one prefix listing", args.objects, lambda: listed.prefetch_metadata(folder_urls))
+    timed("prefetch, batch requests", args.objects, lambda: batched.prefetch_metadata(scattered_urls))
+    timed("cached lookups after prefetch", args.objects, lambda: [listed.get_file_info(url) for url in folder_urls])
+    print(f"cache stats: {listed.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark of batch geocoding against a local stand-in for the Maps Geocoding API
+
+Starts an HTTP server answering /maps/api/geocode/json after a fixed latency,
+failing a share of the requests with OVER_QUERY_LIMIT, then geocodes the same
+list of addresses (with duplicates, as in tip-line imports) two ways:
+
+- geocode_address() one record at a time, the previous import path
+- geocode_batch() with several worker counts
+
+Each run uses a fresh in-memory cache, so every distinct address reaches the server.
+
+Usage:
+    python benchmarks/geocoding_batch.py --addresses 500 --distinct 300 --latency-ms 80 --workers 4 8 16
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import googlemaps
+
+from homeward.config import AppConfig, DataSource
+from homeward.services.geocoding_service import GeocodingService
+from homeward.utils.geocoding_cache import GeocodingCache
+
+
+def start_stand_in(latency: float, error_rate: float) -> tuple[ThreadingHTTPServer, dict]:
+    """Serve fake geocoding responses on a free local port"""
+    counts = {"requests": 0, "errors": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            address = parse_qs(urlparse(self.path).query).get("address", [""])[0]
+            time.sleep(latency)
+            with lock:
+                counts["requests"] += 1
+                failed = random.random() < error_rate
+                counts["errors"] += failed
+
+            if failed:
+                body = {"status": "OVER_QUERY_LIMIT", "results": []}
+            else:
+                seed = sum(map(ord, address))
+                body = {"status": "OK", "results": [{
+                    "geometry": {
+                        "location": {"lat": 38.0 + seed % 1000 / 10000, "lng": 13.0 + seed % 997 / 10000},
+                        "location_type": "ROOFTOP",
+                    },
+                    "formatted_address": address,
+                    "place_id": f"place-{seed}",
+                }]}
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counts
+
+
+def new_service(base_url: str, requests_per_minute: float) -> GeocodingService:
+    config = AppConfig(data_source=DataSource.MOCK, version="benchmark",
+                       geocoding_requests_per_minute=requests_per_minute)
+    service = GeocodingService(config, cache=GeocodingCache(None))
+    # No client-side QPS cap or internal retries: the service's token bucket and retries are measured
+    service.client = googlemaps.Client(
+        key="AIza-benchmark", base_url=base_url, queries_per_second=100_000, retry_over_query_limit=False
+    )
+    return service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--addresses", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Share of requests failing with OVER_QUERY_LIMIT")
+    parser.add_argument("--requests-per-minute", type=float, default=3000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16])
+    args = parser.parse_args()
+
+    random.seed(7)
+    distinct = [f"Via Benchmark {i}, Palermo" for i in range(args.distinct)]
+    addresses = [random.choice(distinct) for _ in range(args.addresses)]
+    server, counts = start_stand_in(args.latency_ms / 1000, args.error_rate)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    print(f"{args.addresses} addresses, {len(set(addresses))} distinct, {args.latency_ms:.0f} ms latency, "
+          f"{args.requests_per_minute:.0f} requests/minute quota")
+    print(f"{'strategy':<28} {'time (s)':>9} {'addr/s':>8} {'requests':>9} {'first (ms)':>11} {'found':>6}")
+
+    def report(label: str, run):
+        counts.update(requests=0, errors=0)
+        start = time.perf_counter()
+        first, found = run(start)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {elapsed:9.2f} {args.addresses / elapsed:8.1f} {counts['requests']:9d} "
+              f"{(first - start) * 1000:11.0f} {found:6d}")
+
+    def sequential(start):
+        service = new_service(base_url, args.requests_per_minute)
+        first, found = None, 0
+        for address in addresses:
+            found += service.geocode_address(address) is not None
+            first = first or time.perf_counter()
+        return first, found
+
+    report("geocode_address, one by one", sequential)
+
+    for workers in args.workers:
+        def batch(start, workers=workers):
+            service = new_service(base_url, args.requests_per_minute)
+            first, found = None, 0
+            for _, result in service.geocode_batch(addresses, max_workers=workers):
+                found += result is not None
+                first = first or time.perf_counter()
+            return first, found
+
+        report(f"geocode_batch, {workers} workers", batch)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
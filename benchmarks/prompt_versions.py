@@ -0,0 +1,140 @@
+"""A/B benchmark of the analysis prompt versions
+
+Local mode renders every prompt version for the mock cases and reports the
+estimated prompt tokens per version and the saving against v1.
+
+BigQuery mode runs every version over the same videos for one case and
+reports, per version, the measured prompt tokens, query latency and the
+agreement with the baseline version (verdicts that flip, and the mean
+confidence change). There are no ground-truth labels, so this measures
+agreement with the baseline, not accuracy. The verdict cache is bypassed so
+every version is queried.
+
+Usage:
+    python benchmarks/prompt_versions.py
+    python benchmarks/prompt_versions.py --bigquery --case-id MP001 --limit 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+
+from homeward.config import load_config
+from homeward.services.mock_data_service import MockDataService
+from homeward.services.video_analysis_service import build_missing_person_data
+from homeward.utils.prompt_registry import default_prompt_registry, person_attributes
+
+PROMPT_NAME = "video_analysis"
+
+
+def run_local(args: argparse.Namespace):
+    cases, _ = MockDataService().get_cases(None, 1, 1000)
+    if not cases:
+        raise SystemExit("No mock cases to render")
+
+    registry = default_prompt_registry()
+    versions = args.versions or registry.versions(PROMPT_NAME)
+    print(f"{len(cases)} mock cases")
+    print(f"{'version':>12} {'mean tokens':>12} {'min':>6} {'max':>6} {'saving':>7}")
+
+    baseline = None
+    for version in versions:
+        tokens = [
+            registry.render_person_prompt(PROMPT_NAME, person_attributes(build_missing_person_data(case)), version).token_count
+            for case in cases
+        ]
+        mean_tokens = statistics.mean(tokens)
+        baseline = baseline or mean_tokens
+        print(f"{version:>12} {mean_tokens:12.0f} {min(tokens):>6} {max(tokens):>6} {1 - mean_tokens / baseline:7.1%}")
+
+
+def run_bigquery(args: argparse.Namespace):
+    from dataclasses import replace
+
+    from homeward.models.video_analysis import VideoAnalysisRequest
+    from homeward.services.bigquery_data_service import BigQueryDataService
+    from homeward.services.bigquery_video_analysis_service import (
+        BigQueryVideoAnalysisService,
+    )
+
+    config = replace(load_config(), verdict_cache_size=0)
+    case = BigQueryDataService(config).get_case_by_id(args.case_id)
+    if case is None:
+        raise SystemExit(f"Case {args.case_id} not found")
+
+    service = BigQueryVideoAnalysisService(config)
+    uris = [uri for uri, _ in service.list_new_videos(datetime(1970, 1, 1, tzinfo=timezone.utc), args.limit)]
+    if not uris:
+        raise SystemExit("No videos in the object table")
+
+    request = VideoAnalysisRequest(
+        case_id=case.id,
+        start_date=case.last_seen_date,
+        end_date=case.last_seen_date,
+        time_range="All Day",
+        search_radius_km=0.0,
+        last_seen_latitude=case.last_seen_location.latitude,
+        last_seen_longitude=case.last_seen_location.longitude,
+    )
+    attributes = person_attributes(build_missing_person_data(case))
+
+    def run_version(version: str) -> tuple[float, int, dict]:
+        rendered = service.prompt_registry.render_person_prompt(PROMPT_NAME, attributes, version)
+        query = service._build_video_analysis_query(request, rendered.text, uris)
+        start = time.perf_counter()
+        rows = list(service.client.query(query, job_config=service._candidate_uris_job_config(uris)).result())
+        elapsed = time.perf_counter() - start
+
+        verdicts = {}
+        for row in rows:
+            if not row.result:
+                continue
+            full_response = row.result["full_response"] or {}
+            if isinstance(full_response, str):
+                full_response = json.loads(full_response)
+            verdicts[row.uri] = {
+                "found": row.result["personFound"],
+                "confidence": row.result["confidenceScore"] or 0.0,
+                "tokens": full_response.get("usage_metadata", {}).get("prompt_token_count", 0),
+            }
+        return elapsed, rendered.token_count, verdicts
+
+    versions = args.versions or service.prompt_registry.versions(PROMPT_NAME)
+    print(f"{len(uris)} videos for case {case.id}, baseline {versions[0]}")
+    print(f"{'version':>12} {'videos':>7} {'est. text':>10} {'tokens/video':>13} {'latency (s)':>12} {'agreement':>10} {'flipped':>8} {'conf. delta':>12}")
+
+    baseline = None
+    for version in versions:
+        elapsed, estimated, verdicts = run_version(version)
+        baseline = baseline or verdicts
+        shared = [uri for uri in verdicts if uri in baseline]
+        flipped = sum(verdicts[uri]["found"] != baseline[uri]["found"] for uri in shared)
+        agreement = 1 - flipped / len(shared) if shared else 0.0
+        confidence_delta = (
+            statistics.mean(verdicts[uri]["confidence"] - baseline[uri]["confidence"] for uri in shared)
+            if shared else 0.0
+        )
+        tokens = statistics.mean(verdict["tokens"] for verdict in verdicts.values()) if verdicts else 0
+        print(f"{version:>12} {len(verdicts):>7} {estimated:>10} {tokens:13.0f} {elapsed:12.1f} {agreement:10.1%} {flipped:>8} {confidence_delta:+12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--versions", nargs="+", help="Versions to compare, the first is the baseline (default: all)")
+    parser.add_argument("--bigquery", action="store_true", help="Run the versions on BigQuery")
+    parser.add_argument("--case-id", help="Case analyzed in BigQuery mode")
+    parser.add_argument("--limit", type=int, default=20, help="Videos per version in BigQuery mode")
+    args = parser.parse_args()
+
+    if args.bigquery:
+        if not args.case_id:
+            parser.error("--case-id is required with --bigquery")
+        run_bigquery(args)
+    else:
+        run_local(args)
+
+
+if __name__ == "__main__":
+    main()
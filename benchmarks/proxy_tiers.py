@@ -0,0 +1,169 @@
+"""Benchmark of the proxy resolution tiers used for video analysis
+
+Local mode transcodes the demo videos into every proxy tier with ffmpeg and
+reports transcode time, proxy size and estimated Gemini video tokens.
+
+BigQuery mode runs the same analysis prompt over one object table per tier
+and reports, per tier, the measured prompt tokens, query latency and the
+accuracy delta against the original footage (verdicts that flip, and the mean
+confidence change). Create the tables first, e.g. one object table per proxy
+tier over the processed bucket.
+
+Usage:
+    python benchmarks/proxy_tiers.py
+    python benchmarks/proxy_tiers.py --bigquery original=video_objects 480p=video_proxies_480p 360p=video_proxies_360p
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from homeward.config import load_config
+from homeward.services.simulated_video_analysis_service import DEFAULT_MEDIA_DIR
+from homeward.utils.ffmpeg_utils import (
+    PROXY_TIERS,
+    probe_duration,
+    proxy_filename,
+    transcode_proxy,
+)
+from homeward.utils.video_utils import parse_video_filename
+
+# Gemini video tokenization at the default media resolution
+TOKENS_PER_FRAME = 258
+TOKENS_PER_AUDIO_SECOND = 32
+SAMPLED_FRAMES_PER_SECOND = 1.0
+
+BENCHMARK_PROMPT = (
+    "Is there a person wearing a red top in this video? Answer with personFound, "
+    "a confidenceScore between 0.0 and 1.0, and a short summaryOfFindings."
+)
+
+
+def estimated_tokens(duration_seconds: float, fps: float, has_audio: bool) -> int:
+    """Estimate Gemini video tokens: frames are sampled at most once per second"""
+    frames = duration_seconds * min(fps, SAMPLED_FRAMES_PER_SECOND)
+    audio = duration_seconds * TOKENS_PER_AUDIO_SECOND if has_audio else 0
+    return round(frames * TOKENS_PER_FRAME + audio)
+
+
+def run_local(args: argparse.Namespace):
+    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+        raise SystemExit("ffmpeg and ffprobe are required for the local benchmark")
+
+    sources = [path for path in sorted(Path(args.media_dir).glob("*.mp4")) if parse_video_filename(str(path))]
+    if not sources:
+        raise SystemExit(f"No videos following the filename convention in {args.media_dir}")
+
+    print(f"{len(sources)} source videos from {args.media_dir}")
+    print(f"{'tier':>9} {'resolution':>11} {'fps':>4} {'transcode (s)':>14} {'size (MB)':>10} {'size %':>7} {'est. tokens':>12}")
+
+    source_bytes = sum(path.stat().st_size for path in sources)
+    source_durations = [probe_duration(str(path)) for path in sources]
+    if None in source_durations:
+        raise SystemExit("ffprobe could not read the duration of every source video")
+    source_tokens = sum(estimated_tokens(duration, 30, True) for duration in source_durations)
+    print(f"{'original':>9} {'-':>11} {'-':>4} {'-':>14} {source_bytes / 1e6:10.1f} {100:7.0f} {source_tokens:>12}")
+
+    with tempfile.TemporaryDirectory(prefix="homeward-proxy-bench-") as work_dir:
+        for tier in PROXY_TIERS.values():
+            durations = []
+            proxy_bytes = 0
+            proxy_tokens = 0
+            resolutions = set()
+            for source in sources:
+                proxy_name = proxy_filename(source.name, tier)
+                output = str(Path(work_dir) / proxy_name)
+
+                start = time.perf_counter()
+                transcode_proxy(str(source), output, tier)
+                durations.append(time.perf_counter() - start)
+
+                proxy_bytes += Path(output).stat().st_size
+                duration = probe_duration(output)
+                if duration is None:
+                    raise SystemExit(f"ffprobe could not read the duration of {proxy_name}")
+                proxy_tokens += estimated_tokens(duration, tier.fps, False)
+                resolutions.add(parse_video_filename(proxy_name).resolution)
+
+            print(f"{tier.name:>9} {'/'.join(sorted(resolutions)):>11} {tier.fps:>4g} {statistics.mean(durations):14.2f} "
+                  f"{proxy_bytes / 1e6:10.1f} {proxy_bytes / source_bytes * 100:7.1f} {proxy_tokens:>12}")
+
+
+def run_bigquery(args: argparse.Namespace):
+    from google.cloud import bigquery
+
+    config = load_config()
+    client = bigquery.Client(project=config.bigquery_project_id)
+    tables = dict(item.split("=", 1) for item in args.bigquery)
+    if "original" not in tables:
+        raise SystemExit("Pass the original footage table as original=<table>")
+
+    def run_tier(table: str) -> tuple[float, dict]:
+        query = f"""
+        SELECT
+          uri,
+          AI.GENERATE(
+            ("{BENCHMARK_PROMPT}", OBJ.GET_ACCESS_URL(ref, 'r')),
+            connection_id => '{config.bigquery_project_id}.{config.bigquery_region}.{config.bigquery_connection}',
+            endpoint => '{config.bigquery_model}',
+            output_schema => 'personFound BOOL, confidenceScore FLOAT64, summaryOfFindings STRING',
+            model_params => JSON '{{"generation_config": {{"temperature": 0}}}}'
+          ) AS result
+        FROM `{config.bigquery_project_id}.{config.bigquery_dataset}.{table}`
+        ORDER BY uri
+        LIMIT {args.limit}
+        """
+        start = time.perf_counter()
+        rows = list(client.query(query).result())
+        elapsed = time.perf_counter() - start
+
+        verdicts = {}
+        for row in rows:
+            video = parse_video_filename(row.uri)
+            # Proxies only differ from the original by the resolution field
+            key = (video.camera_id, video.timestamp, video.latitude, video.longitude) if video else row.uri
+            full_response = row.result["full_response"] or {}
+            if isinstance(full_response, str):
+                full_response = json.loads(full_response)
+            usage = full_response.get("usage_metadata", {})
+            verdicts[key] = {
+                "found": row.result["personFound"],
+                "confidence": row.result["confidenceScore"] or 0.0,
+                "tokens": usage.get("prompt_token_count", 0),
+            }
+        return elapsed, verdicts
+
+    print(f"{'tier':>9} {'videos':>7} {'tokens/video':>13} {'latency (s)':>12} {'flipped':>8} {'conf. delta':>12}")
+    original_run = run_tier(tables["original"])
+    original = original_run[1]
+    for name, table in tables.items():
+        elapsed, verdicts = original_run if name == "original" else run_tier(table)
+        shared = [key for key in verdicts if key in original]
+        flipped = sum(verdicts[key]["found"] != original[key]["found"] for key in shared)
+        confidence_delta = (
+            statistics.mean(verdicts[key]["confidence"] - original[key]["confidence"] for key in shared)
+            if shared else 0.0
+        )
+        tokens = statistics.mean(verdict["tokens"] for verdict in verdicts.values()) if verdicts else 0
+        print(f"{name:>9} {len(verdicts):>7} {tokens:13.0f} {elapsed:12.1f} {flipped:>8} {confidence_delta:+12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--media-dir", default=DEFAULT_MEDIA_DIR)
+    parser.add_argument("--bigquery", nargs="+", metavar="TIER=TABLE", help="Object table per tier, including original=")
+    parser.add_argument("--limit", type=int, default=20, help="Videos per tier in BigQuery mode")
+    args = parser.parse_args()
+
+    if args.bigquery:
+        run_bigquery(args)
+    else:
+        run_local(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -712,10 +712,35 @@ replace_sql_placeholders() {
     sql_content="${sql_content//<PROJECT_ID>/${PROJECT_ID}}"
     sql_content="${sql_content//<REGION>/${REGION}}"
     sql_content="${sql_content//<CONNECTION_NAME>/${HOMEWARD_BQ_CONNECTION}}"
+    sql_content="${sql_content//<VIDEO_TABLE>/${HOMEWARD_BQ_TABLE:-video_objects}}"
+    sql_content="${sql_content//<MODEL>/${HOMEWARD_BQ_MODEL:-gemini-2.5-flash}}"
+    sql_content="${sql_content//<PROCESSED_BUCKET>/${HOMEWARD_GCS_BUCKET_PROCESSED}}"
 
     echo "$sql_content"
 }
 
+# Execute a single SQL script, returning non-zero on failure
+execute_sql_file() {
+    local sql_file="$1"
+    local description="$2"
+
+    print_info "Executing SQL script: $(basename "$sql_file") ($description)"
+
+    local sql_content
+    if ! sql_content=$(cat "$sql_file"); then
+        print_error "Failed to read SQL file: $sql_file"
+        return 1
+    fi
+    sql_content=$(replace_sql_placeholders "$sql_content")
+
+    if bq query --use_legacy_sql=false --project_id="$PROJECT_ID" "$sql_content"; then
+        print_success "Successfully executed: $description"
+    else
+        print_error "Failed to execute SQL script: $sql_file"
+        return 1
+    fi
+}
+
 # Execute SQL scripts from a specified folder
 execute_sql_scripts_from_folder() {
     local folder_path="$1"
@@ -1128,14 +1153,38 @@ main() {
     create_bigquery_object_table
     
     # Execute SQL scripts in required order
-    # 1. DDL SQL scripts (mandatory)
+    # 1. DDL SQL scripts (mandatory), including the column migrations of existing tables
     execute_sql_scripts_from_folder "sql/DDL" "DDL SQL Scripts"
+
+    # Proxy object table, only when a processed bucket for the proxies already exists
+    if [[ -n "$HOMEWARD_GCS_BUCKET_PROCESSED" ]] && gsutil ls -b "gs://$HOMEWARD_GCS_BUCKET_PROCESSED" > /dev/null 2>&1; then
+        execute_sql_file "sql/proxies/create_video_proxies_object_table.sql" "Proxy object table" || \
+            print_warning "Analyses keep reading the original footage"
+    else
+        print_info "No processed bucket configured, skipping the proxy object table"
+    fi
+
+    # Key the uploaded videos in the video catalog, so result URL lookups do not scan the object table
+    execute_sql_file "sql/DML/refresh_video_catalog.sql" "Video catalog refresh" || \
+        print_warning "Videos missing from the catalog are still found through the object table"
+
+    # List the people in each uploaded video, so case analyses can prefilter footage by description
+    if execute_sql_file "sql/DML/refresh_video_people_inventory.sql" "People inventory refresh"; then
+        execute_sql_file "sql/DML/update_video_people_embeddings.sql" "People inventory embeddings" || \
+            print_warning "Rerun sql/DML/update_video_people_embeddings.sql to embed the remaining people"
+    else
+        print_warning "Videos without an inventory are always analyzed in full"
+    fi
     
     # 2. Demo-specific SQL scripts (only if demo folder specified)
     if [[ -n "$DEMO_FOLDER" ]]; then
         execute_sql_scripts_from_folder "$DEMO_FOLDER/reports/missings" "Missing Persons Reports"
         execute_sql_scripts_from_folder "$DEMO_FOLDER/reports/sightings" "Sightings Reports"
     fi
+
+    # Rows loaded by the demo reports or written before the geohash columns existed only have a geography
+    execute_sql_file "sql/DML/backfill_geohash_cells.sql" "Geohash cell backfill" || \
+        print_warning "Location searches still find rows without a geohash cell, only without pruning"
     
     # Generate final .env file
     generate_env_file
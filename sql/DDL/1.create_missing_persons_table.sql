@@ -31,6 +31,7 @@ CREATE TABLE IF NOT EXISTS `<DATASET>.missing_persons` (
   last_seen_latitude FLOAT64 OPTIONS(description="Latitude coordinates of last seen location"),
   last_seen_longitude FLOAT64 OPTIONS(description="Longitude coordinates of last seen location"),
   last_seen_geo GEOGRAPHY OPTIONS(description="SFS position of last seen location"),
+  last_seen_geohash STRING OPTIONS(description="Geohash cell of last seen location, 9 characters, for pruning location searches"),
 
   /* Case Details */
   circumstances STRING NOT NULL OPTIONS(description="Detailed description of circumstances of disappearance"),
@@ -62,7 +63,7 @@ CREATE TABLE IF NOT EXISTS `<DATASET>.missing_persons` (
   --TODO Add Missing Photo Embedding
 )
 PARTITION BY DATE(created_date)
-CLUSTER BY status, priority, last_seen_city
+CLUSTER BY last_seen_geohash, status, priority, last_seen_city
 OPTIONS(
   description="Table storing comprehensive missing person case information for the Homeward application",
   labels=[("environment", "hackathon"), ("application", "homeward"), ("data_type", "missing_persons")]
@@ -17,6 +17,7 @@ CREATE TABLE IF NOT EXISTS `<DATASET>.sightings` (
   sighted_latitude FLOAT64 OPTIONS(description="Latitude coordinates of sighting location"),
   sighted_longitude FLOAT64 OPTIONS(description="Longitude coordinates of sighting location"),
   sighted_geo GEOGRAPHY OPTIONS(description="SFS position of sighting location"),
+  sighted_geohash STRING OPTIONS(description="Geohash cell of sighting location, 9 characters, for pruning location searches"),
   
   /* Person Description */
   apparent_gender STRING OPTIONS(description="Apparent gender of sighted person"),
@@ -58,7 +59,7 @@ CREATE TABLE IF NOT EXISTS `<DATASET>.sightings` (
   ml_summary_embedding ARRAY<FLOAT64> OPTIONS(description="Embedding vector of the AI-generated summary for similarity search and matching")
 )
 PARTITION BY DATE(created_date)
-CLUSTER BY status, priority, sighted_city, source_type
+CLUSTER BY sighted_geohash, status, priority, source_type
 OPTIONS(
   description="Table storing sighting reports that can be linked to missing person cases",
   labels=[("environment", "hackathon"), ("application", "homeward"), ("data_type", "sightings")]
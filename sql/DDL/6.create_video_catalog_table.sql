@@ -0,0 +1,32 @@
+/* Video Catalog Table Creation Script for BigQuery
+   Native, keyed copy of the video object table metadata
+   Lets the application resolve a video result ID to its URI with a point lookup
+   instead of scanning the whole object table */
+
+CREATE TABLE IF NOT EXISTS `<DATASET>.video_catalog` (
+  /* Primary identifiers */
+  video_id STRING NOT NULL OPTIONS(description="Stable video identifier: CONCAT('video_', SUBSTR(TO_HEX(SHA256(uri)), 1, 16))"),
+  uri STRING NOT NULL OPTIONS(description="GCS URI of the video file"),
+
+  /* Metadata from the video filename */
+  camera_id STRING OPTIONS(description="Camera identifier from video filename"),
+  video_timestamp TIMESTAMP OPTIONS(description="Timestamp from video filename (YYYYMMDDHHMMSS)"),
+  video_latitude FLOAT64 OPTIONS(description="Camera latitude from video filename"),
+  video_longitude FLOAT64 OPTIONS(description="Camera longitude from video filename"),
+  video_geo GEOGRAPHY OPTIONS(description="SFS position of camera location"),
+  video_geohash STRING OPTIONS(description="Geohash cell of camera location, 9 characters, for pruning location searches"),
+  camera_type STRING OPTIONS(description="Camera type from video filename"),
+  video_resolution STRING OPTIONS(description="Video resolution from video filename"),
+
+  /* Object information */
+  size INT64 OPTIONS(description="Object size in bytes"),
+  updated TIMESTAMP OPTIONS(description="Last update time of the GCS object"),
+
+  /* Metadata */
+  created_date TIMESTAMP NOT NULL OPTIONS(description="Date and time when the video was added to the catalog")
+)
+CLUSTER BY video_id
+OPTIONS(
+  description="Keyed catalog of surveillance videos referenced by the video object table",
+  labels=[("environment", "hackathon"), ("application", "homeward"), ("data_type", "video_catalog")]
+);
@@ -0,0 +1,42 @@
+/* Video People Inventory Table Creation Script for BigQuery
+   One row per person visible in a surveillance video, extracted once at ingestion time
+   Lets new cases be matched with VECTOR_SEARCH and attribute filters before any per-case Gemini call */
+
+CREATE TABLE IF NOT EXISTS `<DATASET>.video_people_inventory` (
+  /* Primary identifiers */
+  video_id STRING NOT NULL OPTIONS(description="Stable video identifier: CONCAT('video_', SUBSTR(TO_HEX(SHA256(uri)), 1, 16))"),
+  person_index INT64 NOT NULL OPTIONS(description="Position of the person in the video inventory"),
+  uri STRING NOT NULL OPTIONS(description="GCS URI of the video file"),
+
+  /* Video metadata from the filename */
+  camera_id STRING OPTIONS(description="Camera identifier from video filename"),
+  video_timestamp TIMESTAMP OPTIONS(description="Timestamp from video filename (YYYYMMDDHHMMSS)"),
+  video_geo GEOGRAPHY OPTIONS(description="SFS position of camera location"),
+  video_geohash STRING OPTIONS(description="Geohash cell of camera location, 9 characters, for pruning location searches"),
+
+  /* Person attributes */
+  gender STRING OPTIONS(description="Apparent gender: Male, Female or Unknown"),
+  age_range STRING OPTIONS(description="Apparent age range"),
+  build STRING OPTIONS(description="Build and approximate height"),
+  hair STRING OPTIONS(description="Hair color and style"),
+  clothing_top STRING OPTIONS(description="Upper body clothing"),
+  clothing_bottom STRING OPTIONS(description="Lower body clothing"),
+  footwear STRING OPTIONS(description="Footwear"),
+  accessories STRING OPTIONS(description="Bags, hats, glasses and other accessories"),
+  distinguishing_features STRING OPTIONS(description="Visible distinguishing features"),
+  first_seen STRING OPTIONS(description="First appearance in the video (HH:MM:SS)"),
+  last_seen STRING OPTIONS(description="Last appearance in the video (HH:MM:SS)"),
+
+  /* Search */
+  description STRING OPTIONS(description="Natural language description of the person, used for the embedding"),
+  description_embedding ARRAY<FLOAT64> OPTIONS(description="Text embedding of the description"),
+
+  /* Metadata */
+  model_name STRING OPTIONS(description="Endpoint used to extract the inventory"),
+  created_date TIMESTAMP NOT NULL OPTIONS(description="Date and time when the inventory row was created")
+)
+CLUSTER BY video_geohash, video_id
+OPTIONS(
+  description="Per-video inventory of visible people, with embeddings for case matching",
+  labels=[("environment", "hackathon"), ("application", "homeward"), ("data_type", "video_people_inventory")]
+);
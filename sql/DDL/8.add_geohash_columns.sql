@@ -0,0 +1,12 @@
+/* Add the geohash cells of cases, sightings and cameras to tables created before they existed
+   Required: the application and the video catalog and inventory refreshes write these
+   columns, so this runs with every setup, after the tables are created.
+   Existing tables keep their old clustering until it is updated, for example:
+     bq update --clustering_fields=last_seen_geohash,status,priority,last_seen_city <DATASET>.missing_persons
+     bq update --clustering_fields=sighted_geohash,status,priority,source_type <DATASET>.sightings
+     bq update --clustering_fields=video_geohash,video_id <DATASET>.video_people_inventory */
+
+ALTER TABLE `<DATASET>.missing_persons` ADD COLUMN IF NOT EXISTS last_seen_geohash STRING;
+ALTER TABLE `<DATASET>.sightings` ADD COLUMN IF NOT EXISTS sighted_geohash STRING;
+ALTER TABLE `<DATASET>.video_catalog` ADD COLUMN IF NOT EXISTS video_geohash STRING;
+ALTER TABLE `<DATASET>.video_people_inventory` ADD COLUMN IF NOT EXISTS video_geohash STRING;
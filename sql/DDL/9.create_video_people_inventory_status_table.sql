@@ -0,0 +1,30 @@
+/* Video People Inventory Status Table Creation Script for BigQuery
+   One row per video the people inventory extraction has processed, including videos
+   with nobody in them, which have no inventory rows. Refreshes only send videos
+   without a complete status to Gemini, and case searches only rule out videos
+   with a complete status. */
+
+CREATE TABLE IF NOT EXISTS `<DATASET>.video_people_inventory_status` (
+  video_id STRING NOT NULL OPTIONS(description="Stable video identifier: CONCAT('video_', SUBSTR(TO_HEX(SHA256(uri)), 1, 16))"),
+  uri STRING NOT NULL OPTIONS(description="GCS URI of the video file"),
+  status STRING NOT NULL OPTIONS(description="complete, or failed when the extraction returned an error"),
+  people_count INT64 OPTIONS(description="Number of people listed for the video, 0 when nobody is visible"),
+  error STRING OPTIONS(description="Error status of the last failed extraction"),
+  attempts INT64 NOT NULL OPTIONS(description="Number of extractions run for the video; failed videos are retried up to 3 times"),
+  model_name STRING OPTIONS(description="Endpoint used for the last extraction"),
+  processed_date TIMESTAMP NOT NULL OPTIONS(description="Date and time of the last extraction")
+)
+CLUSTER BY uri
+OPTIONS(
+  description="Per-video status of the people inventory extraction",
+  labels=[("environment", "hackathon"), ("application", "homeward"), ("data_type", "video_people_inventory")]
+);
+
+-- Videos inventoried before this table existed are complete
+INSERT INTO `<DATASET>.video_people_inventory_status` (
+  video_id, uri, status, people_count, error, attempts, model_name, processed_date
+)
+SELECT video_id, uri, 'complete', COUNT(*), NULL, 1, ANY_VALUE(model_name), MAX(created_date)
+FROM `<DATASET>.video_people_inventory`
+WHERE uri NOT IN (SELECT uri FROM `<DATASET>.video_people_inventory_status`)
+GROUP BY video_id, uri;
@@ -0,0 +1,21 @@
+/* Backfill the geohash cells of cases, sightings and cameras
+   Location searches prune on these clustered columns before the exact ST_DWITHIN
+   filter. Rows without a cell are still searched, so this can run at any time;
+   rerun it after loading rows that were not written by the application.
+   The columns are added by sql/DDL/8.add_geohash_columns.sql. */
+
+UPDATE `<DATASET>.missing_persons`
+SET last_seen_geohash = ST_GEOHASH(last_seen_geo, 9)
+WHERE last_seen_geo IS NOT NULL AND last_seen_geohash IS NULL;
+
+UPDATE `<DATASET>.sightings`
+SET sighted_geohash = ST_GEOHASH(sighted_geo, 9)
+WHERE sighted_geo IS NOT NULL AND sighted_geohash IS NULL;
+
+UPDATE `<DATASET>.video_catalog`
+SET video_geohash = ST_GEOHASH(video_geo, 9)
+WHERE video_geo IS NOT NULL AND video_geohash IS NULL;
+
+UPDATE `<DATASET>.video_people_inventory`
+SET video_geohash = ST_GEOHASH(video_geo, 9)
+WHERE video_geo IS NOT NULL AND video_geohash IS NULL;
@@ -17,6 +17,7 @@ USING (
     @sighted_latitude AS sighted_latitude,
     @sighted_longitude AS sighted_longitude,
     @sighted_geo AS sighted_geo,
+    ST_GEOHASH(@sighted_geo, 9) AS sighted_geohash,
     @apparent_gender AS apparent_gender,
     @apparent_age_range AS apparent_age_range,
     @height_estimate AS height_estimate,
@@ -119,7 +120,7 @@ ON target.id = source.id
 WHEN NOT MATCHED THEN
   INSERT (
     id, sighting_number, sighted_date, sighted_time, sighted_address, sighted_city, sighted_country,
-    sighted_postal_code, sighted_latitude, sighted_longitude, sighted_geo,
+    sighted_postal_code, sighted_latitude, sighted_longitude, sighted_geo, sighted_geohash,
     apparent_gender, apparent_age_range, height_estimate, weight_estimate, hair_color, eye_color,
     clothing_description, distinguishing_features, description, circumstances, confidence_level,
     photo_url, video_url, source_type, witness_name, witness_phone, witness_email,
@@ -128,7 +129,7 @@ WHEN NOT MATCHED THEN
   )
   VALUES (
     source.id, source.sighting_number, source.sighted_date, source.sighted_time, source.sighted_address, source.sighted_city, source.sighted_country,
-    source.sighted_postal_code, source.sighted_latitude, source.sighted_longitude, source.sighted_geo,
+    source.sighted_postal_code, source.sighted_latitude, source.sighted_longitude, source.sighted_geo, source.sighted_geohash,
     source.apparent_gender, source.apparent_age_range, source.height_estimate, source.weight_estimate, source.hair_color, source.eye_color,
     source.clothing_description, source.distinguishing_features, source.description, source.circumstances, source.confidence_level,
     source.photo_url, source.video_url, source.source_type, source.witness_name, source.witness_phone, source.witness_email,
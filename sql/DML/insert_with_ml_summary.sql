@@ -27,6 +27,7 @@ USING (
     @last_seen_latitude AS last_seen_latitude,
     @last_seen_longitude AS last_seen_longitude,
     @last_seen_geo AS last_seen_geo,
+    ST_GEOHASH(@last_seen_geo, 9) AS last_seen_geohash,
     @circumstances AS circumstances,
     @priority AS priority,
     @status AS status,
@@ -108,7 +109,7 @@ WHEN NOT MATCHED THEN
     id, case_number, name, surname, date_of_birth, gender,
     height, weight, hair_color, eye_color, distinguishing_marks, clothing_description,
     last_seen_date, last_seen_time, last_seen_address, last_seen_city, last_seen_country,
-    last_seen_postal_code, last_seen_latitude, last_seen_longitude, last_seen_geo,
+    last_seen_postal_code, last_seen_latitude, last_seen_longitude, last_seen_geo, last_seen_geohash,
     circumstances, priority, status, description, medical_conditions, additional_info,
     photo_url, reporter_name, reporter_phone, reporter_email, relationship,
     created_date, updated_date, ml_summary
@@ -117,7 +118,7 @@ WHEN NOT MATCHED THEN
     source.id, source.case_number, source.name, source.surname, source.date_of_birth, source.gender,
     source.height, source.weight, source.hair_color, source.eye_color, source.distinguishing_marks, source.clothing_description,
     source.last_seen_date, source.last_seen_time, source.last_seen_address, source.last_seen_city, source.last_seen_country,
-    source.last_seen_postal_code, source.last_seen_latitude, source.last_seen_longitude, source.last_seen_geo,
+    source.last_seen_postal_code, source.last_seen_latitude, source.last_seen_longitude, source.last_seen_geo, source.last_seen_geohash,
     source.circumstances, source.priority, source.status, source.description, source.medical_conditions, source.additional_info,
     source.photo_url, source.reporter_name, source.reporter_phone, source.reporter_email, source.relationship,
     source.created_date, source.updated_date, source.ml_summary
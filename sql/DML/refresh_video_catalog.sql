@@ -0,0 +1,38 @@
+/* Refresh the video catalog from the video object table
+   Adds videos that are not cataloged yet, parsing the filename convention
+   CameraID_YYYYMMDDHHMMSS_LATITUDE_LONGITUDE_CAMERATYPE_RESOLUTION.mp4 */
+
+MERGE `<DATASET>.video_catalog` AS target
+USING (
+  SELECT
+    CONCAT('video_', SUBSTR(TO_HEX(SHA256(uri)), 1, 16)) AS video_id,
+    uri,
+    parts[SAFE_OFFSET(0)] AS camera_id,
+    TIMESTAMP(SAFE.PARSE_DATETIME('%Y%m%d%H%M%S', parts[SAFE_OFFSET(1)])) AS video_timestamp,
+    SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64) AS video_latitude,
+    SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64) AS video_longitude,
+    SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)) AS video_geo,
+    ST_GEOHASH(SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)), 9) AS video_geohash,
+    parts[SAFE_OFFSET(4)] AS camera_type,
+    parts[SAFE_OFFSET(5)] AS video_resolution,
+    size,
+    updated
+  FROM (
+    SELECT
+      uri,
+      size,
+      updated,
+      SPLIT(REGEXP_REPLACE(REGEXP_EXTRACT(uri, r'[^/]+$'), r'\.mp4$', ''), '_') AS parts
+    FROM `<DATASET>.<VIDEO_TABLE>`
+  )
+) AS source
+ON target.video_id = source.video_id
+WHEN NOT MATCHED THEN
+  INSERT (
+    video_id, uri, camera_id, video_timestamp, video_latitude, video_longitude,
+    video_geo, video_geohash, camera_type, video_resolution, size, updated, created_date
+  )
+  VALUES (
+    source.video_id, source.uri, source.camera_id, source.video_timestamp, source.video_latitude, source.video_longitude,
+    source.video_geo, source.video_geohash, source.camera_type, source.video_resolution, source.size, source.updated, CURRENT_TIMESTAMP()
+  );
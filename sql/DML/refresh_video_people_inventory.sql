@@ -0,0 +1,79 @@
+/* Build the people inventory for videos that have not been inventoried yet
+   Gemini lists every visible person once per video; the embeddings are computed by
+   update_video_people_embeddings.sql. Every processed video gets a status row, so
+   videos with nobody in them are not sent to Gemini again. Failed extractions are
+   retried up to 3 times. */
+
+CREATE TEMP TABLE generated AS
+SELECT
+  uri,
+  SPLIT(REGEXP_REPLACE(REGEXP_EXTRACT(uri, r'[^/]+$'), r'\.mp4$', ''), '_') AS parts,
+  AI.GENERATE(
+    (
+      "List every distinct person visible in this surveillance video. For each person describe gender, apparent age range, build and height, hair, upper and lower clothing, footwear, accessories and distinguishing features, the first and last time they appear (HH:MM:SS), and a one-sentence description combining all of these. Use Unknown for anything that cannot be seen.",
+      OBJ.GET_ACCESS_URL(ref, 'r')
+    ),
+    connection_id => '<PROJECT_ID>.<REGION>.<CONNECTION_NAME>',
+    endpoint => '<MODEL>',
+    output_schema => 'people ARRAY<STRUCT<gender STRING, ageRange STRING, build STRING, hair STRING, clothingTop STRING, clothingBottom STRING, footwear STRING, accessories STRING, distinguishingFeatures STRING, firstSeen STRING, lastSeen STRING, description STRING>>',
+    model_params => JSON '{"generation_config": {"temperature": 0}}'
+  ) AS result
+FROM `<DATASET>.<VIDEO_TABLE>`
+WHERE uri NOT IN (
+  SELECT uri FROM `<DATASET>.video_people_inventory_status`
+  WHERE status = 'complete' OR attempts >= 3
+);
+
+BEGIN TRANSACTION;
+
+INSERT INTO `<DATASET>.video_people_inventory` (
+  video_id, person_index, uri, camera_id, video_timestamp, video_geo, video_geohash,
+  gender, age_range, build, hair, clothing_top, clothing_bottom, footwear, accessories,
+  distinguishing_features, first_seen, last_seen, description, model_name, created_date
+)
+SELECT
+  CONCAT('video_', SUBSTR(TO_HEX(SHA256(generated.uri)), 1, 16)) AS video_id,
+  person_index,
+  generated.uri,
+  parts[SAFE_OFFSET(0)] AS camera_id,
+  TIMESTAMP(SAFE.PARSE_DATETIME('%Y%m%d%H%M%S', parts[SAFE_OFFSET(1)])) AS video_timestamp,
+  SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)) AS video_geo,
+  ST_GEOHASH(SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)), 9) AS video_geohash,
+  person.gender,
+  person.ageRange,
+  person.build,
+  person.hair,
+  person.clothingTop,
+  person.clothingBottom,
+  person.footwear,
+  person.accessories,
+  person.distinguishingFeatures,
+  person.firstSeen,
+  person.lastSeen,
+  person.description,
+  '<MODEL>' AS model_name,
+  CURRENT_TIMESTAMP() AS created_date
+FROM generated,
+UNNEST(generated.result.people) AS person WITH OFFSET AS person_index
+WHERE generated.result.status = '';
+
+MERGE `<DATASET>.video_people_inventory_status` AS target
+USING (
+  SELECT
+    CONCAT('video_', SUBSTR(TO_HEX(SHA256(uri)), 1, 16)) AS video_id,
+    uri,
+    IF(result.status = '', 'complete', 'failed') AS status,
+    IF(result.status = '', IFNULL(ARRAY_LENGTH(result.people), 0), NULL) AS people_count,
+    NULLIF(result.status, '') AS error
+  FROM generated
+) AS source
+ON target.uri = source.uri
+WHEN MATCHED THEN
+  UPDATE SET
+    status = source.status, people_count = source.people_count, error = source.error,
+    attempts = target.attempts + 1, model_name = '<MODEL>', processed_date = CURRENT_TIMESTAMP()
+WHEN NOT MATCHED THEN
+  INSERT (video_id, uri, status, people_count, error, attempts, model_name, processed_date)
+  VALUES (source.video_id, source.uri, source.status, source.people_count, source.error, 1, '<MODEL>', CURRENT_TIMESTAMP());
+
+COMMIT TRANSACTION;
@@ -0,0 +1,12 @@
+UPDATE `<DATASET>.video_people_inventory` AS inventory
+SET inventory.description_embedding = e.ml_generate_embedding_result
+FROM ML.GENERATE_EMBEDDING(
+  MODEL `<DATASET>.text_embedding_model`,
+  (
+    SELECT video_id, person_index, description AS content
+    FROM `<DATASET>.video_people_inventory`
+    WHERE description IS NOT NULL AND (description_embedding IS NULL OR ARRAY_LENGTH(description_embedding) = 0)
+  ),
+  STRUCT('SEMANTIC_SIMILARITY' AS task_type)
+) AS e
+WHERE inventory.video_id = e.video_id AND inventory.person_index = e.person_index;
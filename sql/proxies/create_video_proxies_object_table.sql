@@ -0,0 +1,14 @@
+/* Object table over the low-resolution proxies of the processed bucket
+   Created once proxy_pipeline has written proxies; point HOMEWARD_BQ_TABLE at
+   video_proxies to analyze them instead of the original footage. The proxies
+   keep the filename convention and custom metadata of the originals, so every
+   filter of the analysis queries works unchanged. */
+
+CREATE EXTERNAL TABLE IF NOT EXISTS `<DATASET>.video_proxies`
+WITH CONNECTION `<PROJECT_ID>.<REGION>.<CONNECTION_NAME>`
+OPTIONS (
+  object_metadata = 'SIMPLE',
+  uris = ['gs://<PROCESSED_BUCKET>/*.mp4'],
+  max_staleness = INTERVAL 1 HOUR,
+  metadata_cache_mode = 'AUTOMATIC'
+);
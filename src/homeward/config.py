@@ -7,6 +7,7 @@ from typing import Optional
 class DataSource(Enum):
     MOCK = "mock"
     BIGQUERY = "bigquery"
+    SIMULATED = "simulated"
 
 
 @dataclass
@@ -18,10 +19,26 @@ class AppConfig:
     bigquery_region: Optional[str] = None
     bigquery_connection: Optional[str] = None
     bigquery_model: Optional[str] = None
+    bigquery_video_table: str = "video_objects"
+    model_routes_path: Optional[str] = None
+    analysis_prompt_version: str = "v1"
+    verdict_cache_size: int = 10000
     gcs_bucket_ingestion: Optional[str] = None
     gcs_bucket_processed: Optional[str] = None
+    thumbnail_cache_dir: str = ".thumbnail_cache"
     geocoding_api_key: Optional[str] = None
+    geocoding_cache_path: Optional[str] = ".geocoding_cache.sqlite3"
+    geocoding_cache_ttl_days: int = 30
+    geocoding_requests_per_minute: float = 3000.0
+    gazetteer_path: Optional[str] = None
     service_account_key_path: Optional[str] = None
+    simulation_media_dir: Optional[str] = None
+    video_inventory_top_k: int = 0
+    analysis_max_concurrency: int = 4
+    analysis_requests_per_minute: float = 60.0
+    analysis_shard_size: int = 250
+    analysis_max_shards: int = 8
+    analysis_shard_by: str = "camera"
 
 
 def load_config() -> AppConfig:
@@ -41,8 +58,24 @@ def load_config() -> AppConfig:
         bigquery_region=os.getenv("HOMEWARD_BIGQUERY_REGION", "us-central1"),
         bigquery_connection=os.getenv("HOMEWARD_BQ_CONNECTION", "homeward_gcp_connection"),
         bigquery_model=os.getenv("HOMEWARD_BQ_MODEL", "gemini-2.5-flash"),
+        bigquery_video_table=os.getenv("HOMEWARD_BQ_TABLE", "video_objects"),
+        model_routes_path=os.getenv("HOMEWARD_MODEL_ROUTES") or None,
+        analysis_prompt_version=os.getenv("HOMEWARD_PROMPT_VERSION", "v1"),
+        verdict_cache_size=int(os.getenv("HOMEWARD_VERDICT_CACHE_SIZE", "10000")),
         gcs_bucket_ingestion=os.getenv("HOMEWARD_GCS_BUCKET_INGESTION"),
         gcs_bucket_processed=os.getenv("HOMEWARD_GCS_BUCKET_PROCESSED"),
+        thumbnail_cache_dir=os.getenv("HOMEWARD_THUMBNAIL_CACHE_DIR", ".thumbnail_cache"),
         geocoding_api_key=os.getenv("HOMEWARD_GEOCODING_API_KEY"),
+        geocoding_cache_path=os.getenv("HOMEWARD_GEOCODING_CACHE_PATH", ".geocoding_cache.sqlite3"),
+        geocoding_cache_ttl_days=int(os.getenv("HOMEWARD_GEOCODING_CACHE_TTL_DAYS", "30")),
+        geocoding_requests_per_minute=float(os.getenv("HOMEWARD_GEOCODING_REQUESTS_PER_MINUTE", "3000")),
+        gazetteer_path=os.getenv("HOMEWARD_GAZETTEER_PATH") or None,
         service_account_key_path=os.getenv("HOMEWARD_SERVICE_ACCOUNT_KEY_PATH", "downloads/key.json"),
+        simulation_media_dir=os.getenv("HOMEWARD_SIMULATION_MEDIA_DIR", "demo/videos/media"),
+        video_inventory_top_k=int(os.getenv("HOMEWARD_VIDEO_INVENTORY_TOP_K", "0")),
+        analysis_max_concurrency=int(os.getenv("HOMEWARD_ANALYSIS_MAX_CONCURRENCY", "4")),
+        analysis_requests_per_minute=float(os.getenv("HOMEWARD_ANALYSIS_REQUESTS_PER_MINUTE", "60")),
+        analysis_shard_size=int(os.getenv("HOMEWARD_ANALYSIS_SHARD_SIZE", "250")),
+        analysis_max_shards=int(os.getenv("HOMEWARD_ANALYSIS_MAX_SHARDS", "8")),
+        analysis_shard_by=os.getenv("HOMEWARD_ANALYSIS_SHARD_BY", "camera"),
     )
@@ -1,15 +1,25 @@
-from nicegui import ui
+import threading
+
+from nicegui import app, ui
 
 from homeward.config import load_config
 from homeward.services.service_factory import (
+    create_analysis_scheduler,
+    create_background_geocoder,
     create_data_service,
+    create_gcs_service,
+    create_thumbnail_service,
     create_video_analysis_service,
+    create_video_stream_service,
 )
+from homeward.ui.components.video_player import register_video_stream_route
+from homeward.ui.components.video_thumbnail import register_thumbnail_route
 from homeward.ui.pages.case_detail import create_case_detail_page
 from homeward.ui.pages.dashboard import create_dashboard
 from homeward.ui.pages.new_report import create_new_report_page
 from homeward.ui.pages.new_sighting import create_new_sighting_page
 from homeward.ui.pages.sighting_detail import create_sighting_detail_page
+from homeward.utils.gazetteer import shared_gazetteer
 
 
 def main():
@@ -17,7 +27,15 @@ def main():
     # Load configuration
     config = load_config()
     data_service = create_data_service(config)
-    video_analysis_service = create_video_analysis_service(config)
+    analysis_scheduler = create_analysis_scheduler(config)
+    video_analysis_service = create_video_analysis_service(config, analysis_scheduler)
+    gcs_service = create_gcs_service(config)
+    register_video_stream_route(app, create_video_stream_service(config, gcs_service))
+    register_thumbnail_route(app, create_thumbnail_service(config, gcs_service))
+    background_geocoder = create_background_geocoder(config)
+    if config.gazetteer_path:
+        # Load the gazetteer in the background rather than on the first submission
+        threading.Thread(target=shared_gazetteer, args=(config.gazetteer_path,), daemon=True).start()
 
     @ui.page("/")
     def index():
@@ -25,7 +43,7 @@ def main():
 
     @ui.page("/new-report")
     def new_report():
-        create_new_report_page(data_service, config, lambda: ui.navigate.to("/"))
+        create_new_report_page(data_service, config, lambda: ui.navigate.to("/"), background_geocoder)
 
     @ui.page("/case/{case_id}")
     def case_detail(case_id: str):
@@ -35,11 +53,13 @@ def main():
             video_analysis_service,
             config,
             lambda: ui.navigate.to("/"),
+            analysis_scheduler,
+            gcs_service,
         )
 
     @ui.page("/new-sighting")
     def new_sighting():
-        create_new_sighting_page(data_service, config, lambda: ui.navigate.to("/"))
+        create_new_sighting_page(data_service, config, lambda: ui.navigate.to("/"), background_geocoder)
 
     @ui.page("/sighting/{sighting_id}")
     def sighting_detail(sighting_id: str):
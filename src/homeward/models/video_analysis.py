@@ -1,5 +1,13 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+
+class TravelMode(Enum):
+    WALKING = "Walking"
+    TRANSIT = "Transit"
+    CAR = "Car"
 
 
 @dataclass
@@ -41,3 +49,84 @@ class VideoAnalysisRequest:
     search_radius_km: float
     last_seen_latitude: float
     last_seen_longitude: float
+    # When both are set, the radius grows with the time elapsed since last_seen_date
+    last_seen_date: Optional[datetime] = None
+    travel_mode: Optional[TravelMode] = None
+
+
+@dataclass
+class SweepCase:
+    """A single missing person case taking part in a multi-case video sweep"""
+
+    case_id: str
+    last_seen_latitude: float
+    last_seen_longitude: float
+    missing_person_data: dict = field(default_factory=dict)
+
+
+@dataclass
+class VideoSweepRequest:
+    """Data model for analyzing one footage window against many cases at once"""
+
+    cases: list[SweepCase]
+    start_date: datetime
+    end_date: datetime
+    time_range: str
+    search_radius_km: float
+    center_latitude: float
+    center_longitude: float
+    # Analyze exactly these videos instead of resolving the window, e.g. newly ingested footage
+    candidate_uris: Optional[list[str]] = None
+
+
+@dataclass
+class VideoMetadata:
+    """Metadata encoded in a video filename (CameraID_YYYYMMDDHHMMSS_LAT_LON_TYPE_RES.mp4)"""
+
+    uri: str
+    camera_id: str
+    timestamp: datetime
+    latitude: float
+    longitude: float
+    camera_type: str
+    resolution: Optional[str] = None
+
+
+@dataclass
+class VideoAnalysisRing:
+    """One step of a progressive search, covering videos up to a distance and time offset"""
+
+    index: int
+    total_rings: int
+    max_distance_km: Optional[float]
+    max_hours: Optional[float]
+    uris: list[str] = field(default_factory=list)
+
+    @property
+    def is_last(self) -> bool:
+        """Whether no ring lies further out"""
+        return self.index >= self.total_rings - 1
+
+
+@dataclass
+class VideoTrack:
+    """Detections of the same person across adjacent cameras or consecutive clips"""
+
+    id: str
+    detections: list[VideoAnalysisResult]
+    representative: VideoAnalysisResult
+    confidence_score: float  # Aggregate over the detections, 0.0 to 1.0
+
+    @property
+    def start_time(self) -> datetime:
+        return min(detection.timestamp for detection in self.detections)
+
+    @property
+    def end_time(self) -> datetime:
+        return max(detection.timestamp for detection in self.detections)
+
+    @property
+    def camera_ids(self) -> list[str]:
+        """Cameras of the track, in the order the person passed them"""
+        ordered = sorted(self.detections, key=lambda detection: detection.timestamp)
+        return list(dict.fromkeys(detection.camera_id for detection in ordered))
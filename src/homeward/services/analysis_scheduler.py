@@ -0,0 +1,366 @@
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from homeward.models.case import CasePriority
+from homeward.models.video_analysis import VideoAnalysisRequest, VideoAnalysisRing
+from homeward.services.video_analysis_service import VideoAnalysisService
+from homeward.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANK = {
+    CasePriority.HIGH: 0,
+    CasePriority.MEDIUM: 1,
+    CasePriority.LOW: 2,
+}
+
+# Jobs waiting longer than this are promoted one priority level, so low priority cases are never starved
+DEFAULT_AGING_SECONDS = 300.0
+# Within a priority, cases in the first day, then the first three days after the disappearance go first
+DISAPPEARANCE_WINDOWS_HOURS = (24, 72)
+# Wait times kept for the metrics
+WAIT_TIME_WINDOW = 1000
+
+
+@dataclass
+class AnalysisJob:
+    """One queued unit of analysis work for a case"""
+
+    case_id: str
+    priority: CasePriority
+    last_seen_date: Optional[datetime]
+    func: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    cost: float
+    sequence: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: Future = field(default_factory=Future)
+
+    def effective_rank(self, now: float, aging_seconds: float) -> int:
+        """Priority rank after aging, 0 is the most urgent"""
+        rank = PRIORITY_RANK.get(self.priority, PRIORITY_RANK[CasePriority.MEDIUM])
+        if aging_seconds > 0:
+            rank -= int((now - self.enqueued_at) // aging_seconds)
+        return max(0, rank)
+
+    def hours_since_disappearance(self, now: datetime) -> float:
+        """Hours since the person was last seen; unknown dates sort last"""
+        if self.last_seen_date is None:
+            return float("inf")
+        return max(0.0, (now - self.last_seen_date).total_seconds() / 3600)
+
+    def urgency_window(self, now: datetime) -> int:
+        """Index of the disappearance window the case is in, 0 for the most recent"""
+        hours = self.hours_since_disappearance(now)
+        return sum(hours >= limit for limit in DISAPPEARANCE_WINDOWS_HOURS)
+
+
+class AnalysisScheduler:
+    """
+    Run video analysis jobs from every officer through shared priority queues.
+
+    Jobs are ordered by case priority, then by how recently the person
+    disappeared, since the first hours matter most. Each case has its own
+    queue; among equally urgent cases, those with fewer running jobs and
+    those served least recently go first, so one case submitting many
+    searches cannot take every slot. A global concurrency cap
+    and a token bucket matched to the connection quota keep concurrent
+    analyses from exhausting the Gemini and BigQuery quotas together.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        requests_per_minute: float = 60.0,
+        burst: Optional[float] = None,
+        aging_seconds: float = DEFAULT_AGING_SECONDS,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.max_concurrency = max_concurrency
+        self.aging_seconds = aging_seconds
+        # One minute of quota by default, so a typical analysis starts at once and larger ones are paced
+        self.rate_limiter = TokenBucket.per_minute(
+            requests_per_minute, burst if burst is not None else max(1.0, requests_per_minute)
+        )
+
+        self._condition = threading.Condition()
+        self._queues: dict[str, deque[AnalysisJob]] = {}
+        self._running_by_case: dict[str, int] = {}
+        self._last_served: dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._dispatches = itertools.count()
+        self._shutdown = False
+
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._throttled_seconds = 0.0
+        self._wait_times: dict[CasePriority, deque[float]] = {
+            priority: deque(maxlen=WAIT_TIME_WINDOW) for priority in CasePriority
+        }
+
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"analysis-scheduler-{i}", daemon=True)
+            for i in range(max_concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        case_id: str,
+        priority: CasePriority,
+        last_seen_date: Optional[datetime],
+        func: Callable[..., Any],
+        *args,
+        cost: float = 1.0,
+        **kwargs,
+    ) -> Future:
+        """
+        Queue a job for a case
+
+        Args:
+            case_id: Case the job belongs to, used for fair sharing
+            priority: Priority of the case
+            last_seen_date: When the person was last seen
+            func: Callable running the analysis
+            cost: Quota requests the job consumes, e.g. the number of videos analyzed
+            *args, **kwargs: Passed to func
+
+        Returns:
+            Future resolved with the return value of func
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Analysis scheduler is shut down")
+
+            job = AnalysisJob(
+                case_id=case_id,
+                priority=priority,
+                last_seen_date=last_seen_date,
+                func=func,
+                args=args,
+                kwargs=kwargs,
+                cost=max(1.0, cost),
+                sequence=next(self._sequence),
+            )
+            self._queues.setdefault(case_id, deque()).append(job)
+            self._condition.notify()
+
+        logger.debug(f"Queued analysis job for case {case_id} ({priority.value}), queue depth {self.queue_depth}")
+        return job.future
+
+    def submit_analysis(
+        self,
+        case,
+        video_analysis_service: VideoAnalysisService,
+        request: VideoAnalysisRequest,
+        missing_person_data: dict = None,
+    ) -> Future:
+        """
+        Queue an analyze_videos call for a case
+
+        The quota cost is the number of candidate videos, one model request
+        each, when the service can resolve them up front.
+
+        Args:
+            case: MissingPersonCase being analyzed
+            video_analysis_service: Service running the analysis
+            request: VideoAnalysisRequest containing search parameters
+            missing_person_data: Optional data for the AI prompt
+
+        Returns:
+            Future resolved with the analyze_videos return value
+        """
+        args = (request, missing_person_data) if missing_person_data is not None else (request,)
+        return self.submit(
+            case.id,
+            case.priority,
+            case.last_seen_date,
+            video_analysis_service.analyze_videos,
+            *args,
+            cost=self.analysis_cost(video_analysis_service, request),
+        )
+
+    def ring_runner(self, case) -> Callable[[VideoAnalysisRing, Callable[[], Any]], Any]:
+        """
+        Runner for analyze_videos_progressive queuing each ring as a job of the case
+
+        A ring costs one quota request per video, or 1 when its videos are not
+        known ahead of the analysis. The runner blocks until the ring is analyzed.
+
+        Args:
+            case: MissingPersonCase being analyzed
+
+        Returns:
+            Callable taking a ring and the function analyzing it
+        """
+        def run_ring(ring: VideoAnalysisRing, analyze: Callable[[], Any]) -> Any:
+            future = self.submit(case.id, case.priority, case.last_seen_date, analyze, cost=len(ring.uris) or 1)
+            return future.result()
+
+        return run_ring
+
+    @staticmethod
+    def analysis_cost(video_analysis_service: VideoAnalysisService, request: VideoAnalysisRequest) -> float:
+        """Quota requests of an analysis: one per candidate video, or 1 when unknown"""
+        try:
+            candidate_uris = video_analysis_service.resolve_candidate_uris(request)
+        except Exception as e:
+            logger.warning(f"Could not resolve candidate videos for request {request.case_id}: {e}")
+            candidate_uris = None
+        return len(candidate_uris) if candidate_uris else 1
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting to run"""
+        with self._condition:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def metrics(self) -> dict:
+        """
+        Snapshot of the scheduler state
+
+        Returns:
+            dict: queue depth overall and per priority, running, completed and
+            failed jobs, wait times per priority and seconds spent throttled
+        """
+        with self._condition:
+            depth_by_priority = {priority.value: 0 for priority in CasePriority}
+            for queue in self._queues.values():
+                for job in queue:
+                    depth_by_priority[job.priority.value] += 1
+
+            wait_seconds = {}
+            for priority, waits in self._wait_times.items():
+                ordered = sorted(waits)
+                wait_seconds[priority.value] = {
+                    "count": len(ordered),
+                    "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+                    "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0,
+                    "max": ordered[-1] if ordered else 0.0,
+                }
+
+            return {
+                "queue_depth": sum(depth_by_priority.values()),
+                "queue_depth_by_priority": depth_by_priority,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "wait_seconds": wait_seconds,
+                "throttled_seconds": self._throttled_seconds,
+                "available_tokens": self.rate_limiter.available,
+            }
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True):
+        """
+        Stop accepting jobs and stop the workers
+
+        Args:
+            wait: Wait for the running jobs to finish
+            cancel_pending: Cancel queued jobs instead of running them first
+        """
+        with self._condition:
+            self._shutdown = True
+            if cancel_pending:
+                for queue in self._queues.values():
+                    for job in queue:
+                        job.future.cancel()
+                self._queues.clear()
+            self._condition.notify_all()
+
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _next_job(self) -> Optional[AnalysisJob]:
+        """Pop the most urgent job, sharing slots fairly between cases. Called with the lock held."""
+        now = time.monotonic()
+        wall_clock = datetime.now()
+        best_key = None
+        best_case = None
+
+        for case_id, queue in self._queues.items():
+            if not queue:
+                continue
+            job = queue[0]
+            key = (
+                job.effective_rank(now, self.aging_seconds),
+                job.urgency_window(wall_clock),
+                self._running_by_case.get(case_id, 0),
+                self._last_served.get(case_id, -1),
+                job.hours_since_disappearance(wall_clock),
+                job.sequence,
+            )
+            if best_key is None or key < best_key:
+                best_key, best_case = key, case_id
+
+        if best_case is None:
+            return None
+
+        queue = self._queues[best_case]
+        job = queue.popleft()
+        if not queue:
+            del self._queues[best_case]
+        return job
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    if self._shutdown:
+                        return
+                    self._condition.wait()
+                    job = self._next_job()
+
+                self._running += 1
+                self._running_by_case[job.case_id] = self._running_by_case.get(job.case_id, 0) + 1
+                self._last_served[job.case_id] = next(self._dispatches)
+
+            self._run(job)
+
+            with self._condition:
+                self._running -= 1
+                self._running_by_case[job.case_id] -= 1
+                if not self._running_by_case[job.case_id]:
+                    del self._running_by_case[job.case_id]
+
+    def _run(self, job: AnalysisJob):
+        """Wait for quota, then run the job and resolve its future"""
+        if not job.future.set_running_or_notify_cancel():
+            return
+
+        throttled = self.rate_limiter.acquire(job.cost)
+        wait_time = time.monotonic() - job.enqueued_at
+
+        with self._condition:
+            self._throttled_seconds += throttled
+            self._wait_times[job.priority].append(wait_time)
+
+        logger.info(
+            f"Running analysis job for case {job.case_id} ({job.priority.value}) "
+            f"after {wait_time:.1f}s in queue, {throttled:.1f}s throttled"
+        )
+
+        try:
+            result = job.func(*job.args, **job.kwargs)
+        except BaseException as e:
+            with self._condition:
+                self._failed += 1
+            logger.error(f"Analysis job for case {job.case_id} failed: {e}")
+            job.future.set_exception(e)
+        else:
+            with self._condition:
+                self._completed += 1
+            job.future.set_result(result)
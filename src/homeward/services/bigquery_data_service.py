@@ -5,6 +5,7 @@ from google.cloud import bigquery
 from homeward.config import AppConfig
 from homeward.models.case import KPIData, MissingPersonCase, Sighting
 from homeward.services.data_service import DataService
+from homeward.utils.geohash import GEOHASH_PRECISION, prune_filter
 
 
 class BigQueryDataService(DataService):
@@ -353,6 +354,11 @@ class BigQueryDataService(DataService):
               THEN ST_GEOGPOINT(@last_seen_longitude, @last_seen_latitude)
               ELSE NULL
             END AS last_seen_geo,
+            CASE
+              WHEN @last_seen_latitude IS NOT NULL AND @last_seen_longitude IS NOT NULL
+              THEN ST_GEOHASH(ST_GEOGPOINT(@last_seen_longitude, @last_seen_latitude), {GEOHASH_PRECISION})
+              ELSE NULL
+            END AS last_seen_geohash,
             @circumstances AS circumstances,
             @priority AS priority,
             @status AS status,
@@ -432,7 +438,7 @@ class BigQueryDataService(DataService):
             id, case_number, name, surname, date_of_birth, gender,
             height, weight, hair_color, eye_color, distinguishing_marks, clothing_description,
             last_seen_date, last_seen_time, last_seen_address, last_seen_city, last_seen_country,
-            last_seen_postal_code, last_seen_latitude, last_seen_longitude, last_seen_geo,
+            last_seen_postal_code, last_seen_latitude, last_seen_longitude, last_seen_geo, last_seen_geohash,
             circumstances, priority, status, description, medical_conditions, additional_info,
             photo_url, reporter_name, reporter_phone, reporter_email, relationship,
             created_date, updated_date, ml_summary
@@ -441,7 +447,7 @@ class BigQueryDataService(DataService):
             source.id, source.case_number, source.name, source.surname, source.date_of_birth, source.gender,
             source.height, source.weight, source.hair_color, source.eye_color, source.distinguishing_marks, source.clothing_description,
             source.last_seen_date, source.last_seen_time, source.last_seen_address, source.last_seen_city, source.last_seen_country,
-            source.last_seen_postal_code, source.last_seen_latitude, source.last_seen_longitude, source.last_seen_geo,
+            source.last_seen_postal_code, source.last_seen_latitude, source.last_seen_longitude, source.last_seen_geo, source.last_seen_geohash,
             source.circumstances, source.priority, source.status, source.description, source.medical_conditions, source.additional_info,
             source.photo_url, source.reporter_name, source.reporter_phone, source.reporter_email, source.relationship,
             source.created_date, source.updated_date, source.ml_summary
@@ -525,6 +531,11 @@ class BigQueryDataService(DataService):
               THEN ST_GEOGPOINT(@last_seen_longitude, @last_seen_latitude)
               ELSE NULL
             END AS last_seen_geo,
+            CASE
+              WHEN @last_seen_latitude IS NOT NULL AND @last_seen_longitude IS NOT NULL
+              THEN ST_GEOHASH(ST_GEOGPOINT(@last_seen_longitude, @last_seen_latitude), {GEOHASH_PRECISION})
+              ELSE NULL
+            END AS last_seen_geohash,
             @circumstances AS circumstances,
             @priority AS priority,
             @status AS status,
@@ -620,6 +631,7 @@ class BigQueryDataService(DataService):
             last_seen_latitude = source.last_seen_latitude,
             last_seen_longitude = source.last_seen_longitude,
             last_seen_geo = source.last_seen_geo,
+            last_seen_geohash = source.last_seen_geohash,
             circumstances = source.circumstances,
             priority = source.priority,
             status = source.status,
@@ -996,6 +1008,11 @@ class BigQueryDataService(DataService):
               THEN ST_GEOGPOINT(@sighted_longitude, @sighted_latitude)
               ELSE NULL
             END AS sighted_geo,
+            CASE
+              WHEN @sighted_latitude IS NOT NULL AND @sighted_longitude IS NOT NULL
+              THEN ST_GEOHASH(ST_GEOGPOINT(@sighted_longitude, @sighted_latitude), {GEOHASH_PRECISION})
+              ELSE NULL
+            END AS sighted_geohash,
             @apparent_gender AS apparent_gender,
             @apparent_age_range AS apparent_age_range,
             @height_estimate AS height_estimate,
@@ -1091,7 +1108,7 @@ class BigQueryDataService(DataService):
         WHEN NOT MATCHED THEN
           INSERT (
             id, sighting_number, sighted_date, sighted_time, sighted_address, sighted_city, sighted_country,
-            sighted_postal_code, sighted_latitude, sighted_longitude, sighted_geo,
+            sighted_postal_code, sighted_latitude, sighted_longitude, sighted_geo, sighted_geohash,
             apparent_gender, apparent_age_range, height_estimate, weight_estimate, hair_color, eye_color,
             clothing_description, distinguishing_features, description, circumstances, confidence_level,
             photo_url, video_url, source_type, witness_name, witness_phone, witness_email,
@@ -1100,7 +1117,7 @@ class BigQueryDataService(DataService):
           )
           VALUES (
             source.id, source.sighting_number, source.sighted_date, source.sighted_time, source.sighted_address, source.sighted_city, source.sighted_country,
-            source.sighted_postal_code, source.sighted_latitude, source.sighted_longitude, source.sighted_geo,
+            source.sighted_postal_code, source.sighted_latitude, source.sighted_longitude, source.sighted_geo, source.sighted_geohash,
             source.apparent_gender, source.apparent_age_range, source.height_estimate, source.weight_estimate, source.hair_color, source.eye_color,
             source.clothing_description, source.distinguishing_features, source.description, source.circumstances, source.confidence_level,
             source.photo_url, source.video_url, source.source_type, source.witness_name, source.witness_phone, source.witness_email,
@@ -1175,6 +1192,11 @@ class BigQueryDataService(DataService):
               THEN ST_GEOGPOINT(@sighted_longitude, @sighted_latitude)
               ELSE NULL
             END AS sighted_geo,
+            CASE
+              WHEN @sighted_latitude IS NOT NULL AND @sighted_longitude IS NOT NULL
+              THEN ST_GEOHASH(ST_GEOGPOINT(@sighted_longitude, @sighted_latitude), {GEOHASH_PRECISION})
+              ELSE NULL
+            END AS sighted_geohash,
             @apparent_gender AS apparent_gender,
             @apparent_age_range AS apparent_age_range,
             @height_estimate AS height_estimate,
@@ -1278,6 +1300,7 @@ class BigQueryDataService(DataService):
             sighted_latitude = source.sighted_latitude,
             sighted_longitude = source.sighted_longitude,
             sighted_geo = source.sighted_geo,
+            sighted_geohash = source.sighted_geohash,
             apparent_gender = source.apparent_gender,
             apparent_age_range = source.apparent_age_range,
             height_estimate = source.height_estimate,
@@ -1356,6 +1379,45 @@ class BigQueryDataService(DataService):
             print(f"Error updating sighting {sighting.id}: {str(e)}")
             return False
 
+    def update_case_coordinates(self, case_id: str, latitude: float, longitude: float) -> bool:
+        """Set the last seen coordinates and geography of a case, leaving its summary and embedding as they are"""
+        return self._update_coordinates("missing_persons", "last_seen", case_id, latitude, longitude)
+
+    def update_sighting_coordinates(self, sighting_id: str, latitude: float, longitude: float) -> bool:
+        """Set the coordinates and geography of a sighting, leaving its summary and embedding as they are"""
+        return self._update_coordinates("sightings", "sighted", sighting_id, latitude, longitude)
+
+    def _update_coordinates(self, table: str, column_prefix: str, record_id: str, latitude: float, longitude: float) -> bool:
+        """Patch the latitude, longitude, geography and geohash columns of one record, without an AI.GENERATE call"""
+        COORDINATES_UPDATE_QUERY = f"""
+        UPDATE `{self.config.bigquery_dataset}.{table}`
+        SET
+          {column_prefix}_latitude = @latitude,
+          {column_prefix}_longitude = @longitude,
+          {column_prefix}_geo = ST_GEOGPOINT(@longitude, @latitude),
+          {column_prefix}_geohash = ST_GEOHASH(ST_GEOGPOINT(@longitude, @latitude), {GEOHASH_PRECISION}),
+          updated_date = CURRENT_TIMESTAMP()
+        WHERE id = @id
+        """
+
+        try:
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("id", "STRING", record_id),
+                    bigquery.ScalarQueryParameter("latitude", "FLOAT64", latitude),
+                    bigquery.ScalarQueryParameter("longitude", "FLOAT64", longitude),
+                ]
+            )
+
+            query_job = self.client.query(COORDINATES_UPDATE_QUERY, job_config=job_config)
+            query_job.result()  # Wait for the query to complete
+
+            return bool(query_job.num_dml_affected_rows)
+
+        except Exception as e:
+            print(f"Error updating coordinates of {table} {record_id}: {str(e)}")
+            return False
+
     def search_cases(self, query: str, field: str = "all", page: int = 1, page_size: int = 20) -> tuple[list[MissingPersonCase], int]:
         """Search missing person cases with LIKE filtering"""
         if not query or not query.strip():
@@ -2299,14 +2361,17 @@ class BigQueryDataService(DataService):
         # Calculate offset
         offset = (page - 1) * page_size
 
+        # Prune to the geohash cells covering the circle, then refine with ST_DWITHIN on the stored geography
+        cell_filter, cell_parameters = prune_filter("last_seen_geohash", latitude, longitude, radius_km)
+
         # Count query using ST_DWITHIN for geographic distance filtering
         COUNT_QUERY = f"""
         SELECT COUNT(id) as total_count
         FROM `{self.config.bigquery_dataset}.missing_persons`
-        WHERE last_seen_latitude IS NOT NULL
-            AND last_seen_longitude IS NOT NULL
+        WHERE last_seen_geo IS NOT NULL
+            AND {cell_filter}
             AND ST_DWITHIN(
-                ST_GEOGPOINT(last_seen_longitude, last_seen_latitude),
+                last_seen_geo,
                 ST_GEOGPOINT(@search_longitude, @search_latitude),
                 @radius_meters
             )
@@ -2323,14 +2388,14 @@ class BigQueryDataService(DataService):
             photo_url, reporter_name, reporter_phone, reporter_email, relationship,
             created_date, updated_date, ml_summary,
             ST_DISTANCE(
-                ST_GEOGPOINT(last_seen_longitude, last_seen_latitude),
+                last_seen_geo,
                 ST_GEOGPOINT(@search_longitude, @search_latitude)
             ) / 1000 as distance_km
         FROM `{self.config.bigquery_dataset}.missing_persons`
-        WHERE last_seen_latitude IS NOT NULL
-            AND last_seen_longitude IS NOT NULL
+        WHERE last_seen_geo IS NOT NULL
+            AND {cell_filter}
             AND ST_DWITHIN(
-                ST_GEOGPOINT(last_seen_longitude, last_seen_latitude),
+                last_seen_geo,
                 ST_GEOGPOINT(@search_longitude, @search_latitude),
                 @radius_meters
             )
@@ -2341,13 +2406,17 @@ class BigQueryDataService(DataService):
         try:
             # Convert radius from km to meters for BigQuery ST_DWITHIN
             radius_meters = radius_km * 1000
+            cell_query_parameters = [
+                bigquery.ScalarQueryParameter(name, "STRING", value) for name, value in cell_parameters.items()
+            ]
 
             # Execute count query
             count_job_config = bigquery.QueryJobConfig(
                 query_parameters=[
                     bigquery.ScalarQueryParameter("search_latitude", "FLOAT64", latitude),
                     bigquery.ScalarQueryParameter("search_longitude", "FLOAT64", longitude),
-                    bigquery.ScalarQueryParameter("radius_meters", "FLOAT64", radius_meters)
+                    bigquery.ScalarQueryParameter("radius_meters", "FLOAT64", radius_meters),
+                    *cell_query_parameters,
                 ]
             )
             count_query_job = self.client.query(COUNT_QUERY, job_config=count_job_config)
@@ -2361,7 +2430,8 @@ class BigQueryDataService(DataService):
                     bigquery.ScalarQueryParameter("search_longitude", "FLOAT64", longitude),
                     bigquery.ScalarQueryParameter("radius_meters", "FLOAT64", radius_meters),
                     bigquery.ScalarQueryParameter("page_size", "INT64", page_size),
-                    bigquery.ScalarQueryParameter("offset", "INT64", offset)
+                    bigquery.ScalarQueryParameter("offset", "INT64", offset),
+                    *cell_query_parameters,
                 ]
             )
             data_query_job = self.client.query(CASES_QUERY, job_config=data_job_config)
@@ -2385,14 +2455,17 @@ class BigQueryDataService(DataService):
         # Calculate offset
         offset = (page - 1) * page_size
 
+        # Prune to the geohash cells covering the circle, then refine with ST_DWITHIN on the stored geography
+        cell_filter, cell_parameters = prune_filter("sighted_geohash", latitude, longitude, radius_km)
+
         # Count query using ST_DWITHIN for geographic distance filtering
         COUNT_QUERY = f"""
         SELECT COUNT(id) as total_count
         FROM `{self.config.bigquery_dataset}.sightings`
-        WHERE sighted_latitude IS NOT NULL
-            AND sighted_longitude IS NOT NULL
+        WHERE sighted_geo IS NOT NULL
+            AND {cell_filter}
             AND ST_DWITHIN(
-                ST_GEOGPOINT(sighted_longitude, sighted_latitude),
+                sighted_geo,
                 ST_GEOGPOINT(@search_longitude, @search_latitude),
                 @radius_meters
             )
@@ -2408,14 +2481,14 @@ class BigQueryDataService(DataService):
             distinguishing_features, description, confidence_level, source_type,
             created_date, updated_date, ml_summary,
             ST_DISTANCE(
-                ST_GEOGPOINT(sighted_longitude, sighted_latitude),
+                sighted_geo,
                 ST_GEOGPOINT(@search_longitude, @search_latitude)
             ) / 1000 as distance_km
         FROM `{self.config.bigquery_dataset}.sightings`
-        WHERE sighted_latitude IS NOT NULL
-            AND sighted_longitude IS NOT NULL
+        WHERE sighted_geo IS NOT NULL
+            AND {cell_filter}
             AND ST_DWITHIN(
-                ST_GEOGPOINT(sighted_longitude, sighted_latitude),
+                sighted_geo,
                 ST_GEOGPOINT(@search_longitude, @search_latitude),
                 @radius_meters
             )
@@ -2426,13 +2499,17 @@ class BigQueryDataService(DataService):
         try:
             # Convert radius from km to meters for BigQuery ST_DWITHIN
             radius_meters = radius_km * 1000
+            cell_query_parameters = [
+                bigquery.ScalarQueryParameter(name, "STRING", value) for name, value in cell_parameters.items()
+            ]
 
             # Execute count query
             count_job_config = bigquery.QueryJobConfig(
                 query_parameters=[
                     bigquery.ScalarQueryParameter("search_latitude", "FLOAT64", latitude),
                     bigquery.ScalarQueryParameter("search_longitude", "FLOAT64", longitude),
-                    bigquery.ScalarQueryParameter("radius_meters", "FLOAT64", radius_meters)
+                    bigquery.ScalarQueryParameter("radius_meters", "FLOAT64", radius_meters),
+                    *cell_query_parameters,
                 ]
             )
             count_query_job = self.client.query(COUNT_QUERY, job_config=count_job_config)
@@ -2446,7 +2523,8 @@ class BigQueryDataService(DataService):
                     bigquery.ScalarQueryParameter("search_longitude", "FLOAT64", longitude),
                     bigquery.ScalarQueryParameter("radius_meters", "FLOAT64", radius_meters),
                     bigquery.ScalarQueryParameter("page_size", "INT64", page_size),
-                    bigquery.ScalarQueryParameter("offset", "INT64", offset)
+                    bigquery.ScalarQueryParameter("offset", "INT64", offset),
+                    *cell_query_parameters,
                 ]
             )
             data_query_job = self.client.query(SIGHTINGS_QUERY, job_config=data_job_config)
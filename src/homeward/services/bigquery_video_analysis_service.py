@@ -1,21 +1,143 @@
+import json
 import logging
-from datetime import datetime
-
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Optional
+
+from google.api_core import exceptions as google_exceptions
 from google.cloud import bigquery
 
 from homeward.config import AppConfig
-from homeward.models.video_analysis import VideoAnalysisRequest, VideoAnalysisResult
+from homeward.models.video_analysis import (
+    TravelMode,
+    VideoAnalysisRequest,
+    VideoAnalysisResult,
+    VideoSweepRequest,
+)
 from homeward.services.video_analysis_service import VideoAnalysisService
+from homeward.utils.camera_index import CameraIndex, shard_videos
+from homeward.utils.geo_utils import (
+    REACHABILITY_BASE_KM,
+    TRAVEL_SPEEDS_KMH,
+    haversine_km,
+)
+from homeward.utils.geohash import GEOHASH_PRECISION, prune_filter
+from homeward.utils.model_routing import (
+    DEFAULT_MODEL_PARAMS,
+    DEFAULT_ROUTE_NAME,
+    ModelRoute,
+    load_model_routes,
+    route_videos,
+)
+from homeward.utils.prompt_registry import (
+    RenderedPrompt,
+    default_prompt_registry,
+    person_attributes,
+)
+from homeward.utils.rate_limit import TokenBucket, retry_with_backoff
+from homeward.utils.video_utils import (
+    VIDEO_RESULT_ID_SQL,
+    parse_video_filename,
+    video_result_id,
+)
 
 logger = logging.getLogger(__name__)
 
+# People listed once per video at ingestion time, matched against cases with VECTOR_SEARCH
+PEOPLE_INVENTORY_OUTPUT_SCHEMA = (
+    "people ARRAY<STRUCT<gender STRING, ageRange STRING, build STRING, hair STRING, "
+    "clothingTop STRING, clothingBottom STRING, footwear STRING, accessories STRING, "
+    "distinguishingFeatures STRING, firstSeen STRING, lastSeen STRING, description STRING>>"
+)
+
+PEOPLE_INVENTORY_PROMPT = (
+    "List every distinct person visible in this surveillance video. For each person describe gender, "
+    "apparent age range, build and height, hair, upper and lower clothing, footwear, accessories and "
+    "distinguishing features, the first and last time they appear (HH:MM:SS), and a one-sentence "
+    "description combining all of these. Use Unknown for anything that cannot be seen."
+)
+
+# Failed inventory extractions are retried this many times in total; videos with a complete status never are
+INVENTORY_MAX_ATTEMPTS = 3
+
+# Matches the object table metadata cache staleness, so new uploads show up
+CAMERA_INDEX_TTL_SECONDS = 600
+# After a failed load, searches use the metadata filters for this long before the listing is tried again
+CAMERA_INDEX_RETRY_SECONDS = 60
+
+# Restricts the object table to the URIs resolved from the camera index
+CANDIDATE_URIS_FILTER = """
+          AND uri IN UNNEST(@uris)
+        """
+
+# Result ID -> video URI entries kept in memory, least recently used evicted first
+VIDEO_URI_CACHE_SIZE = 10_000
+
+# Each shard of a sharded analysis is tried this many times before its videos count as errors
+SHARD_ATTEMPTS = 3
+SHARD_RETRY_BASE_DELAY_SECONDS = 5.0
+# Error reasons BigQuery reports for quota and backend failures that may succeed when retried
+TRANSIENT_BIGQUERY_REASONS = frozenset({"rateLimitExceeded", "backendError", "internalError", "badGateway"})
+
+ANALYSIS_OUTPUT_SCHEMA = "personFound BOOL, confidenceScore FLOAT64, matchJustification STRING, summaryOfFindings STRING"
+
+# One verdict per case, so a single pass over each video serves the whole sweep
+SWEEP_OUTPUT_SCHEMA = (
+    "verdicts ARRAY<STRUCT<caseId STRING, personFound BOOL, confidenceScore FLOAT64, "
+    "matchJustification STRING, summaryOfFindings STRING>>"
+)
+
+
+def is_transient_bigquery_error(error: Exception) -> bool:
+    """Whether a BigQuery job failure may succeed when retried: quota, server, timeout and transport errors"""
+    if isinstance(
+        error,
+        (
+            google_exceptions.TooManyRequests,
+            google_exceptions.InternalServerError,
+            google_exceptions.BadGateway,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.GatewayTimeout,
+            google_exceptions.DeadlineExceeded,
+        ),
+    ):
+        return True
+    if isinstance(error, google_exceptions.GoogleAPICallError):
+        return any(
+            isinstance(detail, dict) and detail.get("reason") in TRANSIENT_BIGQUERY_REASONS
+            for detail in error.errors or []
+        )
+    return isinstance(error, (TimeoutError, ConnectionError))
+
 
 class BigQueryVideoAnalysisService(VideoAnalysisService):
     """BigQuery implementation of VideoAnalysisService using Gemini AI for video analysis"""
 
-    def __init__(self, config: AppConfig):
+    def __init__(self, config: AppConfig, rate_limiter: Optional[TokenBucket] = None):
         self.config = config
         self.client = bigquery.Client(project=config.bigquery_project_id)
+        # Model request quota shared with the analysis scheduler; shard retries draw from it
+        self.rate_limiter = rate_limiter
+        # Result ID -> video URI of the videos seen by this process, least recently used first
+        self._video_uri_cache: OrderedDict = OrderedDict()
+        self._video_uri_cache_lock = threading.Lock()
+        # Spatio-temporal index of the footage, loaded lazily from the object listing
+        self._camera_index: Optional[CameraIndex] = None
+        self._camera_index_loaded_at = 0.0
+        self._camera_index_failed_at: Optional[float] = None
+        self._camera_index_lock = threading.Lock()
+        # Model endpoint per camera type and resolution; empty sends every video to bigquery_model
+        self.model_routes: list[ModelRoute] = (
+            load_model_routes(config.model_routes_path) if config.model_routes_path else []
+        )
+        # Analysis and sweep prompts by version, with the tokens of every rendered prompt
+        self.prompt_registry = default_prompt_registry(config.analysis_prompt_version)
+        # (uri, prompt version, prompt digest, endpoint) -> AI verdict, least recently used first
+        self._verdict_cache: OrderedDict = OrderedDict()
+        self._verdict_cache_lock = threading.Lock()
 
     def analyze_videos(
         self, request: VideoAnalysisRequest, missing_person_data: dict = None
@@ -30,72 +152,314 @@ class BigQueryVideoAnalysisService(VideoAnalysisService):
                 - no_person_found: Number of videos where no person was found
                 - errors: Number of videos that had processing errors
         """
+        # Resolve the candidate videos up front so the query only reads those
+        candidate_uris = self.resolve_candidate_uris(request)
+
+        if self.config.video_inventory_top_k and candidate_uris != []:
+            return self.analyze_videos_indexed(
+                request, missing_person_data, self.config.video_inventory_top_k, candidate_uris
+            )
+
+        return self._analyze_candidate_uris(request, candidate_uris, missing_person_data)
+
+    def analyze_videos_indexed(
+        self,
+        request: VideoAnalysisRequest,
+        missing_person_data: dict = None,
+        top_k_videos: int = 10,
+        candidate_uris: Optional[list[str]] = None,
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """
+        Match the case against the people inventory, then verify only the best videos
+
+        The case description is embedded and compared with VECTOR_SEARCH to the
+        people extracted from each video at ingestion time. The top videos, plus
+        any candidate video that has not been inventoried yet, are then verified
+        with the full analysis prompt. Falls back to the full analysis if the
+        inventory cannot be queried.
+
+        Args:
+            request: VideoAnalysisRequest containing search parameters
+            missing_person_data: Missing person attributes for the AI prompt
+            top_k_videos: Number of inventory matches to verify
+            candidate_uris: Candidate videos already resolved for the request
+
+        Returns:
+            tuple: (video_results, analysis_stats) with the analyze_videos stats
+            plus inventory_candidates, the number of videos sent to verification
+        """
+        if candidate_uris is None:
+            candidate_uris = self.resolve_candidate_uris(request)
+
         try:
-            # Build the video analysis prompt from the missing person case data
-            video_analysis_prompt = self._build_analysis_prompt(request, missing_person_data)
+            query = self._build_inventory_search_query(request, candidate_uris)
+            cell_parameters = {} if candidate_uris is not None else self._inventory_cell_filter(request)[1]
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=self._metadata_query_parameters(request, candidate_uris) + [
+                    bigquery.ScalarQueryParameter(name, "STRING", value) for name, value in cell_parameters.items()
+                ] + [
+                    bigquery.ScalarQueryParameter(
+                        "description", "STRING", self._build_person_description(missing_person_data)
+                    ),
+                    bigquery.ScalarQueryParameter(
+                        "gender", "STRING", self._person_attributes(missing_person_data)["gender"]
+                    ),
+                    bigquery.ScalarQueryParameter("top_k_people", "INT64", top_k_videos * 5),
+                    bigquery.ScalarQueryParameter("top_k_videos", "INT64", top_k_videos),
+                ]
+            )
 
-            # Build BigQuery query for video analysis
-            query = self._build_video_analysis_query(request, video_analysis_prompt)
+            logger.info(f"Searching the people inventory for case {request.case_id}")
+            verify_uris = list(dict.fromkeys(
+                row.uri for row in self.client.query(query, job_config=job_config).result()
+            ))
+        except Exception as e:
+            logger.warning(f"People inventory search failed for case {request.case_id}, analyzing every video: {e}")
+            return self._analyze_candidate_uris(request, candidate_uris, missing_person_data)
+
+        video_results, analysis_stats = self._analyze_candidate_uris(request, verify_uris, missing_person_data)
+        analysis_stats['inventory_candidates'] = len(verify_uris)
+        return video_results, analysis_stats
+
+    def _analyze_candidate_uris(
+        self,
+        request: VideoAnalysisRequest,
+        candidate_uris: Optional[list[str]],
+        missing_person_data: dict = None,
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """Run the AI analysis over the candidate URIs, or over the metadata filters when None"""
+        if candidate_uris == []:
+            logger.info(f"No videos match the search window for case {request.case_id}")
+            return [], {'total_analyzed': 0, 'matches_found': 0, 'no_person_found': 0, 'errors': 0}
+
+        if candidate_uris is None:
+            return self._run_video_analysis_query(request, None, missing_person_data)
+
+        jobs = self._plan_analysis_jobs(candidate_uris)
+        if len(jobs) == 1:
+            route, uris = jobs[0]
+            return self._run_video_analysis_query(request, uris, missing_person_data, route)
+
+        return self._run_analysis_jobs(request, jobs, missing_person_data)
+
+    def analyze_videos_sharded(
+        self,
+        request: VideoAnalysisRequest,
+        candidate_uris: list[str],
+        missing_person_data: dict = None,
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """
+        Split a large analysis into concurrent BigQuery jobs and merge the results
 
-            logger.info(f"Executing BigQuery video analysis for case {request.case_id}")
+        Candidates are grouped by model route, then sharded by camera or time
+        bucket, at most analysis_shard_size videos each, and up to
+        analysis_max_shards jobs run at once. Shards failing with a transient
+        error are retried with exponential backoff, each retry drawing from the
+        shared rate limiter; the videos of a shard that keeps failing are
+        counted as errors.
 
-            # Execute the BigQuery query with timeout
-            query_job = self.client.query(query)
+        Args:
+            request: VideoAnalysisRequest containing search parameters
+            candidate_uris: Candidate videos resolved for the request
+            missing_person_data: Missing person attributes for the AI prompt
 
-            try:
-                results = query_job.result()
-            except Exception as timeout_error:
-                logger.error(f"BigQuery video analysis query timed out after 300 seconds: {timeout_error}")
-                raise TimeoutError("Video analysis query timed out. This may happen with large video datasets. Try reducing the search time range or area.") from timeout_error
+        Returns:
+            tuple: (video_results, analysis_stats) with the analyze_videos stats
+            plus shards, failed_shards and the per-route breakdown
+
+        Raises:
+            Exception: The last error, if every shard failed
+        """
+        return self._run_analysis_jobs(request, self._plan_analysis_jobs(candidate_uris), missing_person_data)
+
+    def _plan_analysis_jobs(self, candidate_uris: list[str]) -> list[tuple[Optional[ModelRoute], list[str]]]:
+        """Split the candidates into (model route, URIs) jobs, sharding the routes larger than a shard"""
+        shard_size = self.config.analysis_shard_size
+
+        jobs = []
+        for route, uris in route_videos(candidate_uris, self.model_routes):
+            if not shard_size or len(uris) <= shard_size:
+                jobs.append((route, uris))
+                continue
+
+            videos = [video for video in map(parse_video_filename, uris) if video]
+            shards = shard_videos(videos, shard_size, self.config.analysis_shard_by)
+            # Names without encoded metadata cannot be sharded by camera or time; give them their own shard
+            known_uris = {video.uri for video in videos}
+            unparsed_uris = [uri for uri in uris if uri not in known_uris]
+            if unparsed_uris:
+                shards.append(unparsed_uris)
+            jobs.extend((route, shard) for shard in shards)
+
+        return jobs
+
+    def _run_analysis_jobs(
+        self,
+        request: VideoAnalysisRequest,
+        jobs: list[tuple[Optional[ModelRoute], list[str]]],
+        missing_person_data: dict = None,
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """Run the analysis jobs concurrently with retries and merge their results and stats"""
+        total_videos = sum(len(uris) for _, uris in jobs)
+        logger.info(f"Analyzing {total_videos} videos for case {request.case_id} in {len(jobs)} jobs")
+
+        def analyze_shard(route: Optional[ModelRoute], shard_uris: list[str]):
+            attempts = 0
+
+            def attempt():
+                nonlocal attempts
+                attempts += 1
+                # The first attempt is paid for when the analysis is scheduled, each retry is new model requests
+                if attempts > 1 and self.rate_limiter is not None:
+                    self.rate_limiter.acquire(len(shard_uris))
+                return self._run_video_analysis_query(request, shard_uris, missing_person_data, route)
+
+            return retry_with_backoff(
+                attempt,
+                attempts=SHARD_ATTEMPTS,
+                base_delay=SHARD_RETRY_BASE_DELAY_SECONDS,
+                description=f"Video analysis shard of {len(shard_uris)} videos for case {request.case_id}",
+                retry_on=is_transient_bigquery_error,
+            )
+
+        video_results = []
+        analysis_stats = {
+            'total_analyzed': 0, 'matches_found': 0, 'no_person_found': 0, 'errors': 0, 'cached': 0, 'routes': {}
+        }
+        failed_shards = 0
+        last_error = None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.config.analysis_max_shards, len(jobs)))) as executor:
+            futures = {executor.submit(analyze_shard, route, uris): (route, uris) for route, uris in jobs}
+            for future in as_completed(futures):
+                route, shard_uris = futures[future]
+                try:
+                    shard_results, shard_stats = future.result()
+                except Exception as e:
+                    failed_shards += 1
+                    last_error = e
+                    analysis_stats['total_analyzed'] += len(shard_uris)
+                    analysis_stats['errors'] += len(shard_uris)
+                    route_stats = analysis_stats['routes'].setdefault(
+                        route.name if route else DEFAULT_ROUTE_NAME, self._empty_route_stats()
+                    )
+                    route_stats['videos'] += len(shard_uris)
+                    route_stats['errors'] += len(shard_uris)
+                    logger.error(f"Video analysis shard failed for case {request.case_id}: {e}")
+                    continue
+
+                video_results.extend(shard_results)
+                for key in ('total_analyzed', 'matches_found', 'no_person_found', 'errors', 'cached'):
+                    analysis_stats[key] += shard_stats.get(key, 0)
+                for route_name, stats in shard_stats.get('routes', {}).items():
+                    route_stats = analysis_stats['routes'].setdefault(route_name, self._empty_route_stats())
+                    for key, value in stats.items():
+                        route_stats[key] += value
+
+        if failed_shards == len(jobs) and last_error is not None:
+            raise last_error
+
+        video_results.sort(key=lambda x: x.confidence_score, reverse=True)
+        analysis_stats['prompt_version'] = self.prompt_registry.get("video_analysis").key
+        analysis_stats['shards'] = len(jobs)
+        analysis_stats['failed_shards'] = failed_shards
+        return video_results, analysis_stats
+
+    @staticmethod
+    def _empty_route_stats() -> dict:
+        return {
+            'jobs': 0, 'videos': 0, 'matches': 0, 'errors': 0, 'cached': 0,
+            'latency_seconds': 0.0, 'prompt_tokens': 0, 'tokens': 0, 'estimated_cost': 0.0,
+        }
+
+    def _run_video_analysis_query(
+        self,
+        request: VideoAnalysisRequest,
+        candidate_uris: Optional[list[str]],
+        missing_person_data: dict = None,
+        route: Optional[ModelRoute] = None,
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """
+        Run one AI.GENERATE job over the candidate URIs, or over the metadata filters when None
+
+        Videos already judged with the same prompt version, person description
+        and model endpoint are answered from the verdict cache and left out of
+        the query.
+        """
+        try:
+            # Build the video analysis prompt from the missing person case data
+            rendered_prompt = self._render_analysis_prompt(missing_person_data)
+            route_name = route.name if route else DEFAULT_ROUTE_NAME
+
+            verdicts = []
+            query_uris = candidate_uris
+            if candidate_uris is not None:
+                cached_verdicts = self._cached_verdicts(candidate_uris, rendered_prompt, route)
+                verdicts = list(cached_verdicts.items())
+                query_uris = [uri for uri in candidate_uris if uri not in cached_verdicts]
+            cached_count = len(verdicts)
+
+            start_time = time.perf_counter()
+            if query_uris is None or query_uris:
+                # Build BigQuery query for video analysis
+                query = self._build_video_analysis_query(request, rendered_prompt.text, query_uris, route)
+
+                logger.info(
+                    f"Executing BigQuery video analysis for case {request.case_id} on route {route_name} "
+                    f"with prompt {rendered_prompt.template_key} (~{rendered_prompt.token_count} tokens), "
+                    f"{cached_count} cached verdicts"
+                )
+
+                # Execute the BigQuery query with timeout
+                query_job = self.client.query(query, job_config=self._candidate_uris_job_config(query_uris))
+
+                try:
+                    results = query_job.result()
+                except Exception as timeout_error:
+                    logger.error(f"BigQuery video analysis query timed out after 300 seconds: {timeout_error}")
+                    raise TimeoutError("Video analysis query timed out. This may happen with large video datasets. Try reducing the search time range or area.") from timeout_error
+
+                queried_verdicts = [(row.uri, row.result) for row in results]
+                self._store_verdicts(queried_verdicts, rendered_prompt, route)
+                verdicts.extend(queried_verdicts)
+            else:
+                logger.info(f"Every candidate video of case {request.case_id} has a cached verdict, skipping the query")
 
             video_results = []
             total_videos_analyzed = 0
             videos_with_person_found = 0
             videos_with_no_person = 0
             videos_with_errors = 0
+            total_tokens = 0
 
-            for row in results:
+            for index, (uri, ai_result) in enumerate(verdicts):
                 total_videos_analyzed += 1
                 try:
-                    # Access structured BigQuery result fields directly
-                    ai_result = row.result
                     if ai_result:
+                        # Cached verdicts were already paid for
+                        if index >= cached_count:
+                            total_tokens += self._total_tokens(ai_result)
                         # Access structured fields from BigQuery result
                         if ai_result['personFound']:
                             videos_with_person_found += 1
-                            # Extract video metadata from URI
-                            video_metadata = self._extract_video_metadata(row.uri)
-
-                            # Create VideoAnalysisResult
-                            video_result = VideoAnalysisResult(
-                                id=f"video_{hash(row.uri)}",
-                                timestamp=video_metadata.get("timestamp", request.start_date),
-                                latitude=video_metadata.get("latitude", request.last_seen_latitude),
-                                longitude=video_metadata.get("longitude", request.last_seen_longitude),
-                                address=video_metadata.get("address", "Unknown"),
-                                distance_from_last_seen=self._calculate_distance(
-                                    video_metadata.get("latitude", request.last_seen_latitude),
-                                    video_metadata.get("longitude", request.last_seen_longitude),
-                                    request.last_seen_latitude,
-                                    request.last_seen_longitude
-                                ),
-                                video_url=row.uri,
-                                confidence_score=float(ai_result['confidenceScore']) if ai_result['confidenceScore'] else 0.0,
-                                ai_description=ai_result['summaryOfFindings'] or "AI analysis result",
-                                camera_id=video_metadata.get("camera_id", "Unknown"),
-                                camera_type=video_metadata.get("camera_type", "Unknown")
+                            video_result = self._build_result(
+                                uri,
+                                ai_result,
+                                request.last_seen_latitude,
+                                request.last_seen_longitude,
+                                request.start_date,
                             )
                             video_results.append(video_result)
                         else:
                             videos_with_no_person += 1
-                            logger.debug(f"Video {row.uri}: Person not found - {ai_result['matchJustification'] or 'No justification provided'}")
+                            logger.debug(f"Video {uri}: Person not found - {ai_result['matchJustification'] or 'No justification provided'}")
                     else:
                         videos_with_errors += 1
-                        logger.warning(f"Empty AI result for video {row.uri}")
+                        logger.warning(f"Empty AI result for video {uri}")
 
                 except Exception as e:
                     videos_with_errors += 1
-                    logger.warning(f"Failed to process video analysis result for {row.uri}: {e}")
+                    logger.warning(f"Failed to process video analysis result for {uri}: {e}")
                     continue
 
             # Sort by confidence score (highest first)
@@ -112,7 +476,22 @@ class BigQueryVideoAnalysisService(VideoAnalysisService):
                 'total_analyzed': total_videos_analyzed,
                 'matches_found': videos_with_person_found,
                 'no_person_found': videos_with_no_person,
-                'errors': videos_with_errors
+                'errors': videos_with_errors,
+                'cached': cached_count,
+                'prompt_version': rendered_prompt.template_key,
+                'routes': {
+                    route_name: {
+                        'jobs': 1,
+                        'videos': total_videos_analyzed,
+                        'matches': videos_with_person_found,
+                        'errors': videos_with_errors,
+                        'cached': cached_count,
+                        'latency_seconds': time.perf_counter() - start_time,
+                        'prompt_tokens': rendered_prompt.token_count * (total_videos_analyzed - cached_count),
+                        'tokens': total_tokens,
+                        'estimated_cost': total_tokens / 1_000_000 * (route.cost_per_million_tokens if route else 0.0),
+                    }
+                },
             }
 
             return video_results, analysis_stats
@@ -121,93 +500,339 @@ class BigQueryVideoAnalysisService(VideoAnalysisService):
             logger.error(f"Video analysis failed for case {request.case_id}: {e}")
             raise
 
+    def analyze_videos_sweep(
+        self, request: VideoSweepRequest
+    ) -> tuple[dict[str, list[VideoAnalysisResult]], dict]:
+        """
+        Analyze one footage window against several cases with a single query
+
+        Every video is fetched and tokenized once, and Gemini returns one verdict
+        per case for it, instead of re-running the whole analysis for each case.
+
+        Returns:
+            tuple: (results_by_case, sweep_stats) where sweep_stats contains:
+                - total_analyzed: Total number of videos processed
+                - errors: Number of videos that had processing errors
+                - cases: Per-case matches_found and no_person_found counts
+        """
+        cases_by_id = {sweep_case.case_id: sweep_case for sweep_case in request.cases}
+        results_by_case = {case_id: [] for case_id in cases_by_id}
+        case_stats = {
+            case_id: {'matches_found': 0, 'no_person_found': 0} for case_id in cases_by_id
+        }
+
+        if not cases_by_id:
+            return results_by_case, {'total_analyzed': 0, 'errors': 0, 'cases': case_stats}
+
+        try:
+            candidate_uris = request.candidate_uris
+            if candidate_uris is None:
+                candidate_uris = self._resolve_candidate_uris(
+                    request.start_date,
+                    request.end_date,
+                    request.time_range,
+                    request.center_latitude,
+                    request.center_longitude,
+                    request.search_radius_km,
+                )
+            if candidate_uris == []:
+                logger.info("No videos match the sweep window")
+                return results_by_case, {'total_analyzed': 0, 'errors': 0, 'cases': case_stats}
+
+            sweep_prompt = self._build_sweep_prompt(request)
+            query = self._build_sweep_query(request, sweep_prompt, candidate_uris)
+
+            logger.info(f"Executing BigQuery video sweep for {len(cases_by_id)} cases")
+
+            query_job = self.client.query(query, job_config=self._candidate_uris_job_config(candidate_uris))
+
+            try:
+                results = query_job.result()
+            except Exception as timeout_error:
+                logger.error(f"BigQuery video sweep query timed out: {timeout_error}")
+                raise TimeoutError("Video sweep query timed out. Try reducing the search time range or area.") from timeout_error
+
+            total_videos_analyzed = 0
+            videos_with_errors = 0
+
+            for row in results:
+                total_videos_analyzed += 1
+                try:
+                    ai_result = row.result
+                    if not ai_result or not ai_result['verdicts']:
+                        videos_with_errors += 1
+                        logger.warning(f"Empty AI sweep result for video {row.uri}")
+                        continue
+
+                    for verdict in ai_result['verdicts']:
+                        sweep_case = cases_by_id.get(verdict['caseId'])
+                        if not sweep_case:
+                            logger.warning(f"Video {row.uri}: verdict for unknown case {verdict['caseId']}")
+                            continue
+
+                        if verdict['personFound']:
+                            case_stats[sweep_case.case_id]['matches_found'] += 1
+                            results_by_case[sweep_case.case_id].append(
+                                self._build_result(
+                                    row.uri,
+                                    verdict,
+                                    sweep_case.last_seen_latitude,
+                                    sweep_case.last_seen_longitude,
+                                    request.start_date,
+                                )
+                            )
+                        else:
+                            case_stats[sweep_case.case_id]['no_person_found'] += 1
+
+                except Exception as e:
+                    videos_with_errors += 1
+                    logger.warning(f"Failed to process video sweep result for {row.uri}: {e}")
+                    continue
+
+            for case_results in results_by_case.values():
+                case_results.sort(key=lambda x: x.confidence_score, reverse=True)
+
+            logger.info(f"Video sweep complete: {total_videos_analyzed} videos analyzed "
+                       f"for {len(cases_by_id)} cases, {videos_with_errors} errors")
+
+            sweep_stats = {
+                'total_analyzed': total_videos_analyzed,
+                'errors': videos_with_errors,
+                'cases': case_stats,
+            }
+
+            return results_by_case, sweep_stats
+
+        except Exception as e:
+            logger.error(f"Video sweep failed for cases {list(cases_by_id)}: {e}")
+            raise
+
     def _build_analysis_prompt(self, request: VideoAnalysisRequest, missing_person_data: dict = None) -> str:
-        """Build the video analysis prompt template based on missing person data"""
-
-        # Extract person data or use defaults from the demo notebook format
-        gender = missing_person_data.get("gender", "Unknown") if missing_person_data else "Unknown"
-        age = str(missing_person_data.get("age", "Unknown")) if missing_person_data else "Unknown"
-        height = str(missing_person_data.get("height", "Unknown")) if missing_person_data else "Unknown"
-        weight = str(missing_person_data.get("weight", "Unknown")) if missing_person_data else "Unknown"
-        hair_color = missing_person_data.get("hair_color", "Unknown") if missing_person_data else "Unknown"
-        clothing_description = missing_person_data.get("clothing_description", "Unknown") if missing_person_data else "Unknown"
-        distinguishing_marks = missing_person_data.get("distinguishing_marks", "None") if missing_person_data else "None"
-
-        # Build height/weight description like in demo notebook
-        build_height = f"{height}cm, {weight}kg" if height != "Unknown" and weight != "Unknown" else "Unknown"
-
-        # Extract clothing parts from description (simplified for demo)
-        clothing_top = "Unknown"
-        clothing_bottom = "Unknown"
-        footwear = "Unknown"
-        accessories = "None"
-
-        if clothing_description and clothing_description != "Unknown":
-            # Simple parsing - in real implementation this could be more sophisticated
-            clothing_top = clothing_description
-            clothing_bottom = "Unknown"
-
-        # Use the exact VIDEO_ANALYSIS_PROMPT from demo notebook
-        VIDEO_ANALYSIS_PROMPT = """# ROLE AND GOAL
-You are a state-of-the-art AI visual analysis system with an expert specialization in human identification within low-quality video footage.
-Your primary mission is to analyze the provided video for a critical missing person case with the highest degree of accuracy and diligence.
-You must be methodical and detail-oriented in your analysis and reporting.
-
-# TASK CONTEXT
-This is a high-priority, time-sensitive analysis.
-The provided video is a low-quality security footage from the street, where people are walking around.
-The objective is to determine if the missing person is visible in this video, and if so, to extract all relevant information about their presence.
-
-# MISSING PERSON DATA
-Carefully analyze the following description of the missing person. Every detail is crucial.
-
-- **Gender:** `{gender}`
-- **Approximate Age:** `{age}`
-- **Build - Height:** `{build_height}`
-- **Hair Color and Style:** `{hair}`
-- **Clothing:** `{clothing_top}`
-- **Footwear:** `{footwear}`
-- **Accessories:** `{accessories}`
-- **Distinguishing Features:** `{features}`
-
-# ANALYSIS INSTRUCTIONS
-You must perform the following steps in your analysis:
-
-1.  **Full Video Scan:** Meticulously review the entire video from start to finish. Do not stop after a potential first match; the person may appear multiple times.
-2.  **Feature Matching:** Compare every individual in the video against the `MISSING PERSON DATA`. Assess matches based on all available criteria: clothing, build, hair, accessories, and any visible distinguishing features or mannerisms.
-3.  **Justification:** You MUST provide a step-by-step justification for your match. List the features that matched, the features that did not match, and any features that were ambiguous or obscured (e.g., 'Face was unclear, but clothing is a 90% match').
-4.  **Contextual Analysis (If Found):** If you identify the person with confidence:
-    -   Note the exact timestamp(s) (in `HH:MM:SS` format) of their appearance.
-    -   Document their behavior, actions, and movements throughout their appearance in the video.
-5. **Confidence Score (If Found):** If you identify a person with confidence:
-    -   Return the confidence score of the finding in the range 0.0 to 1.0
-"""
-
-        # Format the prompt with the missing person data (just like in demo notebook)
-        formatted_prompt = VIDEO_ANALYSIS_PROMPT.format(
-            gender=gender,
-            age=age,
-            build_height=build_height,
-            hair=hair_color,
-            clothing_top=clothing_top,
-            clothing_botton=clothing_bottom,  # Note: keeping the typo from demo notebook
-            footwear=footwear,
-            accessories=accessories,
-            features=distinguishing_marks,
+        """Build the video analysis prompt based on missing person data"""
+        return self._render_analysis_prompt(missing_person_data).text
+
+    def _render_analysis_prompt(self, missing_person_data: dict = None) -> RenderedPrompt:
+        """Render the configured version of the analysis prompt, with its token count"""
+        return self.prompt_registry.render_person_prompt(
+            "video_analysis", self._person_attributes(missing_person_data)
         )
 
-        # Combine with output format (just like in demo notebook)
-        complete_prompt = formatted_prompt + "\n"
+    def _verdict_cache_key(self, uri: str, rendered_prompt: RenderedPrompt, route: Optional[ModelRoute]) -> tuple:
+        endpoint = route.endpoint if route else self.config.bigquery_model
+        return (uri, rendered_prompt.template_key, rendered_prompt.fingerprint, endpoint)
+
+    def _cached_verdicts(
+        self, uris: list[str], rendered_prompt: RenderedPrompt, route: Optional[ModelRoute]
+    ) -> dict:
+        """Cached verdicts of the videos already judged with this prompt and model, by URI"""
+        cached = {}
+        with self._verdict_cache_lock:
+            for uri in uris:
+                key = self._verdict_cache_key(uri, rendered_prompt, route)
+                if key in self._verdict_cache:
+                    self._verdict_cache.move_to_end(key)
+                    cached[uri] = self._verdict_cache[key]
+        return cached
+
+    def _store_verdicts(self, verdicts: list[tuple], rendered_prompt: RenderedPrompt, route: Optional[ModelRoute]):
+        """Cache the non-empty verdicts of a query, evicting the least recently used"""
+        max_size = self.config.verdict_cache_size
+        if max_size <= 0:
+            return
+        with self._verdict_cache_lock:
+            for uri, ai_result in verdicts:
+                if not ai_result:
+                    continue
+                key = self._verdict_cache_key(uri, rendered_prompt, route)
+                self._verdict_cache[key] = ai_result
+                self._verdict_cache.move_to_end(key)
+            while len(self._verdict_cache) > max_size:
+                self._verdict_cache.popitem(last=False)
+
+    def _person_attributes(self, missing_person_data: dict = None) -> dict:
+        """Extract the prompt attributes for a missing person"""
+        return person_attributes(missing_person_data)
+
+    def _build_person_description(self, missing_person_data: dict = None) -> str:
+        """Build a one-sentence person description, in the style of the people inventory"""
+        attributes = self._person_attributes(missing_person_data)
+        labels = {
+            "gender": "Gender",
+            "age": "Age",
+            "build_height": "Build",
+            "hair": "Hair",
+            "clothing_top": "Clothing",
+            "clothing_bottom": "Lower clothing",
+            "footwear": "Footwear",
+            "accessories": "Accessories",
+            "features": "Distinguishing features",
+        }
+        parts = [
+            f"{label}: {attributes[key]}"
+            for key, label in labels.items()
+            if attributes[key] not in ("Unknown", "None", "")
+        ]
+        return ". ".join(parts) if parts else "Unknown person"
+
+    def _build_sweep_prompt(self, request: VideoSweepRequest) -> str:
+        """Build a single multi-person prompt covering every case in a sweep"""
+        rendered_prompt = self.prompt_registry.render_cases_prompt(
+            "video_sweep",
+            [
+                (sweep_case.case_id, self._person_attributes(sweep_case.missing_person_data))
+                for sweep_case in request.cases
+            ],
+        )
+        logger.debug(f"Sweep prompt {rendered_prompt.template_key}: ~{rendered_prompt.token_count} tokens")
+        return rendered_prompt.text
+
+    def _build_video_analysis_query(
+        self,
+        request: VideoAnalysisRequest,
+        video_analysis_prompt: str,
+        candidate_uris: Optional[list[str]] = None,
+        route: Optional[ModelRoute] = None,
+    ) -> str:
+        """Build the BigQuery query for video analysis, restricted to the candidate URIs or the metadata filters"""
+        query = self._build_ai_generate_query(video_analysis_prompt, ANALYSIS_OUTPUT_SCHEMA, route)
+        if candidate_uris is not None:
+            return query + CANDIDATE_URIS_FILTER
+        query += self._build_metadata_filters(
+            request.start_date,
+            request.end_date,
+            getattr(request, "time_range", None),
+            getattr(request, "last_seen_latitude", None),
+            getattr(request, "last_seen_longitude", None),
+            getattr(request, "search_radius_km", None),
+            getattr(request, "last_seen_date", None),
+            getattr(request, "travel_mode", None),
+        )
+        return query
 
-        return complete_prompt
+    def _build_sweep_query(
+        self, request: VideoSweepRequest, sweep_prompt: str, candidate_uris: Optional[list[str]] = None
+    ) -> str:
+        """Build the BigQuery query for a multi-case sweep over a shared footage window"""
+        query = self._build_ai_generate_query(sweep_prompt, SWEEP_OUTPUT_SCHEMA)
+        if candidate_uris is not None:
+            return query + CANDIDATE_URIS_FILTER
+        query += self._build_metadata_filters(
+            request.start_date,
+            request.end_date,
+            request.time_range,
+            request.center_latitude,
+            request.center_longitude,
+            request.search_radius_km,
+        )
+        return query
 
-    def _build_video_analysis_query(self, request: VideoAnalysisRequest, video_analysis_prompt: str) -> str:
-        """Build the BigQuery query for video analysis with metadata filtering"""
+    def _build_inventory_search_query(
+        self, request: VideoAnalysisRequest, candidate_uris: Optional[list[str]]
+    ) -> str:
+        """Build the VECTOR_SEARCH over the people inventory for a case description"""
+        inventory_table = f"`{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_people_inventory`"
+
+        if candidate_uris is not None:
+            window_filter = "uri IN UNNEST(@uris)"
+        else:
+            # The geohash cells prune the clustered inventory before the exact distance filter
+            cell_filter, _ = self._inventory_cell_filter(request)
+            window_filter = f"""DATE(video_timestamp) BETWEEN @start_date AND @end_date
+                AND {cell_filter}
+                AND ST_DWITHIN(video_geo, ST_GEOGPOINT(@longitude, @latitude), @search_radius_meters)"""
+
+        query = f"""
+        WITH matches AS (
+          SELECT base.uri AS uri, MIN(distance) AS distance
+          FROM VECTOR_SEARCH(
+            (
+              SELECT *
+              FROM {inventory_table}
+              WHERE {window_filter}
+                AND (@gender = 'Unknown' OR gender IS NULL OR gender = 'Unknown' OR LOWER(gender) = LOWER(@gender))
+            ),
+            'description_embedding',
+            (
+              SELECT ml_generate_embedding_result AS description_embedding
+              FROM ML.GENERATE_EMBEDDING(
+                MODEL `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.text_embedding_model`,
+                (SELECT @description AS content),
+                STRUCT('SEMANTIC_SIMILARITY' AS task_type)
+              )
+            ),
+            top_k => @top_k_people,
+            distance_type => 'COSINE'
+          )
+          GROUP BY uri
+          ORDER BY distance
+          LIMIT @top_k_videos
+        )
+        SELECT uri, distance FROM matches
+        """
+
+        # Videos without a complete inventory cannot be ruled out, so they are always verified;
+        # videos inventoried with nobody in them have a complete status and no inventory rows
+        inventoried = f"""(
+          SELECT uri FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_people_inventory_status`
+          WHERE status = 'complete'
+        )"""
+        if candidate_uris is not None:
+            query += f"""
+        UNION ALL
+        SELECT uri, NULL AS distance
+        FROM UNNEST(@uris) AS uri
+        WHERE uri NOT IN {inventoried}
+        """
+        else:
+            query += f"""
+        UNION ALL
+        SELECT uri, NULL AS distance
+        FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.{self.config.bigquery_video_table}`
+        WHERE uri NOT IN {inventoried}
+        """ + self._build_metadata_filters(
+                request.start_date,
+                request.end_date,
+                getattr(request, "time_range", None),
+                request.last_seen_latitude,
+                request.last_seen_longitude,
+                request.search_radius_km,
+                getattr(request, "last_seen_date", None),
+                getattr(request, "travel_mode", None),
+            )
+
+        return query
+
+    def _inventory_cell_filter(self, request: VideoAnalysisRequest) -> tuple[str, dict[str, str]]:
+        """Geohash condition and parameters covering the search circle of a request"""
+        return prune_filter(
+            "video_geohash", request.last_seen_latitude, request.last_seen_longitude, request.search_radius_km
+        )
+
+    def _metadata_query_parameters(
+        self, request: VideoAnalysisRequest, candidate_uris: Optional[list[str]]
+    ) -> list:
+        """Build the parameters restricting a native-table query to the request window"""
+        if candidate_uris is not None:
+            return [bigquery.ArrayQueryParameter("uris", "STRING", candidate_uris)]
+
+        return [
+            bigquery.ScalarQueryParameter("start_date", "DATE", request.start_date.date()),
+            bigquery.ScalarQueryParameter("end_date", "DATE", request.end_date.date()),
+            bigquery.ScalarQueryParameter("latitude", "FLOAT64", request.last_seen_latitude),
+            bigquery.ScalarQueryParameter("longitude", "FLOAT64", request.last_seen_longitude),
+            bigquery.ScalarQueryParameter("search_radius_meters", "FLOAT64", request.search_radius_km * 1000),
+        ]
+
+    def _build_ai_generate_query(self, prompt: str, output_schema: str, route: Optional[ModelRoute] = None) -> str:
+        """Build the AI.GENERATE projection over the video object table, on the route's model when given"""
 
         # Escape the prompt for SQL
-        escaped_prompt = video_analysis_prompt.encode("unicode-escape").replace(b'"', b'\\"').decode("utf-8")
+        escaped_prompt = prompt.encode("unicode-escape").replace(b'"', b'\\"').decode("utf-8")
 
-        query = f"""
+        endpoint = route.endpoint if route else self.config.bigquery_model
+        model_params = json.dumps(route.model_params if route else DEFAULT_MODEL_PARAMS).replace("'", "\\'")
+
+        return f"""
         SELECT
           uri,
           AI.GENERATE(
@@ -217,20 +842,34 @@ You must perform the following steps in your analysis:
               OBJ.GET_ACCESS_URL(ref, 'r')
             ),
             connection_id => '{self.config.bigquery_project_id}.{self.config.bigquery_region}.{self.config.bigquery_connection}',
-            endpoint => '{self.config.bigquery_model}',
-            output_schema => 'personFound BOOL, confidenceScore FLOAT64, matchJustification STRING, summaryOfFindings STRING',
-            model_params => JSON '{{"generation_config": {{"temperature": 0}}}}'
+            endpoint => '{endpoint}',
+            output_schema => '{output_schema}',
+            model_params => JSON '{model_params}'
           ) as result
-        FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_objects`
+        FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.{self.config.bigquery_video_table}`
         WHERE 1=1
         """
 
+    def _build_metadata_filters(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        time_range: str,
+        latitude: float,
+        longitude: float,
+        search_radius_km: float,
+        last_seen_date: Optional[datetime] = None,
+        travel_mode: Optional[TravelMode] = None,
+    ) -> str:
+        """Build the object-table metadata filters for the time window and search area"""
+        filters = ""
+
         # Add date filtering using metadata timestamp
-        if request.start_date and request.end_date:
-            start_date_str = request.start_date.strftime("%Y-%m-%d")
-            end_date_str = request.end_date.strftime("%Y-%m-%d")
+        if start_date and end_date:
+            start_date_str = start_date.strftime("%Y-%m-%d")
+            end_date_str = end_date.strftime("%Y-%m-%d")
 
-            query += f"""
+            filters += f"""
           AND EXISTS (
             SELECT 1 FROM UNNEST(metadata) AS meta
             WHERE meta.name = 'timestamp'
@@ -240,10 +879,10 @@ You must perform the following steps in your analysis:
         """
 
         # Add time range filtering if specified (not "All Day")
-        if hasattr(request, 'time_range') and request.time_range and request.time_range != "All Day":
-            time_conditions = self._get_time_range_condition(request.time_range)
+        if time_range and time_range != "All Day":
+            time_conditions = self._get_time_range_condition(time_range)
             if time_conditions:
-                query += f"""
+                filters += f"""
           AND EXISTS (
             SELECT 1 FROM UNNEST(metadata) AS meta
             WHERE meta.name = 'timestamp'
@@ -252,22 +891,168 @@ You must perform the following steps in your analysis:
         """
 
         # Add geographic filtering if coordinates and radius are provided
-        if (hasattr(request, 'last_seen_latitude') and hasattr(request, 'last_seen_longitude') and
-            hasattr(request, 'search_radius_km') and
-            request.last_seen_latitude and request.last_seen_longitude and request.search_radius_km):
+        if latitude and longitude and search_radius_km:
+            filters += f"""
+          AND ST_DWITHIN(
+            ST_GEOGPOINT(
+              CAST((SELECT value FROM UNNEST(metadata) WHERE name = 'longitude') AS FLOAT64),
+              CAST((SELECT value FROM UNNEST(metadata) WHERE name = 'latitude') AS FLOAT64)
+            ),
+            ST_GEOGPOINT({longitude}, {latitude}),
+            {search_radius_km * 1000}  -- Convert km to meters for ST_DWITHIN
+          )
+        """
 
-            query += f"""
+            # Narrow the radius to the reachability cone around the last sighting
+            if last_seen_date and travel_mode:
+                last_seen_str = last_seen_date.strftime("%Y-%m-%d %H:%M:%S")
+                speed_m_per_s = TRAVEL_SPEEDS_KMH[travel_mode] / 3.6
+                filters += f"""
           AND ST_DWITHIN(
             ST_GEOGPOINT(
               CAST((SELECT value FROM UNNEST(metadata) WHERE name = 'longitude') AS FLOAT64),
               CAST((SELECT value FROM UNNEST(metadata) WHERE name = 'latitude') AS FLOAT64)
             ),
-            ST_GEOGPOINT({request.last_seen_longitude}, {request.last_seen_latitude}),
-            {request.search_radius_km * 1000}  -- Convert km to meters for ST_DWITHIN
+            ST_GEOGPOINT({longitude}, {latitude}),
+            {REACHABILITY_BASE_KM * 1000} + {speed_m_per_s} * ABS(DATETIME_DIFF(
+              PARSE_DATETIME('%Y%m%d%H%M%S', (SELECT value FROM UNNEST(metadata) WHERE name = 'timestamp')),
+              DATETIME('{last_seen_str}'),
+              SECOND
+            ))  -- {travel_mode.value} reachability in meters
           )
         """
 
-        return query
+        return filters
+
+    def _candidate_uris_job_config(self, candidate_uris: Optional[list[str]]) -> Optional[bigquery.QueryJobConfig]:
+        """Build the query parameters binding the candidate URI list, if any"""
+        if candidate_uris is None:
+            return None
+        return bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter("uris", "STRING", candidate_uris),
+            ]
+        )
+
+    def list_new_videos(
+        self, since: datetime, limit: Optional[int] = None, after_uri: str = ""
+    ) -> list[tuple[str, datetime]]:
+        """
+        List the videos added to the object table after a point in time
+
+        Reads the object table, so only footage the analysis queries can
+        already see is returned. (since, after_uri) is a compound watermark
+        matching the sort order, so videos updated in the same instant are
+        split by URI rather than skipped.
+
+        Args:
+            since: Only videos updated after this time
+            limit: Maximum number of videos to return
+            after_uri: Also return the videos updated exactly at since whose URI sorts after this one
+
+        Returns:
+            (uri, updated) pairs, oldest first
+        """
+        query = f"""
+        SELECT uri, updated
+        FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.{self.config.bigquery_video_table}`
+        WHERE (updated > @since OR (updated = @since AND uri > @after_uri))
+          AND ENDS_WITH(LOWER(uri), '.mp4')
+        ORDER BY updated, uri
+        {"LIMIT @limit" if limit else ""}
+        """
+        query_parameters = [
+            bigquery.ScalarQueryParameter("since", "TIMESTAMP", since),
+            bigquery.ScalarQueryParameter("after_uri", "STRING", after_uri),
+        ]
+        if limit:
+            query_parameters.append(bigquery.ScalarQueryParameter("limit", "INT64", limit))
+
+        rows = self.client.query(query, job_config=bigquery.QueryJobConfig(query_parameters=query_parameters)).result()
+        return [(row.uri, row.updated) for row in rows]
+
+    def resolve_candidate_uris(self, request: VideoAnalysisRequest) -> Optional[list[str]]:
+        """Resolve the videos covered by a request from the in-memory camera index"""
+        return self._resolve_candidate_uris(
+            request.start_date,
+            request.end_date,
+            getattr(request, "time_range", None),
+            getattr(request, "last_seen_latitude", None),
+            getattr(request, "last_seen_longitude", None),
+            getattr(request, "search_radius_km", None),
+            getattr(request, "last_seen_date", None),
+            getattr(request, "travel_mode", None),
+        )
+
+    def _resolve_candidate_uris(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        time_range: str,
+        latitude: float,
+        longitude: float,
+        search_radius_km: float,
+        last_seen_date: Optional[datetime] = None,
+        travel_mode: Optional[TravelMode] = None,
+    ) -> Optional[list[str]]:
+        """Query the camera index; None means the index is unavailable and SQL filters apply"""
+        camera_index = self.get_camera_index()
+        if camera_index is None:
+            return None
+
+        videos = camera_index.query(
+            start_date, end_date, time_range, latitude, longitude, search_radius_km, last_seen_date, travel_mode
+        )
+        return [video.uri for video in videos]
+
+    def get_camera_index(self, refresh: bool = False) -> Optional[CameraIndex]:
+        """
+        Get the spatio-temporal camera index, loading it on first use
+
+        The index is built from the object table listing, which only reads
+        object metadata, or from the video catalog when the listing fails.
+        It is reloaded after CAMERA_INDEX_TTL_SECONDS. A failed load is not
+        retried for CAMERA_INDEX_RETRY_SECONDS, so an unavailable listing does
+        not cost two queries on every search.
+
+        Args:
+            refresh: Reload the index even if it is still fresh
+
+        Returns:
+            CameraIndex, or None if no listing could be loaded
+        """
+        with self._camera_index_lock:
+            is_fresh = time.monotonic() - self._camera_index_loaded_at < CAMERA_INDEX_TTL_SECONDS
+            if self._camera_index is not None and is_fresh and not refresh:
+                return self._camera_index
+            recently_failed = (
+                self._camera_index_failed_at is not None
+                and time.monotonic() - self._camera_index_failed_at < CAMERA_INDEX_RETRY_SECONDS
+            )
+            if recently_failed and not refresh:
+                return self._camera_index
+
+            listing_queries = (
+                f"SELECT uri FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.{self.config.bigquery_video_table}`",
+                f"SELECT uri FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_catalog`",
+            )
+
+            for query in listing_queries:
+                try:
+                    uris = [row.uri for row in self.client.query(query).result()]
+                except Exception as e:
+                    logger.warning(f"Failed to load video listing for the camera index: {e}")
+                    continue
+
+                self._camera_index = CameraIndex.from_uris(uris)
+                self._camera_index_loaded_at = time.monotonic()
+                self._camera_index_failed_at = None
+                logger.info(f"Camera index loaded with {len(self._camera_index)} videos")
+                return self._camera_index
+
+            # Keep serving a stale index rather than none at all
+            self._camera_index_failed_at = time.monotonic()
+            return self._camera_index
 
     def _get_time_range_condition(self, time_range: str) -> str:
         """Get SQL condition for time range filtering"""
@@ -283,31 +1068,18 @@ You must perform the following steps in your analysis:
     def _extract_video_metadata(self, video_uri: str) -> dict:
         """Extract metadata from video URI/filename"""
         # Expected format: CameraID_YYYYMMDDHHMMSS_LATITUDE_LONGITUDE_CAMERATYPE_RESOLUTION.mp4
-        try:
-            filename = video_uri.split("/")[-1]
-            parts = filename.replace(".mp4", "").split("_")
-
-            if len(parts) >= 6:
-                camera_id = parts[0]
-                timestamp_str = parts[1]
-                latitude = float(parts[2])
-                longitude = float(parts[3])
-                camera_type = parts[4]
-
-                # Parse timestamp
-                timestamp = datetime.strptime(timestamp_str, "%Y%m%d%H%M%S")
-
-                return {
-                    "camera_id": camera_id,
-                    "timestamp": timestamp,
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "camera_type": camera_type,
-                    "address": f"Camera {camera_id} Location"
-                }
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Failed to parse video metadata from {video_uri}: {e}")
+        metadata = parse_video_filename(video_uri)
+        if metadata:
+            return {
+                "camera_id": metadata.camera_id,
+                "timestamp": metadata.timestamp,
+                "latitude": metadata.latitude,
+                "longitude": metadata.longitude,
+                "camera_type": metadata.camera_type,
+                "address": f"Camera {metadata.camera_id} Location"
+            }
 
+        logger.warning(f"Failed to parse video metadata from {video_uri}")
         return {
             "camera_id": "Unknown",
             "timestamp": datetime.now(),
@@ -317,24 +1089,57 @@ You must perform the following steps in your analysis:
             "address": "Unknown Location"
         }
 
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two points in kilometers using Haversine formula"""
-        from math import radians, sin, cos, sqrt, atan2
-
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
+    def _build_result(
+        self,
+        uri: str,
+        ai_result: dict,
+        last_seen_latitude: float,
+        last_seen_longitude: float,
+        fallback_timestamp: datetime,
+    ) -> VideoAnalysisResult:
+        """Create a VideoAnalysisResult from a positive AI verdict for a video"""
+        # Extract video metadata from URI
+        video_metadata = self._extract_video_metadata(uri)
+        latitude = video_metadata.get("latitude", last_seen_latitude)
+        longitude = video_metadata.get("longitude", last_seen_longitude)
+
+        result_id = video_result_id(uri)
+        self._remember_video_uri(result_id, uri)
+
+        return VideoAnalysisResult(
+            id=result_id,
+            timestamp=video_metadata.get("timestamp", fallback_timestamp),
+            latitude=latitude,
+            longitude=longitude,
+            address=video_metadata.get("address", "Unknown"),
+            distance_from_last_seen=self._calculate_distance(
+                latitude, longitude, last_seen_latitude, last_seen_longitude
+            ),
+            video_url=uri,
+            confidence_score=float(ai_result['confidenceScore']) if ai_result['confidenceScore'] else 0.0,
+            ai_description=ai_result['summaryOfFindings'] or "AI analysis result",
+            camera_id=video_metadata.get("camera_id", "Unknown"),
+            camera_type=video_metadata.get("camera_type", "Unknown")
+        )
 
-        # Earth radius in kilometers
-        R = 6371.0
-        distance = R * c
+    def _total_tokens(self, ai_result) -> int:
+        """Tokens billed for one AI.GENERATE call, from the usage metadata of its full response"""
+        try:
+            full_response = ai_result['full_response']
+        except (KeyError, TypeError):
+            return 0
+        if isinstance(full_response, str):
+            try:
+                full_response = json.loads(full_response)
+            except ValueError:
+                return 0
+        if not isinstance(full_response, dict):
+            return 0
+        return int(full_response.get('usage_metadata', {}).get('total_token_count', 0) or 0)
 
-        return distance
+    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """Calculate distance between two points in kilometers using Haversine formula"""
+        return haversine_km(lat1, lon1, lat2, lon2)
 
     def add_to_evidence(self, result, case_id: str) -> bool:
         """Add analysis result to case evidence in BigQuery"""
@@ -393,31 +1198,436 @@ You must perform the following steps in your analysis:
             logger.error(f"Failed to add evidence for case {case_id}: {e}")
             return False
 
-    def get_video_url(self, result_id: str) -> str:
-        """Get the video URL from BigQuery/GCS"""
+    def add_to_evidence_batch(self, results, case_id: str) -> int:
+        """Add several analysis results to case evidence with a single BigQuery load job"""
+        table_id = f"{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_analytics_results"
+
         try:
-            # Query the video_objects table to get the URI
-            query = f"""
-            SELECT uri
-            FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_objects`
-            WHERE CAST(FARM_FINGERPRINT(uri) AS STRING) = @result_id
-            LIMIT 1
+            # Deduplicate within the batch on the result ID
+            unique_results = list({result.id: result for result in results}.values())
+            if not unique_results:
+                return 0
+
+            # Skip results that are already evidence for this case
+            existing_query = f"""
+            SELECT id
+            FROM `{table_id}`
+            WHERE case_id = @case_id
+              AND id IN UNNEST(@result_ids)
             """
 
+            existing_job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("case_id", "STRING", case_id),
+                    bigquery.ArrayQueryParameter(
+                        "result_ids", "STRING", [result.id for result in unique_results]
+                    ),
+                ]
+            )
+            existing_ids = {
+                row.id for row in self.client.query(existing_query, job_config=existing_job_config).result()
+            }
+
+            rows = [
+                self._evidence_row(result, case_id)
+                for result in unique_results
+                if result.id not in existing_ids
+            ]
+            if not rows:
+                logger.info(f"All {len(unique_results)} results are already evidence for case {case_id}")
+                return 0
+
+            # A load job appends every row at once and does not consume DML quota
+            load_job_config = bigquery.LoadJobConfig(
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            )
+            load_job = self.client.load_table_from_json(rows, table_id, job_config=load_job_config)
+            load_job.result()  # Wait for completion
+
+            logger.info(f"Added {len(rows)} video analysis results to evidence for case {case_id}")
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"Failed to add evidence batch for case {case_id}: {e}")
+            return 0
+
+    def _evidence_row(self, result, case_id: str) -> dict:
+        """Build a JSON row for video_analytics_results from an analysis result"""
+        return {
+            "id": result.id,
+            "analysis_session_id": f"evidence_session_{case_id}",
+            "case_id": case_id,
+            "video_url": result.video_url,
+            "video_filename": result.video_url.split("/")[-1],
+            "camera_id": result.camera_id,
+            "video_timestamp": result.timestamp.isoformat(),
+            "video_latitude": result.latitude,
+            "video_longitude": result.longitude,
+            "video_geo": f"POINT({result.longitude} {result.latitude})",
+            "camera_type": result.camera_type,
+            "video_resolution": "1080p",  # default resolution
+            "detection_timestamp": 0.0,
+            "detection_confidence": result.confidence_score,
+            "model_name": "gemini-2.5-flash",
+            "created_date": datetime.now(timezone.utc).isoformat(),
+            "created_by": "Evidence_System",
+        }
+
+    def get_video_url(self, result_id: str) -> str:
+        """Get the video URL from the in-process cache or the keyed video catalog"""
+        with self._video_uri_cache_lock:
+            cached_uri = self._video_uri_cache.get(result_id)
+            if cached_uri:
+                self._video_uri_cache.move_to_end(result_id)
+                return cached_uri
+
+        try:
             job_config = bigquery.QueryJobConfig(
                 query_parameters=[
                     bigquery.ScalarQueryParameter("result_id", "STRING", result_id),
                 ]
             )
 
-            query_job = self.client.query(query, job_config=job_config)
-            results = query_job.result()
+            # Point lookup on the catalog, which is clustered by video_id
+            catalog_query = f"""
+            SELECT uri
+            FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_catalog`
+            WHERE video_id = @result_id
+            LIMIT 1
+            """
 
-            for row in results:
-                return row.uri
+            # Fallback for videos that have not been cataloged yet
+            object_table_query = f"""
+            SELECT uri
+            FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.{self.config.bigquery_video_table}`
+            WHERE {VIDEO_RESULT_ID_SQL} = @result_id
+            LIMIT 1
+            """
+
+            for query in (catalog_query, object_table_query):
+                try:
+                    results = self.client.query(query, job_config=job_config).result()
+                except Exception as lookup_error:
+                    logger.warning(f"Video URL lookup failed for result {result_id}: {lookup_error}")
+                    continue
+
+                for row in results:
+                    self._remember_video_uri(result_id, row.uri)
+                    return row.uri
 
             return ""
 
         except Exception as e:
             logger.error(f"Failed to get video URL for result {result_id}: {e}")
-            return ""
\ No newline at end of file
+            return ""
+
+    def _remember_video_uri(self, result_id: str, uri: str):
+        """Cache the URI of a result ID, evicting the least recently used beyond VIDEO_URI_CACHE_SIZE"""
+        with self._video_uri_cache_lock:
+            self._video_uri_cache[result_id] = uri
+            self._video_uri_cache.move_to_end(result_id)
+            while len(self._video_uri_cache) > VIDEO_URI_CACHE_SIZE:
+                self._video_uri_cache.popitem(last=False)
+
+    def refresh_video_catalog(self) -> dict:
+        """Add videos from the object table that are missing from the keyed video catalog"""
+        REFRESH_VIDEO_CATALOG_QUERY = f"""
+        MERGE `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_catalog` AS target
+        USING (
+          SELECT
+            {VIDEO_RESULT_ID_SQL} AS video_id,
+            uri,
+            parts[SAFE_OFFSET(0)] AS camera_id,
+            TIMESTAMP(SAFE.PARSE_DATETIME('%Y%m%d%H%M%S', parts[SAFE_OFFSET(1)])) AS video_timestamp,
+            SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64) AS video_latitude,
+            SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64) AS video_longitude,
+            SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)) AS video_geo,
+            ST_GEOHASH(SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)), {GEOHASH_PRECISION}) AS video_geohash,
+            parts[SAFE_OFFSET(4)] AS camera_type,
+            parts[SAFE_OFFSET(5)] AS video_resolution,
+            size,
+            updated
+          FROM (
+            SELECT
+              uri,
+              size,
+              updated,
+              SPLIT(REGEXP_REPLACE(REGEXP_EXTRACT(uri, r'[^/]+$'), r'\\.mp4$', ''), '_') AS parts
+            FROM `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.{self.config.bigquery_video_table}`
+          )
+        ) AS source
+        ON target.video_id = source.video_id
+        WHEN NOT MATCHED THEN
+          INSERT (
+            video_id, uri, camera_id, video_timestamp, video_latitude, video_longitude,
+            video_geo, video_geohash, camera_type, video_resolution, size, updated, created_date
+          )
+          VALUES (
+            source.video_id, source.uri, source.camera_id, source.video_timestamp, source.video_latitude, source.video_longitude,
+            source.video_geo, source.video_geohash, source.camera_type, source.video_resolution, source.size, source.updated, CURRENT_TIMESTAMP()
+          );
+        """
+
+        try:
+            query_job = self.client.query(REFRESH_VIDEO_CATALOG_QUERY)
+            query_job.result()
+
+            return {
+                "success": True,
+                "rows_modified": query_job.num_dml_affected_rows or 0,
+                "message": f"Added {query_job.num_dml_affected_rows or 0} videos to the catalog"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "rows_modified": 0,
+                "message": f"Error refreshing video catalog: {str(e)}"
+            }
+
+    def register_videos(self, videos: list[dict]) -> dict:
+        """
+        Add freshly uploaded videos to the keyed video catalog
+
+        The object table only sees new objects when its metadata cache is
+        refreshed, so ingestion registers the clips directly. Videos already
+        in the catalog are left unchanged, so registering twice is harmless.
+
+        Args:
+            videos: dicts with the uri, size and updated time of each object
+
+        Returns:
+            dict: success, rows_modified and message
+        """
+        if not videos:
+            return {"success": True, "rows_modified": 0, "message": "No videos to register"}
+
+        REGISTER_VIDEOS_QUERY = f"""
+        MERGE `{self.config.bigquery_project_id}.{self.config.bigquery_dataset}.video_catalog` AS target
+        USING (
+          SELECT
+            {VIDEO_RESULT_ID_SQL} AS video_id,
+            uri,
+            parts[SAFE_OFFSET(0)] AS camera_id,
+            TIMESTAMP(SAFE.PARSE_DATETIME('%Y%m%d%H%M%S', parts[SAFE_OFFSET(1)])) AS video_timestamp,
+            SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64) AS video_latitude,
+            SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64) AS video_longitude,
+            SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)) AS video_geo,
+            ST_GEOHASH(SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)), {GEOHASH_PRECISION}) AS video_geohash,
+            parts[SAFE_OFFSET(4)] AS camera_type,
+            parts[SAFE_OFFSET(5)] AS video_resolution,
+            size,
+            updated
+          FROM (
+            SELECT
+              video.uri,
+              video.size,
+              video.updated,
+              SPLIT(REGEXP_REPLACE(REGEXP_EXTRACT(video.uri, r'[^/]+$'), r'\\.mp4$', ''), '_') AS parts
+            FROM UNNEST(@videos) AS video
+          )
+        ) AS source
+        ON target.video_id = source.video_id
+        WHEN NOT MATCHED THEN
+          INSERT (
+            video_id, uri, camera_id, video_timestamp, video_latitude, video_longitude,
+            video_geo, video_geohash, camera_type, video_resolution, size, updated, created_date
+          )
+          VALUES (
+            source.video_id, source.uri, source.camera_id, source.video_timestamp, source.video_latitude, source.video_longitude,
+            source.video_geo, source.video_geohash, source.camera_type, source.video_resolution, source.size, source.updated, CURRENT_TIMESTAMP()
+          );
+        """
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter(
+                    "videos",
+                    "STRUCT",
+                    [
+                        bigquery.StructQueryParameter(
+                            None,
+                            bigquery.ScalarQueryParameter("uri", "STRING", video["uri"]),
+                            bigquery.ScalarQueryParameter("size", "INT64", video.get("size")),
+                            bigquery.ScalarQueryParameter("updated", "TIMESTAMP", video.get("updated")),
+                        )
+                        for video in videos
+                    ],
+                )
+            ]
+        )
+
+        try:
+            query_job = self.client.query(REGISTER_VIDEOS_QUERY, job_config=job_config)
+            query_job.result()
+
+            return {
+                "success": True,
+                "rows_modified": query_job.num_dml_affected_rows or 0,
+                "message": f"Registered {query_job.num_dml_affected_rows or 0} videos in the catalog"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "rows_modified": 0,
+                "message": f"Error registering videos in the catalog: {str(e)}"
+            }
+
+    def refresh_video_people_inventory(self) -> dict:
+        """
+        Extract the people inventory of videos not inventoried yet, then embed their descriptions
+
+        Every processed video gets a row in video_people_inventory_status, also
+        when nobody is visible and it has no inventory rows, so it is never sent
+        to Gemini again. Failed extractions are retried up to
+        INVENTORY_MAX_ATTEMPTS times.
+
+        Returns:
+            dict: success, rows_modified (people inventoried) and message
+        """
+        dataset = f"{self.config.bigquery_project_id}.{self.config.bigquery_dataset}"
+        inventory_table = f"`{dataset}.video_people_inventory`"
+        status_table = f"`{dataset}.video_people_inventory_status`"
+
+        PENDING_VIDEOS_QUERY = f"""
+        SELECT uri
+        FROM `{dataset}.{self.config.bigquery_video_table}`
+        WHERE uri NOT IN (
+          SELECT uri FROM {status_table}
+          WHERE status = 'complete' OR attempts >= @max_attempts
+        )
+        ORDER BY uri
+        """
+
+        # The generations are stored once in a temporary table; the people and the statuses are written together
+        REFRESH_VIDEO_PEOPLE_INVENTORY_QUERY = f"""
+        CREATE TEMP TABLE generated AS
+        SELECT
+          uri,
+          SPLIT(REGEXP_REPLACE(REGEXP_EXTRACT(uri, r'[^/]+$'), r'\\.mp4$', ''), '_') AS parts,
+          AI.GENERATE(
+            (
+              "{PEOPLE_INVENTORY_PROMPT}",
+              OBJ.GET_ACCESS_URL(ref, 'r')
+            ),
+            connection_id => '{self.config.bigquery_project_id}.{self.config.bigquery_region}.{self.config.bigquery_connection}',
+            endpoint => '{self.config.bigquery_model}',
+            output_schema => '{PEOPLE_INVENTORY_OUTPUT_SCHEMA}',
+            model_params => JSON '{{"generation_config": {{"temperature": 0}}}}'
+          ) AS result
+        FROM `{dataset}.{self.config.bigquery_video_table}`
+        WHERE uri IN UNNEST(@uris);
+
+        BEGIN TRANSACTION;
+
+        INSERT INTO {inventory_table} (
+          video_id, person_index, uri, camera_id, video_timestamp, video_geo, video_geohash,
+          gender, age_range, build, hair, clothing_top, clothing_bottom, footwear, accessories,
+          distinguishing_features, first_seen, last_seen, description, model_name, created_date
+        )
+        SELECT
+          {VIDEO_RESULT_ID_SQL} AS video_id,
+          person_index,
+          uri,
+          parts[SAFE_OFFSET(0)] AS camera_id,
+          TIMESTAMP(SAFE.PARSE_DATETIME('%Y%m%d%H%M%S', parts[SAFE_OFFSET(1)])) AS video_timestamp,
+          SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)) AS video_geo,
+          ST_GEOHASH(SAFE.ST_GEOGPOINT(SAFE_CAST(parts[SAFE_OFFSET(3)] AS FLOAT64), SAFE_CAST(parts[SAFE_OFFSET(2)] AS FLOAT64)), {GEOHASH_PRECISION}) AS video_geohash,
+          person.gender,
+          person.ageRange,
+          person.build,
+          person.hair,
+          person.clothingTop,
+          person.clothingBottom,
+          person.footwear,
+          person.accessories,
+          person.distinguishingFeatures,
+          person.firstSeen,
+          person.lastSeen,
+          person.description,
+          '{self.config.bigquery_model}' AS model_name,
+          CURRENT_TIMESTAMP() AS created_date
+        FROM generated,
+        UNNEST(generated.result.people) AS person WITH OFFSET AS person_index
+        WHERE generated.result.status = '';
+
+        MERGE {status_table} AS target
+        USING (
+          SELECT
+            {VIDEO_RESULT_ID_SQL} AS video_id,
+            uri,
+            IF(result.status = '', 'complete', 'failed') AS status,
+            IF(result.status = '', IFNULL(ARRAY_LENGTH(result.people), 0), NULL) AS people_count,
+            NULLIF(result.status, '') AS error
+          FROM generated
+        ) AS source
+        ON target.uri = source.uri
+        WHEN MATCHED THEN
+          UPDATE SET
+            status = source.status, people_count = source.people_count, error = source.error,
+            attempts = target.attempts + 1, model_name = '{self.config.bigquery_model}', processed_date = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN
+          INSERT (video_id, uri, status, people_count, error, attempts, model_name, processed_date)
+          VALUES (source.video_id, source.uri, source.status, source.people_count, source.error, 1,
+                  '{self.config.bigquery_model}', CURRENT_TIMESTAMP());
+
+        COMMIT TRANSACTION;
+
+        SELECT status, COUNT(*) AS videos, SUM(IFNULL(people_count, 0)) AS people
+        FROM {status_table}
+        WHERE uri IN UNNEST(@uris)
+        GROUP BY status;
+        """
+
+        UPDATE_VIDEO_PEOPLE_EMBEDDINGS_QUERY = f"""
+        UPDATE {inventory_table} AS inventory
+        SET inventory.description_embedding = e.ml_generate_embedding_result
+        FROM ML.GENERATE_EMBEDDING(
+          MODEL `{dataset}.text_embedding_model`,
+          (
+            SELECT video_id, person_index, description AS content
+            FROM {inventory_table}
+            WHERE description IS NOT NULL AND (description_embedding IS NULL OR ARRAY_LENGTH(description_embedding) = 0)
+          ),
+          STRUCT('SEMANTIC_SIMILARITY' AS task_type)
+        ) AS e
+        WHERE inventory.video_id = e.video_id AND inventory.person_index = e.person_index;
+        """
+
+        try:
+            pending_job = self.client.query(
+                PENDING_VIDEOS_QUERY,
+                job_config=bigquery.QueryJobConfig(
+                    query_parameters=[bigquery.ScalarQueryParameter("max_attempts", "INT64", INVENTORY_MAX_ATTEMPTS)]
+                ),
+            )
+            pending_uris = [row.uri for row in pending_job.result()]
+
+            counts = {}
+            if pending_uris:
+                logger.info(f"Extracting the people inventory of {len(pending_uris)} videos")
+                inventory_job = self.client.query(
+                    REFRESH_VIDEO_PEOPLE_INVENTORY_QUERY,
+                    job_config=bigquery.QueryJobConfig(
+                        query_parameters=[bigquery.ArrayQueryParameter("uris", "STRING", pending_uris)]
+                    ),
+                )
+                counts = {row.status: row for row in inventory_job.result()}
+
+            embeddings_job = self.client.query(UPDATE_VIDEO_PEOPLE_EMBEDDINGS_QUERY)
+            embeddings_job.result()
+
+            people = counts["complete"].people if "complete" in counts else 0
+            failed = counts["failed"].videos if "failed" in counts else 0
+            message = (
+                f"Inventoried {people} people in {len(pending_uris) - failed} videos "
+                f"and embedded {embeddings_job.num_dml_affected_rows or 0} descriptions"
+            )
+            if failed:
+                message += f"; {failed} videos failed and are retried by the next refresh"
+            return {"success": True, "rows_modified": people, "message": message}
+        except Exception as e:
+            return {
+                "success": False,
+                "rows_modified": 0,
+                "message": f"Error refreshing video people inventory: {str(e)}"
+            }
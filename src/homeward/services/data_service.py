@@ -52,6 +52,16 @@ class DataService(ABC):
         """Update an existing sighting and return success status"""
         pass
 
+    @abstractmethod
+    def update_case_coordinates(self, case_id: str, latitude: float, longitude: float) -> bool:
+        """Set the last seen coordinates of a case, without regenerating its summary, and return success status"""
+        pass
+
+    @abstractmethod
+    def update_sighting_coordinates(self, sighting_id: str, latitude: float, longitude: float) -> bool:
+        """Set the coordinates of a sighting, without regenerating its summary, and return success status"""
+        pass
+
     @abstractmethod
     def search_cases(self, query: str, field: str = "all", page: int = 1, page_size: int = 20) -> tuple[list[MissingPersonCase], int]:
         """Search missing person cases with LIKE filtering. Returns (cases, total_count)"""
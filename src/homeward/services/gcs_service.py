@@ -4,12 +4,15 @@ import datetime
 import hashlib
 import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import quote
 
 import six
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from google.oauth2 import service_account
 from nicegui import ui
 
@@ -17,18 +20,79 @@ from homeward.config import AppConfig
 
 logger = logging.getLogger(__name__)
 
+SIGNED_URL_EXPIRATION_SECONDS = 3600
+# Cached signed URLs are reused until this long before they expire
+SIGNED_URL_SAFETY_MARGIN_SECONDS = 300
+SIGNED_URL_CACHE_SIZE = 1024
+
+# Object metadata is trusted for this long; missing objects are checked again sooner, as they may be uploading
+METADATA_TTL_SECONDS = 300
+MISSING_METADATA_TTL_SECONDS = 30
+METADATA_CACHE_SIZE = 4096
+# A folder is listed in one request when at least this many of its objects are prefetched
+PREFIX_LISTING_MIN_OBJECTS = 20
+# Sub-requests per JSON API batch request, the API maximum
+METADATA_BATCH_SIZE = 100
+# Uploads are resumable, sent in chunks of this size (a multiple of 256 KiB) that are retried on their own
+RESUMABLE_CHUNK_SIZE = 16 * 1024 * 1024
+# Larger files are uploaded as parts sent in parallel and assembled by GCS
+PARALLEL_UPLOAD_MIN_BYTES = 256 * 1024 * 1024
+PARALLEL_UPLOAD_PART_SIZE = 32 * 1024 * 1024
+PARALLEL_UPLOAD_WORKERS = 8
+
+
+def parse_gcs_url(video_url: str) -> Optional[tuple[str, str]]:
+    """Split a gs://bucket/path URL into (bucket, object name), None if it is not one"""
+    if not video_url or not video_url.startswith('gs://'):
+        return None
+    url_parts = video_url[5:].split('/', 1)
+    if len(url_parts) != 2 or not all(url_parts):
+        return None
+    return url_parts[0], url_parts[1]
+
 
 class GCSService:
-    """Service for downloading files from Google Cloud Storage"""
+    """
+    Service for downloading files from Google Cloud Storage
+
+    Signed URLs are cached per (bucket, object, method, headers) and reused
+    until shortly before they expire, and object metadata is cached for a few
+    minutes, so rendering and clicking many download links does not sign and
+    HEAD every object each time. Share one instance across pages to share the
+    caches.
+    """
 
-    def __init__(self, config: AppConfig):
+    def __init__(self, config: AppConfig, clock: Callable[[], float] = time.time):
         self.config = config
-        self.client = storage.Client(project=config.bigquery_project_id)
+        # Created on first use, so building the service needs no credentials
+        self._client: Optional[storage.Client] = None
+        self._client_lock = threading.Lock()
         self.processed_bucket = config.gcs_bucket_processed
 
         # Try to get service account credentials for signing
         self.service_account_credentials = self._get_service_account_credentials()
 
+        # Wall clock, since signed URLs expire in wall-clock time
+        self._clock = clock
+        self._cache_lock = threading.Lock()
+        # (bucket, object, method, headers) -> (signed URL, expiry timestamp)
+        self._signed_urls: collections.OrderedDict = collections.OrderedDict()
+        # (bucket, object) -> (metadata dict or None when missing, fetch timestamp)
+        self._metadata: collections.OrderedDict = collections.OrderedDict()
+        self._cache_stats = {'signed_url_hits': 0, 'signed_url_misses': 0, 'metadata_hits': 0, 'metadata_misses': 0}
+
+    @property
+    def client(self) -> storage.Client:
+        """Storage client, created on first use"""
+        with self._client_lock:
+            if self._client is None:
+                self._client = storage.Client(project=self.config.bigquery_project_id)
+            return self._client
+
+    @client.setter
+    def client(self, client: storage.Client):
+        self._client = client
+
     def _get_service_account_credentials(self) -> Optional[service_account.Credentials]:
         """Try to get service account credentials with private key for signing"""
         try:
@@ -53,63 +117,307 @@ class GCSService:
     def download_video_file(self, video_url: str) -> None:
         """Download a video file from GCS using presigned URL"""
         try:
-            # Parse the GCS URL to extract bucket and blob name
             # Expected format: gs://bucket-name/path/to/file.mp4
-            if not video_url.startswith('gs://'):
-                ui.notify("❌ Invalid GCS URL format", type="negative")
-                return
-
-            # Remove gs:// prefix and split bucket/path
-            url_parts = video_url[5:].split('/', 1)
-            if len(url_parts) != 2:
+            parsed = parse_gcs_url(video_url)
+            if not parsed:
                 ui.notify("❌ Invalid GCS URL format", type="negative")
                 return
 
-            bucket_name, blob_name = url_parts
+            bucket_name, blob_name = parsed
 
-            # Get the bucket and blob
-            bucket = self.client.bucket(bucket_name)
-            blob = bucket.blob(blob_name)
-
-            # Check if blob exists
-            if not blob.exists():
+            # Check if blob exists, from the cached metadata when fresh
+            if self.get_object_metadata(bucket_name, blob_name) is None:
                 ui.notify(f"❌ File not found: {blob_name}", type="negative")
                 return
 
             # Get the filename from the blob path
             filename = Path(blob_name).name
 
-            # Try to generate presigned URL
-            if self.service_account_credentials:
-                try:
-                    signed_url = self.generate_signed_url(
-                        bucket_name=bucket_name,
-                        object_name=blob_name,
-                        expiration=3600  # 1 hour
-                    )
-                    ui.download(signed_url, filename)
-                    ui.notify(f"✅ Downloading {filename}", type="positive")
-                    return
-                except Exception as e:
-                    logger.warning(f"Failed to generate presigned URL: {e}")
-
-            # Fallback: Try standard blob signing (might fail without private key)
             try:
-                signed_url = blob.generate_signed_url(
-                    version="v4",
-                    expiration=datetime.timedelta(hours=1),
-                    method="GET"
-                )
-                ui.download(signed_url, filename)
-                ui.notify(f"✅ Downloading {filename}", type="positive")
+                signed_url = self.get_signed_url(bucket_name, blob_name)
             except Exception as e:
-                logger.error(f"Standard signing also failed: {e}")
+                logger.error(f"Signing failed for {video_url}: {e}")
                 ui.notify("❌ Download failed: Unable to generate signed URL. Service account with private key required.", type="negative")
+                return
+
+            ui.download(signed_url, filename)
+            ui.notify(f"✅ Downloading {filename}", type="positive")
 
         except Exception as e:
             logger.error(f"Failed to download video file {video_url}: {e}")
             ui.notify(f"❌ Download failed: {str(e)}", type="negative")
 
+    def get_signed_url(
+        self,
+        bucket_name: str,
+        object_name: str,
+        http_method: str = "GET",
+        headers: Optional[dict] = None,
+        expiration: int = SIGNED_URL_EXPIRATION_SECONDS,
+    ) -> str:
+        """
+        Get a V4 signed URL, reusing a cached one until shortly before it expires
+
+        Args:
+            bucket_name: Bucket of the object
+            object_name: Object name within the bucket
+            http_method: HTTP method the URL is signed for
+            headers: Headers the request must send, part of the signature
+            expiration: Lifetime of a newly signed URL in seconds
+
+        Returns:
+            str: The signed URL
+
+        Raises:
+            Exception: If neither the service account key nor the client credentials can sign
+        """
+        key = (
+            bucket_name,
+            object_name,
+            http_method.upper(),
+            tuple(sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items())),
+        )
+
+        with self._cache_lock:
+            cached = self._signed_urls.get(key)
+            if cached and cached[1] - SIGNED_URL_SAFETY_MARGIN_SECONDS > self._clock():
+                self._signed_urls.move_to_end(key)
+                self._cache_stats['signed_url_hits'] += 1
+                return cached[0]
+            self._cache_stats['signed_url_misses'] += 1
+
+        signed_at = self._clock()
+        signed_url = self._sign_url(bucket_name, object_name, http_method.upper(), headers, expiration)
+
+        with self._cache_lock:
+            self._signed_urls[key] = (signed_url, signed_at + expiration)
+            self._signed_urls.move_to_end(key)
+            while len(self._signed_urls) > SIGNED_URL_CACHE_SIZE:
+                self._signed_urls.popitem(last=False)
+
+        return signed_url
+
+    def _sign_url(
+        self, bucket_name: str, object_name: str, http_method: str, headers: Optional[dict], expiration: int
+    ) -> str:
+        """Sign with the service account key, falling back to the client credentials"""
+        if self.service_account_credentials:
+            try:
+                return self.generate_signed_url(
+                    bucket_name=bucket_name,
+                    object_name=object_name,
+                    expiration=expiration,
+                    http_method=http_method,
+                    headers=dict(headers) if headers else None,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to generate presigned URL: {e}")
+
+        # Fallback: Try standard blob signing (might fail without private key)
+        blob = self.client.bucket(bucket_name).blob(object_name)
+        return blob.generate_signed_url(
+            version="v4",
+            expiration=datetime.timedelta(seconds=expiration),
+            method=http_method,
+            headers=headers,
+        )
+
+    def get_object_metadata(self, bucket_name: str, object_name: str) -> Optional[dict]:
+        """
+        Get the metadata of an object, from the cache while it is fresh
+
+        A single GET returns both the existence and the metadata of the object.
+
+        Returns:
+            dict: name, size, content_type, generation, created and updated, or None if the object does not exist
+        """
+        key = (bucket_name, object_name)
+        now = self._clock()
+
+        with self._cache_lock:
+            cached = self._fresh_metadata(key, now)
+            if cached is not None:
+                self._cache_stats['metadata_hits'] += 1
+                return cached[0]
+            self._cache_stats['metadata_misses'] += 1
+
+        blob = self.client.bucket(bucket_name).get_blob(object_name)
+        metadata = self._blob_metadata(blob) if blob is not None else None
+
+        with self._cache_lock:
+            self._store_metadata(key, metadata, now)
+
+        return metadata
+
+    def prefetch_metadata(self, video_urls: list[str]) -> int:
+        """
+        Fill the metadata cache for many objects with a few requests
+
+        Objects sharing a folder are read with one listing of that prefix when
+        enough of them are requested; the others go through JSON API batch
+        requests of up to METADATA_BATCH_SIZE objects. Objects already cached
+        are skipped, and later lookups are served from the cache.
+
+        Args:
+            video_urls: gs:// URLs of the objects
+
+        Returns:
+            int: Number of objects whose metadata was fetched
+        """
+        now = self._clock()
+        by_prefix: dict[tuple[str, str], list[str]] = {}
+        with self._cache_lock:
+            for video_url in dict.fromkeys(video_urls):
+                parsed = parse_gcs_url(video_url)
+                if not parsed or self._fresh_metadata(parsed, now) is not None:
+                    continue
+                bucket_name, object_name = parsed
+                prefix = object_name.rsplit('/', 1)[0] + '/' if '/' in object_name else ''
+                by_prefix.setdefault((bucket_name, prefix), []).append(object_name)
+
+        fetched = 0
+        batched: dict[str, list[str]] = {}
+        for (bucket_name, prefix), object_names in by_prefix.items():
+            # Listing the bucket root could page through the whole bucket
+            if prefix and len(object_names) >= PREFIX_LISTING_MIN_OBJECTS:
+                fetched += self._prefetch_by_listing(bucket_name, prefix, object_names, now)
+            else:
+                batched.setdefault(bucket_name, []).extend(object_names)
+
+        for bucket_name, object_names in batched.items():
+            fetched += self._prefetch_by_batch(bucket_name, object_names, now)
+
+        logger.debug(f"Prefetched metadata of {fetched} objects in {len(by_prefix)} prefixes")
+        return fetched
+
+    def prefetch_metadata_in_background(self, video_urls: list[str]) -> threading.Thread:
+        """Run prefetch_metadata in a daemon thread, so a page can render while it runs"""
+        def prefetch():
+            try:
+                self.prefetch_metadata(video_urls)
+            except Exception as e:
+                logger.warning(f"Metadata prefetch of {len(video_urls)} objects failed: {e}")
+
+        thread = threading.Thread(target=prefetch, name="gcs-metadata-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def _prefetch_by_listing(self, bucket_name: str, prefix: str, object_names: list[str], now: float) -> int:
+        """Read the requested objects of a prefix from a single listing; unlisted ones are missing"""
+        wanted = set(object_names)
+        found = {}
+        for blob in self.client.list_blobs(bucket_name, prefix=prefix):
+            if blob.name in wanted:
+                found[blob.name] = self._blob_metadata(blob)
+
+        with self._cache_lock:
+            for object_name in object_names:
+                self._store_metadata((bucket_name, object_name), found.get(object_name), now)
+        return len(object_names)
+
+    def _prefetch_by_batch(self, bucket_name: str, object_names: list[str], now: float) -> int:
+        """Reload the objects in JSON API batches; objects that fail are left to per-file lookups"""
+        bucket = self.client.bucket(bucket_name)
+        fetched = 0
+        for start in range(0, len(object_names), METADATA_BATCH_SIZE):
+            blobs = [bucket.blob(object_name) for object_name in object_names[start:start + METADATA_BATCH_SIZE]]
+            with self.client.batch(raise_exception=False):
+                for blob in blobs:
+                    blob.reload()
+
+            with self._cache_lock:
+                for blob in blobs:
+                    # Failed sub-requests leave the error payload instead of the object resource
+                    if blob.generation is not None:
+                        self._store_metadata((bucket_name, blob.name), self._blob_metadata(blob), now)
+                        fetched += 1
+        return fetched
+
+    @staticmethod
+    def _blob_metadata(blob) -> dict:
+        return {
+            'name': Path(blob.name).name,
+            'size': blob.size,
+            'content_type': blob.content_type,
+            'generation': blob.generation,
+            'created': blob.time_created,
+            'updated': blob.updated
+        }
+
+    def _fresh_metadata(self, key: tuple[str, str], now: float) -> Optional[tuple[Optional[dict]]]:
+        """(metadata,) when the cache holds a fresh entry, None otherwise. Called with the lock held."""
+        cached = self._metadata.get(key)
+        if not cached:
+            return None
+        metadata, fetched_at = cached
+        ttl = METADATA_TTL_SECONDS if metadata is not None else MISSING_METADATA_TTL_SECONDS
+        if now - fetched_at >= ttl:
+            return None
+        self._metadata.move_to_end(key)
+        return (metadata,)
+
+    def _store_metadata(self, key: tuple[str, str], metadata: Optional[dict], fetched_at: float):
+        """Cache the metadata of an object, evicting the least recently used. Called with the lock held."""
+        self._metadata[key] = (metadata, fetched_at)
+        self._metadata.move_to_end(key)
+        while len(self._metadata) > METADATA_CACHE_SIZE:
+            self._metadata.popitem(last=False)
+
+    def upload_file(
+        self,
+        local_path: str,
+        bucket_name: str,
+        object_name: str,
+        content_type: str = "video/mp4",
+        metadata: Optional[dict] = None,
+        part_workers: int = PARALLEL_UPLOAD_WORKERS,
+    ) -> dict:
+        """
+        Upload a local file, resumably or in parallel parts depending on its size
+
+        Files below PARALLEL_UPLOAD_MIN_BYTES go through a resumable upload
+        whose chunks are retried individually; larger ones are split into
+        parts uploaded concurrently, so a single file can fill the uplink.
+
+        Args:
+            local_path: File to upload
+            bucket_name: Destination bucket
+            object_name: Destination object name
+            content_type: Content type of the object
+            metadata: Custom metadata of the object
+            part_workers: Threads uploading the parts of a large file
+
+        Returns:
+            dict: Metadata of the uploaded object, as returned by get_object_metadata
+        """
+        blob = self.client.bucket(bucket_name).blob(object_name)
+        blob.metadata = metadata
+
+        if os.path.getsize(local_path) >= PARALLEL_UPLOAD_MIN_BYTES:
+            transfer_manager.upload_chunks_concurrently(
+                local_path,
+                blob,
+                content_type=content_type,
+                chunk_size=PARALLEL_UPLOAD_PART_SIZE,
+                worker_type=transfer_manager.THREAD,
+                max_workers=part_workers,
+            )
+            # The XML multipart upload does not return the object resource
+            blob.reload()
+        else:
+            blob.chunk_size = RESUMABLE_CHUNK_SIZE
+            blob.upload_from_filename(local_path, content_type=content_type)
+
+        uploaded = self._blob_metadata(blob)
+        with self._cache_lock:
+            self._store_metadata((bucket_name, object_name), uploaded, self._clock())
+        return uploaded
+
+    def cache_stats(self) -> dict:
+        """Hit and miss counts of the signed URL and metadata caches"""
+        with self._cache_lock:
+            return {**self._cache_stats, 'signed_urls': len(self._signed_urls), 'metadata': len(self._metadata)}
+
     def generate_signed_url(
         self,
         bucket_name: str,
@@ -211,30 +519,12 @@ class GCSService:
     def get_file_info(self, video_url: str) -> Optional[dict]:
         """Get information about a file in GCS"""
         try:
-            if not video_url.startswith('gs://'):
-                return None
-
-            url_parts = video_url[5:].split('/', 1)
-            if len(url_parts) != 2:
+            parsed = parse_gcs_url(video_url)
+            if not parsed:
                 return None
 
-            bucket_name, blob_name = url_parts
-            bucket = self.client.bucket(bucket_name)
-            blob = bucket.blob(blob_name)
-
-            if not blob.exists():
-                return None
-
-            blob.reload()  # Refresh metadata
-
-            return {
-                'name': Path(blob_name).name,
-                'size': blob.size,
-                'content_type': blob.content_type,
-                'created': blob.time_created,
-                'updated': blob.updated
-            }
+            return self.get_object_metadata(*parsed)
 
         except Exception as e:
             logger.error(f"Failed to get file info for {video_url}: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -1,13 +1,41 @@
 import logging
-from dataclasses import dataclass
-from typing import Optional
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional, Union
 
 import googlemaps
 from homeward.config import AppConfig
+from homeward.models.case import Location
+from homeward.utils.gazetteer import Gazetteer, Place, shared_gazetteer
+from homeward.utils.geocoding_cache import (
+    GeocodingCache,
+    address_key,
+    coordinates_key,
+    shared_geocoding_cache,
+)
+from homeward.utils.rate_limit import TokenBucket, retry_with_backoff
 
 
 logger = logging.getLogger(__name__)
 
+GEOCODE_BATCH_WORKERS = 8
+GEOCODE_ATTEMPTS = 4
+GEOCODE_RETRY_BASE_DELAY_SECONDS = 1.0
+BACKGROUND_GEOCODING_WORKERS = 4
+# Cached and gazetteer answers arrive within this, and are saved with the record itself
+QUICK_GEOCODE_SECONDS = 0.05
+
+
+def is_transient_maps_error(error: Exception) -> bool:
+    """Whether a Maps API failure may succeed when retried: quota, server and transport errors"""
+    if isinstance(error, googlemaps.exceptions.HTTPError):
+        return error.status_code == 429 or error.status_code >= 500
+    if isinstance(error, googlemaps.exceptions.ApiError):
+        return error.status in ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+    return isinstance(error, (googlemaps.exceptions.Timeout, googlemaps.exceptions.TransportError))
+
 
 @dataclass
 class GeocodingResult:
@@ -18,16 +46,52 @@ class GeocodingResult:
     place_id: Optional[str] = None
     accuracy: Optional[str] = None
 
+    @classmethod
+    def from_place(cls, place: Place, latitude: float = None, longitude: float = None) -> "GeocodingResult":
+        """Result for a gazetteer place, with the Maps location type of postal code and town centre results"""
+        return cls(
+            latitude=place.latitude if latitude is None else latitude,
+            longitude=place.longitude if longitude is None else longitude,
+            formatted_address=place.label,
+            place_id=f"gazetteer:{place.country_code}:{place.postal_code or place.name}",
+            accuracy="APPROXIMATE",
+        )
 
-class GeocodingService:
-    """Service for geocoding addresses using Google Maps Python SDK"""
 
-    def __init__(self, config: AppConfig):
+class GeocodingService:
+    """
+    Service for geocoding addresses using Google Maps Python SDK
+
+    Results, including addresses that were not found, are cached by
+    normalized address and by rounded coordinates. By default every instance
+    shares the cache of the configured SQLite file, so pages creating a
+    service per submission still reuse earlier lookups. API errors are not
+    cached.
+
+    With a gazetteer configured, addresses without a street are geocoded
+    offline to their postal code area or town, and the API is only called
+    for street addresses. The gazetteer also answers when the API cannot,
+    so cases are not stored without coordinates.
+    """
+
+    def __init__(
+        self, config: AppConfig, cache: Optional[GeocodingCache] = None, gazetteer: Optional[Gazetteer] = None
+    ):
         self.config = config
         self.api_key = config.geocoding_api_key
         self.client = None
         if self.api_key:
             self.client = googlemaps.Client(key=self.api_key)
+        self.cache = cache or shared_geocoding_cache(
+            config.geocoding_cache_path or None, config.geocoding_cache_ttl_days * 24 * 3600
+        )
+        self.gazetteer = gazetteer
+        if gazetteer is None and config.gazetteer_path:
+            self.gazetteer = shared_gazetteer(config.gazetteer_path)
+        # Batch geocoding stays within the Maps quota, bursting up to a second of requests
+        self.rate_limiter = TokenBucket.per_minute(
+            config.geocoding_requests_per_minute, burst=max(1.0, config.geocoding_requests_per_minute / 60)
+        )
 
     def geocode_address(self, address: str, city: str = None, country: str = None, postal_code: str = None) -> Optional[GeocodingResult]:
         """
@@ -42,10 +106,6 @@ class GeocodingService:
         Returns:
             GeocodingResult object with coordinates or None if geocoding fails
         """
-        if not self.client:
-            logger.warning("Geocoding API key not configured, skipping geocoding")
-            return None
-
         # Construct full address for better geocoding accuracy
         full_address = self._construct_full_address(address, city, country, postal_code)
 
@@ -53,35 +113,30 @@ class GeocodingService:
             logger.warning("Empty address provided for geocoding")
             return None
 
-        logger.info(f"Geocoding address: {full_address}")
+        # Without a street the gazetteer is as precise as the API
+        if not (address and address.strip()):
+            result = self._geocode_offline(city=city, country=country, postal_code=postal_code)
+            if result:
+                return result
 
-        try:
-            # Use Google Maps SDK to geocode
-            geocode_result = self.client.geocode(full_address)
+        return self._geocode_online(full_address) or self._geocode_offline(address, city, country, postal_code)
 
-            if not geocode_result:
-                logger.warning("No geocoding results found for address")
-                return None
-
-            # Use the first (most relevant) result
-            result = geocode_result[0]
-            geometry = result.get("geometry", {})
-            location = geometry.get("location", {})
+    def _geocode_online(self, full_address: str) -> Optional[GeocodingResult]:
+        """Geocode an address through the cache and the Geocoding API"""
+        cache_key = address_key(full_address)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Geocoding cache hit for: {full_address}")
+            return GeocodingResult(**cached[0]) if cached[0] else None
 
-            if "lat" not in location or "lng" not in location:
-                logger.warning("Invalid geocoding response: missing coordinates")
-                return None
+        if not self.client:
+            logger.warning("Geocoding API key not configured, skipping geocoding")
+            return None
 
-            geocoding_result = GeocodingResult(
-                latitude=float(location["lat"]),
-                longitude=float(location["lng"]),
-                formatted_address=result.get("formatted_address", full_address),
-                place_id=result.get("place_id"),
-                accuracy=geometry.get("location_type")
-            )
+        logger.info(f"Geocoding address: {full_address}")
 
-            logger.info(f"Successfully geocoded address to: {geocoding_result.latitude}, {geocoding_result.longitude}")
-            return geocoding_result
+        try:
+            return self._geocode_uncached(full_address, cache_key)
 
         except googlemaps.exceptions.ApiError as e:
             logger.error(f"Google Maps API error: {str(e)}")
@@ -94,6 +149,145 @@ class GeocodingService:
 
         return None
 
+    def _geocode_offline(
+        self, address: str = None, city: str = None, country: str = None, postal_code: str = None
+    ) -> Optional[GeocodingResult]:
+        """Geocode the city or postal code of an address with the gazetteer, or a free-text address"""
+        if not self.gazetteer:
+            return None
+        place = self.gazetteer.lookup(city=city, postal_code=postal_code, country=country)
+        if place is None and address and not (city or postal_code):
+            place = self.gazetteer.search(", ".join(part for part in (address, country) if part))
+        if place is None:
+            return None
+        logger.info(f"Geocoded {place.label} with the gazetteer")
+        return GeocodingResult.from_place(place)
+
+    def geocode_batch(
+        self, addresses: Iterable[Union[str, dict]], max_workers: int = GEOCODE_BATCH_WORKERS
+    ) -> Iterator[tuple[int, Optional[GeocodingResult]]]:
+        """
+        Geocode many addresses concurrently, yielding each result as soon as it is known
+
+        Addresses equal after normalization are geocoded once, those the
+        gazetteer or the cache can answer are yielded first, and the API calls
+        share a token bucket matched to the Maps quota. Transient failures are
+        retried with jittered backoff, then left to the gazetteer.
+
+        Args:
+            addresses: Full address strings, or dicts with the address, city,
+                country and postal_code arguments of geocode_address
+            max_workers: API calls in flight at once
+
+        Yields:
+            (index of the address in addresses, GeocodingResult or None), in completion order
+        """
+        indexes_by_key: dict[str, list[int]] = {}
+        full_addresses: dict[str, str] = {}
+        components_by_key: dict[str, dict] = {}
+        for index, components in enumerate(addresses):
+            if isinstance(components, str):
+                components = {"address": components}
+            full_address = self._construct_full_address(
+                components.get("address"), components.get("city"), components.get("country"), components.get("postal_code")
+            )
+            if not full_address.strip():
+                yield index, None
+                continue
+            cache_key = address_key(full_address)
+            full_addresses.setdefault(cache_key, full_address)
+            components_by_key.setdefault(cache_key, components)
+            indexes_by_key.setdefault(cache_key, []).append(index)
+
+        def offline(cache_key: str) -> Optional[GeocodingResult]:
+            components = components_by_key[cache_key]
+            return self._geocode_offline(
+                components.get("address"), components.get("city"), components.get("country"), components.get("postal_code")
+            )
+
+        pending = []
+        for cache_key, indexes in indexes_by_key.items():
+            address = components_by_key[cache_key].get("address")
+            # Without a street the gazetteer is as precise as the API
+            result = None if address and address.strip() else offline(cache_key)
+            cached = self.cache.get(cache_key) if result is None else None
+            if result or cached is not None or not self.client:
+                if result is None:
+                    result = GeocodingResult(**cached[0]) if cached and cached[0] else offline(cache_key)
+                for index in indexes:
+                    yield index, result
+            else:
+                pending.append(cache_key)
+
+        if not pending:
+            return
+        logger.info(f"Geocoding {len(pending)} distinct addresses out of {sum(map(len, indexes_by_key.values()))}")
+
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geocoding")
+        try:
+            futures = {
+                pool.submit(self._geocode_with_retries, full_addresses[cache_key], cache_key): cache_key
+                for cache_key in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to geocode {full_addresses[futures[future]]}: {e}")
+                    result = None
+                result = result or offline(futures[future])
+                for index in indexes_by_key[futures[future]]:
+                    yield index, result
+        finally:
+            # Stop queued calls when the caller stops consuming
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _geocode_with_retries(self, full_address: str, cache_key: str) -> Optional[GeocodingResult]:
+        """Geocode one address within the rate limit, retrying transient errors"""
+        def attempt():
+            self.rate_limiter.acquire()
+            return self._geocode_uncached(full_address, cache_key)
+
+        return retry_with_backoff(
+            attempt,
+            attempts=GEOCODE_ATTEMPTS,
+            base_delay=GEOCODE_RETRY_BASE_DELAY_SECONDS,
+            description=f"Geocoding {full_address}",
+            retry_on=is_transient_maps_error,
+        )
+
+    def _geocode_uncached(self, full_address: str, cache_key: str) -> Optional[GeocodingResult]:
+        """Call the Geocoding API and cache the outcome; API errors are raised and not cached"""
+        # Use Google Maps SDK to geocode
+        geocode_result = self.client.geocode(full_address)
+
+        if not geocode_result:
+            logger.warning("No geocoding results found for address")
+            self.cache.put(cache_key, None)
+            return None
+
+        # Use the first (most relevant) result
+        result = geocode_result[0]
+        geometry = result.get("geometry", {})
+        location = geometry.get("location", {})
+
+        if "lat" not in location or "lng" not in location:
+            logger.warning("Invalid geocoding response: missing coordinates")
+            self.cache.put(cache_key, None)
+            return None
+
+        geocoding_result = GeocodingResult(
+            latitude=float(location["lat"]),
+            longitude=float(location["lng"]),
+            formatted_address=result.get("formatted_address", full_address),
+            place_id=result.get("place_id"),
+            accuracy=geometry.get("location_type")
+        )
+
+        logger.info(f"Successfully geocoded address to: {geocoding_result.latitude}, {geocoding_result.longitude}")
+        self.cache.put(cache_key, asdict(geocoding_result))
+        return geocoding_result
+
     def _construct_full_address(self, address: str, city: str = None, country: str = None, postal_code: str = None) -> str:
         """
         Construct a full address string from components for better geocoding accuracy
@@ -134,6 +328,22 @@ class GeocodingService:
         Returns:
             GeocodingResult object with address or None if reverse geocoding fails
         """
+        return self._reverse_geocode_online(latitude, longitude) or self._reverse_geocode_offline(latitude, longitude)
+
+    def _reverse_geocode_offline(self, latitude: float, longitude: float) -> Optional[GeocodingResult]:
+        """Name the gazetteer place nearest to the coordinates"""
+        place = self.gazetteer.nearest(latitude, longitude) if self.gazetteer else None
+        return GeocodingResult.from_place(place, latitude, longitude) if place else None
+
+    def _reverse_geocode_online(self, latitude: float, longitude: float) -> Optional[GeocodingResult]:
+        """Reverse geocode coordinates through the cache and the Geocoding API"""
+        cache_key = coordinates_key(latitude, longitude)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Reverse geocoding cache hit for: {latitude}, {longitude}")
+            # Nearby coordinates share the address, the result keeps the requested ones
+            return GeocodingResult(**{**cached[0], "latitude": latitude, "longitude": longitude}) if cached[0] else None
+
         if not self.client:
             logger.warning("Geocoding API key not configured, skipping reverse geocoding")
             return None
@@ -146,6 +356,7 @@ class GeocodingService:
 
             if not reverse_geocode_result:
                 logger.warning("No reverse geocoding results found for coordinates")
+                self.cache.put(cache_key, None)
                 return None
 
             # Use the first (most relevant) result
@@ -159,6 +370,7 @@ class GeocodingService:
             )
 
             logger.info(f"Successfully reverse geocoded coordinates to: {geocoding_result.formatted_address}")
+            self.cache.put(cache_key, asdict(geocoding_result))
             return geocoding_result
 
         except googlemaps.exceptions.ApiError as e:
@@ -170,4 +382,88 @@ class GeocodingService:
         except Exception as e:
             logger.error(f"Unexpected error during reverse geocoding: {str(e)}")
 
-        return None
\ No newline at end of file
+        return None
+
+    def cache_stats(self) -> dict:
+        """Hit rate and hits per tier of the geocoding cache"""
+        return self.cache.stats()
+
+
+class BackgroundGeocoder:
+    """
+    Geocodes submitted locations off the request path
+
+    The lookup starts as soon as a form is validated and runs while the
+    record is written. Answers ready by then, from the cache or the
+    gazetteer, are part of that write; slower ones are saved afterwards with
+    a coordinates-only update, so submitting waits for a single write.
+    """
+
+    def __init__(self, geocoding_service: GeocodingService, max_workers: int = BACKGROUND_GEOCODING_WORKERS):
+        self.geocoding_service = geocoding_service
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background-geocoding")
+
+    def start(self, location: Location) -> Future:
+        """Start geocoding a location, returning a future of its GeocodingResult or None"""
+        return self.pool.submit(
+            self.geocoding_service.geocode_address, location.address, location.city, location.country, location.postal_code
+        )
+
+    def apply_if_ready(self, lookup: Future, location: Location, timeout: float = QUICK_GEOCODE_SECONDS) -> bool:
+        """
+        Copy the coordinates of a lookup into the location if it finishes within timeout
+
+        Returns:
+            True if the location has coordinates
+        """
+        try:
+            result = lookup.result(timeout)
+        except FutureTimeoutError:
+            return location.has_coordinates()
+        except Exception as e:
+            logger.error(f"Geocoding {location.get_full_address()} failed: {e}")
+            return location.has_coordinates()
+
+        if result:
+            location.update_coordinates(result.latitude, result.longitude)
+        return location.has_coordinates()
+
+    def save_when_ready(self, lookup: Future, save: Callable[[float, float], bool], description: str) -> Future:
+        """
+        Save the coordinates of a lookup once it finishes
+
+        Args:
+            lookup: Future returned by start()
+            save: Called with the latitude and longitude, returning whether they were stored
+            description: Record named in the logs, e.g. "case 123"
+
+        Returns:
+            Future resolved with whether coordinates were saved
+        """
+        if lookup.done():
+            return self.pool.submit(self._save, lookup, save, description)
+
+        # The worker that finishes the lookup writes it, so no worker sits waiting on a lookup
+        saved = Future()
+        lookup.add_done_callback(lambda done: saved.set_result(self._save(done, save, description)))
+        return saved
+
+    def shutdown(self):
+        """Stop the worker threads once the queued lookups are done"""
+        self.pool.shutdown(wait=False)
+
+    def _save(self, lookup: Future, save: Callable[[float, float], bool], description: str) -> bool:
+        try:
+            result = lookup.result()
+            if result is None:
+                logger.warning(f"Could not geocode {description}, it stays without coordinates")
+                return False
+            if not save(result.latitude, result.longitude):
+                logger.error(f"Could not save the coordinates of {description}")
+                return False
+        except Exception as e:
+            logger.error(f"Background geocoding of {description} failed: {e}")
+            return False
+
+        logger.info(f"Saved coordinates {result.latitude}, {result.longitude} of {description}")
+        return True
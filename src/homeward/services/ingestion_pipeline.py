@@ -0,0 +1,408 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from homeward.config import AppConfig, load_config
+from homeward.services.bigquery_video_analysis_service import (
+    BigQueryVideoAnalysisService,
+)
+from homeward.services.gcs_service import GCSService
+from homeward.utils.ffmpeg_utils import probe_resolution
+from homeward.utils.video_utils import format_video_filename, parse_video_filename
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {".mp4"}
+# Date and time as camera exports usually write them: 20250922093000, 2025-09-22_09-30-00, 20250922T093000...
+EXPORT_TIMESTAMP_PATTERN = re.compile(
+    r"(20\d{2})[-_.]?(\d{2})[-_.]?(\d{2})[-_.T ]?(\d{2})[-_.:]?(\d{2})[-_.:]?(\d{2})"
+)
+# Uploaded clips are registered in the video catalog in batches of this size
+CATALOG_BATCH_SIZE = 500
+DEFAULT_CHECKPOINT_PATH = ".ingestion_checkpoint.jsonl"
+
+
+@dataclass(frozen=True)
+class CameraInfo:
+    """Location and type of a camera, from the camera manifest"""
+
+    camera_id: str
+    latitude: float
+    longitude: float
+    camera_type: str
+    resolution: Optional[str] = None
+
+
+def load_camera_manifest(path: str) -> dict[str, CameraInfo]:
+    """
+    Read a camera manifest CSV
+
+    Columns: camera_id, latitude, longitude, camera_type and optionally
+    resolution (WIDTHxHEIGHT, probed from each file when missing).
+
+    Returns:
+        Cameras by camera ID
+    """
+    cameras = {}
+    with open(path, newline="") as manifest:
+        for row in csv.DictReader(manifest):
+            cameras[row["camera_id"].strip()] = CameraInfo(
+                camera_id=row["camera_id"].strip(),
+                latitude=float(row["latitude"]),
+                longitude=float(row["longitude"]),
+                camera_type=row["camera_type"].strip(),
+                resolution=(row.get("resolution") or "").strip() or None,
+            )
+    return cameras
+
+
+def export_timestamp(path: Path) -> datetime:
+    """Recording time of an exported clip, from its filename or else its modification time (in UTC)"""
+    match = EXPORT_TIMESTAMP_PATTERN.search(path.stem)
+    if match:
+        try:
+            return datetime(*(int(group) for group in match.groups()))
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+
+
+def ingestion_filename(
+    path: Path,
+    cameras: dict[str, CameraInfo],
+    camera_id: Optional[str] = None,
+    ffprobe_binary: str = "ffprobe",
+) -> str:
+    """
+    Name a clip following the CameraID_YYYYMMDDHHMMSS_LAT_LON_TYPE_RES.mp4 convention
+
+    Clips already following the convention are validated and normalized.
+    Others take their camera from camera_id, or else from the folder they
+    are in, looked up in the camera manifest.
+
+    Raises:
+        ValueError: If the clip cannot be named
+    """
+    video = parse_video_filename(path.name)
+    if video is not None and video.resolution:
+        return format_video_filename(
+            video.camera_id, video.timestamp, video.latitude, video.longitude, video.camera_type, video.resolution
+        )
+
+    camera = cameras.get(camera_id or path.parent.name)
+    if camera is None:
+        raise ValueError(f"no camera {camera_id or path.parent.name!r} in the manifest")
+
+    resolution = camera.resolution
+    if not resolution:
+        try:
+            resolution = probe_resolution(str(path), ffprobe_binary)
+        except RuntimeError as e:
+            raise ValueError(str(e)) from e
+
+    return format_video_filename(
+        camera.camera_id, export_timestamp(path), camera.latitude, camera.longitude, camera.camera_type, resolution
+    )
+
+
+class IngestionCheckpoint:
+    """
+    Append-only record of the clips already uploaded, so an interrupted run resumes where it stopped
+
+    One JSON line per event; the last line of a clip wins. A clip is uploaded
+    again if its size or modification time changed since.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path) as checkpoint:
+                for line in checkpoint:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by an interruption
+                        continue
+                    self._entries[entry["source"]] = entry
+
+    def is_uploaded(self, source: str, size: int, mtime: float) -> bool:
+        entry = self._entries.get(source)
+        return entry is not None and entry["size"] == size and entry["mtime"] == mtime
+
+    def record(self, entry: dict):
+        with self._lock:
+            self._entries[entry["source"]] = entry
+            with open(self.path, "a") as checkpoint:
+                checkpoint.write(json.dumps(entry) + "\n")
+
+    def uncataloged(self) -> list[dict]:
+        """Uploaded clips not registered in the video catalog yet"""
+        with self._lock:
+            return [entry for entry in self._entries.values() if not entry.get("cataloged")]
+
+
+class VideoIngestionPipeline:
+    """
+    Upload camera exports to the ingestion bucket and register them in the video catalog
+
+    Clips are renamed to the metadata naming convention, uploaded by a pool
+    of threads (large clips additionally in parallel parts), checkpointed as
+    they complete and registered in the catalog in batches. Once a run has
+    uploaded clips, the catalog is refreshed from the object table and the
+    people inventory extracted for the new videos, so they are prefiltered
+    like the rest of the footage.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        gcs_service: GCSService,
+        catalog=None,
+        checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+        max_workers: int = 8,
+        prefix: str = "",
+        ffprobe_binary: str = "ffprobe",
+        refresh_inventory: bool = True,
+    ):
+        self.config = config
+        self.gcs_service = gcs_service
+        # Anything with register_videos(videos), refresh_video_catalog() and refresh_video_people_inventory()
+        # returning result dicts, the BigQuery video analysis service in production
+        self.catalog = catalog
+        self.refresh_inventory = refresh_inventory
+        self.checkpoint = IngestionCheckpoint(checkpoint_path)
+        self.max_workers = max_workers
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.ffprobe_binary = ffprobe_binary
+
+    def plan(
+        self, source_dir: str, cameras: dict[str, CameraInfo], camera_id: Optional[str] = None
+    ) -> tuple[list[tuple[Path, str]], list[tuple[Path, str]]]:
+        """
+        Name every clip under source_dir that still has to be uploaded
+
+        Returns:
+            (clips to upload as (path, object name), rejected clips as (path, reason))
+        """
+        pending, rejected = [], []
+        object_names = {}
+        for path in sorted(Path(source_dir).rglob("*")):
+            if not path.is_file() or path.suffix.lower() not in VIDEO_EXTENSIONS:
+                continue
+            stat = path.stat()
+            if self.checkpoint.is_uploaded(str(path.resolve()), stat.st_size, stat.st_mtime):
+                continue
+            try:
+                object_name = self.prefix + ingestion_filename(path, cameras, camera_id, self.ffprobe_binary)
+            except ValueError as e:
+                rejected.append((path, str(e)))
+                continue
+            if object_name in object_names:
+                rejected.append((path, f"same name as {object_names[object_name]}"))
+                continue
+            object_names[object_name] = path
+            pending.append((path, object_name))
+        return pending, rejected
+
+    def run(
+        self,
+        source_dir: str,
+        cameras: Optional[dict[str, CameraInfo]] = None,
+        camera_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> dict:
+        """
+        Upload the pending clips of source_dir
+
+        Args:
+            source_dir: Folder of the camera export, searched recursively
+            cameras: Camera manifest, for clips not following the naming convention
+            camera_id: Camera of every clip, instead of their folder name
+            limit: Maximum number of clips to upload
+
+        Returns:
+            dict: success, rows_modified (clips uploaded) and message
+        """
+        pending, rejected = self.plan(source_dir, cameras or {}, camera_id)
+        for path, reason in rejected:
+            logger.warning(f"Skipping {path}: {reason}")
+        if limit is not None:
+            pending = pending[:limit]
+
+        uploaded = 0
+        failed = 0
+        total_bytes = 0
+        since_registration = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._upload_clip, path, object_name): path for path, object_name in pending}
+            for future in as_completed(futures):
+                try:
+                    total_bytes += future.result()["size"] or 0
+                    uploaded += 1
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Failed to upload {futures[future]}: {e}")
+                    continue
+                since_registration += 1
+                if since_registration >= CATALOG_BATCH_SIZE:
+                    self.register_uploaded()
+                    since_registration = 0
+
+        # Also registers clips uploaded by earlier runs whose registration failed
+        catalog_result = self.register_uploaded()
+        refresh_results = self.refresh_indexes() if uploaded else []
+
+        message = f"Uploaded {uploaded} clips ({total_bytes / 1024 ** 3:.2f} GiB)"
+        if failed:
+            message += f", {failed} failed"
+        if rejected:
+            message += f", {len(rejected)} skipped"
+        for result in [catalog_result, *refresh_results]:
+            if not result["success"]:
+                message += f"; {result['message']}"
+        success = failed == 0 and all(result["success"] for result in [catalog_result, *refresh_results])
+        return {"success": success, "rows_modified": uploaded, "message": message}
+
+    def refresh_indexes(self) -> list[dict]:
+        """
+        Refresh the video catalog and the people inventory after an upload
+
+        The catalog picks up clips uploaded by other means, and the inventory
+        lists the people of every video not inventoried yet. Videos the object
+        table does not show yet are inventoried by the next run or by setup,
+        and are analyzed in full by searches meanwhile.
+
+        Returns:
+            The result dict of each refresh
+        """
+        if self.catalog is None:
+            return []
+
+        refreshes = [self.catalog.refresh_video_catalog]
+        if self.refresh_inventory:
+            refreshes.append(self.catalog.refresh_video_people_inventory)
+
+        results = []
+        for refresh in refreshes:
+            result = refresh()
+            if result["success"]:
+                logger.info(result["message"])
+            else:
+                logger.error(result["message"])
+            results.append(result)
+        return results
+
+    def register_uploaded(self) -> dict:
+        """Register the uploaded clips missing from the video catalog"""
+        entries = self.checkpoint.uncataloged()
+        if self.catalog is None or not entries:
+            return {"success": True, "rows_modified": 0, "message": "No videos to register"}
+
+        result = self.catalog.register_videos(
+            [
+                {
+                    "uri": entry["uri"],
+                    "size": entry["size"],
+                    "updated": datetime.fromisoformat(entry["updated"]) if entry.get("updated") else None,
+                }
+                for entry in entries
+            ]
+        )
+        if result["success"]:
+            for entry in entries:
+                self.checkpoint.record({**entry, "cataloged": True})
+        else:
+            logger.error(result["message"])
+        return result
+
+    def _upload_clip(self, path: Path, object_name: str) -> dict:
+        """Upload one clip with its filename metadata and checkpoint it"""
+        stat = path.stat()
+        video = parse_video_filename(object_name)
+        metadata = {
+            "camera-id": video.camera_id,
+            "timestamp": video.timestamp.strftime("%Y%m%d%H%M%S"),
+            "latitude": str(video.latitude),
+            "longitude": str(video.longitude),
+            "camera-type": video.camera_type,
+            "resolution": video.resolution,
+            "source-filename": path.name,
+        }
+        uploaded = self.gcs_service.upload_file(
+            str(path), self.config.gcs_bucket_ingestion, object_name, metadata=metadata
+        )
+
+        self.checkpoint.record({
+            "source": str(path.resolve()),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "uri": f"gs://{self.config.gcs_bucket_ingestion}/{object_name}",
+            "updated": uploaded["updated"].isoformat() if uploaded.get("updated") else None,
+            "cataloged": False,
+        })
+        logger.info(f"Uploaded {path} to gs://{self.config.gcs_bucket_ingestion}/{object_name}")
+        return uploaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload camera exports to the ingestion bucket and catalog them")
+    parser.add_argument("source", help="Folder of the camera export, one subfolder per camera")
+    parser.add_argument("--cameras", help="Camera manifest CSV: camera_id,latitude,longitude,camera_type[,resolution]")
+    parser.add_argument("--camera-id", help="Camera of every clip, instead of their folder name")
+    parser.add_argument("--prefix", default="", help="Folder of the ingestion bucket to upload into")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("HOMEWARD_INGESTION_WORKERS", "8")),
+                        help="Clips uploaded at once")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Progress file, to resume interrupted runs")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of clips to upload")
+    parser.add_argument("--no-catalog", action="store_true", help="Do not register the clips in the video catalog")
+    parser.add_argument("--no-inventory", action="store_true",
+                        help="Do not extract the people inventory of the new clips (setup.sh or a later run will)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the object names without uploading")
+    parser.add_argument("--ffprobe", default="ffprobe", help="ffprobe executable")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = load_config()
+    cameras = load_camera_manifest(args.cameras) if args.cameras else {}
+
+    catalog = None
+    if not args.no_catalog and not args.dry_run:
+        catalog = BigQueryVideoAnalysisService(config)
+
+    pipeline = VideoIngestionPipeline(
+        config,
+        GCSService(config),
+        catalog,
+        args.checkpoint,
+        args.workers,
+        args.prefix,
+        args.ffprobe,
+        refresh_inventory=not args.no_inventory,
+    )
+
+    if args.dry_run:
+        pending, rejected = pipeline.plan(args.source, cameras, args.camera_id)
+        for path, object_name in pending:
+            print(f"{path} -> gs://{config.gcs_bucket_ingestion}/{object_name}")
+        for path, reason in rejected:
+            print(f"{path} skipped: {reason}")
+        raise SystemExit(0)
+
+    result = pipeline.run(args.source, cameras, args.camera_id, args.limit)
+    print(result["message"])
+    raise SystemExit(0 if result["success"] else 1)
+
+
+if __name__ == "__main__":
+    main()
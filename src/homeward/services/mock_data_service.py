@@ -107,6 +107,22 @@ class MockDataService(DataService):
                 return True
         return False
 
+    def update_case_coordinates(self, case_id: str, latitude: float, longitude: float) -> bool:
+        """Set the last seen coordinates of a case and return success status"""
+        case = self.get_case_by_id(case_id)
+        if case is None:
+            return False
+        case.last_seen_location.update_coordinates(latitude, longitude)
+        return True
+
+    def update_sighting_coordinates(self, sighting_id: str, latitude: float, longitude: float) -> bool:
+        """Set the coordinates of a sighting and return success status"""
+        sighting = self.get_sighting_by_id(sighting_id)
+        if sighting is None:
+            return False
+        sighting.sighted_location.update_coordinates(latitude, longitude)
+        return True
+
     def search_cases(self, query: str, field: str = "all", page: int = 1, page_size: int = 20) -> tuple[list[MissingPersonCase], int]:
         """Search missing person cases with LIKE filtering"""
         if not query or not query.strip():
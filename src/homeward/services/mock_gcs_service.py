@@ -0,0 +1,48 @@
+from typing import Optional
+
+from homeward.services.gcs_service import SIGNED_URL_EXPIRATION_SECONDS, GCSService
+
+
+class MockGCSService(GCSService):
+    """
+    GCS service for the mock and simulated data sources
+
+    No bucket is read and no client is created: every object is reported
+    missing, so downloads, streaming and thumbnails fail gracefully without
+    Google Cloud credentials.
+    """
+
+    def _get_service_account_credentials(self) -> None:
+        """Nothing is signed in mock mode"""
+        return None
+
+    def get_object_metadata(self, bucket_name: str, object_name: str) -> Optional[dict]:
+        """Mock objects never exist in GCS"""
+        return None
+
+    def prefetch_metadata(self, video_urls: list[str]) -> int:
+        """Nothing to prefetch"""
+        return 0
+
+    def get_signed_url(
+        self,
+        bucket_name: str,
+        object_name: str,
+        http_method: str = "GET",
+        headers: Optional[dict] = None,
+        expiration: int = SIGNED_URL_EXPIRATION_SECONDS,
+    ) -> str:
+        """Mock objects cannot be signed"""
+        raise ValueError("Signed URLs are not available with the mock data source")
+
+    def upload_file(
+        self,
+        local_path: str,
+        bucket_name: str,
+        object_name: str,
+        content_type: str = "video/mp4",
+        metadata: Optional[dict] = None,
+        part_workers: int = 1,
+    ) -> dict:
+        """Mock mode has no bucket to upload to"""
+        raise ValueError("Uploads are not available with the mock data source")
@@ -103,6 +103,16 @@ class MockVideoAnalysisService(VideoAnalysisService):
         self._evidence_store.add(evidence_key)
         return True
 
+    def add_to_evidence_batch(self, results, case_id: str) -> int:
+        """Add several analysis results to case evidence (mock implementation)"""
+        added = 0
+        for result in results:
+            evidence_key = f"{case_id}:{result.id}"
+            if evidence_key not in self._evidence_store:
+                self._evidence_store.add(evidence_key)
+                added += 1
+        return added
+
     def get_video_url(self, result_id: str) -> str:
         """Get the video URL for a specific analysis result (mock implementation)"""
         # In a real implementation, this would query the database
@@ -0,0 +1,182 @@
+import argparse
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+from google.cloud import storage
+
+from homeward.config import AppConfig, load_config
+from homeward.utils.ffmpeg_utils import (
+    DEFAULT_PROXY_TIER,
+    PROXY_TIERS,
+    ProxyTier,
+    proxy_filename,
+    transcode_proxy,
+)
+from homeward.utils.video_utils import parse_video_filename
+
+logger = logging.getLogger(__name__)
+
+
+class ProxyTranscodingPipeline:
+    """Turn new videos of the ingestion bucket into low-resolution proxies in the processed bucket"""
+
+    def __init__(
+        self,
+        config: AppConfig,
+        tier: ProxyTier = PROXY_TIERS[DEFAULT_PROXY_TIER],
+        max_processes: Optional[int] = None,
+        ffmpeg_binary: str = "ffmpeg",
+    ):
+        self.config = config
+        self.client = storage.Client(project=config.bigquery_project_id)
+        self.tier = tier
+        # ffmpeg is CPU bound: one process per core by default, 0 transcodes in the calling thread
+        self.max_processes = (os.cpu_count() or 1) if max_processes is None else max_processes
+        self.ffmpeg_binary = ffmpeg_binary
+
+    def pending_videos(self) -> list[tuple[str, str]]:
+        """
+        List the ingestion videos that have no proxy for this tier yet
+
+        Returns:
+            List of (source blob name, proxy blob name) pairs
+        """
+        ingestion_bucket = self.client.bucket(self.config.gcs_bucket_ingestion)
+        processed_bucket = self.client.bucket(self.config.gcs_bucket_processed)
+
+        existing_proxies = {blob.name for blob in self.client.list_blobs(processed_bucket)}
+
+        pending = []
+        for blob in self.client.list_blobs(ingestion_bucket):
+            if not blob.name.endswith(".mp4"):
+                continue
+            try:
+                proxy_name = str(Path(blob.name).with_name(proxy_filename(Path(blob.name).name, self.tier)))
+            except ValueError as e:
+                logger.warning(f"Skipping {blob.name}: {e}")
+                continue
+            if proxy_name not in existing_proxies:
+                pending.append((blob.name, proxy_name))
+
+        return pending
+
+    def run(self, limit: Optional[int] = None) -> dict:
+        """
+        Transcode every pending video and upload the proxies
+
+        Downloads and uploads run in threads; the ffmpeg transcodes run in a
+        process pool so they use every core.
+
+        Args:
+            limit: Maximum number of videos to process
+
+        Returns:
+            dict: success, rows_modified (proxies written) and message
+        """
+        try:
+            pending = self.pending_videos()
+        except Exception as e:
+            return {"success": False, "rows_modified": 0, "message": f"Error listing videos: {str(e)}"}
+
+        if limit is not None:
+            pending = pending[:limit]
+        if not pending:
+            return {"success": True, "rows_modified": 0, "message": "No new videos to transcode"}
+
+        process_pool = ProcessPoolExecutor(max_workers=self.max_processes) if self.max_processes > 0 else None
+        transcoded = 0
+        failed = 0
+
+        try:
+            with tempfile.TemporaryDirectory(prefix="homeward-proxies-") as work_dir:
+                io_workers = max(1, self.max_processes) * 2
+                with ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+                    futures = {
+                        io_pool.submit(self._process_video, source_name, proxy_name, work_dir, process_pool): source_name
+                        for source_name, proxy_name in pending
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                            transcoded += 1
+                        except Exception as e:
+                            failed += 1
+                            logger.error(f"Failed to create proxy for {futures[future]}: {e}")
+        finally:
+            if process_pool:
+                process_pool.shutdown()
+
+        return {
+            "success": failed == 0,
+            "rows_modified": transcoded,
+            "message": f"Created {transcoded} {self.tier.name} proxies" + (f", {failed} failed" if failed else ""),
+        }
+
+    def _process_video(self, source_name: str, proxy_name: str, work_dir: str, process_pool) -> str:
+        """Download one original, transcode it and upload the proxy with the original metadata"""
+        ingestion_bucket = self.client.bucket(self.config.gcs_bucket_ingestion)
+        processed_bucket = self.client.bucket(self.config.gcs_bucket_processed)
+
+        source_blob = ingestion_bucket.blob(source_name)
+        source_path = os.path.join(work_dir, f"source_{Path(proxy_name).name}")
+        proxy_path = os.path.join(work_dir, Path(proxy_name).name)
+
+        try:
+            source_blob.download_to_filename(source_path)
+            source_blob.reload()
+
+            if process_pool:
+                process_pool.submit(transcode_proxy, source_path, proxy_path, self.tier, self.ffmpeg_binary).result()
+            else:
+                transcode_proxy(source_path, proxy_path, self.tier, self.ffmpeg_binary)
+
+            proxy_blob = processed_bucket.blob(proxy_name)
+            proxy_blob.metadata = self._proxy_metadata(source_blob, proxy_name)
+            proxy_blob.upload_from_filename(proxy_path, content_type="video/mp4")
+
+            logger.info(f"Uploaded proxy gs://{self.config.gcs_bucket_processed}/{proxy_name}")
+            return proxy_name
+        finally:
+            for path in (source_path, proxy_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _proxy_metadata(self, source_blob, proxy_name: str) -> dict:
+        """Copy the original custom metadata, which the object table filters read, and describe the proxy"""
+        metadata = dict(source_blob.metadata or {})
+
+        video = parse_video_filename(proxy_name)
+        metadata.update({
+            "camera-id": video.camera_id,
+            "timestamp": video.timestamp.strftime("%Y%m%d%H%M%S"),
+            "latitude": str(video.latitude),
+            "longitude": str(video.longitude),
+            "camera-type": video.camera_type,
+            "resolution": video.resolution,
+            "source-uri": f"gs://{self.config.gcs_bucket_ingestion}/{source_blob.name}",
+            "proxy-tier": self.tier.name,
+        })
+        return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create low-resolution proxies of new surveillance videos")
+    parser.add_argument("--tier", choices=sorted(PROXY_TIERS), default=os.getenv("HOMEWARD_PROXY_TIER", DEFAULT_PROXY_TIER))
+    parser.add_argument("--processes", type=int, default=None, help="ffmpeg processes (default: one per core)")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of videos to process")
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg executable")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    pipeline = ProxyTranscodingPipeline(load_config(), PROXY_TIERS[args.tier], args.processes, args.ffmpeg)
+    result = pipeline.run(args.limit)
+    print(result["message"])
+    raise SystemExit(0 if result["success"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,29 @@
+from typing import Optional
+
 from homeward.config import AppConfig, DataSource
+from homeward.services.analysis_scheduler import AnalysisScheduler
 from homeward.services.bigquery_data_service import BigQueryDataService
 from homeward.services.bigquery_video_analysis_service import (
     BigQueryVideoAnalysisService,
 )
 from homeward.services.data_service import DataService
+from homeward.services.gcs_service import GCSService
+from homeward.services.geocoding_service import BackgroundGeocoder, GeocodingService
 from homeward.services.mock_data_service import MockDataService
+from homeward.services.mock_gcs_service import MockGCSService
 from homeward.services.mock_video_analysis_service import MockVideoAnalysisService
+from homeward.services.simulated_video_analysis_service import (
+    SimulatedVideoAnalysisService,
+)
+from homeward.services.thumbnail_service import ThumbnailService
 from homeward.services.video_analysis_service import VideoAnalysisService
+from homeward.services.video_stream_service import VideoStreamService
 
 
 def create_data_service(config: AppConfig) -> DataService:
     """Factory function to create the appropriate data service based on configuration"""
 
-    if config.data_source == DataSource.MOCK:
+    if config.data_source in (DataSource.MOCK, DataSource.SIMULATED):
         return MockDataService()
     elif config.data_source == DataSource.BIGQUERY:
         return BigQueryDataService(config)
@@ -20,12 +31,65 @@ def create_data_service(config: AppConfig) -> DataService:
         raise ValueError(f"Unknown data source: {config.data_source}")
 
 
-def create_video_analysis_service(config: AppConfig) -> VideoAnalysisService:
-    """Factory function to create the appropriate video analysis service based on configuration"""
+def create_video_analysis_service(
+    config: AppConfig, analysis_scheduler: Optional[AnalysisScheduler] = None
+) -> VideoAnalysisService:
+    """
+    Factory function to create the appropriate video analysis service based on configuration
+
+    With an analysis scheduler, the BigQuery service draws its shard retries from the scheduler's quota.
+    """
 
     if config.data_source == DataSource.MOCK:
         return MockVideoAnalysisService()
+    elif config.data_source == DataSource.SIMULATED:
+        return SimulatedVideoAnalysisService(config.simulation_media_dir)
+    elif config.data_source == DataSource.BIGQUERY:
+        rate_limiter = analysis_scheduler.rate_limiter if analysis_scheduler is not None else None
+        return BigQueryVideoAnalysisService(config, rate_limiter)
+    else:
+        raise ValueError(f"Unknown data source: {config.data_source}")
+
+
+def create_analysis_scheduler(config: AppConfig) -> AnalysisScheduler:
+    """Factory function to create the scheduler shared by every video analysis"""
+
+    return AnalysisScheduler(
+        max_concurrency=config.analysis_max_concurrency,
+        requests_per_minute=config.analysis_requests_per_minute,
+    )
+
+
+def create_gcs_service(config: AppConfig) -> GCSService:
+    """Factory function to create the GCS service shared by every page, with its signed URL cache"""
+
+    if config.data_source in (DataSource.MOCK, DataSource.SIMULATED):
+        return MockGCSService(config)
     elif config.data_source == DataSource.BIGQUERY:
-        return BigQueryVideoAnalysisService(config)
+        return GCSService(config)
     else:
         raise ValueError(f"Unknown data source: {config.data_source}")
+
+
+def video_buckets(config: AppConfig) -> frozenset[str]:
+    """The configured ingestion and processed buckets, the only ones videos are served from"""
+
+    return frozenset(bucket for bucket in (config.gcs_bucket_ingestion, config.gcs_bucket_processed) if bucket)
+
+
+def create_video_stream_service(config: AppConfig, gcs_service: GCSService) -> VideoStreamService:
+    """Factory function to create the range-request video streamer, limited to the configured buckets"""
+
+    return VideoStreamService(gcs_service, allowed_buckets=video_buckets(config))
+
+
+def create_thumbnail_service(config: AppConfig, gcs_service: GCSService) -> ThumbnailService:
+    """Factory function to create the keyframe thumbnail service, limited to the configured buckets"""
+
+    return ThumbnailService(config, gcs_service, config.thumbnail_cache_dir, allowed_buckets=video_buckets(config))
+
+
+def create_background_geocoder(config: AppConfig) -> BackgroundGeocoder:
+    """Factory function to create the geocoder shared by the report and sighting forms"""
+
+    return BackgroundGeocoder(GeocodingService(config))
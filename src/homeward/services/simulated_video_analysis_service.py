@@ -0,0 +1,272 @@
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from homeward.models.video_analysis import (
+    VideoAnalysisRequest,
+    VideoAnalysisResult,
+    VideoMetadata,
+)
+from homeward.services.video_analysis_service import VideoAnalysisService
+from homeward.utils.camera_index import CameraIndex
+from homeward.utils.geo_utils import haversine_km
+from homeward.utils.video_utils import parse_video_filename, video_result_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEDIA_DIR = "demo/videos/media"
+
+
+@dataclass
+class LatencyDistribution:
+    """Distribution of simulated latency, in seconds"""
+
+    kind: str = "lognormal"  # constant, uniform or lognormal
+    mean: float = 8.0
+    spread: float = 0.5  # uniform: relative half-width, lognormal: sigma
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency value"""
+        if self.kind == "constant":
+            return self.mean
+        if self.kind == "uniform":
+            return rng.uniform(self.mean * (1 - self.spread), self.mean * (1 + self.spread))
+        if self.kind == "lognormal":
+            # Parametrized so that the distribution mean equals self.mean
+            mu = math.log(self.mean) - self.spread**2 / 2
+            return rng.lognormvariate(mu, self.spread)
+        raise ValueError(f"Unknown latency distribution: {self.kind}")
+
+
+@dataclass
+class SimulationProfile:
+    """Behaviour of the simulated video analysis backend"""
+
+    model_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    evidence_latency: LatencyDistribution = field(
+        default_factory=lambda: LatencyDistribution(kind="uniform", mean=1.5, spread=0.3)
+    )
+    failure_rate: float = 0.02
+    match_rate: float = 0.15
+    max_concurrency: int = 8
+    time_scale: float = 1.0  # Multiplier applied to every simulated wait
+    seed: Optional[int] = None
+
+
+class SimulatedVideoAnalysisService(VideoAnalysisService):
+    """Offline stand-in for the BigQuery backend with realistic latency, failures and concurrency"""
+
+    def __init__(
+        self,
+        media_dir: str = DEFAULT_MEDIA_DIR,
+        profile: Optional[SimulationProfile] = None,
+        video_uris: Optional[list[str]] = None,
+    ):
+        self.profile = profile or SimulationProfile()
+        self._rng = random.Random(self.profile.seed)
+        self._rng_lock = threading.Lock()
+        # Shared by every analysis running on this service, like a model quota
+        self._concurrency = threading.BoundedSemaphore(self.profile.max_concurrency)
+        self._evidence_store = set()
+
+        if video_uris is None:
+            video_uris = [str(path) for path in sorted(Path(media_dir).glob("*.mp4"))]
+
+        self._videos = []
+        for uri in video_uris:
+            metadata = parse_video_filename(uri)
+            if metadata:
+                self._videos.append(metadata)
+            else:
+                logger.warning(f"Skipping video with unparseable filename: {uri}")
+
+        self._camera_index = CameraIndex(self._videos)
+        self._video_uri_by_id = {video_result_id(video.uri): video.uri for video in self._videos}
+
+    def analyze_videos(
+        self,
+        request: VideoAnalysisRequest,
+        missing_person_data: dict = None,
+        on_result: Optional[Callable[[VideoAnalysisResult], None]] = None,
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """
+        Simulate AI video analysis over the videos matching the request
+
+        Args:
+            request: VideoAnalysisRequest containing search parameters
+            missing_person_data: Ignored, accepted for interface compatibility
+            on_result: Optional callback invoked as soon as each match is found
+
+        Returns:
+            tuple: (video_results, analysis_stats) with the same stats as the
+            BigQuery backend plus elapsed_seconds and first_match_seconds
+        """
+        return self._analyze_videos(request, self._query_index(request), on_result)
+
+    def _analyze_candidate_uris(
+        self, request: VideoAnalysisRequest, candidate_uris: list[str], missing_person_data: dict = None
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """Simulate AI video analysis over an explicit list of videos"""
+        uris = set(candidate_uris)
+        return self._analyze_videos(request, [video for video in self._videos if video.uri in uris])
+
+    def _analyze_videos(
+        self,
+        request: VideoAnalysisRequest,
+        candidates: list[VideoMetadata],
+        on_result: Optional[Callable[[VideoAnalysisResult], None]] = None,
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """Run the simulated model calls concurrently and collect the stats"""
+        start_time = time.perf_counter()
+        first_match_seconds = None
+
+        video_results = []
+        videos_with_no_person = 0
+        videos_with_errors = 0
+
+        workers = max(1, min(self.profile.max_concurrency, len(candidates)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._analyze_video, video, request): video
+                for video in candidates
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    videos_with_errors += 1
+                    logger.debug(f"Simulated analysis failed for {futures[future].uri}: {e}")
+                    continue
+
+                if result is None:
+                    videos_with_no_person += 1
+                    continue
+
+                if first_match_seconds is None:
+                    first_match_seconds = time.perf_counter() - start_time
+                video_results.append(result)
+                if on_result:
+                    on_result(result)
+
+        video_results.sort(key=lambda x: x.confidence_score, reverse=True)
+
+        analysis_stats = {
+            'total_analyzed': len(candidates),
+            'matches_found': len(video_results),
+            'no_person_found': videos_with_no_person,
+            'errors': videos_with_errors,
+            'elapsed_seconds': time.perf_counter() - start_time,
+            'first_match_seconds': first_match_seconds,
+        }
+        return video_results, analysis_stats
+
+    def add_to_evidence(self, result, case_id: str) -> bool:
+        """Add analysis result to case evidence after a simulated write delay"""
+        self._sleep(self.profile.evidence_latency)
+        self._evidence_store.add(f"{case_id}:{result.id}")
+        return True
+
+    def add_to_evidence_batch(self, results, case_id: str) -> int:
+        """Add several analysis results to case evidence with one simulated write"""
+        self._sleep(self.profile.evidence_latency)
+        added = 0
+        for result in results:
+            evidence_key = f"{case_id}:{result.id}"
+            if evidence_key not in self._evidence_store:
+                self._evidence_store.add(evidence_key)
+                added += 1
+        return added
+
+    def get_video_url(self, result_id: str) -> str:
+        """Get the video URL for a simulated analysis result"""
+        return self._video_uri_by_id.get(result_id, "")
+
+    def resolve_candidate_uris(self, request: VideoAnalysisRequest) -> Optional[list[str]]:
+        """Resolve the simulated videos matching the request from the camera index"""
+        return [video.uri for video in self._query_index(request)]
+
+    def _query_index(self, request: VideoAnalysisRequest) -> list[VideoMetadata]:
+        """Apply the same date, time range and radius filters as the analysis query"""
+        return self._camera_index.query(
+            request.start_date,
+            request.end_date,
+            request.time_range,
+            request.last_seen_latitude,
+            request.last_seen_longitude,
+            request.search_radius_km,
+            request.last_seen_date,
+            request.travel_mode,
+        )
+
+    def _analyze_video(self, video: VideoMetadata, request: VideoAnalysisRequest) -> Optional[VideoAnalysisResult]:
+        """Simulate one model call; returns a result on a match, None otherwise"""
+        with self._concurrency:
+            self._sleep(self.profile.model_latency)
+
+        with self._rng_lock:
+            failed = self._rng.random() < self.profile.failure_rate
+            matched = self._rng.random() < self.profile.match_rate
+            confidence = self._rng.uniform(0.5, 0.99)
+
+        if failed:
+            raise RuntimeError("Simulated model failure")
+        if not matched:
+            return None
+
+        return VideoAnalysisResult(
+            id=video_result_id(video.uri),
+            timestamp=video.timestamp,
+            latitude=video.latitude,
+            longitude=video.longitude,
+            address=f"Camera {video.camera_id} Location",
+            distance_from_last_seen=haversine_km(
+                video.latitude, video.longitude,
+                request.last_seen_latitude, request.last_seen_longitude,
+            ),
+            video_url=video.uri,
+            confidence_score=confidence,
+            ai_description=f"Simulated detection on camera {video.camera_id} at {video.timestamp:%H:%M}",
+            camera_id=video.camera_id,
+            camera_type=video.camera_type,
+        )
+
+    def _sleep(self, distribution: LatencyDistribution):
+        """Wait for a latency drawn from the distribution, scaled by the profile"""
+        with self._rng_lock:
+            latency = distribution.sample(self._rng)
+        time.sleep(max(0.0, latency * self.profile.time_scale))
+
+
+def synthetic_video_uris(
+    base_uris: list[str], copies: int, spacing_minutes: int = 5
+) -> list[str]:
+    """
+    Build a larger fleet of video URIs by shifting the timestamps of real ones.
+
+    Args:
+        base_uris: URIs following the filename convention
+        copies: Number of shifted copies per base URI
+        spacing_minutes: Time shift between consecutive copies
+
+    Returns:
+        List of synthetic URIs that keep the filename convention
+    """
+    uris = []
+    for uri in base_uris:
+        metadata = parse_video_filename(uri)
+        if not metadata:
+            continue
+        for i in range(copies):
+            timestamp = datetime.fromtimestamp(metadata.timestamp.timestamp() + i * spacing_minutes * 60)
+            uris.append(
+                f"gs://simulated/{metadata.camera_id}_{timestamp:%Y%m%d%H%M%S}_"
+                f"{metadata.latitude}_{metadata.longitude}_{metadata.camera_type}_{metadata.resolution}.mp4"
+            )
+    return uris
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from homeward.config import AppConfig
+from homeward.services.gcs_service import GCSService, parse_gcs_url
+from homeward.utils.ffmpeg_utils import extract_thumbnail
+from homeward.utils.video_utils import video_result_id
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTH = 320
+# Folder of the processed bucket holding the thumbnails
+THUMBNAIL_PREFIX = "thumbnails"
+DEFAULT_MAX_CACHED_FILES = 2000
+THUMBNAIL_TIMEOUT_SECONDS = 30.0
+
+
+class ThumbnailService:
+    """
+    Keyframe thumbnails of videos, for triaging results without downloading them.
+
+    A thumbnail is looked up in the local disk cache, then in the processed
+    bucket, and only extracted when neither has it. Extraction runs ffmpeg in
+    a process pool on a signed URL, seeking to the detection with range
+    requests, and the JPEG is uploaded to the processed bucket so other
+    instances reuse it. Concurrent requests for the same thumbnail share one
+    extraction.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        gcs_service: GCSService,
+        cache_dir: str,
+        allowed_buckets: frozenset[str] = frozenset(),
+        max_processes: Optional[int] = None,
+        max_cached_files: int = DEFAULT_MAX_CACHED_FILES,
+        width: int = THUMBNAIL_WIDTH,
+        ffmpeg_binary: str = "ffmpeg",
+    ):
+        self.config = config
+        self.gcs_service = gcs_service
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Like the video streamer, only videos in these buckets are read
+        self.allowed_buckets = frozenset(allowed_buckets)
+        self.max_cached_files = max_cached_files
+        self.width = width
+        self.ffmpeg_binary = ffmpeg_binary
+
+        # ffmpeg is CPU bound: one process per core by default, 0 extracts in the I/O threads
+        max_processes = (os.cpu_count() or 1) if max_processes is None else max_processes
+        self.process_pool = ProcessPoolExecutor(max_workers=max_processes) if max_processes > 0 else None
+        self.io_pool = ThreadPoolExecutor(max_workers=max(1, max_processes) * 2, thread_name_prefix="thumbnails")
+
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future] = {}
+
+    def thumbnail_name(self, video_url: str, offset_seconds: Optional[int] = None) -> str:
+        """Object name of a thumbnail in the processed bucket, also its disk cache filename"""
+        return f"{THUMBNAIL_PREFIX}/{video_result_id(video_url)}_{int(offset_seconds or 0)}s.jpg"
+
+    def cached_path(self, video_url: str, offset_seconds: Optional[int] = None) -> Optional[str]:
+        """Local path of the thumbnail if it is in the disk cache"""
+        path = self.cache_dir / Path(self.thumbnail_name(video_url, offset_seconds)).name
+        return str(path) if path.exists() else None
+
+    def request(self, video_url: str, offset_seconds: Optional[int] = None) -> Future:
+        """
+        Start producing a thumbnail in the background
+
+        Args:
+            video_url: gs:// URL of the video
+            offset_seconds: Detection offset in the video, the first keyframe when None
+
+        Returns:
+            Future resolved with the local path of the JPEG
+        """
+        cached = self.cached_path(video_url, offset_seconds)
+        if cached:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        name = self.thumbnail_name(video_url, offset_seconds)
+        with self._lock:
+            future = self._pending.get(name)
+            started = future is None
+            if started:
+                future = self.io_pool.submit(self._produce, video_url, offset_seconds, name)
+                self._pending[name] = future
+        # Outside the lock: the callback runs right away, taking the lock, when the future is already done
+        if started:
+            future.add_done_callback(lambda _: self._forget(name))
+        return future
+
+    def get(
+        self, video_url: str, offset_seconds: Optional[int] = None, timeout: float = THUMBNAIL_TIMEOUT_SECONDS
+    ) -> Optional[str]:
+        """Local path of the thumbnail, waiting up to timeout for it; None if it cannot be produced"""
+        try:
+            return self.request(video_url, offset_seconds).result(timeout)
+        except Exception as e:
+            logger.warning(f"No thumbnail for {video_url} at {offset_seconds}s: {e}")
+            return None
+
+    async def get_async(
+        self, video_url: str, offset_seconds: Optional[int] = None, timeout: float = THUMBNAIL_TIMEOUT_SECONDS
+    ) -> Optional[str]:
+        """Like get(), but awaits the thumbnail without holding a thread while it is extracted"""
+        try:
+            # Shielded, so a timed out request does not cancel the extraction other requests share
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(self.request(video_url, offset_seconds))), timeout
+            )
+        except Exception as e:
+            logger.warning(f"No thumbnail for {video_url} at {offset_seconds}s: {e}")
+            return None
+
+    def shutdown(self):
+        """Stop the worker pools"""
+        self.io_pool.shutdown(wait=False, cancel_futures=True)
+        if self.process_pool:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _produce(self, video_url: str, offset_seconds: Optional[int], name: str) -> str:
+        """Fetch the thumbnail from the processed bucket, or extract and upload it"""
+        parsed = parse_gcs_url(video_url)
+        if not parsed:
+            raise ValueError(f"Not a GCS video: {video_url}")
+        if parsed[0] not in self.allowed_buckets:
+            raise ValueError(f"Bucket not allowed: {video_url}")
+
+        cache_path = self.cache_dir / Path(name).name
+        processed_bucket = (
+            self.gcs_service.client.bucket(self.config.gcs_bucket_processed) if self.config.gcs_bucket_processed else None
+        )
+
+        # Written beside the cache entry and renamed, so readers never see a partial file
+        fd, temporary_path = tempfile.mkstemp(suffix=".jpg", dir=self.cache_dir)
+        os.close(fd)
+        try:
+            stored = processed_bucket.get_blob(name) if processed_bucket else None
+            if stored is not None and stored.size:
+                stored.download_to_filename(temporary_path)
+            else:
+                self._extract(parsed, offset_seconds, temporary_path)
+                # mkstemp created the file, so an extraction writing no frame leaves it empty
+                if os.path.getsize(temporary_path) == 0:
+                    raise RuntimeError(f"No frame extracted from {video_url} at {offset_seconds}s")
+                if processed_bucket:
+                    blob = processed_bucket.blob(name)
+                    blob.metadata = {"source-uri": video_url, "offset-seconds": str(int(offset_seconds or 0))}
+                    blob.upload_from_filename(temporary_path, content_type="image/jpeg")
+                    logger.info(f"Uploaded thumbnail gs://{self.config.gcs_bucket_processed}/{name}")
+
+            os.replace(temporary_path, cache_path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+        self._prune_cache()
+        return str(cache_path)
+
+    def _extract(self, parsed: tuple[str, str], offset_seconds: Optional[int], output_path: str):
+        """Run ffmpeg on a signed URL, so only the bytes around the offset are transferred"""
+        source_url = self.gcs_service.get_signed_url(*parsed)
+        args = (source_url, output_path, offset_seconds or 0, self.width, self.ffmpeg_binary)
+        if self.process_pool:
+            self.process_pool.submit(extract_thumbnail, *args).result()
+        else:
+            extract_thumbnail(*args)
+
+    def _prune_cache(self):
+        """Delete the least recently written thumbnails beyond max_cached_files"""
+        files = sorted(self.cache_dir.glob("*.jpg"), key=lambda path: path.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_cached_files)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _forget(self, name: str):
+        with self._lock:
+            self._pending.pop(name, None)
@@ -1,6 +1,35 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from typing import Optional
 
-from homeward.models.video_analysis import VideoAnalysisRequest, VideoAnalysisResult
+from homeward.models.case import MissingPersonCase
+from homeward.models.video_analysis import (
+    VideoAnalysisRequest,
+    VideoAnalysisResult,
+    VideoAnalysisRing,
+    VideoSweepRequest,
+)
+from homeward.utils.camera_index import partition_rings
+from homeward.utils.video_utils import parse_video_filename
+
+# Progressive search defaults
+DEFAULT_STOP_CONFIDENCE = 0.8
+DEFAULT_RING_WIDTH_KM = 1.0
+DEFAULT_RING_HOURS = 6.0
+
+
+def build_missing_person_data(case: MissingPersonCase) -> dict:
+    """Collect the case attributes used in the video analysis prompt"""
+    return {
+        "gender": case.gender,
+        "age": case.age,
+        "height": case.height,
+        "weight": case.weight,
+        "hair_color": case.hair_color,
+        "clothing_description": case.clothing_description,
+        "distinguishing_marks": case.distinguishing_marks,
+    }
 
 
 class VideoAnalysisService(ABC):
@@ -35,6 +64,25 @@ class VideoAnalysisService(ABC):
         """
         pass
 
+    @abstractmethod
+    def add_to_evidence_batch(
+        self, results: list[VideoAnalysisResult], case_id: str
+    ) -> int:
+        """
+        Add several analysis results to case evidence in one write
+
+        Results already linked to the case, or repeated in the batch, are
+        skipped based on their result ID.
+
+        Args:
+            results: VideoAnalysisResult objects to add
+            case_id: ID of the missing person case
+
+        Returns:
+            Number of evidence rows written
+        """
+        pass
+
     @abstractmethod
     def get_video_url(self, result_id: str) -> str:
         """
@@ -47,3 +95,173 @@ class VideoAnalysisService(ABC):
             URL to access the video
         """
         pass
+
+    def resolve_candidate_uris(self, request: VideoAnalysisRequest) -> Optional[list[str]]:
+        """
+        Resolve the exact set of videos an analysis request would cover
+
+        Backends that cannot list their footage ahead of the analysis return None.
+
+        Args:
+            request: VideoAnalysisRequest containing search parameters
+
+        Returns:
+            URIs of the candidate videos, or None if unknown
+        """
+        return None
+
+    def list_new_videos(
+        self, since: datetime, limit: Optional[int] = None, after_uri: str = ""
+    ) -> list[tuple[str, datetime]]:
+        """
+        List the videos added to the analyzed footage after a point in time
+
+        Backends that cannot list their footage return an empty list.
+
+        Args:
+            since: Only videos added after this time
+            limit: Maximum number of videos to return
+            after_uri: Also return the videos added exactly at since whose URI sorts after this one
+
+        Returns:
+            (uri, added time) pairs, oldest first
+        """
+        return []
+
+    def analyze_videos_progressive(
+        self,
+        request: VideoAnalysisRequest,
+        missing_person_data: dict = None,
+        stop_confidence: Optional[float] = DEFAULT_STOP_CONFIDENCE,
+        ring_width_km: float = DEFAULT_RING_WIDTH_KM,
+        ring_hours: float = DEFAULT_RING_HOURS,
+        start_ring: int = 0,
+        run_ring: Optional[Callable[[VideoAnalysisRing, Callable[[], tuple]], tuple]] = None,
+    ) -> Iterator[tuple[VideoAnalysisRing, list[VideoAnalysisResult], dict]]:
+        """
+        Analyze the footage in expanding space-time rings, nearest and most recent first
+
+        Results are yielded ring by ring. The search stops after the first ring
+        with a match at or above stop_confidence; call again with start_ring set
+        to the next ring index to continue outward. Backends that cannot resolve
+        candidate videos ahead of the analysis run a single ring.
+
+        Args:
+            request: VideoAnalysisRequest containing search parameters
+            missing_person_data: Missing person attributes for the AI prompt
+            stop_confidence: Confidence that ends the search, or None to analyze every ring
+            ring_width_km: Distance added by each ring
+            ring_hours: Time offset from the last sighting added by each ring
+            start_ring: Index of the first ring to analyze
+            run_ring: Called with each ring and a function analyzing it, e.g. to
+                queue the ring in the analysis scheduler; runs it directly when None
+
+        Yields:
+            tuple: (ring, ring_results, ring_stats) for each analyzed ring
+        """
+        run_ring = run_ring or (lambda ring, analyze: analyze())
+        candidate_uris = self.resolve_candidate_uris(request)
+
+        if candidate_uris is None:
+            ring = VideoAnalysisRing(0, 1, request.search_radius_km, None)
+            results, stats = run_ring(ring, lambda: self._analyze_request(request, missing_person_data))
+            yield ring, results, stats
+            return
+
+        rings = partition_rings(
+            filter(None, map(parse_video_filename, candidate_uris)),
+            request.last_seen_latitude,
+            request.last_seen_longitude,
+            request.last_seen_date or request.start_date,
+            ring_width_km,
+            ring_hours,
+        )
+
+        for ring in rings[start_ring:]:
+            results, stats = run_ring(
+                ring, lambda uris=ring.uris: self._analyze_candidate_uris(request, uris, missing_person_data)
+            )
+            yield ring, results, stats
+
+            if stop_confidence is not None and any(
+                result.confidence_score >= stop_confidence for result in results
+            ):
+                return
+
+    def _analyze_candidate_uris(
+        self, request: VideoAnalysisRequest, candidate_uris: list[str], missing_person_data: dict = None
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """
+        Analyze an explicit list of videos
+
+        The default implementation analyzes the request window and keeps the
+        results of the listed videos. Backends that can restrict the analysis
+        to given videos should override it.
+        """
+        if not candidate_uris:
+            return [], {"total_analyzed": 0, "matches_found": 0, "no_person_found": 0, "errors": 0}
+
+        uris = set(candidate_uris)
+        results, stats = self._analyze_request(request, missing_person_data)
+        results = [result for result in results if result.video_url in uris]
+        return results, {**stats, "matches_found": len(results)}
+
+    def analyze_videos_sweep(
+        self, request: VideoSweepRequest
+    ) -> tuple[dict[str, list[VideoAnalysisResult]], dict]:
+        """
+        Analyze one footage window against several cases
+
+        The default implementation runs one analysis per case. Backends that can
+        evaluate several case descriptions in a single pass over the footage
+        should override it.
+
+        Args:
+            request: VideoSweepRequest with the shared window and the cases
+
+        Returns:
+            tuple: (results_by_case, sweep_stats) where results_by_case maps each
+            case ID to its results sorted by confidence, and sweep_stats has the
+            total_analyzed, errors and per-case cases counts of the BigQuery sweep
+        """
+        results_by_case = {}
+        case_stats = {}
+        total_analyzed, errors = 0, 0
+        for sweep_case in request.cases:
+            case_request = VideoAnalysisRequest(
+                case_id=sweep_case.case_id,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                time_range=request.time_range,
+                search_radius_km=request.search_radius_km,
+                last_seen_latitude=sweep_case.last_seen_latitude,
+                last_seen_longitude=sweep_case.last_seen_longitude,
+            )
+            if request.candidate_uris is not None:
+                results, stats = self._analyze_candidate_uris(
+                    case_request, request.candidate_uris, sweep_case.missing_person_data
+                )
+            else:
+                results, stats = self._analyze_request(case_request, sweep_case.missing_person_data)
+            results_by_case[sweep_case.case_id] = results
+            case_stats[sweep_case.case_id] = {
+                "matches_found": stats.get("matches_found", len(results)),
+                "no_person_found": stats.get("no_person_found", 0),
+            }
+            # Every case covers the same footage, so the window is counted once
+            total_analyzed = max(total_analyzed, stats.get("total_analyzed", len(results)))
+            errors = max(errors, stats.get("errors", 0))
+
+        sweep_stats = {"total_analyzed": total_analyzed, "errors": errors, "cases": case_stats}
+        return results_by_case, sweep_stats
+
+    def _analyze_request(
+        self, request: VideoAnalysisRequest, missing_person_data: dict = None
+    ) -> tuple[list[VideoAnalysisResult], dict]:
+        """Run analyze_videos with the person attributes, always returning (results, stats)"""
+        try:
+            results = self.analyze_videos(request, missing_person_data)
+        except TypeError:
+            # Fallback for services that don't accept missing_person_data parameter
+            results = self.analyze_videos(request)
+        return results if isinstance(results, tuple) else (results, {})
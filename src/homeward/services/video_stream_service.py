@@ -0,0 +1,166 @@
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Optional
+
+from homeward.services.gcs_service import GCSService, parse_gcs_url
+
+logger = logging.getLogger(__name__)
+
+# Reads from GCS are aligned to blocks of this size, the unit of the block cache
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+# 64 MB of recently read blocks, enough to seek back and forth around a few detections
+DEFAULT_CACHE_BLOCKS = 64
+# Open-ended ranges ("bytes=0-") are answered with at most this much, players ask again as they play
+MAX_OPEN_RANGE_BYTES = 8 * 1024 * 1024
+
+
+class RangeNotSatisfiable(ValueError):
+    """The requested byte range lies outside the object"""
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    """Inclusive byte range of an object"""
+
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+
+def parse_range_header(header: Optional[str], size: int, max_open_range: int = MAX_OPEN_RANGE_BYTES) -> Optional[ByteRange]:
+    """
+    Parse a single-range HTTP Range header
+
+    Args:
+        header: Range header value, e.g. "bytes=1000-1999", "bytes=1000-" or "bytes=-500"
+        size: Object size in bytes
+        max_open_range: Cap on the length of open-ended ranges
+
+    Returns:
+        ByteRange clamped to the object, or None when there is no usable header
+        and the whole object should be served
+
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the object
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # Suffix range: the last N bytes
+        if not end or size == 0:
+            raise RangeNotSatisfiable(header)
+        return ByteRange(max(0, size - end), size - 1)
+
+    if end is None:
+        end = start + max_open_range - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return ByteRange(start, min(end, size - 1))
+
+
+class VideoStreamService:
+    """
+    Serve byte ranges of GCS videos for in-browser playback
+
+    Ranges are read in fixed-size, aligned blocks kept in a small LRU cache
+    keyed by object generation, so seeking back to a detection, or several
+    viewers of the same clip, reuse the blocks already fetched instead of
+    downloading the whole file.
+    """
+
+    def __init__(
+        self,
+        gcs_service: GCSService,
+        allowed_buckets: frozenset[str] = frozenset(),
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+    ):
+        self.gcs_service = gcs_service
+        # Only videos in these buckets are streamed, so the endpoint is not a proxy to any readable bucket
+        self.allowed_buckets = frozenset(allowed_buckets)
+        if not self.allowed_buckets:
+            logger.warning("No buckets allowed for video streaming; every stream request will be refused")
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+
+        self._lock = threading.Lock()
+        # (bucket, object, generation, block index) -> bytes
+        self._blocks: OrderedDict = OrderedDict()
+        self._stats = {"block_hits": 0, "block_misses": 0, "bytes_read": 0}
+
+    def open(self, video_url: str) -> Optional[tuple[str, str, dict]]:
+        """
+        Resolve a video for streaming
+
+        Returns:
+            (bucket, object name, metadata) or None if the URL is invalid,
+            outside the allowed buckets or the object does not exist
+        """
+        parsed = parse_gcs_url(video_url)
+        if not parsed:
+            return None
+        bucket_name, object_name = parsed
+        if bucket_name not in self.allowed_buckets:
+            logger.warning(f"Refusing to stream {video_url}: bucket not allowed")
+            return None
+
+        metadata = self.gcs_service.get_object_metadata(bucket_name, object_name)
+        if metadata is None:
+            return None
+        return bucket_name, object_name, metadata
+
+    def iter_range(
+        self, bucket_name: str, object_name: str, generation: Optional[int], byte_range: ByteRange
+    ) -> Iterator[bytes]:
+        """Yield the bytes of a range, one block at a time"""
+        first_block = byte_range.start // self.block_size
+        last_block = byte_range.end // self.block_size
+
+        for index in range(first_block, last_block + 1):
+            block = self.read_block(bucket_name, object_name, generation, index)
+            block_start = index * self.block_size
+            yield block[max(0, byte_range.start - block_start):byte_range.end - block_start + 1]
+
+    def read_block(self, bucket_name: str, object_name: str, generation: Optional[int], index: int) -> bytes:
+        """Read one aligned block, from the cache when possible"""
+        key = (bucket_name, object_name, generation, index)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                self._stats["block_hits"] += 1
+                return block
+            self._stats["block_misses"] += 1
+
+        start = index * self.block_size
+        blob = self.gcs_service.client.bucket(bucket_name).blob(object_name, generation=generation)
+        # The end offset is inclusive; reads past the end of the object are truncated by GCS
+        block = blob.download_as_bytes(start=start, end=start + self.block_size - 1)
+
+        with self._lock:
+            self._stats["bytes_read"] += len(block)
+            if self.cache_blocks > 0:
+                self._blocks[key] = block
+                self._blocks.move_to_end(key)
+                while len(self._blocks) > self.cache_blocks:
+                    self._blocks.popitem(last=False)
+        return block
+
+    def cache_stats(self) -> dict:
+        """Block cache hits, misses, cached blocks and bytes read from GCS"""
+        with self._lock:
+            return {**self._stats, "cached_blocks": len(self._blocks)}
@@ -0,0 +1,350 @@
+import argparse
+import json
+import logging
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from homeward.config import load_config
+from homeward.models.case import CasePriority, CaseStatus, MissingPersonCase
+from homeward.models.video_analysis import (
+    SweepCase,
+    VideoAnalysisResult,
+    VideoSweepRequest,
+)
+from homeward.services.analysis_scheduler import PRIORITY_RANK, AnalysisScheduler
+from homeward.services.data_service import DataService
+from homeward.services.video_analysis_service import (
+    VideoAnalysisService,
+    build_missing_person_data,
+)
+from homeward.utils.geo_utils import haversine_km
+from homeward.utils.video_utils import parse_video_filename
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 25
+DEFAULT_POLL_SECONDS = 60.0
+DEFAULT_MIN_CONFIDENCE = 0.7
+# Cases are only checked against footage recorded within this distance of the last sighting
+DEFAULT_WATCH_RADIUS_KM = 50.0
+# Page size used to load the active cases
+CASES_PAGE_SIZE = 100
+
+
+@dataclass
+class WatchlistHit:
+    """A confident match of a watched case in newly ingested footage"""
+
+    case_id: str
+    case_name: str
+    priority: CasePriority
+    result: VideoAnalysisResult
+
+
+class WatchlistService:
+    """
+    Check newly ingested footage against the active high-priority cases.
+
+    Each poll lists the videos added to the analyzed footage since the last
+    watermark, splits them into micro-batches and sweeps every batch once
+    against all the watched cases near it. Confident hits on footage within a
+    case's own radius, recorded after its last sighting, are written to the
+    case evidence and passed to the notifiers, so the work is proportional to
+    the new footage rather than to the whole archive.
+    """
+
+    def __init__(
+        self,
+        data_service: DataService,
+        video_analysis_service: VideoAnalysisService,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        watch_radius_km: float = DEFAULT_WATCH_RADIUS_KM,
+        priorities: tuple[CasePriority, ...] = (CasePriority.HIGH,),
+        since: Optional[datetime] = None,
+        state_path: Optional[str] = None,
+        notifiers: Optional[list[Callable[[WatchlistHit], None]]] = None,
+        analysis_scheduler: Optional[AnalysisScheduler] = None,
+    ):
+        self.data_service = data_service
+        self.video_analysis_service = video_analysis_service
+        # Sweeps share its priority queues and quota with the officers' analyses; they run directly when None
+        self.analysis_scheduler = analysis_scheduler
+        self.batch_size = max(1, batch_size)
+        self.min_confidence = min_confidence
+        self.watch_radius_km = watch_radius_km
+        self.priorities = set(priorities)
+        self.state_path = state_path
+        self.notifiers = list(notifiers) if notifiers is not None else [log_hit]
+        self.recent_hits: deque[WatchlistHit] = deque(maxlen=100)
+
+        # (updated, uri) of the last processed video: videos sharing its timestamp are split by URI
+        watermark = (since, "") if since else self._load_watermark()
+        self.watermark, self.watermark_uri = watermark or (datetime.now(timezone.utc), "")
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_notifier(self, notifier: Callable[[WatchlistHit], None]):
+        """Register a callback invoked for every new hit"""
+        self.notifiers.append(notifier)
+
+    def watched_cases(self) -> list[MissingPersonCase]:
+        """Load the active cases with a watched priority"""
+        cases = []
+        page = 1
+        while True:
+            page_cases, total = self.data_service.get_cases(CaseStatus.ACTIVE.value, page, CASES_PAGE_SIZE)
+            cases.extend(case for case in page_cases if case.priority in self.priorities)
+            if not page_cases or page * CASES_PAGE_SIZE >= total:
+                return cases
+            page += 1
+
+    def poll_once(self) -> dict:
+        """
+        Process the footage added since the watermark
+
+        Batches are processed oldest first and the watermark only advances past
+        batches that completed, so a failed batch is retried on the next poll.
+        The watermark is the (updated, uri) of the last processed video, so
+        videos updated in the same instant are neither skipped nor repeated.
+
+        Returns:
+            dict: new_videos, batches, hits, evidence_added and errors
+        """
+        stats = {"new_videos": 0, "batches": 0, "hits": 0, "evidence_added": 0, "errors": 0}
+
+        new_videos = self.video_analysis_service.list_new_videos(self.watermark, after_uri=self.watermark_uri)
+        stats["new_videos"] = len(new_videos)
+        if not new_videos:
+            return stats
+
+        cases = self.watched_cases()
+        if not cases:
+            logger.info(f"{len(new_videos)} new videos, but no active {self._priority_names()} cases to watch")
+            self._advance_watermark(*new_videos[-1])
+            return stats
+
+        for start in range(0, len(new_videos), self.batch_size):
+            batch = new_videos[start:start + self.batch_size]
+            try:
+                hits, evidence_added = self._process_batch([uri for uri, _ in batch], cases)
+            except Exception as e:
+                stats["errors"] += 1
+                logger.error(f"Watchlist batch of {len(batch)} videos failed, retrying on the next poll: {e}")
+                break
+
+            stats["batches"] += 1
+            stats["hits"] += len(hits)
+            stats["evidence_added"] += evidence_added
+            self._advance_watermark(*batch[-1])
+
+        logger.info(
+            f"Watchlist poll: {stats['new_videos']} new videos in {stats['batches']} batches "
+            f"against {len(cases)} cases, {stats['hits']} hits"
+        )
+        return stats
+
+    def start(self, poll_seconds: float = DEFAULT_POLL_SECONDS):
+        """Poll in a background thread until stop() is called"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run_forever, args=(poll_seconds,), name="watchlist", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background polling"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run_forever(self, poll_seconds: float = DEFAULT_POLL_SECONDS):
+        """Poll every poll_seconds in the calling thread until stop() is called"""
+        while not self._stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Watchlist poll failed: {e}")
+            self._stop_event.wait(poll_seconds)
+
+    def _process_batch(self, uris: list[str], cases: list[MissingPersonCase]) -> tuple[list[WatchlistHit], int]:
+        """Sweep one micro-batch against the cases it could concern and record the hits"""
+        videos = [video for video in map(parse_video_filename, uris) if video]
+        relevant_cases = [case for case in cases if self._is_relevant(case, videos)]
+        if not videos or not relevant_cases:
+            return [], 0
+
+        # Footage no watched case covers is not analyzed at all
+        videos = [
+            video for video in videos
+            if any(self._covers(case, video.latitude, video.longitude, video.timestamp) for case in relevant_cases)
+        ]
+
+        request = VideoSweepRequest(
+            cases=[
+                SweepCase(
+                    case_id=case.id,
+                    last_seen_latitude=case.last_seen_location.latitude,
+                    last_seen_longitude=case.last_seen_location.longitude,
+                    missing_person_data=build_missing_person_data(case),
+                )
+                for case in relevant_cases
+            ],
+            start_date=min(video.timestamp for video in videos),
+            end_date=max(video.timestamp for video in videos),
+            time_range="All Day",
+            search_radius_km=self.watch_radius_km,
+            center_latitude=relevant_cases[0].last_seen_location.latitude,
+            center_longitude=relevant_cases[0].last_seen_location.longitude,
+            candidate_uris=[video.uri for video in videos],
+        )
+
+        results_by_case, _ = self._sweep(request, relevant_cases)
+
+        cases_by_id = {case.id: case for case in relevant_cases}
+        hits = []
+        evidence_added = 0
+        for case_id, results in results_by_case.items():
+            # The sweep pairs every case with every video of the batch, so footage outside a case's own
+            # radius or from before its last sighting is dropped before it becomes evidence
+            case = cases_by_id[case_id]
+            confident = [
+                result for result in results
+                if result.confidence_score >= self.min_confidence
+                and self._covers(case, result.latitude, result.longitude, result.timestamp)
+            ]
+            if not confident:
+                continue
+
+            evidence_added += self.video_analysis_service.add_to_evidence_batch(confident, case_id)
+            for result in confident:
+                hit = WatchlistHit(case_id, f"{case.name} {case.surname}", case.priority, result)
+                hits.append(hit)
+                self.recent_hits.append(hit)
+                self._notify(hit)
+
+        return hits, evidence_added
+
+    def _sweep(self, request: VideoSweepRequest, cases: list[MissingPersonCase]) -> tuple[dict, dict]:
+        """Run a sweep, queued as a job of its most urgent case costing one request per video"""
+        if self.analysis_scheduler is None:
+            return self.video_analysis_service.analyze_videos_sweep(request)
+
+        urgent = min(cases, key=lambda case: PRIORITY_RANK.get(case.priority, PRIORITY_RANK[CasePriority.MEDIUM]))
+        future = self.analysis_scheduler.submit(
+            urgent.id,
+            urgent.priority,
+            urgent.last_seen_date,
+            self.video_analysis_service.analyze_videos_sweep,
+            request,
+            cost=len(request.candidate_uris),
+        )
+        return future.result()
+
+    def _is_relevant(self, case: MissingPersonCase, videos) -> bool:
+        """Whether any video was recorded near the last sighting, after the person went missing"""
+        return any(self._covers(case, video.latitude, video.longitude, video.timestamp) for video in videos)
+
+    def _covers(self, case: MissingPersonCase, latitude: float, longitude: float, timestamp: datetime) -> bool:
+        """Whether footage recorded at this place and time is within the watch radius, after the last sighting"""
+        location = case.last_seen_location
+        if location is None or location.latitude is None or location.longitude is None:
+            return False
+        if latitude is None or longitude is None:
+            return False
+
+        last_seen = case.last_seen_date
+        if last_seen is not None and timestamp is not None:
+            # Filename timestamps are naive, so both sides are compared without a timezone
+            if last_seen.replace(tzinfo=None) - timedelta(hours=1) > timestamp.replace(tzinfo=None):
+                return False
+        return haversine_km(latitude, longitude, location.latitude, location.longitude) <= self.watch_radius_km
+
+    def _notify(self, hit: WatchlistHit):
+        for notifier in self.notifiers:
+            try:
+                notifier(hit)
+            except Exception as e:
+                logger.warning(f"Watchlist notifier failed for case {hit.case_id}: {e}")
+
+    def _advance_watermark(self, uri: str, added_at: datetime):
+        if added_at.tzinfo is None:
+            added_at = added_at.replace(tzinfo=timezone.utc)
+        if (added_at, uri) > (self.watermark, self.watermark_uri):
+            self.watermark, self.watermark_uri = added_at, uri
+            self._save_watermark()
+
+    def _load_watermark(self) -> Optional[tuple[datetime, str]]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path) as state_file:
+                state = json.load(state_file)
+            return datetime.fromisoformat(state["watermark"]), state.get("uri", "")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable watchlist state {self.state_path}: {e}")
+            return None
+
+    def _save_watermark(self):
+        if not self.state_path:
+            return
+        temporary_path = f"{self.state_path}.tmp"
+        with open(temporary_path, "w") as state_file:
+            json.dump({"watermark": self.watermark.isoformat(), "uri": self.watermark_uri}, state_file)
+        os.replace(temporary_path, self.state_path)
+
+    def _priority_names(self) -> str:
+        return "/".join(sorted(priority.value for priority in self.priorities))
+
+
+def log_hit(hit: WatchlistHit):
+    """Default notifier: log the hit"""
+    logger.warning(
+        f"Watchlist hit for case {hit.case_id} ({hit.case_name}, {hit.priority.value}): "
+        f"{hit.result.confidence_score:.0%} on camera {hit.result.camera_id} at {hit.result.timestamp:%Y-%m-%d %H:%M}"
+    )
+
+
+def main():
+    from homeward.services.service_factory import (
+        create_analysis_scheduler,
+        create_data_service,
+        create_video_analysis_service,
+    )
+
+    parser = argparse.ArgumentParser(description="Check newly ingested footage against the active high-priority cases")
+    parser.add_argument("--poll-seconds", type=float, default=float(os.getenv("HOMEWARD_WATCHLIST_POLL_SECONDS", DEFAULT_POLL_SECONDS)))
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("HOMEWARD_WATCHLIST_BATCH_SIZE", DEFAULT_BATCH_SIZE)))
+    parser.add_argument("--min-confidence", type=float, default=DEFAULT_MIN_CONFIDENCE)
+    parser.add_argument("--priorities", nargs="+", default=[CasePriority.HIGH.value], choices=[priority.value for priority in CasePriority])
+    parser.add_argument("--state", default=os.getenv("HOMEWARD_WATCHLIST_STATE", ".watchlist_state.json"), help="Watermark file")
+    parser.add_argument("--once", action="store_true", help="Poll once and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = load_config()
+    analysis_scheduler = create_analysis_scheduler(config)
+    watchlist = WatchlistService(
+        create_data_service(config),
+        create_video_analysis_service(config, analysis_scheduler),
+        batch_size=args.batch_size,
+        min_confidence=args.min_confidence,
+        priorities=tuple(CasePriority(priority) for priority in args.priorities),
+        state_path=args.state,
+        analysis_scheduler=analysis_scheduler,
+    )
+
+    if args.once:
+        stats = watchlist.poll_once()
+        logger.info(f"Watchlist poll finished: {stats}")
+        return
+
+    watchlist.run_forever(args.poll_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+from typing import Callable, Optional
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from nicegui import ui
+
+from homeward.services.video_stream_service import (
+    ByteRange,
+    RangeNotSatisfiable,
+    VideoStreamService,
+    parse_range_header,
+)
+
+VIDEO_STREAM_PATH = "/video/stream"
+
+# Playback starts this long before the detection, so the person is seen walking into frame
+PLAYBACK_LEAD_IN_SECONDS = 2
+
+
+def register_video_stream_route(app, stream_service: VideoStreamService):
+    """Serve GCS videos with HTTP Range support at VIDEO_STREAM_PATH?uri=gs://..."""
+
+    @app.get(VIDEO_STREAM_PATH)
+    def stream_video(request: Request, uri: str):
+        opened = stream_service.open(uri)
+        if opened is None:
+            return Response(status_code=404)
+
+        bucket_name, object_name, metadata = opened
+        size = metadata["size"] or 0
+        headers = {"Accept-Ranges": "bytes", "Cache-Control": "private, max-age=300"}
+
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+        status_code = 206
+        if byte_range is None:
+            status_code = 200
+            byte_range = ByteRange(0, size - 1)
+        else:
+            headers["Content-Range"] = f"bytes {byte_range.start}-{byte_range.end}/{size}"
+        headers["Content-Length"] = str(max(0, byte_range.length))
+
+        return StreamingResponse(
+            stream_service.iter_range(bucket_name, object_name, metadata.get("generation"), byte_range),
+            status_code=status_code,
+            media_type=metadata.get("content_type") or "video/mp4",
+            headers=headers,
+        )
+
+
+def stream_url(video_url: str, offset_seconds: Optional[int] = None) -> str:
+    """Player URL for a GCS video, starting at the offset with a media fragment"""
+    url = f"{VIDEO_STREAM_PATH}?uri={quote(video_url, safe='')}"
+    if offset_seconds:
+        url += f"#t={max(0, offset_seconds - PLAYBACK_LEAD_IN_SECONDS)}"
+    return url
+
+
+def open_video_player(
+    video_url: str,
+    title: str,
+    offset_seconds: Optional[int] = None,
+    on_download: Optional[Callable[[], None]] = None,
+):
+    """Open a dialog playing the video from the detection, streamed by range requests"""
+    with ui.dialog() as dialog, ui.card().classes("w-full max-w-4xl bg-gray-900 border border-gray-700"):
+        with ui.row().classes("w-full items-center justify-between"):
+            ui.label(title).classes("text-gray-100 font-medium")
+            if offset_seconds is not None:
+                ui.label(f"Detection at {offset_seconds // 60:02d}:{offset_seconds % 60:02d}").classes(
+                    "text-gray-400 text-sm"
+                )
+
+        ui.video(stream_url(video_url, offset_seconds)).classes("w-full rounded")
+
+        with ui.row().classes("w-full justify-end gap-2"):
+            if on_download:
+                ui.button("Download", on_click=on_download).classes(
+                    "bg-transparent text-cyan-300 px-2 py-1 rounded border border-cyan-500/60 text-xs"
+                )
+            ui.button("Close", on_click=dialog.close).classes(
+                "bg-transparent text-gray-300 px-2 py-1 rounded border border-gray-500/60 text-xs"
+            )
+
+    dialog.open()
@@ -0,0 +1,51 @@
+from typing import Callable, Optional
+from urllib.parse import quote
+
+from fastapi.responses import FileResponse, Response
+from nicegui import ui
+
+from homeward.services.thumbnail_service import ThumbnailService
+
+VIDEO_THUMBNAIL_PATH = "/video/thumbnail"
+
+
+def register_thumbnail_route(app, thumbnail_service: ThumbnailService):
+    """Serve keyframe thumbnails at VIDEO_THUMBNAIL_PATH?uri=gs://...&t=SECONDS"""
+
+    @app.get(VIDEO_THUMBNAIL_PATH)
+    async def video_thumbnail(uri: str, t: Optional[int] = None):
+        # Awaited on the event loop, so slow extractions do not hold a worker thread each
+        path = await thumbnail_service.get_async(uri, t)
+        if path is None:
+            return Response(status_code=404)
+        # Thumbnails of a video at an offset never change
+        return FileResponse(path, media_type="image/jpeg", headers={"Cache-Control": "private, max-age=86400"})
+
+
+def thumbnail_url(video_url: str, offset_seconds: Optional[int] = None) -> str:
+    """Thumbnail URL of a GCS video at the detection offset"""
+    url = f"{VIDEO_THUMBNAIL_PATH}?uri={quote(video_url, safe='')}"
+    if offset_seconds is not None:
+        url += f"&t={offset_seconds}"
+    return url
+
+
+def create_video_thumbnail(
+    video_url: str, offset_seconds: Optional[int] = None, on_click: Optional[Callable[[], None]] = None
+):
+    """
+    Thumbnail of the detection, loaded by the browser only when scrolled into view
+
+    Hidden when no thumbnail can be produced, so the row keeps its View button.
+    """
+    thumbnail = ui.element("img").classes("w-24 h-14 object-cover rounded border border-gray-700/60 bg-gray-900")
+    thumbnail.props.update(
+        src=thumbnail_url(video_url, offset_seconds),
+        loading="lazy",
+        decoding="async",
+        alt="",
+        onerror="this.style.display='none'",
+    )
+    if on_click:
+        thumbnail.classes("cursor-pointer hover:border-cyan-400").on("click", lambda _: on_click())
+    return thumbnail
@@ -1,16 +1,30 @@
+import asyncio
 import logging
 from datetime import datetime, date
+from functools import partial
 
 from nicegui import run, ui
 
 from homeward.config import AppConfig
 from homeward.models.case import CaseStatus, CasePriority, MissingPersonCase
-from homeward.models.video_analysis import VideoAnalysisRequest, VideoAnalysisResult
+from homeward.models.video_analysis import (
+    TravelMode,
+    VideoAnalysisRequest,
+    VideoAnalysisResult,
+)
+from homeward.services.analysis_scheduler import AnalysisScheduler
 from homeward.services.data_service import DataService
 from homeward.services.gcs_service import GCSService
-from homeward.services.video_analysis_service import VideoAnalysisService
+from homeward.services.video_analysis_service import (
+    VideoAnalysisService,
+    build_missing_person_data,
+)
 from homeward.ui.components.footer import create_footer
 from homeward.ui.components.missing_person_form import create_missing_person_form
+from homeward.ui.components.video_player import open_video_player
+from homeward.ui.components.video_thumbnail import create_video_thumbnail
+from homeward.utils.track_utils import build_tracks, track_result
+from homeward.utils.video_utils import detection_offset_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +35,14 @@ def create_case_detail_page(
     video_analysis_service: VideoAnalysisService,
     config: AppConfig,
     on_back_to_dashboard: callable,
+    analysis_scheduler: AnalysisScheduler = None,
+    gcs_service: GCSService = None,
 ):
     """Create the case detail page"""
 
-    # Initialize GCS service for video downloads
-    gcs_service = GCSService(config)
+    # GCS service for video downloads, shared across pages so its signed URL cache is reused
+    if gcs_service is None:
+        gcs_service = GCSService(config)
 
     # Get case data
     case = data_service.get_case_by_id(case_id)
@@ -382,7 +399,7 @@ def create_case_detail_page(
                         )
 
                     # Video analysis form - store form elements for access
-                    start_date_input, end_date_input, time_range_select, search_radius_input = create_video_analysis_section(case)
+                    start_date_input, end_date_input, time_range_select, search_radius_input, travel_mode_select = create_video_analysis_section(case, video_analysis_service)
 
                     # AI Analysis results section with styled box
                     ui.separator().classes("my-6 bg-gray-600")
@@ -419,7 +436,7 @@ def create_case_detail_page(
                                     )
 
                         # AI Analysis button with consistent styling - positioned after results container for proper scoping
-                        with ui.row().classes("w-full justify-center mt-6"):
+                        with ui.row().classes("w-full justify-center gap-4 mt-6"):
                             ui.button(
                                 "AI Video Intelligence",
                                 on_click=lambda: handle_analyze_video(
@@ -433,10 +450,30 @@ def create_case_detail_page(
                                     time_range_select.value,
                                     search_radius_input.value,
                                     gcs_service,
+                                    travel_mode_select.value,
+                                    analysis_scheduler,
                                 ),
                             ).classes(
                                 "bg-transparent text-purple-300 px-8 py-4 rounded-full border-2 border-purple-400/80 hover:bg-purple-200 hover:text-purple-900 hover:border-purple-200 transition-all duration-300 font-light text-sm tracking-wide ring-2 ring-purple-400/20 hover:ring-purple-200/40 hover:ring-4"
                             )
+                            ui.button(
+                                "Nearest First",
+                                on_click=lambda: handle_progressive_video_analysis(
+                                    case.id,
+                                    video_analysis_service,
+                                    case,
+                                    results_container,
+                                    start_date_input.value,
+                                    end_date_input.value,
+                                    time_range_select.value,
+                                    search_radius_input.value,
+                                    gcs_service,
+                                    travel_mode_select.value,
+                                    analysis_scheduler=analysis_scheduler,
+                                ),
+                            ).classes(
+                                "bg-transparent text-cyan-300 px-8 py-4 rounded-full border-2 border-cyan-400/80 hover:bg-cyan-200 hover:text-cyan-900 hover:border-cyan-200 transition-all duration-300 font-light text-sm tracking-wide ring-2 ring-cyan-400/20 hover:ring-cyan-200/40 hover:ring-4"
+                            )
 
                 # Video Evidence Section
                 with ui.card().classes(
@@ -486,6 +523,9 @@ def create_video_evidence_table(case_id: str, data_service: DataService, gcs_ser
             ui.label("No video evidence linked to this case yet").classes("text-gray-400 text-center")
             ui.label("Use 'Add' button from video analysis results to add evidence").classes("text-gray-500 text-xs mt-2 text-center")
     else:
+        # Warm the metadata cache so the View buttons skip the per-file existence check
+        gcs_service.prefetch_metadata_in_background([evidence.get("video_url") for evidence in video_evidence])
+
         with ui.element("div").classes(
             "w-full bg-gray-800/30 rounded-lg border border-gray-700/50 overflow-hidden"
         ):
@@ -539,20 +579,34 @@ def create_video_evidence_table(case_id: str, data_service: DataService, gcs_ser
                             ui.label("N/A").classes("text-gray-400 text-sm")
 
                     # Actions
-                    with ui.element("div").classes("flex justify-center"):
-                        ui.button(
-                            "View",
-                            on_click=lambda e=evidence: handle_view_evidence_video(e.get("video_url"), gcs_service)
-                        ).classes(
+                    with ui.element("div").classes("flex flex-col items-center gap-2"):
+                        view_evidence = partial(
+                            handle_view_evidence_video,
+                            evidence.get("video_url"),
+                            gcs_service,
+                            evidence.get("ai_description"),
+                        )
+                        # Keyframe at the detection, so evidence is triaged without opening the video
+                        if (evidence.get("video_url") or "").startswith("gs://"):
+                            create_video_thumbnail(
+                                evidence["video_url"],
+                                detection_offset_seconds(evidence.get("ai_description")),
+                                on_click=view_evidence,
+                            )
+                        ui.button("View", on_click=view_evidence).classes(
                             "bg-transparent text-cyan-300 px-2 py-1 rounded border border-cyan-500/60 hover:bg-cyan-200 hover:text-cyan-900 hover:border-cyan-200 transition-all duration-300 font-light text-xs tracking-wide"
                         )
 
 
-def handle_view_evidence_video(video_url: str, gcs_service: GCSService):
-    """Handle downloading/viewing video evidence from GCS"""
+def handle_view_evidence_video(video_url: str, gcs_service: GCSService, description: str = None):
+    """Handle viewing video evidence from GCS, streamed from the detection"""
     if video_url and video_url.startswith('gs://'):
-        gcs_service.download_video_file(video_url)
-        ui.notify("📥 Downloading video evidence...", type="info")
+        open_video_player(
+            video_url,
+            "Video Evidence",
+            detection_offset_seconds(description),
+            on_download=lambda: gcs_service.download_video_file(video_url),
+        )
     elif video_url:
         ui.notify(f"Opening video: {video_url}", type="info")
     else:
@@ -674,7 +728,9 @@ def create_sightings_table(case_id: str, data_service: DataService):
 
 
 
-def create_video_analysis_section(case: MissingPersonCase):
+def create_video_analysis_section(
+    case: MissingPersonCase, video_analysis_service: VideoAnalysisService = None
+):
     """Create the video analysis form section and return form elements for access"""
 
     with ui.column().classes("w-full space-y-6"):
@@ -725,8 +781,79 @@ def create_video_analysis_section(case: MissingPersonCase):
                     search_radius_input = ui.number("", value=5, min=1, max=50).classes(
                         "w-full bg-gray-700/50 text-white border-gray-500 rounded-lg text-sm"
                     ).props("outlined dense")
+                with ui.column().classes("w-36"):
+                    ui.label("Travel Mode").classes("text-gray-300 text-xs mb-1")
+                    # "Any" keeps the fixed radius; a mode grows it with time since last seen
+                    travel_mode_select = ui.select(
+                        ["Any"] + [mode.value for mode in TravelMode],
+                        value="Any",
+                    ).classes(
+                        "w-full bg-gray-700/50 text-white border-gray-500 rounded-lg text-sm"
+                    ).props("outlined dense")
+
+        if video_analysis_service is not None:
+            video_count_label = ui.label("").classes("text-gray-400 text-xs")
+
+            async def update_video_count():
+                """Show how many videos the current filters select, without running the analysis"""
+                request = build_video_analysis_request(
+                    case,
+                    start_date_input.value,
+                    end_date_input.value,
+                    time_range_select.value,
+                    search_radius_input.value,
+                    travel_mode_select.value,
+                )
+                try:
+                    candidate_uris = await run.io_bound(
+                        video_analysis_service.resolve_candidate_uris, request
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to resolve candidate videos: {e}")
+                    candidate_uris = None
+
+                if candidate_uris is None:
+                    video_count_label.text = ""
+                else:
+                    video_count_label.text = f"{len(candidate_uris)} videos will be analyzed"
 
-    return start_date_input, end_date_input, time_range_select, search_radius_input
+            for form_input in (
+                start_date_input, end_date_input, time_range_select, search_radius_input, travel_mode_select
+            ):
+                form_input.on_value_change(update_video_count)
+            ui.timer(0.1, update_video_count, once=True)
+
+    return start_date_input, end_date_input, time_range_select, search_radius_input, travel_mode_select
+
+
+def build_video_analysis_request(
+    case: MissingPersonCase,
+    start_date_str: str,
+    end_date_str: str,
+    time_range: str,
+    search_radius_km: float,
+    travel_mode: str = None,
+) -> VideoAnalysisRequest:
+    """Build a video analysis request from the form values, falling back to the case data"""
+    try:
+        start_date = datetime.fromisoformat(start_date_str) if start_date_str else case.last_seen_date
+        end_date = datetime.fromisoformat(end_date_str) if end_date_str else datetime.now()
+    except ValueError:
+        # Fallback to case date if parsing fails
+        start_date = case.last_seen_date
+        end_date = datetime.now()
+
+    return VideoAnalysisRequest(
+        case_id=case.id,
+        start_date=start_date,
+        end_date=end_date,
+        time_range=time_range or "All Day",
+        last_seen_latitude=case.last_seen_location.latitude or 0.0,
+        last_seen_longitude=case.last_seen_location.longitude or 0.0,
+        search_radius_km=search_radius_km or 5.0,
+        last_seen_date=case.last_seen_date,
+        travel_mode=TravelMode(travel_mode) if travel_mode and travel_mode != "Any" else None,
+    )
 
 
 def open_link_sighting_modal(case_id: str, data_service: DataService):
@@ -1266,6 +1393,8 @@ async def handle_analyze_video(
     time_range: str,
     search_radius_km: float,
     gcs_service: GCSService,
+    travel_mode: str = None,
+    analysis_scheduler: AnalysisScheduler = None,
 ):
     """Handle AI video analysis request using BigQuery and Gemini with run.io_bound()"""
     ui.notify(
@@ -1313,34 +1442,11 @@ async def handle_analyze_video(
 
     try:
         # Prepare missing person data for the AI prompt
-        missing_person_data = {
-            "gender": case.gender,
-            "age": case.age,
-            "height": case.height,
-            "weight": case.weight,
-            "hair_color": case.hair_color,
-            "clothing_description": case.clothing_description,
-            "distinguishing_marks": case.distinguishing_marks,
-        }
-
-        # Parse form values for the video analysis request
-        try:
-            start_date = datetime.fromisoformat(start_date_str) if start_date_str else case.last_seen_date
-            end_date = datetime.fromisoformat(end_date_str) if end_date_str else datetime.now()
-        except ValueError:
-            # Fallback to case date if parsing fails
-            start_date = case.last_seen_date
-            end_date = datetime.now()
+        missing_person_data = build_missing_person_data(case)
 
         # Create the video analysis request with actual form values
-        request = VideoAnalysisRequest(
-            case_id=case_id,
-            start_date=start_date,
-            end_date=end_date,
-            time_range=time_range or "All Day",
-            last_seen_latitude=case.last_seen_location.latitude or 0.0,
-            last_seen_longitude=case.last_seen_location.longitude or 0.0,
-            search_radius_km=search_radius_km or 5.0,
+        request = build_video_analysis_request(
+            case, start_date_str, end_date_str, time_range, search_radius_km, travel_mode
         )
 
         logger.info(f"Starting video analysis for case {case_id}")
@@ -1370,8 +1476,16 @@ async def handle_analyze_video(
 
             return results, analysis_stats
 
-        # Use run.io_bound to execute the blocking BigQuery operation
-        results, analysis_stats = await run.io_bound(run_video_analysis)
+        if analysis_scheduler is not None:
+            # Queue behind the other analyses by case priority, within the shared quota
+            cost = await run.io_bound(analysis_scheduler.analysis_cost, video_analysis_service, request)
+            future = analysis_scheduler.submit(
+                case.id, case.priority, case.last_seen_date, run_video_analysis, cost=cost
+            )
+            results, analysis_stats = await asyncio.wrap_future(future)
+        else:
+            # Use run.io_bound to execute the blocking BigQuery operation
+            results, analysis_stats = await run.io_bound(run_video_analysis)
 
         logger.info(f"Video analysis completed with {len(results)} results")
 
@@ -1459,6 +1573,114 @@ async def handle_analyze_video(
             ui.notify(f"❌ Analysis failed: {str(e)}", type="negative")
 
 
+async def handle_progressive_video_analysis(
+    case_id: str,
+    video_analysis_service: VideoAnalysisService,
+    case: MissingPersonCase,
+    results_container,
+    start_date_str: str,
+    end_date_str: str,
+    time_range: str,
+    search_radius_km: float,
+    gcs_service: GCSService,
+    travel_mode: str = None,
+    start_ring: int = 0,
+    previous_results: list = None,
+    previous_stats: dict = None,
+    analysis_scheduler: AnalysisScheduler = None,
+):
+    """Handle a nearest-first video analysis that stops at the first confident match"""
+    request = build_video_analysis_request(
+        case, start_date_str, end_date_str, time_range, search_radius_km, travel_mode
+    )
+    missing_person_data = build_missing_person_data(case)
+
+    results = list(previous_results or [])
+    analysis_stats = dict(previous_stats or {'total_analyzed': 0, 'matches_found': 0, 'no_person_found': 0, 'errors': 0})
+    last_ring = None
+
+    results_container.clear()
+    with results_container:
+        with ui.column().classes("w-full items-center justify-center py-8"):
+            ui.spinner(size="xl").classes("text-cyan-400 mb-4")
+            ui.label("Nearest-First Video Intelligence in Progress").classes("text-gray-300 text-lg font-medium")
+            progress_status = ui.label("Resolving the nearest footage...").classes("text-gray-400 text-sm mt-2")
+
+    try:
+        # Each ring queues behind the other analyses by case priority, within the shared quota
+        rings = video_analysis_service.analyze_videos_progressive(
+            request,
+            missing_person_data,
+            start_ring=start_ring,
+            run_ring=analysis_scheduler.ring_runner(case) if analysis_scheduler is not None else None,
+        )
+
+        # Pull one ring at a time so progress is shown as each ring completes
+        while True:
+            step = await run.io_bound(next, rings, None)
+            if step is None:
+                break
+
+            last_ring, ring_results, ring_stats = step
+            results.extend(ring_results)
+            for key in ('total_analyzed', 'matches_found', 'no_person_found', 'errors'):
+                analysis_stats[key] = analysis_stats.get(key, 0) + ring_stats.get(key, 0)
+
+            progress_status.text = (
+                f"Ring {last_ring.index + 1} of {last_ring.total_rings}: "
+                f"{analysis_stats['total_analyzed']} videos analyzed, {len(results)} matches"
+            )
+
+    except Exception as e:
+        logger.error(f"Progressive video analysis failed: {e}")
+        ui.notify(f"❌ Analysis failed: {str(e)}", type="negative")
+
+    results.sort(key=lambda x: x.confidence_score, reverse=True)
+
+    results_container.clear()
+    with results_container:
+        create_analysis_stats_section(analysis_stats)
+
+        if last_ring is not None and not last_ring.is_last:
+            with ui.row().classes("w-full items-center justify-center gap-4 mt-4"):
+                ui.label(
+                    f"Stopped after ring {last_ring.index + 1} of {last_ring.total_rings} "
+                    f"(within {last_ring.max_distance_km:g} km and {last_ring.max_hours:g} h of the last sighting)"
+                ).classes("text-gray-400 text-sm")
+                ui.button(
+                    "Continue Outward",
+                    on_click=lambda: handle_progressive_video_analysis(
+                        case_id,
+                        video_analysis_service,
+                        case,
+                        results_container,
+                        start_date_str,
+                        end_date_str,
+                        time_range,
+                        search_radius_km,
+                        gcs_service,
+                        travel_mode,
+                        last_ring.index + 1,
+                        results,
+                        analysis_stats,
+                        analysis_scheduler,
+                    ),
+                ).classes(
+                    "bg-transparent text-cyan-300 px-2 py-1 rounded border border-cyan-500/60 hover:bg-cyan-200 hover:text-cyan-900 hover:border-cyan-200 transition-all duration-300 font-light text-xs tracking-wide"
+                )
+
+        if results:
+            ui.separator().classes("my-4 bg-gray-600")
+            create_analysis_results_table(
+                results, video_analysis_service, case_id, results_container, gcs_service
+            )
+
+    ui.notify(
+        f"Nearest-first analysis: {len(results)} matches out of {analysis_stats['total_analyzed']} videos analyzed",
+        type="positive" if results else "info",
+    )
+
+
 def handle_view_sighting(sighting: dict):
     """Handle viewing sighting details"""
     ui.notify(f"View sighting at {sighting['location']}", type="info")
@@ -1537,6 +1759,28 @@ def create_analysis_stats_section(analysis_stats: dict):
                         with ui.element("div").classes(f"{color_class} h-2 rounded-full").style(f"width: {max(match_rate, 2)}%"):  # Minimum 2% width for visibility
                             pass
 
+        cached = analysis_stats.get('cached', 0)
+        if cached:
+            ui.label(
+                f"{cached} of {total_analyzed} verdicts reused from earlier analyses "
+                f"({analysis_stats.get('prompt_version', 'unknown prompt')})"
+            ).classes("text-gray-400 text-xs mt-2")
+
+        # Per-route breakdown when videos were sent to more than one model
+        routes = analysis_stats.get('routes', {})
+        if len(routes) > 1:
+            with ui.column().classes("w-full mt-4 gap-1"):
+                ui.label("Model Routes").classes("text-gray-300 text-sm font-medium")
+                for route_name, route_stats in sorted(routes.items()):
+                    jobs = max(route_stats.get('jobs', 0), 1)
+                    ui.label(
+                        f"{route_name}: {route_stats.get('videos', 0)} videos, "
+                        f"{route_stats.get('matches', 0)} matches, "
+                        f"{route_stats.get('latency_seconds', 0.0) / jobs:.1f}s per job, "
+                        f"{route_stats.get('tokens', 0):,} tokens, "
+                        f"${route_stats.get('estimated_cost', 0.0):.4f}"
+                    ).classes("text-gray-400 text-xs")
+
 
 def create_analysis_results_table(
     results: list[VideoAnalysisResult],
@@ -1546,13 +1790,37 @@ def create_analysis_results_table(
     gcs_service: GCSService,
 ):
     """Create and display visual intelligence insights table"""
+    # One row per track: the same person on adjacent cameras or consecutive clips
+    tracks = build_tracks(results)
+    track_sizes = {track.id: len(track.detections) for track in tracks}
+    results = [track_result(track) for track in tracks]
+    detection_count = sum(track_sizes.values())
+
+    gcs_service.prefetch_metadata_in_background([result.video_url for result in results])
+
     with container:
         with ui.column().classes("w-full space-y-4"):
             # Results summary (no duplicate header since it's already in the parent container)
-            with ui.row().classes("items-center mb-4"):
-                ui.label(f"{len(results)} matches found").classes(
-                    "text-gray-400 text-sm"
-                )
+            with ui.row().classes("w-full items-center justify-between mb-4"):
+                ui.label(
+                    f"{detection_count} matches found"
+                    + (f" in {len(tracks)} tracks" if len(tracks) < detection_count else "")
+                ).classes("text-gray-400 text-sm")
+
+                # Bulk evidence: add every result above a confidence threshold
+                with ui.row().classes("items-center gap-2"):
+                    ui.label("Add all above").classes("text-gray-400 text-xs")
+                    min_confidence_input = ui.number("", value=80, min=0, max=100, suffix="%").classes(
+                        "w-24 bg-gray-700/50 text-white border-gray-500 rounded-lg text-sm"
+                    ).props("outlined dense")
+                    ui.button(
+                        "Add All",
+                        on_click=lambda: handle_add_evidence_batch(
+                            results, min_confidence_input.value, case_id, video_analysis_service
+                        ),
+                    ).classes(
+                        "bg-transparent text-green-300 px-2 py-1 rounded border border-green-500/60 hover:bg-green-200 hover:text-green-900 hover:border-green-200 transition-all duration-300 font-light text-xs tracking-wide"
+                    )
 
             # Results table
             with ui.element("div").classes(
@@ -1589,9 +1857,14 @@ def create_analysis_results_table(
 
                     with ui.element("div").classes(row_classes):
                         # Date & Time
-                        ui.label(result.timestamp.strftime("%m/%d %H:%M")).classes(
-                            "text-gray-100 text-sm"
-                        )
+                        with ui.column().classes("gap-0"):
+                            ui.label(result.timestamp.strftime("%m/%d %H:%M")).classes(
+                                "text-gray-100 text-sm"
+                            )
+                            if track_sizes.get(result.id, 1) > 1:
+                                ui.label(f"{track_sizes[result.id]} clips").classes(
+                                    "text-cyan-400 text-xs"
+                                )
 
                         # Location (truncated address)
                         address_short = (
@@ -1609,14 +1882,16 @@ def create_analysis_results_table(
                                 "text-gray-100 text-sm"
                             )
 
-                        # Video link
-                        with ui.element("div").classes("flex justify-center"):
-                            ui.button(
-                                "View",
-                                on_click=lambda r=result: handle_view_video(
-                                    r.video_url, gcs_service
-                                ),
-                            ).classes(
+                        # Video link, with the keyframe at the detection
+                        with ui.element("div").classes("flex flex-col items-center gap-2"):
+                            view_video = partial(handle_view_video, result.video_url, gcs_service, result.ai_description)
+                            if result.video_url.startswith("gs://"):
+                                create_video_thumbnail(
+                                    result.video_url,
+                                    detection_offset_seconds(result.ai_description),
+                                    on_click=view_video,
+                                )
+                            ui.button("View", on_click=view_video).classes(
                                 "bg-transparent text-blue-300 px-2 py-1 rounded border border-blue-500/60 hover:bg-blue-200 hover:text-blue-900 hover:border-blue-200 transition-all duration-300 font-light text-xs tracking-wide"
                             )
 
@@ -1656,10 +1931,15 @@ def create_analysis_results_table(
                             )
 
 
-def handle_view_video(video_url: str, gcs_service: GCSService):
-    """Handle downloading video from analysis result"""
+def handle_view_video(video_url: str, gcs_service: GCSService, description: str = None):
+    """Handle playing the video of an analysis result from the detection"""
     if video_url.startswith('gs://'):
-        gcs_service.download_video_file(video_url)
+        open_video_player(
+            video_url,
+            "Analysis Result",
+            detection_offset_seconds(description),
+            on_download=lambda: gcs_service.download_video_file(video_url),
+        )
     else:
         ui.notify(f"Opening video: {video_url}", type="info")
 
@@ -1678,6 +1958,29 @@ def handle_add_evidence(
         ui.notify(f"❌ Error adding evidence: {str(e)}", type="negative")
 
 
+def handle_add_evidence_batch(
+    results: list[VideoAnalysisResult],
+    min_confidence_pct: float,
+    case_id: str,
+    video_analysis_service: VideoAnalysisService,
+):
+    """Handle adding every analysis result above a confidence threshold to case evidence"""
+    min_confidence = (min_confidence_pct or 0) / 100
+    selected = [result for result in results if result.confidence_score >= min_confidence]
+    if not selected:
+        ui.notify(f"No results with confidence of at least {min_confidence:.0%}", type="warning")
+        return
+
+    try:
+        added = video_analysis_service.add_to_evidence_batch(selected, case_id)
+        if added:
+            ui.notify(f"✅ {added} results added to case evidence", type="positive")
+        else:
+            ui.notify("No new evidence added, results may already be linked to the case", type="info")
+    except Exception as e:
+        ui.notify(f"❌ Error adding evidence: {str(e)}", type="negative")
+
+
 def handle_edit_case(case_id: str, case: MissingPersonCase, data_service: DataService):
     """Handle editing the case"""
     open_edit_case_modal(case_id, case, data_service)
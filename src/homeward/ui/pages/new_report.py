@@ -6,14 +6,17 @@ from nicegui import ui
 from homeward.config import AppConfig
 from homeward.models.case import CasePriority, CaseStatus, Location, MissingPersonCase
 from homeward.services.data_service import DataService
-from homeward.services.geocoding_service import GeocodingService
+from homeward.services.geocoding_service import BackgroundGeocoder, GeocodingService
 from homeward.ui.components.footer import create_footer
 from homeward.ui.components.missing_person_form import create_missing_person_form
 from homeward.utils.form_utils import sanitize_form_data
 
 
 def create_new_report_page(
-    data_service: DataService, config: AppConfig, on_back_to_dashboard: callable
+    data_service: DataService,
+    config: AppConfig,
+    on_back_to_dashboard: callable,
+    background_geocoder: BackgroundGeocoder = None,
 ):
     """Create the new missing person report page"""
 
@@ -43,7 +46,7 @@ def create_new_report_page(
             with ui.column().classes("w-full"):
                 create_missing_person_form(
                     on_submit=lambda form_data, reset_loading_callback=None: handle_form_submission(
-                        form_data, data_service, config, on_back_to_dashboard, reset_loading_callback
+                        form_data, data_service, config, on_back_to_dashboard, reset_loading_callback, background_geocoder
                     ),
                     on_cancel=on_back_to_dashboard,
                 )
@@ -54,7 +57,12 @@ def create_new_report_page(
 
 
 def handle_form_submission(
-    form_data: dict, data_service: DataService, config: AppConfig, _on_success: callable = None, reset_loading_callback: callable = None
+    form_data: dict,
+    data_service: DataService,
+    config: AppConfig,
+    _on_success: callable = None,
+    reset_loading_callback: callable = None,
+    background_geocoder: BackgroundGeocoder = None,
 ):
     """Handle the form submission and create new case"""
     try:
@@ -75,25 +83,11 @@ def handle_form_submission(
             postal_code=sanitized_data.get("postal_code"),
         )
 
-        # Initialize geocoding service and try to get coordinates
-        geocoding_service = GeocodingService(config)
+        # Geocode in the background while the case is built and written
+        geocoder, lookup = None, None
         try:
-            geocoding_result = geocoding_service.geocode_address(
-                address=location.address,
-                city=location.city,
-                country=location.country,
-                postal_code=location.postal_code
-            )
-
-            if geocoding_result:
-                location.update_coordinates(
-                    geocoding_result.latitude,
-                    geocoding_result.longitude
-                )
-                ui.notify("Address geocoded successfully", type="info")
-            else:
-                ui.notify("Could not geocode address - location will be saved without coordinates", type="warning")
-
+            geocoder = background_geocoder or BackgroundGeocoder(GeocodingService(config))
+            lookup = geocoder.start(location)
         except Exception as e:
             ui.notify(f"Geocoding failed: {str(e)} - continuing without coordinates", type="warning")
 
@@ -173,11 +167,23 @@ def handle_form_submission(
             priority=priority,
         )
 
+        # Coordinates known in time are saved with the case, later ones are patched in
+        if lookup is not None:
+            geocoder.apply_if_ready(lookup, location)
+
         # Save case using data service
         case_id = data_service.create_case(case)
         if not case_id:
             raise ValueError("Failed to create case")
 
+        if lookup is not None and not location.has_coordinates():
+            geocoder.save_when_ready(
+                lookup,
+                lambda latitude, longitude: data_service.update_case_coordinates(case_id, latitude, longitude),
+                f"case {case_id}",
+            )
+            ui.notify("Locating the address in the background", type="info")
+
         ui.notify("Missing person report submitted successfully!", type="positive")
 
         # Reset loading state on success
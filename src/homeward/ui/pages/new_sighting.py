@@ -3,15 +3,19 @@ import uuid
 from nicegui import ui
 
 from homeward.config import AppConfig
+from homeward.models.case import Location
 from homeward.models.form_mappers import SightingFormMapper, SightingFormValidator, SightingFormData
 from homeward.services.data_service import DataService
-from homeward.services.geocoding_service import GeocodingService
+from homeward.services.geocoding_service import BackgroundGeocoder, GeocodingService
 from homeward.ui.components.footer import create_footer
 from homeward.utils.form_utils import sanitize_form_data
 
 
 def create_new_sighting_page(
-    data_service: DataService, config: AppConfig, on_back_to_dashboard: callable
+    data_service: DataService,
+    config: AppConfig,
+    on_back_to_dashboard: callable,
+    background_geocoder: BackgroundGeocoder = None,
 ):
     """Create the new sighting registration page"""
 
@@ -518,7 +522,8 @@ def create_new_sighting_page(
                             submit_button = ui.button(
                                 "Submit Sighting Report",
                                 on_click=lambda: handle_sighting_submit(
-                                    form_data, data_service, config, is_loading, submit_button, cancel_button
+                                    form_data, data_service, config, is_loading, submit_button, cancel_button,
+                                    background_geocoder,
                                 ),
                             ).classes(
                                 "bg-transparent text-green-300 px-8 py-4 rounded-full border-2 border-green-400/80 hover:bg-green-200 hover:text-green-900 hover:border-green-200 transition-all duration-300 font-light text-sm tracking-wide ring-2 ring-green-400/20 hover:ring-green-200/40 hover:ring-4"
@@ -529,7 +534,7 @@ def create_new_sighting_page(
             create_footer(config.version)
 
 
-def handle_sighting_submit(form_data: dict, data_service: DataService, config: AppConfig, is_loading: dict, submit_button, cancel_button):
+def handle_sighting_submit(form_data: dict, data_service: DataService, config: AppConfig, is_loading: dict, submit_button, cancel_button, background_geocoder: BackgroundGeocoder = None):
     """Handle sighting submission with loading state management"""
 
     def reset_loading_state():
@@ -554,7 +559,7 @@ def handle_sighting_submit(form_data: dict, data_service: DataService, config: A
     # Use a timer to allow the UI to update the loading state first
     def handle_async_submission():
         try:
-            handle_form_submission(form_data, data_service, config, None, reset_loading_state)
+            handle_form_submission(form_data, data_service, config, None, reset_loading_state, background_geocoder)
         except Exception as e:
             ui.notify(f"An unexpected error occurred during submission: {str(e)}", type="negative")
             reset_loading_state()
@@ -562,7 +567,7 @@ def handle_sighting_submit(form_data: dict, data_service: DataService, config: A
     ui.timer(0.1, handle_async_submission, once=True)
 
 
-def handle_form_submission(form_data: dict, data_service: DataService, config: AppConfig, on_success: callable = None, reset_loading_callback: callable = None):
+def handle_form_submission(form_data: dict, data_service: DataService, config: AppConfig, on_success: callable = None, reset_loading_callback: callable = None, background_geocoder: BackgroundGeocoder = None):
     """Handle sighting report form submission and create new sighting"""
     try:
         # Collect form data from the form_data dictionary
@@ -614,6 +619,21 @@ def handle_form_submission(form_data: dict, data_service: DataService, config: A
                 reset_loading_callback()
             return
 
+        # Geocode in the background while the sighting is built and written
+        geocoder, lookup = None, None
+        try:
+            geocoder = background_geocoder or BackgroundGeocoder(GeocodingService(config))
+            lookup = geocoder.start(
+                Location(
+                    address=sighting_data.get("sighting_address", ""),
+                    city=sighting_data.get("sighting_city", ""),
+                    country=sighting_data.get("sighting_country", "USA"),
+                    postal_code=sighting_data.get("sighting_postal"),
+                )
+            )
+        except Exception as e:
+            ui.notify(f"Geocoding failed: {str(e)} - continuing without coordinates", type="warning")
+
         # Create form data object
         form_data_obj = SightingFormData(
             sighting_date=sighting_data.get("sighting_date", ""),
@@ -652,27 +672,9 @@ def handle_form_submission(form_data: dict, data_service: DataService, config: A
         # Convert form data to sighting object using mapper
         sighting = SightingFormMapper.form_to_sighting(form_data_obj, sighting_id)
 
-        # Initialize geocoding service and try to get coordinates
-        geocoding_service = GeocodingService(config)
-        try:
-            geocoding_result = geocoding_service.geocode_address(
-                address=sighting.sighted_location.address,
-                city=sighting.sighted_location.city,
-                country=sighting.sighted_location.country,
-                postal_code=sighting.sighted_location.postal_code
-            )
-
-            if geocoding_result:
-                sighting.sighted_location.update_coordinates(
-                    geocoding_result.latitude,
-                    geocoding_result.longitude
-                )
-                ui.notify("Address geocoded successfully", type="info")
-            else:
-                ui.notify("Could not geocode address - sighting will be saved without coordinates", type="warning")
-
-        except Exception as e:
-            ui.notify(f"Geocoding failed: {str(e)} - continuing without coordinates", type="warning")
+        # Coordinates known in time are saved with the sighting, later ones are patched in
+        if lookup is not None:
+            geocoder.apply_if_ready(lookup, sighting.sighted_location)
 
         # Sighting object already created above using SightingFormMapper
 
@@ -684,6 +686,14 @@ def handle_form_submission(form_data: dict, data_service: DataService, config: A
         if not result_sighting_id:
             raise ValueError("Failed to create sighting")
 
+        if lookup is not None and not sighting.sighted_location.has_coordinates():
+            geocoder.save_when_ready(
+                lookup,
+                lambda latitude, longitude: data_service.update_sighting_coordinates(result_sighting_id, latitude, longitude),
+                f"sighting {result_sighting_id}",
+            )
+            ui.notify("Locating the address in the background", type="info")
+
         ui.notify("✅ Sighting report submitted successfully!", type="positive")
 
         # Reset loading state on success
@@ -0,0 +1,278 @@
+"""In-memory spatio-temporal index of surveillance videos"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import datetime, time
+from typing import Optional
+
+from homeward.models.video_analysis import TravelMode, VideoAnalysisRing, VideoMetadata
+from homeward.utils.geo_utils import haversine_km, reachable_radius_km
+from homeward.utils.video_utils import matches_time_range, parse_video_filename
+
+# Roughly 5.5 km of latitude per cell, the order of a typical search radius
+DEFAULT_CELL_SIZE_DEG = 0.05
+
+KM_PER_DEGREE_LATITUDE = 111.32
+
+
+class CameraIndex:
+    """
+    Grid of camera locations crossed with a sorted time index.
+
+    Videos are bucketed into fixed-size latitude/longitude cells and kept
+    sorted by timestamp inside each cell, so a request only scans the cells
+    overlapping its search radius and the time slice of its date window.
+    """
+
+    def __init__(
+        self,
+        videos: Iterable[VideoMetadata] = (),
+        cell_size_deg: float = DEFAULT_CELL_SIZE_DEG,
+    ):
+        self.cell_size_deg = cell_size_deg
+        # Cell -> (sorted timestamps, videos in the same order)
+        self._cells: dict[tuple[int, int], tuple[list[datetime], list[VideoMetadata]]] = {}
+        self._uris = set()
+
+        for video in videos:
+            self.add(video)
+
+    @classmethod
+    def from_uris(
+        cls, uris: Iterable[str], cell_size_deg: float = DEFAULT_CELL_SIZE_DEG
+    ) -> "CameraIndex":
+        """Build an index from video URIs, skipping names without encoded metadata"""
+        return cls(
+            (metadata for metadata in map(parse_video_filename, uris) if metadata),
+            cell_size_deg,
+        )
+
+    def __len__(self) -> int:
+        return len(self._uris)
+
+    def add(self, video: VideoMetadata) -> None:
+        """Add a video to the index, ignoring URIs that are already indexed"""
+        if video.uri in self._uris:
+            return
+        self._uris.add(video.uri)
+
+        timestamps, videos = self._cells.setdefault(self._cell(video.latitude, video.longitude), ([], []))
+        position = bisect_right(timestamps, video.timestamp)
+        timestamps.insert(position, video.timestamp)
+        videos.insert(position, video)
+
+    def query(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        time_range: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        search_radius_km: Optional[float] = None,
+        last_seen_date: Optional[datetime] = None,
+        travel_mode: Optional[TravelMode] = None,
+    ) -> list[VideoMetadata]:
+        """
+        Find the videos matching the analysis filters.
+
+        Uses the same semantics as the object-table query: whole days from
+        start_date to end_date, a named time range of the day, and a radius
+        around a point. With last_seen_date and travel_mode, the radius is
+        the reachability cone at each video's timestamp, capped by
+        search_radius_km. Missing filters are not applied.
+
+        Returns:
+            Matching videos sorted by timestamp
+        """
+        window_start = datetime.combine(start_date.date(), time.min) if start_date and end_date else None
+        window_end = datetime.combine(end_date.date(), time.max) if start_date and end_date else None
+        spatial = bool(latitude and longitude and search_radius_km)
+        cone = spatial and last_seen_date is not None and travel_mode is not None
+        if cone and last_seen_date.tzinfo:
+            # Filename timestamps are naive, like the DATETIME values the SQL filters compare
+            last_seen_date = last_seen_date.replace(tzinfo=None)
+
+        cell_radius_km = search_radius_km
+        if cone and window_start:
+            # Widest point of the cone inside the date window bounds the cells to scan
+            widest_seconds = max(
+                abs((window_start - last_seen_date).total_seconds()),
+                abs((window_end - last_seen_date).total_seconds()),
+            )
+            cell_radius_km = reachable_radius_km(widest_seconds, travel_mode, search_radius_km)
+
+        matches = []
+        for cell in self._candidate_cells(latitude, longitude, cell_radius_km if spatial else None):
+            timestamps, videos = self._cells[cell]
+            low = bisect_left(timestamps, window_start) if window_start else 0
+            high = bisect_right(timestamps, window_end) if window_end else len(videos)
+
+            for video in videos[low:high]:
+                if not matches_time_range(video.timestamp, time_range):
+                    continue
+                if spatial:
+                    radius_km = search_radius_km
+                    if cone:
+                        elapsed_seconds = (video.timestamp - last_seen_date).total_seconds()
+                        radius_km = reachable_radius_km(elapsed_seconds, travel_mode, search_radius_km)
+                    if haversine_km(video.latitude, video.longitude, latitude, longitude) > radius_km:
+                        continue
+                matches.append(video)
+
+        matches.sort(key=lambda video: (video.timestamp, video.uri))
+        return matches
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Get the grid cell containing a point"""
+        return (
+            math.floor(latitude / self.cell_size_deg),
+            math.floor(longitude / self.cell_size_deg),
+        )
+
+    def _candidate_cells(
+        self, latitude: Optional[float], longitude: Optional[float], search_radius_km: Optional[float]
+    ) -> Iterable[tuple[int, int]]:
+        """Get the populated cells overlapping the bounding box of a search radius"""
+        if not search_radius_km:
+            return list(self._cells)
+
+        lat_delta = search_radius_km / KM_PER_DEGREE_LATITUDE
+        # Longitude degrees shrink towards the poles; clamp to avoid dividing by ~0
+        lon_delta = min(
+            180.0,
+            search_radius_km / (KM_PER_DEGREE_LATITUDE * max(math.cos(math.radians(latitude)), 0.01)),
+        )
+        min_cell = self._cell(latitude - lat_delta, longitude - lon_delta)
+        max_cell = self._cell(latitude + lat_delta, longitude + lon_delta)
+
+        box_size = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if box_size > len(self._cells):
+            # Large radius over a sparse grid: filtering populated cells is cheaper
+            return [
+                cell for cell in self._cells
+                if min_cell[0] <= cell[0] <= max_cell[0] and min_cell[1] <= cell[1] <= max_cell[1]
+            ]
+
+        return [
+            (row, column)
+            for row in range(min_cell[0], max_cell[0] + 1)
+            for column in range(min_cell[1], max_cell[1] + 1)
+            if (row, column) in self._cells
+        ]
+
+
+def partition_rings(
+    videos: Iterable[VideoMetadata],
+    latitude: float,
+    longitude: float,
+    reference_time: datetime,
+    ring_width_km: float,
+    ring_hours: float,
+) -> list[VideoAnalysisRing]:
+    """
+    Split videos into expanding space-time rings around the last sighting.
+
+    Ring k holds the videos within k+1 ring widths of the location and k+1
+    ring durations of the reference time that are not in an earlier ring.
+    Empty rings are skipped, and each ring is ordered nearest in time first.
+
+    Args:
+        videos: Candidate videos
+        latitude: Latitude of the last sighting
+        longitude: Longitude of the last sighting
+        reference_time: Time of the last sighting
+        ring_width_km: Distance added by each ring
+        ring_hours: Time offset added by each ring
+
+    Returns:
+        Non-empty rings, innermost first
+    """
+    if reference_time.tzinfo:
+        reference_time = reference_time.replace(tzinfo=None)
+
+    by_ring: dict[int, list[tuple[float, VideoMetadata]]] = {}
+    for video in videos:
+        distance_km = haversine_km(video.latitude, video.longitude, latitude, longitude)
+        hours = abs((video.timestamp - reference_time).total_seconds()) / 3600
+        ring = max(
+            math.ceil(distance_km / ring_width_km) - 1,
+            math.ceil(hours / ring_hours) - 1,
+            0,
+        )
+        by_ring.setdefault(ring, []).append((hours, video))
+
+    ring_numbers = sorted(by_ring)
+    return [
+        VideoAnalysisRing(
+            index=position,
+            total_rings=len(ring_numbers),
+            max_distance_km=(ring + 1) * ring_width_km,
+            max_hours=(ring + 1) * ring_hours,
+            uris=[video.uri for _, video in sorted(by_ring[ring], key=lambda item: (item[0], item[1].uri))],
+        )
+        for position, ring in enumerate(ring_numbers)
+    ]
+
+
+def shard_videos(
+    videos: Iterable[VideoMetadata],
+    max_shard_size: int,
+    shard_by: str = "camera",
+    time_bucket_hours: float = 1.0,
+) -> list[list[str]]:
+    """
+    Split videos into balanced shards that can be analyzed concurrently.
+
+    Videos are grouped by camera or by time bucket so each shard reads
+    related footage, then the groups are packed largest first into the
+    least loaded shard. Groups larger than a shard are split.
+
+    Args:
+        videos: Candidate videos
+        max_shard_size: Maximum number of videos per shard
+        shard_by: "camera" or "time"
+        time_bucket_hours: Width of the time buckets when sharding by time
+
+    Returns:
+        Shards of video URIs, each ordered by timestamp
+    """
+    if max_shard_size < 1:
+        raise ValueError("max_shard_size must be at least 1")
+    if shard_by not in ("camera", "time"):
+        raise ValueError(f"Unknown shard key: {shard_by}")
+
+    groups: dict[object, list[VideoMetadata]] = {}
+    for video in videos:
+        if shard_by == "camera":
+            key = video.camera_id
+        else:
+            key = math.floor(video.timestamp.timestamp() / (time_bucket_hours * 3600))
+        groups.setdefault(key, []).append(video)
+
+    chunks = []
+    for key in sorted(groups, key=str):
+        group = sorted(groups[key], key=lambda video: (video.timestamp, video.uri))
+        chunks.extend(group[i:i + max_shard_size] for i in range(0, len(group), max_shard_size))
+
+    total = sum(len(chunk) for chunk in chunks)
+    if not total:
+        return []
+
+    shards: list[list[VideoMetadata]] = [[] for _ in range(math.ceil(total / max_shard_size))]
+    for chunk in sorted(chunks, key=len, reverse=True):
+        target = min(
+            (shard for shard in shards if len(shard) + len(chunk) <= max_shard_size),
+            key=len,
+            default=None,
+        )
+        if target is None:
+            target = []
+            shards.append(target)
+        target.extend(chunk)
+
+    return [
+        [video.uri for video in sorted(shard, key=lambda video: (video.timestamp, video.uri))]
+        for shard in shards
+        if shard
+    ]
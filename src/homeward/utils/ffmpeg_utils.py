@@ -0,0 +1,239 @@
+"""Utilities for transcoding surveillance videos into low-resolution proxies with ffmpeg"""
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from homeward.utils.video_utils import parse_video_filename
+
+
+@dataclass(frozen=True)
+class ProxyTier:
+    """Target resolution, frame rate and quality of a proxy video"""
+
+    name: str
+    height: int
+    fps: float
+    crf: int = 28
+
+
+# Gemini samples video at 1 fps by default, so higher proxy frame rates add bytes, not signal
+PROXY_TIERS = {
+    "720p": ProxyTier("720p", 720, 5),
+    "480p": ProxyTier("480p", 480, 2),
+    "360p": ProxyTier("360p", 360, 1),
+}
+
+DEFAULT_PROXY_TIER = "480p"
+
+
+def proxy_resolution(resolution: str, tier: ProxyTier) -> str:
+    """
+    Compute the resolution of a proxy, keeping the source aspect ratio.
+
+    Sources smaller than the tier are not upscaled.
+
+    Args:
+        resolution: Source resolution as WIDTHxHEIGHT
+        tier: Proxy tier
+
+    Returns:
+        Proxy resolution as WIDTHxHEIGHT, with an even width as required by libx264
+    """
+    width, height = (int(value) for value in resolution.lower().split("x"))
+    if height <= tier.height:
+        return f"{width}x{height}"
+
+    scaled_width = round(width * tier.height / height / 2) * 2
+    return f"{scaled_width}x{tier.height}"
+
+
+def proxy_filename(filename: str, tier: ProxyTier) -> str:
+    """
+    Build the proxy filename, keeping the metadata naming convention.
+
+    Only the RESOLUTION field changes, so the proxy is parsed exactly like
+    the original: CameraID_YYYYMMDDHHMMSS_LATITUDE_LONGITUDE_CAMERATYPE_RESOLUTION.mp4
+
+    Args:
+        filename: Original video filename
+
+    Returns:
+        Proxy filename
+
+    Raises:
+        ValueError: If the filename does not follow the naming convention
+    """
+    metadata = parse_video_filename(filename)
+    if metadata is None or not metadata.resolution:
+        raise ValueError(f"Video filename does not follow the naming convention: {filename}")
+
+    parts = Path(filename).stem.split("_")
+    parts[5] = proxy_resolution(metadata.resolution, tier)
+    return "_".join(parts) + ".mp4"
+
+
+def build_proxy_command(
+    source_path: str, output_path: str, tier: ProxyTier, ffmpeg_binary: str = "ffmpeg"
+) -> list[str]:
+    """Build the ffmpeg command that downscales, reduces the frame rate and drops audio"""
+    return [
+        ffmpeg_binary,
+        "-hide_banner",
+        "-loglevel", "error",
+        "-y",
+        "-i", source_path,
+        # Never upscale; -2 keeps the width even for libx264
+        "-vf", f"scale=-2:'min({tier.height},ih)',fps={tier.fps}",
+        "-c:v", "libx264",
+        "-preset", "veryfast",
+        "-crf", str(tier.crf),
+        "-an",
+        "-movflags", "+faststart",
+        output_path,
+    ]
+
+
+def transcode_proxy(
+    source_path: str, output_path: str, tier: ProxyTier, ffmpeg_binary: str = "ffmpeg"
+) -> str:
+    """
+    Transcode a video into a proxy.
+
+    Runs in a separate process when called from a process pool, so it only
+    takes picklable arguments.
+
+    Args:
+        source_path: Local path of the original video
+        output_path: Local path of the proxy to write
+        tier: Proxy tier
+        ffmpeg_binary: ffmpeg executable
+
+    Returns:
+        output_path
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    completed = subprocess.run(
+        build_proxy_command(source_path, output_path, tier, ffmpeg_binary),
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed for {source_path}: {completed.stderr.strip()}")
+    return output_path
+
+
+def build_thumbnail_command(
+    source: str, output_path: str, offset_seconds: float = 0, width: int = 320, ffmpeg_binary: str = "ffmpeg"
+) -> list[str]:
+    """
+    Build the ffmpeg command that writes one JPEG frame at an offset.
+
+    The seek is placed before the input, so ffmpeg jumps to the nearest
+    keyframe with range requests instead of reading the video from the start.
+    """
+    return [
+        ffmpeg_binary,
+        "-hide_banner",
+        "-loglevel", "error",
+        "-y",
+        "-ss", f"{max(0.0, offset_seconds):g}",
+        "-i", source,
+        "-frames:v", "1",
+        "-vf", f"scale={width}:-2",
+        "-q:v", "4",
+        "-an",
+        output_path,
+    ]
+
+
+def extract_thumbnail(
+    source: str,
+    output_path: str,
+    offset_seconds: float = 0,
+    width: int = 320,
+    ffmpeg_binary: str = "ffmpeg",
+    ffprobe_binary: str = "ffprobe",
+) -> str:
+    """
+    Extract a thumbnail from a local video or a (signed) HTTPS URL.
+
+    Runs in a separate process when called from a process pool, so it only
+    takes picklable arguments. Offsets past the end of the clip are clamped
+    to its last second.
+
+    Returns:
+        output_path
+
+    Raises:
+        RuntimeError: If ffmpeg fails or writes no frame, e.g. when the offset is past the end
+    """
+    if offset_seconds > 0:
+        duration = probe_duration(source, ffprobe_binary)
+        if duration is not None:
+            offset_seconds = min(offset_seconds, max(0.0, duration - 1))
+
+    completed = subprocess.run(
+        build_thumbnail_command(source, output_path, offset_seconds, width, ffmpeg_binary),
+        capture_output=True,
+        text=True,
+    )
+    # The output file may exist empty, e.g. created beforehand as a temporary file
+    if completed.returncode != 0 or not Path(output_path).exists() or Path(output_path).stat().st_size == 0:
+        raise RuntimeError(f"ffmpeg could not extract a thumbnail at {offset_seconds}s: {completed.stderr.strip()}")
+    return output_path
+
+
+def probe_duration(source: str, ffprobe_binary: str = "ffprobe") -> Optional[float]:
+    """
+    Read the duration of a local video or a (signed) HTTPS URL with ffprobe.
+
+    Returns:
+        Duration in seconds, or None if ffprobe cannot read it
+    """
+    completed = subprocess.run(
+        [
+            ffprobe_binary,
+            "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            source,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    try:
+        return float(completed.stdout.strip()) if completed.returncode == 0 else None
+    except ValueError:
+        return None
+
+
+def probe_resolution(source_path: str, ffprobe_binary: str = "ffprobe") -> str:
+    """
+    Read the resolution of the first video stream with ffprobe.
+
+    Returns:
+        Resolution as WIDTHxHEIGHT
+
+    Raises:
+        RuntimeError: If ffprobe fails or the file has no video stream
+    """
+    completed = subprocess.run(
+        [
+            ffprobe_binary,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height",
+            "-of", "csv=s=x:p=0",
+            source_path,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    resolution = completed.stdout.strip()
+    if completed.returncode != 0 or "x" not in resolution:
+        raise RuntimeError(f"ffprobe could not read the resolution of {source_path}: {completed.stderr.strip()}")
+    return resolution
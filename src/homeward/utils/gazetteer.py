@@ -0,0 +1,381 @@
+"""Offline gazetteer of places and postal codes, for geocoding without the Maps API"""
+
+import csv
+import logging
+import math
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from homeward.utils.geo_utils import EARTH_RADIUS_KM, haversine_km
+
+logger = logging.getLogger(__name__)
+
+# GeoNames country metadata, read from the gazetteer directory to resolve country names
+COUNTRY_INFO_FILENAME = "countryInfo.txt"
+# Places sharing a name or postal code are one answer only when they lie this close to their centre
+MAX_PLACE_SPREAD_KM = 40.0
+# Reverse lookups farther than this from any place have no answer
+MAX_REVERSE_DISTANCE_KM = 25.0
+# Shorter postal code prefixes match too many places to mean anything
+MIN_POSTAL_PREFIX_LENGTH = 3
+# Points scanned linearly at the bottom of the KD-tree
+KD_TREE_LEAF_SIZE = 8
+
+
+@dataclass(frozen=True)
+class Place:
+    """A populated place or postal code area"""
+    country_code: str
+    postal_code: str
+    name: str
+    admin_name: str
+    latitude: float
+    longitude: float
+
+    @property
+    def label(self) -> str:
+        """Human readable address, e.g. "90133 Palermo, Sicilia, IT" """
+        locality = f"{self.postal_code} {self.name}".strip()
+        return ", ".join(part for part in (locality, self.admin_name, self.country_code) if part)
+
+
+def normalize_place_name(name: str) -> str:
+    """Fold case, accents and punctuation: "Saint-Jérôme" and "saint jerome" are one key"""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    return " ".join("".join(char if char.isalnum() else " " for char in text).split())
+
+
+def normalize_postal_code(postal_code: str) -> str:
+    """Uppercase alphanumerics only: "m5v 3a8" and "M5V3A8" are one key"""
+    return "".join(char for char in (postal_code or "").upper() if char.isalnum())
+
+
+class PrefixIndex:
+    """
+    Keys searched by prefix, mapping each to a list of place positions
+
+    The keys are kept sorted in a flat list and searched by bisection, so
+    exact, prefix and longest-prefix lookups walk the same paths as a trie
+    without a dictionary per character, which would take gigabytes for a
+    worldwide dataset.
+    """
+
+    def __init__(self, entries: dict[str, list[int]]):
+        self._keys = sorted(entries)
+        self._values = [entries[key] for key in self._keys]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, key: str) -> list[int]:
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._values[position]
+        return []
+
+    def with_prefix(self, prefix: str) -> Iterator[tuple[str, list[int]]]:
+        """Keys starting with prefix and their values, in key order"""
+        position = bisect_left(self._keys, prefix)
+        while position < len(self._keys) and self._keys[position].startswith(prefix):
+            yield self._keys[position], self._values[position]
+            position += 1
+
+    def longest_prefix_of(self, key: str, min_length: int = 1) -> Optional[str]:
+        """The longest indexed key that key starts with, e.g. the area "M5V" of the code "M5V3A8" """
+        for length in range(len(key), min_length - 1, -1):
+            if self.get(key[:length]):
+                return key[:length]
+        return None
+
+
+def _unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+class KDTree:
+    """
+    Nearest neighbour search over latitude/longitude points
+
+    Points are stored as unit vectors, so straight-line distances order
+    them like great-circle distances, with no special case at the poles or
+    the antimeridian. The tree is implicit: each range of the point list is
+    split at its median, cycling through the three axes.
+    """
+
+    def __init__(self, points: Iterable[tuple[float, float]]):
+        vectors = [_unit_vector(latitude, longitude) for latitude, longitude in points]
+        self._order = list(range(len(vectors)))
+        self._build(vectors, 0, len(vectors), 0)
+        self._points = [vectors[index] for index in self._order]
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _build(self, vectors: list, lo: int, hi: int, depth: int):
+        if hi - lo <= KD_TREE_LEAF_SIZE:
+            return
+        axis = depth % 3
+        self._order[lo:hi] = sorted(self._order[lo:hi], key=lambda index: vectors[index][axis])
+        middle = (lo + hi) // 2
+        self._build(vectors, lo, middle, depth + 1)
+        self._build(vectors, middle + 1, hi, depth + 1)
+
+    def nearest(self, latitude: float, longitude: float) -> Optional[tuple[int, float]]:
+        """
+        Find the point closest to a location
+
+        Returns:
+            (position of the point in the points given to the constructor,
+            great-circle distance in km), or None when the tree is empty
+        """
+        if not self._points:
+            return None
+        best = [math.inf, -1]
+        self._search(_unit_vector(latitude, longitude), 0, len(self._points), 0, best)
+        chord = math.sqrt(best[0])
+        return self._order[best[1]], 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+    def _search(self, target: tuple, lo: int, hi: int, depth: int, best: list):
+        if hi - lo <= KD_TREE_LEAF_SIZE:
+            for position in range(lo, hi):
+                self._visit(target, position, best)
+            return
+        middle = (lo + hi) // 2
+        self._visit(target, middle, best)
+        difference = target[depth % 3] - self._points[middle][depth % 3]
+        near, far = ((lo, middle), (middle + 1, hi)) if difference < 0 else ((middle + 1, hi), (lo, middle))
+        self._search(target, *near, depth + 1, best)
+        # The other side can only be closer when the splitting plane is
+        if difference * difference < best[0]:
+            self._search(target, *far, depth + 1, best)
+
+    def _visit(self, target: tuple, position: int, best: list):
+        x, y, z = self._points[position]
+        distance = (x - target[0]) ** 2 + (y - target[1]) ** 2 + (z - target[2]) ** 2
+        if distance < best[0]:
+            best[0], best[1] = distance, position
+
+
+class Gazetteer:
+    """
+    In-memory geocoder for place names and postal codes
+
+    Forward lookups go through prefix indexes of normalized place names and
+    postal codes, reverse lookups through a KD-tree of the places, so both
+    answer in microseconds without a network call. Answers are at the
+    precision of a postal code area or a town centre.
+    """
+
+    def __init__(self, places: Iterable[Place], country_names: Optional[dict[str, str]] = None):
+        self.places = list(places)
+        # Lowercase country names and ISO3 codes -> ISO2 code
+        self.country_names = {name.casefold(): code for name, code in (country_names or {}).items()}
+
+        names: dict[str, list[int]] = {}
+        postal_codes: dict[str, list[int]] = {}
+        locations: dict[tuple[float, float], int] = {}
+        for position, place in enumerate(self.places):
+            names.setdefault(normalize_place_name(place.name), []).append(position)
+            if place.postal_code:
+                postal_codes.setdefault(normalize_postal_code(place.postal_code), []).append(position)
+            # Postal codes of one town often share its coordinates, the tree keeps one of them
+            locations.setdefault((round(place.latitude, 4), round(place.longitude, 4)), position)
+
+        self.names = PrefixIndex(names)
+        self.postal_codes = PrefixIndex(postal_codes)
+        self._tree_places = list(locations.values())
+        self.tree = KDTree((self.places[position].latitude, self.places[position].longitude)
+                           for position in self._tree_places)
+        self.country_codes = {place.country_code for place in self.places}
+
+    @classmethod
+    def from_geonames(cls, path: str) -> "Gazetteer":
+        """
+        Load GeoNames postal code files (https://download.geonames.org/export/zip/)
+
+        Args:
+            path: A tab-separated file such as IT.txt or allCountries.txt, or a
+                directory of them, optionally with countryInfo.txt to resolve
+                country names
+        """
+        source = Path(path)
+        files = sorted(source.glob("*.txt")) if source.is_dir() else [source]
+        country_names = {}
+        places = []
+        for file in files:
+            if file.name == COUNTRY_INFO_FILENAME:
+                country_names = _read_country_info(file)
+                continue
+            with open(file, encoding="utf-8", newline="") as handle:
+                for row in csv.reader(handle, delimiter="\t", quoting=csv.QUOTE_NONE):
+                    try:
+                        places.append(Place(row[0], row[1], row[2], row[3], float(row[9]), float(row[10])))
+                    except (IndexError, ValueError):
+                        continue
+        gazetteer = cls(places, country_names)
+        logger.info(f"Loaded {len(places)} gazetteer places from {len(files)} files in {path}")
+        return gazetteer
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def lookup(
+        self, city: Optional[str] = None, postal_code: Optional[str] = None, country: Optional[str] = None
+    ) -> Optional[Place]:
+        """
+        Geocode a postal code or a place name
+
+        A postal code is matched exactly or by its longest indexed prefix,
+        preferring the areas named like city, otherwise city is matched by
+        name. Several matches are merged into their centre when they are
+        close together, as with the postal codes of a city, and give no
+        answer when they are not, as with a Springfield in every state.
+
+        Args:
+            city: Place name
+            postal_code: Postal code
+            country: ISO code or, with country names loaded, country name
+
+        Returns:
+            The matched place, or None when it is unknown or ambiguous
+        """
+        country_code = self.resolve_country(country)
+        city_key = normalize_place_name(city)
+
+        if postal_code:
+            postal_key = self.postal_codes.longest_prefix_of(
+                normalize_postal_code(postal_code), MIN_POSTAL_PREFIX_LENGTH
+            )
+            candidates = self._in_country(self.postal_codes.get(postal_key) if postal_key else [], country_code)
+            named = [position for position in candidates if normalize_place_name(self.places[position].name) == city_key]
+            place = self._merge(named or candidates)
+            if place:
+                return place
+
+        if city_key:
+            return self._merge(self._in_country(self.names.get(city_key), country_code), with_postal_code=False)
+        return None
+
+    def search(self, text: str) -> Optional[Place]:
+        """
+        Geocode a free-text address such as "Via Roma 1, 90133 Palermo, Italy"
+
+        The comma-separated parts are tried from the last one, as a country,
+        then as place names and postal codes, so the street is never needed.
+        """
+        parts = [part.strip() for part in (text or "").split(",") if part.strip()]
+        country = None
+        if len(parts) > 1 and self.resolve_country(parts[-1]):
+            country = parts.pop()
+
+        for part in reversed(parts):
+            place = self.lookup(city=part, country=country)
+            if place:
+                return place
+            for token in part.split():
+                if any(char.isdigit() for char in token):
+                    place = self.lookup(city=part, postal_code=token, country=country)
+                    if place:
+                        return place
+        return None
+
+    def nearest(
+        self, latitude: float, longitude: float, max_distance_km: float = MAX_REVERSE_DISTANCE_KM
+    ) -> Optional[Place]:
+        """The place closest to a location, or None when none is within max_distance_km"""
+        found = self.tree.nearest(latitude, longitude)
+        if found is None or found[1] > max_distance_km:
+            return None
+        return self.places[self._tree_places[found[0]]]
+
+    def complete(self, prefix: str, country: Optional[str] = None, limit: int = 10) -> list[str]:
+        """Place names starting with prefix, e.g. for address autocompletion"""
+        country_code = self.resolve_country(country)
+        names = []
+        for _, positions in self.names.with_prefix(normalize_place_name(prefix)):
+            positions = self._in_country(positions, country_code)
+            if positions:
+                names.append(self.places[positions[0]].name)
+                if len(names) == limit:
+                    break
+        return names
+
+    def resolve_country(self, country: Optional[str]) -> Optional[str]:
+        """The ISO2 code of a country code or name, None when unknown"""
+        if not country or not country.strip():
+            return None
+        country = country.strip()
+        if country.upper() in self.country_codes:
+            return country.upper()
+        return self.country_names.get(country.casefold())
+
+    def _in_country(self, positions: list[int], country_code: Optional[str]) -> list[int]:
+        if not country_code:
+            return positions
+        return [position for position in positions if self.places[position].country_code == country_code]
+
+    def _merge(self, positions: list[int], with_postal_code: bool = True) -> Optional[Place]:
+        """One place for matches close together, None for no or scattered matches"""
+        if not positions:
+            return None
+        places = [self.places[position] for position in positions]
+        if len(places) == 1:
+            return places[0] if with_postal_code else _without_postal_code(places[0])
+
+        latitude = sum(place.latitude for place in places) / len(places)
+        longitude = sum(place.longitude for place in places) / len(places)
+        if any(haversine_km(latitude, longitude, place.latitude, place.longitude) > MAX_PLACE_SPREAD_KM
+               for place in places):
+            return None
+
+        def shared(attribute: str) -> str:
+            values = {getattr(place, attribute) for place in places}
+            return values.pop() if len(values) == 1 else ""
+
+        postal_codes = {place.postal_code for place in places}
+        return Place(
+            country_code=shared("country_code"),
+            postal_code=postal_codes.pop() if with_postal_code and len(postal_codes) == 1 else "",
+            name=shared("name"),
+            admin_name=shared("admin_name"),
+            latitude=latitude,
+            longitude=longitude,
+        )
+
+
+def _without_postal_code(place: Place) -> Place:
+    return Place(place.country_code, "", place.name, place.admin_name, place.latitude, place.longitude)
+
+
+def _read_country_info(path: Path) -> dict[str, str]:
+    """Country names and ISO3 codes -> ISO2 codes, from GeoNames countryInfo.txt"""
+    country_names = {}
+    with open(path, encoding="utf-8", newline="") as handle:
+        for row in csv.reader(handle, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) > 4 and row[0] and not row[0].startswith("#"):
+                country_names[row[4]] = row[0]
+                country_names[row[1]] = row[0]
+    return country_names
+
+
+_shared_gazetteers: dict[str, Optional[Gazetteer]] = {}
+_shared_gazetteers_lock = threading.Lock()
+
+
+def shared_gazetteer(path: str) -> Optional[Gazetteer]:
+    """The process-wide gazetteer loaded from path, or None when it cannot be read"""
+    with _shared_gazetteers_lock:
+        if path not in _shared_gazetteers:
+            try:
+                _shared_gazetteers[path] = Gazetteer.from_geonames(path)
+            except (OSError, ValueError, IndexError, csv.Error) as e:
+                logger.warning(f"Gazetteer {path} unavailable, geocoding online only: {e}")
+                _shared_gazetteers[path] = None
+        return _shared_gazetteers[path]
@@ -0,0 +1,65 @@
+"""Utilities for geographic calculations"""
+
+from math import atan2, cos, radians, sin, sqrt
+from typing import Optional
+
+from homeward.models.video_analysis import TravelMode
+
+EARTH_RADIUS_KM = 6371.0
+
+# Sustained average speeds, including stops, used for reachability estimates
+TRAVEL_SPEEDS_KMH = {
+    TravelMode.WALKING: 5.0,
+    TravelMode.TRANSIT: 25.0,
+    TravelMode.CAR: 60.0,
+}
+
+# Distance always reachable, covering uncertainty on the last seen location
+REACHABILITY_BASE_KM = 0.5
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate the great-circle distance between two points.
+
+    Args:
+        lat1: Latitude of the first point
+        lon1: Longitude of the first point
+        lat2: Latitude of the second point
+        lon2: Longitude of the second point
+
+    Returns:
+        Distance in kilometers
+    """
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def reachable_radius_km(
+    elapsed_seconds: float, travel_mode: Optional[TravelMode], max_radius_km: float
+) -> float:
+    """
+    Calculate how far a person can have travelled from the last seen location.
+
+    The radius grows linearly with the time elapsed since (or before) the last
+    sighting at the speed of the travel mode, and is capped by max_radius_km.
+
+    Args:
+        elapsed_seconds: Time between the last sighting and the footage
+        travel_mode: Travel mode preset, or None for the fixed radius
+        max_radius_km: Search radius cap
+
+    Returns:
+        Reachable radius in kilometers
+    """
+    if travel_mode is None:
+        return max_radius_km
+
+    travelled_km = TRAVEL_SPEEDS_KMH[travel_mode] * abs(elapsed_seconds) / 3600
+    return min(max_radius_km, REACHABILITY_BASE_KM + travelled_km)
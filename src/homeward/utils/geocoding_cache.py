@@ -0,0 +1,194 @@
+"""Two-tier cache of geocoding results: an in-memory LRU in front of a SQLite file"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+# Addresses that were not found are retried sooner, as typos get fixed and places get mapped
+DEFAULT_NEGATIVE_TTL_SECONDS = 24 * 3600
+# Reverse geocoding keys round coordinates to 4 decimals, about 11 m
+REVERSE_GEOCODE_PRECISION = 4
+
+
+def normalize_address(full_address: str) -> str:
+    """
+    Normalize a full address into a cache key
+
+    Case, accents written as combining characters, repeated whitespace,
+    abbreviation dots and the spacing around commas do not change the key,
+    so "Piazza  Giulio Cesare,Palermo" and "piazza giulio cesare, palermo"
+    share one entry.
+    """
+    text = unicodedata.normalize("NFKC", full_address or "").casefold()
+    # Abbreviation dots: "St." and "St" are the same street
+    text = re.sub(r"(?<=[^\W\d])\.", " ", text)
+    parts = [" ".join(part.split()) for part in re.split(r"[,;]", text)]
+    return ", ".join(part for part in parts if part)
+
+
+def address_key(full_address: str) -> str:
+    return f"address:{normalize_address(full_address)}"
+
+
+def coordinates_key(latitude: float, longitude: float, precision: int = REVERSE_GEOCODE_PRECISION) -> str:
+    return f"reverse:{round(latitude, precision):.{precision}f},{round(longitude, precision):.{precision}f}"
+
+
+class GeocodingCache:
+    """
+    Geocoding results by key, with separate TTLs for found and not found results
+
+    Lookups go to the LRU first and then to SQLite, whose hits are promoted
+    to the LRU, so results survive restarts and are shared by processes
+    using the same file. A value of None records that nothing was found.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = DEFAULT_MEMORY_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        # key -> (value, stored_at), least recently used first
+        self._memory: OrderedDict = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "negative_hits": 0, "misses": 0}
+
+        self._db = None
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS geocodes (key TEXT PRIMARY KEY, value TEXT, stored_at REAL NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Geocoding cache {path} unavailable, caching in memory only: {e}")
+                self._db = None
+
+    def get(self, key: str) -> Optional[tuple[Optional[dict]]]:
+        """
+        Look up a key
+
+        Returns:
+            (value,) when a fresh entry exists, where value is None for a
+            cached "not found"; None on a miss
+        """
+        now = self._clock()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and self._is_fresh(cached, now):
+                self._memory.move_to_end(key)
+                self._count_hit("memory_hits", cached[0])
+                return (cached[0],)
+
+            cached = self._read_disk(key)
+            if cached and self._is_fresh(cached, now):
+                self._remember(key, cached)
+                self._count_hit("disk_hits", cached[0])
+                return (cached[0],)
+
+            self._memory.pop(key, None)
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Optional[dict]):
+        """Store a result, or None when nothing was found"""
+        entry = (value, self._clock())
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO geocodes (key, value, stored_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value) if value is not None else None, entry[1]),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not write geocoding cache entry: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete the expired entries from disk, returning how many were removed"""
+        if self._db is None:
+            return 0
+        now = self._clock()
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM geocodes WHERE (value IS NOT NULL AND stored_at <= ?) OR (value IS NULL AND stored_at <= ?)",
+                (now - self.ttl_seconds, now - self.negative_ttl_seconds),
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        """Hits per tier, negative hits, misses, hit rate and cached entries"""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def _is_fresh(self, entry: tuple[Optional[dict], float], now: float) -> bool:
+        value, stored_at = entry
+        ttl = self.ttl_seconds if value is not None else self.negative_ttl_seconds
+        return now - stored_at < ttl
+
+    def _count_hit(self, tier: str, value: Optional[dict]):
+        self._stats[tier] += 1
+        if value is None:
+            self._stats["negative_hits"] += 1
+
+    def _remember(self, key: str, entry: tuple[Optional[dict], float]):
+        """Put an entry in the LRU, evicting the least recently used. Called with the lock held."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[tuple[Optional[dict], float]]:
+        """Read an entry from SQLite. Called with the lock held."""
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT value, stored_at FROM geocodes WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read geocoding cache: {e}")
+            return None
+        if row is None:
+            return None
+        return (json.loads(row[0]) if row[0] is not None else None, row[1])
+
+
+_shared_caches: dict[Optional[str], GeocodingCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def shared_geocoding_cache(path: Optional[str], ttl_seconds: float = DEFAULT_TTL_SECONDS) -> GeocodingCache:
+    """The process-wide cache for a SQLite file, so every geocoding service instance shares its LRU"""
+    with _shared_caches_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = _shared_caches[path] = GeocodingCache(path, ttl_seconds=ttl_seconds)
+        return cache
@@ -0,0 +1,136 @@
+"""Geohash cell IDs, stored on cases, sightings and cameras to prune location searches"""
+
+import math
+from typing import Optional
+
+from homeward.utils.camera_index import KM_PER_DEGREE_LATITUDE
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Stored cells have 9 characters, about 5 m, the same as BigQuery ST_GEOHASH(geo, 9)
+GEOHASH_PRECISION = 9
+# Searches prune with at most this many cells, before merging neighbours into ranges
+MAX_COVERING_CELLS = 32
+# Sorts after every geohash, closing the range of the last cells in the alphabet
+RANGE_END = "~"
+
+
+def encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Geohash of a point
+
+    Longer hashes are cells nested in shorter ones, so sorting by geohash
+    keeps nearby points together and a prefix selects an area.
+    """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate between longitude and latitude, starting with longitude
+        value, interval = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def cell_size_degrees(precision: int) -> tuple[float, float]:
+    """Height and width of the cells of a precision, in degrees of latitude and longitude"""
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def covering_cells(
+    latitude: float, longitude: float, radius_km: float, max_cells: int = MAX_COVERING_CELLS
+) -> Optional[list[str]]:
+    """
+    Cells covering a search circle, at the finest precision needing at most max_cells
+
+    Returns:
+        Sorted geohashes whose union contains every point within radius_km,
+        or None when the circle reaches a pole or the antimeridian, where
+        searches are not pruned
+    """
+    lat_delta = radius_km / KM_PER_DEGREE_LATITUDE
+    min_lat, max_lat = latitude - lat_delta, latitude + lat_delta
+    if min_lat <= -90 or max_lat >= 90:
+        return None
+    lon_delta = radius_km / (KM_PER_DEGREE_LATITUDE * math.cos(math.radians(max(abs(min_lat), abs(max_lat)))))
+    min_lon, max_lon = longitude - lon_delta, longitude + lon_delta
+    if min_lon < -180 or max_lon >= 180:
+        return None
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size_degrees(precision)
+        rows = range(int((min_lat + 90) // height), int((max_lat + 90) // height) + 1)
+        columns = range(int((min_lon + 180) // width), int((max_lon + 180) // width) + 1)
+        if len(rows) * len(columns) <= max_cells:
+            return sorted(
+                encode(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+                for row in rows
+                for column in columns
+            )
+    return None
+
+
+def cell_ranges(cells: list[str]) -> list[tuple[str, str]]:
+    """
+    Half-open ranges of stored geohashes inside any of the cells
+
+    A cell holds the hashes from itself up to the next cell of the same
+    precision, so cells following each other in geohash order merge into
+    one range.
+    """
+    ranges = []
+    for cell in sorted(cells):
+        start, end = cell, _next_cell(cell)
+        if ranges and ranges[-1][1] >= start:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def prune_filter(
+    column: str, latitude: float, longitude: float, radius_km: float, parameter_prefix: str = "cell"
+) -> tuple[str, dict[str, str]]:
+    """
+    SQL condition keeping the rows whose geohash column lies in the cells covering a search circle
+
+    Rows without a geohash, written before the column existed, are kept for
+    the exact distance filter to decide. The condition only compares the
+    column with constants, so BigQuery can skip the blocks of a table
+    clustered on it.
+
+    Returns:
+        (condition, STRING query parameters by name); "TRUE" and no
+        parameters when the circle cannot be covered
+    """
+    cells = covering_cells(latitude, longitude, radius_km)
+    if not cells:
+        return "TRUE", {}
+
+    conditions = [f"{column} IS NULL"]
+    parameters = {}
+    for index, (start, end) in enumerate(cell_ranges(cells)):
+        conditions.append(f"({column} >= @{parameter_prefix}_{index}_start AND {column} < @{parameter_prefix}_{index}_end)")
+        parameters[f"{parameter_prefix}_{index}_start"] = start
+        parameters[f"{parameter_prefix}_{index}_end"] = end
+    return "(" + " OR ".join(conditions) + ")", parameters
+
+
+def _next_cell(cell: str) -> str:
+    """The first geohash after every hash starting with cell"""
+    stripped = cell.rstrip(BASE32[-1])
+    if not stripped:
+        return RANGE_END
+    return stripped[:-1] + BASE32[BASE32.index(stripped[-1]) + 1]
@@ -0,0 +1,123 @@
+"""Utilities for routing videos to model endpoints by camera type and resolution"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Optional
+
+from homeward.utils.video_utils import parse_video_filename
+
+# Route name used for videos that match no configured route
+DEFAULT_ROUTE_NAME = "default"
+
+DEFAULT_MODEL_PARAMS = {"generation_config": {"temperature": 0}}
+
+
+@dataclass
+class ModelRoute:
+    """Model endpoint and generation parameters for a class of footage"""
+
+    name: str
+    endpoint: str
+    # Empty matches every camera type
+    camera_types: tuple[str, ...] = ()
+    min_height: Optional[int] = None
+    max_height: Optional[int] = None
+    model_params: dict = field(default_factory=lambda: dict(DEFAULT_MODEL_PARAMS))
+    # Used to estimate the cost reported in the analysis stats
+    cost_per_million_tokens: float = 0.0
+
+    def matches(self, camera_type: Optional[str], resolution: Optional[str]) -> bool:
+        """Check whether a video with this camera type and resolution takes the route"""
+        if self.camera_types and (camera_type or "").upper() not in self.camera_types:
+            return False
+
+        if self.min_height is None and self.max_height is None:
+            return True
+
+        height = resolution_height(resolution)
+        if height is None:
+            return False
+        if self.min_height is not None and height < self.min_height:
+            return False
+        if self.max_height is not None and height > self.max_height:
+            return False
+        return True
+
+
+def resolution_height(resolution: Optional[str]) -> Optional[int]:
+    """Height of a WIDTHxHEIGHT resolution, None if it cannot be parsed"""
+    try:
+        return int(resolution.lower().split("x")[1])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def parse_model_routes(data) -> list[ModelRoute]:
+    """
+    Build routes from their JSON form.
+
+    Args:
+        data: List of routes, or a mapping with a "routes" list. Each route has
+            name, endpoint and optionally camera_types, min_height, max_height,
+            model_params and cost_per_million_tokens.
+
+    Returns:
+        Routes in priority order
+
+    Raises:
+        ValueError: If a route is missing a name or endpoint
+    """
+    entries = data.get("routes", []) if isinstance(data, dict) else data
+
+    routes = []
+    for entry in entries:
+        if not entry.get("name") or not entry.get("endpoint"):
+            raise ValueError(f"Model route needs a name and an endpoint: {entry}")
+        routes.append(
+            ModelRoute(
+                name=entry["name"],
+                endpoint=entry["endpoint"],
+                camera_types=tuple(camera_type.upper() for camera_type in entry.get("camera_types", [])),
+                min_height=entry.get("min_height"),
+                max_height=entry.get("max_height"),
+                model_params=entry.get("model_params", dict(DEFAULT_MODEL_PARAMS)),
+                cost_per_million_tokens=float(entry.get("cost_per_million_tokens", 0.0)),
+            )
+        )
+    return routes
+
+
+def load_model_routes(path: str) -> list[ModelRoute]:
+    """Load the routing table from a JSON file"""
+    with open(path) as routes_file:
+        return parse_model_routes(json.load(routes_file))
+
+
+def route_videos(
+    uris: list[str], routes: list[ModelRoute]
+) -> list[tuple[Optional[ModelRoute], list[str]]]:
+    """
+    Assign each video to the first route it matches.
+
+    Args:
+        uris: Video URIs following the filename convention
+        routes: Routes in priority order
+
+    Returns:
+        (route, uris) pairs in route order, with None for the videos that
+        match no route and go to the default model
+    """
+    grouped: dict[Optional[str], list[str]] = {}
+    for uri in uris:
+        metadata = parse_video_filename(uri)
+        camera_type = metadata.camera_type if metadata else None
+        resolution = metadata.resolution if metadata else None
+
+        route = next((route for route in routes if route.matches(camera_type, resolution)), None)
+        grouped.setdefault(route.name if route else None, []).append(uri)
+
+    by_name = {route.name: route for route in routes}
+    ordered = [(by_name[name], grouped[name]) for name in by_name if name in grouped]
+    if None in grouped:
+        ordered.append((None, grouped[None]))
+    return ordered
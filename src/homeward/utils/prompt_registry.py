@@ -0,0 +1,275 @@
+"""Versioned prompt templates for the video analysis queries, with token accounting"""
+
+import hashlib
+import math
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+# Gemini averages about four characters per token on English prose
+CHARS_PER_TOKEN = 4
+
+# Attribute key -> label, in prompt order
+PERSON_ATTRIBUTE_LABELS = {
+    "gender": "Gender",
+    "age": "Approximate Age",
+    "build_height": "Build - Height",
+    "hair": "Hair Color and Style",
+    "clothing_top": "Clothing",
+    "clothing_bottom": "Lower Clothing",
+    "footwear": "Footwear",
+    "accessories": "Accessories",
+    "features": "Distinguishing Features",
+}
+
+# The attributes of the original v1 prompts, which had no lower clothing line
+V1_PERSON_ATTRIBUTES = tuple(key for key in PERSON_ATTRIBUTE_LABELS if key != "clothing_bottom")
+
+# Placeholder values that carry no information for the model
+EMPTY_ATTRIBUTE_VALUES = {"", "Unknown", "None"}
+
+VIDEO_ANALYSIS_PROMPT_V1 = """# ROLE AND GOAL
+You are a state-of-the-art AI visual analysis system with an expert specialization in human identification within low-quality video footage.
+Your primary mission is to analyze the provided video for a critical missing person case with the highest degree of accuracy and diligence.
+You must be methodical and detail-oriented in your analysis and reporting.
+
+# TASK CONTEXT
+This is a high-priority, time-sensitive analysis.
+The provided video is a low-quality security footage from the street, where people are walking around.
+The objective is to determine if the missing person is visible in this video, and if so, to extract all relevant information about their presence.
+
+# MISSING PERSON DATA
+Carefully analyze the following description of the missing person. Every detail is crucial.
+
+{person}
+# ANALYSIS INSTRUCTIONS
+You must perform the following steps in your analysis:
+
+1.  **Full Video Scan:** Meticulously review the entire video from start to finish. Do not stop after a potential first match; the person may appear multiple times.
+2.  **Feature Matching:** Compare every individual in the video against the `MISSING PERSON DATA`. Assess matches based on all available criteria: clothing, build, hair, accessories, and any visible distinguishing features or mannerisms.
+3.  **Justification:** You MUST provide a step-by-step justification for your match. List the features that matched, the features that did not match, and any features that were ambiguous or obscured (e.g., 'Face was unclear, but clothing is a 90% match').
+4.  **Contextual Analysis (If Found):** If you identify the person with confidence:
+    -   Note the exact timestamp(s) (in `HH:MM:SS` format) of their appearance.
+    -   Document their behavior, actions, and movements throughout their appearance in the video.
+5. **Confidence Score (If Found):** If you identify a person with confidence:
+    -   Return the confidence score of the finding in the range 0.0 to 1.0
+"""
+
+VIDEO_ANALYSIS_PROMPT_COMPACT = """Find this missing person in the low-quality street security video.
+
+# MISSING PERSON
+{person}
+# INSTRUCTIONS
+1. Review the whole video; the person may appear more than once.
+2. Compare everyone against the description: clothing, build, hair, accessories, distinguishing features.
+3. Justify the verdict: features that matched, did not match, or were obscured.
+4. If found, give each appearance as "at HH:MM:SS into the clip", what the person does, and a confidence score from 0.0 to 1.0.
+"""
+
+VIDEO_SWEEP_PROMPT_V1 = """# ROLE AND GOAL
+You are a state-of-the-art AI visual analysis system with an expert specialization in human identification within low-quality video footage.
+Your primary mission is to analyze the provided video for several critical missing person cases at once, with the highest degree of accuracy and diligence.
+You must be methodical and detail-oriented in your analysis and reporting.
+
+# TASK CONTEXT
+This is a high-priority, time-sensitive analysis.
+The provided video is a low-quality security footage from the street, where people are walking around.
+The objective is to determine, independently for each missing person listed below, if that person is visible in this video.
+
+# MISSING PERSONS DATA
+Carefully analyze the following descriptions. Every detail is crucial and each case must be judged on its own.
+{cases}
+# ANALYSIS INSTRUCTIONS
+You must perform the following steps in your analysis:
+
+1.  **Full Video Scan:** Meticulously review the entire video from start to finish. Do not stop after a potential first match; several people may appear, and a person may appear multiple times.
+2.  **Feature Matching:** Compare every individual in the video against each entry of the `MISSING PERSONS DATA`. Assess matches based on all available criteria: clothing, build, hair, accessories, and any visible distinguishing features or mannerisms.
+3.  **One Verdict Per Case:** Return exactly one verdict for every case ID listed above, using the case ID verbatim.
+4.  **Justification:** For every verdict, provide a step-by-step justification listing the features that matched, did not match, or were ambiguous.
+5.  **Confidence Score (If Found):** If you identify a person with confidence, return the confidence score of the finding in the range 0.0 to 1.0
+"""
+
+VIDEO_SWEEP_PROMPT_COMPACT = """Find each of these missing persons in the low-quality street security video, judging every case on its own.
+{cases}
+# INSTRUCTIONS
+1. Review the whole video; several people may appear, and a person more than once.
+2. Compare everyone against each description: clothing, build, hair, accessories, distinguishing features.
+3. Return exactly one verdict per case ID, using the ID verbatim, with a short justification.
+4. If found, give a confidence score from 0.0 to 1.0.
+"""
+
+
+def person_attributes(missing_person_data: dict = None) -> dict:
+    """Extract the prompt attributes for a missing person, using the demo notebook defaults"""
+    data = missing_person_data or {}
+
+    def value(key: str, default: str) -> str:
+        # Fields left empty in the case record fall back to the placeholder, never to "None"
+        field = data.get(key)
+        return default if field is None or str(field).strip() == "" else str(field)
+
+    height = value("height", "Unknown")
+    weight = value("weight", "Unknown")
+
+    return {
+        "gender": value("gender", "Unknown"),
+        "age": value("age", "Unknown"),
+        "build_height": f"{height}cm, {weight}kg" if height != "Unknown" and weight != "Unknown" else "Unknown",
+        "hair": value("hair_color", "Unknown"),
+        # Case records only hold one free-text clothing description, used for the upper clothing
+        "clothing_top": value("clothing_description", "Unknown"),
+        "clothing_bottom": "Unknown",
+        "footwear": "Unknown",
+        "accessories": "None",
+        "features": value("distinguishing_marks", "None"),
+    }
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text prompt"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """One version of a prompt"""
+
+    name: str
+    version: str
+    template: str
+    # Drop the attributes without information instead of sending "Unknown"
+    compact: bool = False
+    # Attribute keys listed, in order
+    attributes: tuple[str, ...] = tuple(PERSON_ATTRIBUTE_LABELS)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.version}"
+
+    def render_person(self, attributes: dict) -> str:
+        """Render the attribute list of one person"""
+        lines = [
+            f"- **{PERSON_ATTRIBUTE_LABELS[key]}:** `{attributes.get(key, 'Unknown')}`"
+            for key in self.attributes
+            if not self.compact or str(attributes.get(key, "")).strip() not in EMPTY_ATTRIBUTE_VALUES
+        ]
+        if not lines:
+            lines = ["- No description available; report anyone who could be a missing person."]
+        return "\n".join(lines) + "\n"
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """A prompt ready to send, with the version and size it was rendered with"""
+
+    text: str
+    template_key: str
+    token_count: int
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of the prompt text, for cache keys"""
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:16]
+
+
+class PromptRegistry:
+    """Versioned prompt templates with per-version token accounting"""
+
+    def __init__(self, templates: tuple[PromptTemplate, ...] = (), default_versions: Optional[dict] = None):
+        self._templates: dict[str, dict[str, PromptTemplate]] = {}
+        self._default_versions: dict[str, str] = dict(default_versions or {})
+        self._token_stats: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        for template in templates:
+            self.register(template)
+
+    def register(self, template: PromptTemplate, default: bool = False):
+        """Add a template version, making it the default of its name if asked or if it is the first"""
+        self._templates.setdefault(template.name, {})[template.version] = template
+        if default or template.name not in self._default_versions:
+            self._default_versions[template.name] = template.version
+
+    def versions(self, name: str) -> list[str]:
+        """Registered versions of a prompt"""
+        return sorted(self._templates.get(name, {}))
+
+    def get(self, name: str, version: Optional[str] = None) -> PromptTemplate:
+        """
+        Look up a template
+
+        Args:
+            name: Prompt name
+            version: Template version, the default version when None
+
+        Raises:
+            KeyError: If the prompt or version is not registered
+        """
+        versions = self._templates.get(name)
+        if not versions:
+            raise KeyError(f"Unknown prompt: {name}")
+        version = version or self._default_versions[name]
+        if version not in versions:
+            raise KeyError(f"Unknown version {version} of prompt {name}, available: {', '.join(sorted(versions))}")
+        return versions[version]
+
+    def render_person_prompt(self, name: str, attributes: dict, version: Optional[str] = None) -> RenderedPrompt:
+        """Render a single-person prompt"""
+        template = self.get(name, version)
+        return self._record(template, template.template.format(person=template.render_person(attributes)))
+
+    def render_cases_prompt(
+        self, name: str, cases: list[tuple[str, dict]], version: Optional[str] = None
+    ) -> RenderedPrompt:
+        """Render a multi-person prompt from (case ID, attributes) pairs"""
+        template = self.get(name, version)
+        sections = "".join(
+            f"\n## CASE ID: `{case_id}`\n{template.render_person(attributes)}" for case_id, attributes in cases
+        )
+        return self._record(template, template.template.format(cases=sections))
+
+    def token_stats(self) -> dict:
+        """Renders, total and mean estimated tokens per template version"""
+        with self._lock:
+            return {
+                key: {**stats, "mean_tokens": stats["total_tokens"] / stats["renders"]}
+                for key, stats in self._token_stats.items()
+            }
+
+    def _record(self, template: PromptTemplate, text: str) -> RenderedPrompt:
+        rendered = RenderedPrompt(text=text + "\n", template_key=template.key, token_count=estimate_tokens(text + "\n"))
+        with self._lock:
+            stats = self._token_stats.setdefault(template.key, {"renders": 0, "total_tokens": 0})
+            stats["renders"] += 1
+            stats["total_tokens"] += rendered.token_count
+        return rendered
+
+
+def default_prompt_registry(default_version: Optional[str] = None) -> PromptRegistry:
+    """
+    Build the registry of the video analysis prompts.
+
+    Args:
+        default_version: Version used when none is requested, "v1" when None
+
+    Returns:
+        PromptRegistry with the video_analysis and video_sweep prompts
+    """
+    registry = PromptRegistry(
+        (
+            PromptTemplate("video_analysis", "v1", VIDEO_ANALYSIS_PROMPT_V1, attributes=V1_PERSON_ATTRIBUTES),
+            PromptTemplate(
+                "video_analysis", "v1-compact", VIDEO_ANALYSIS_PROMPT_V1, compact=True, attributes=V1_PERSON_ATTRIBUTES
+            ),
+            PromptTemplate("video_analysis", "v2-compact", VIDEO_ANALYSIS_PROMPT_COMPACT, compact=True),
+            PromptTemplate("video_sweep", "v1", VIDEO_SWEEP_PROMPT_V1, attributes=V1_PERSON_ATTRIBUTES),
+            PromptTemplate(
+                "video_sweep", "v1-compact", VIDEO_SWEEP_PROMPT_V1, compact=True, attributes=V1_PERSON_ATTRIBUTES
+            ),
+            PromptTemplate("video_sweep", "v2-compact", VIDEO_SWEEP_PROMPT_COMPACT, compact=True),
+        )
+    )
+    if default_version:
+        for name in ("video_analysis", "video_sweep"):
+            registry.register(registry.get(name, default_version), default=True)
+    return registry
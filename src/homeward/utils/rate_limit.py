@@ -0,0 +1,146 @@
+"""Rate limiting utilities shared by the services that call quota-limited APIs"""
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so
+    bursts of up to `capacity` requests go through immediately and the
+    sustained rate never exceeds the quota.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: Optional[float] = None) -> "TokenBucket":
+        """Create a bucket from a per-minute quota, bursting up to `burst` requests"""
+        return cls(requests_per_minute / 60.0, burst)
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if they are available.
+
+        Args:
+            tokens: Number of tokens to take, at most the bucket capacity
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds to wait before retrying
+
+        Raises:
+            ValueError: If more tokens than the capacity are requested, as they could never be available at once
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens at once from a bucket of {self.capacity}")
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        Block until tokens are available and take them.
+
+        Costs above the capacity are taken in capacity-sized parts, so a large
+        job waits for its whole cost at the sustained rate.
+
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait, None waits indefinitely
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            TimeoutError: If the tokens are not available within the timeout
+        """
+        start = time.monotonic()
+        remaining = tokens
+        while True:
+            part = min(remaining, self.capacity)
+            wait = self.try_acquire(part)
+            waited = time.monotonic() - start
+            if wait == 0.0:
+                remaining -= part
+                if remaining <= 0:
+                    return waited
+                continue
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(f"Rate limit: {tokens} tokens not available within {timeout}s")
+            time.sleep(wait)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+def retry_with_backoff(
+    func: Callable[[], T],
+    attempts: int = 3,
+    base_delay: float = 2.0,
+    max_delay: float = 30.0,
+    description: str = "operation",
+    sleep: Callable[[float], None] = time.sleep,
+    retry_on: Optional[Callable[[Exception], bool]] = None,
+) -> T:
+    """
+    Call func, retrying failures with exponential backoff and full jitter.
+
+    Args:
+        func: Callable without arguments
+        attempts: Total number of calls before giving up
+        base_delay: Upper bound of the first delay, in seconds, doubled on each retry
+        max_delay: Upper bound of any delay, in seconds
+        description: What func does, for the logs
+        sleep: Function used to wait
+        retry_on: Whether an exception is worth retrying, every exception is when None
+
+    Returns:
+        The return value of func
+
+    Raises:
+        The exception of the last attempt
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == attempts or (retry_on is not None and not retry_on(e)):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+            logger.warning(f"{description} failed (attempt {attempt} of {attempts}), retrying in {delay:.1f}s: {e}")
+            sleep(delay)
@@ -0,0 +1,133 @@
+"""Utilities for grouping video detections of the same person into tracks"""
+
+from dataclasses import replace
+from datetime import timedelta
+
+from homeward.models.video_analysis import VideoAnalysisResult, VideoTrack
+from homeward.utils.geo_utils import haversine_km
+
+# Detections further apart in time start a new track
+DEFAULT_MAX_GAP_MINUTES = 15.0
+# Cameras this close are adjacent: the same scene or the next street corner
+DEFAULT_ADJACENCY_KM = 0.3
+# Brisk walking speed, above the average used for reachability
+DEFAULT_MAX_SPEED_KMH = 7.0
+
+
+def is_plausible_transition(
+    previous: VideoAnalysisResult,
+    current: VideoAnalysisResult,
+    max_gap_minutes: float = DEFAULT_MAX_GAP_MINUTES,
+    adjacency_km: float = DEFAULT_ADJACENCY_KM,
+    max_speed_kmh: float = DEFAULT_MAX_SPEED_KMH,
+) -> bool:
+    """
+    Check whether one person could appear in both detections.
+
+    Args:
+        previous: Earlier detection
+        current: Later detection
+        max_gap_minutes: Maximum time between the two clips
+        adjacency_km: Distance covered regardless of the time gap
+        max_speed_kmh: Fastest plausible walking speed
+
+    Returns:
+        True if the detections can belong to the same track
+    """
+    gap_hours = abs((current.timestamp - previous.timestamp).total_seconds()) / 3600
+    if gap_hours * 60 > max_gap_minutes:
+        return False
+
+    if current.camera_id == previous.camera_id:
+        return True
+
+    distance = haversine_km(previous.latitude, previous.longitude, current.latitude, current.longitude)
+    return distance <= max(adjacency_km, max_speed_kmh * gap_hours)
+
+
+def aggregate_confidence(detections: list[VideoAnalysisResult]) -> float:
+    """
+    Confidence of the track: that of its best detection.
+
+    Detections of one walk come from the same person and lighting, so their
+    errors are correlated; combining them as independent evidence would push
+    long tracks towards certainty and past the bulk-add threshold.
+    """
+    return max((min(1.0, max(0.0, detection.confidence_score)) for detection in detections), default=0.0)
+
+
+def build_tracks(
+    results: list[VideoAnalysisResult],
+    max_gap_minutes: float = DEFAULT_MAX_GAP_MINUTES,
+    adjacency_km: float = DEFAULT_ADJACENCY_KM,
+    max_speed_kmh: float = DEFAULT_MAX_SPEED_KMH,
+) -> list[VideoTrack]:
+    """
+    Cluster detections into tracks by camera adjacency, time gap and walking speed.
+
+    Detections are linked in time order to the track whose latest detection
+    is the closest in time among those the person could have walked from.
+
+    Args:
+        results: Detections of one case
+        max_gap_minutes: Maximum time between consecutive detections of a track
+        adjacency_km: Distance between cameras always considered adjacent
+        max_speed_kmh: Fastest plausible walking speed between cameras
+
+    Returns:
+        Tracks sorted by aggregate confidence, highest first
+    """
+    groups: list[list[VideoAnalysisResult]] = []
+
+    for result in sorted(results, key=lambda result: result.timestamp):
+        best_group = None
+        best_gap = None
+        for group in groups:
+            latest = group[-1]
+            if not is_plausible_transition(latest, result, max_gap_minutes, adjacency_km, max_speed_kmh):
+                continue
+            gap = result.timestamp - latest.timestamp
+            if best_gap is None or gap < best_gap:
+                best_group, best_gap = group, gap
+
+        if best_group is None:
+            groups.append([result])
+        else:
+            best_group.append(result)
+
+    tracks = []
+    for group in groups:
+        representative = max(group, key=lambda detection: (detection.confidence_score, -detection.timestamp.timestamp()))
+        tracks.append(
+            VideoTrack(
+                id=representative.id,
+                detections=group,
+                representative=representative,
+                confidence_score=aggregate_confidence(group),
+            )
+        )
+
+    tracks.sort(key=lambda track: track.confidence_score, reverse=True)
+    return tracks
+
+
+def track_result(track: VideoTrack) -> VideoAnalysisResult:
+    """
+    Summarize a track as one result, for the results table and the evidence store.
+
+    The representative keeps its ID and video, so evidence deduplication
+    still applies, and carries the aggregate confidence.
+    """
+    if len(track.detections) == 1:
+        return track.representative
+
+    duration = track.end_time - track.start_time
+    summary = (
+        f" [Track of {len(track.detections)} detections on {', '.join(track.camera_ids)} "
+        f"from {track.start_time:%Y-%m-%d %H:%M} over {duration // timedelta(minutes=1)} min]"
+    )
+    return replace(
+        track.representative,
+        confidence_score=track.confidence_score,
+        ai_description=track.representative.ai_description + summary,
+    )
@@ -0,0 +1,151 @@
+"""Utilities for surveillance video identifiers and metadata"""
+
+import hashlib
+import re
+from datetime import datetime
+from typing import Optional
+
+from homeward.models.video_analysis import VideoMetadata
+
+# SQL expression producing the same value as video_result_id() for a `uri` column.
+# Keep both in sync: stored evidence and the video catalog are keyed on it.
+VIDEO_RESULT_ID_SQL = "CONCAT('video_', SUBSTR(TO_HEX(SHA256(uri)), 1, 16))"
+
+# HH:MM:SS or MM:SS offsets marked as positions in the clip, e.g. "at 0:45 into the clip" or "video time 00:01:23".
+# Bare times such as "seen at 14:30" are usually wall-clock times and are not offsets.
+_OFFSET = r"(?:(\d{1,2}):)?([0-5]?\d):([0-5]\d)"
+VIDEO_OFFSET_PATTERNS = (
+    re.compile(rf"\b{_OFFSET}\s+into\s+the\s+(?:clip|video|footage|recording)\b", re.IGNORECASE),
+    re.compile(rf"\b(?:clip|video)\s+(?:time|timestamp|offset)\s*:?\s*{_OFFSET}\b", re.IGNORECASE),
+)
+
+
+def video_result_id(uri: str) -> str:
+    """
+    Compute the stable result ID for a video.
+
+    The ID is derived from the video URI content, so it is identical across
+    processes and matches VIDEO_RESULT_ID_SQL evaluated in BigQuery.
+
+    Args:
+        uri: GCS URI of the video
+
+    Returns:
+        Result ID in the form video_<16 hex chars>
+    """
+    return f"video_{hashlib.sha256(uri.encode('utf-8')).hexdigest()[:16]}"
+
+
+def parse_video_filename(uri: str) -> Optional[VideoMetadata]:
+    """
+    Parse the metadata encoded in a video filename.
+
+    Expected format: CameraID_YYYYMMDDHHMMSS_LATITUDE_LONGITUDE_CAMERATYPE_RESOLUTION.mp4
+
+    Args:
+        uri: GCS URI, URL or local path of the video
+
+    Returns:
+        VideoMetadata, or None if the filename does not follow the convention
+    """
+    filename = uri.replace("\\", "/").split("/")[-1]
+    parts = filename.replace(".mp4", "").split("_")
+
+    if len(parts) < 6:
+        return None
+
+    try:
+        return VideoMetadata(
+            uri=uri,
+            camera_id=parts[0],
+            timestamp=datetime.strptime(parts[1], "%Y%m%d%H%M%S"),
+            latitude=float(parts[2]),
+            longitude=float(parts[3]),
+            camera_type=parts[4],
+            resolution=parts[5],
+        )
+    except ValueError:
+        return None
+
+
+def format_video_filename(
+    camera_id: str,
+    timestamp: datetime,
+    latitude: float,
+    longitude: float,
+    camera_type: str,
+    resolution: str,
+) -> str:
+    """
+    Build a filename following the metadata naming convention, the inverse of parse_video_filename.
+
+    Underscores and spaces in the text fields are replaced with dashes, as
+    underscores separate the fields.
+
+    Returns:
+        CameraID_YYYYMMDDHHMMSS_LATITUDE_LONGITUDE_CAMERATYPE_RESOLUTION.mp4
+
+    Raises:
+        ValueError: If a field is empty or the coordinates are out of range
+    """
+    fields = [re.sub(r"[_\s]+", "-", str(value).strip()) for value in (camera_id, camera_type, resolution)]
+    if not all(fields):
+        raise ValueError("Camera ID, camera type and resolution are required")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError(f"Coordinates out of range: {latitude}, {longitude}")
+
+    camera_id, camera_type, resolution = fields
+    return (
+        f"{camera_id}_{timestamp.strftime('%Y%m%d%H%M%S')}_{latitude:.6f}_{longitude:.6f}"
+        f"_{camera_type}_{resolution}.mp4"
+    )
+
+
+def matches_time_range(timestamp: datetime, time_range: Optional[str]) -> bool:
+    """
+    Check whether a timestamp falls inside a named time range of the day.
+
+    Mirrors the SQL conditions used to filter the video object table.
+
+    Args:
+        timestamp: Video timestamp
+        time_range: "All Day", "Morning", "Afternoon", "Evening" or "Night"
+
+    Returns:
+        True if the timestamp is inside the time range
+    """
+    hour = timestamp.hour
+    if time_range == "Morning":
+        return 6 <= hour <= 11
+    if time_range == "Afternoon":
+        return 12 <= hour <= 17
+    if time_range == "Evening":
+        return 18 <= hour <= 21
+    if time_range == "Night":
+        return not 6 <= hour <= 21
+    return True
+
+
+def detection_offset_seconds(description: Optional[str], duration_seconds: Optional[float] = None) -> Optional[int]:
+    """
+    Find the first in-clip offset marked in an AI description.
+
+    Only explicitly marked offsets count, so a wall-clock time mentioned in
+    the description is not mistaken for a position in the video.
+
+    Args:
+        description: Summary of findings, e.g. "Enters at 00:01:23 into the clip, walking north"
+        duration_seconds: Length of the clip, when known; later offsets are clamped to its last second
+
+    Returns:
+        Offset from the start of the video in seconds, or None if no offset is marked
+    """
+    matches = [match for match in (pattern.search(description or "") for pattern in VIDEO_OFFSET_PATTERNS) if match]
+    if not matches:
+        return None
+    match = min(matches, key=lambda match: match.start())
+    hours, minutes, seconds = (int(group) if group else 0 for group in match.groups())
+    offset = hours * 3600 + minutes * 60 + seconds
+    if duration_seconds is not None:
+        offset = min(offset, max(0, int(duration_seconds) - 1))
+    return offset
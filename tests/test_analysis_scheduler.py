@@ -0,0 +1,196 @@
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from homeward.models.case import CasePriority
+from homeward.services.analysis_scheduler import AnalysisScheduler
+from homeward.utils.rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Test cases for the token bucket rate limiter"""
+
+    def test_bursts_up_to_capacity_then_refills(self):
+        """Test the bucket allows a burst and then the sustained rate"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert bucket.try_acquire() == 0.0
+
+    def test_cost_above_capacity_is_not_clamped(self):
+        """Test a job larger than the bucket is refused at once and paced by acquire"""
+        bucket = TokenBucket(rate=1000.0, capacity=5)
+
+        with pytest.raises(ValueError):
+            bucket.try_acquire(50)
+
+        waited = bucket.acquire(50)
+        assert waited == pytest.approx(0.045, abs=0.03)
+        assert bucket.available < 5
+
+    def test_per_minute_quota(self):
+        """Test per-minute quotas are converted to a per-second rate"""
+        bucket = TokenBucket.per_minute(120)
+
+        assert bucket.rate == 2.0
+        assert bucket.capacity == 2.0
+
+    def test_acquire_times_out(self):
+        """Test acquire raises when the wait would exceed the timeout"""
+        bucket = TokenBucket(rate=0.1, capacity=1)
+        bucket.acquire()
+
+        with pytest.raises(TimeoutError):
+            bucket.acquire(timeout=0.01)
+
+
+class TestAnalysisScheduler:
+    """Test cases for the priority-aware analysis scheduler"""
+
+    @pytest.fixture
+    def scheduler(self):
+        scheduler = AnalysisScheduler(max_concurrency=1, requests_per_minute=60000)
+        yield scheduler
+        scheduler.shutdown(wait=True)
+
+    def _block(self, scheduler):
+        """Occupy the only worker until the returned event is set"""
+        started, release = threading.Event(), threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait(5)
+
+        scheduler.submit("blocker", CasePriority.LOW, None, blocker)
+        assert started.wait(5)
+        return release
+
+    def test_high_priority_runs_first(self, scheduler):
+        """Test queued jobs run by case priority, then by time since disappearance"""
+        release = self._block(scheduler)
+        order = []
+        now = datetime.now()
+
+        futures = [
+            scheduler.submit("low", CasePriority.LOW, now, order.append, "low"),
+            scheduler.submit("medium-old", CasePriority.MEDIUM, now - timedelta(days=5), order.append, "medium-old"),
+            scheduler.submit("medium-recent", CasePriority.MEDIUM, now - timedelta(hours=2), order.append, "medium-recent"),
+            scheduler.submit("high", CasePriority.HIGH, now - timedelta(days=10), order.append, "high"),
+        ]
+        assert scheduler.metrics()["queue_depth_by_priority"] == {"High": 1, "Medium": 2, "Low": 1}
+
+        release.set()
+        for future in futures:
+            future.result(5)
+
+        assert order == ["high", "medium-recent", "medium-old", "low"]
+
+    def test_cases_share_slots_fairly(self, scheduler):
+        """Test a case with many queued jobs does not starve another case"""
+        release = self._block(scheduler)
+        order = []
+        last_seen = datetime.now() - timedelta(hours=1)
+
+        futures = [scheduler.submit("busy", CasePriority.MEDIUM, last_seen, order.append, f"busy-{i}") for i in range(3)]
+        futures.append(scheduler.submit("quiet", CasePriority.MEDIUM, last_seen, order.append, "quiet"))
+
+        release.set()
+        for future in futures:
+            future.result(5)
+
+        assert order == ["busy-0", "quiet", "busy-1", "busy-2"]
+
+    def test_waiting_jobs_are_promoted(self):
+        """Test aging promotes jobs that waited long enough"""
+        scheduler = AnalysisScheduler(max_concurrency=1, requests_per_minute=60000, aging_seconds=0.05)
+        try:
+            release = self._block(scheduler)
+            order = []
+            low = scheduler.submit("low", CasePriority.LOW, None, order.append, "low")
+            threading.Event().wait(0.12)
+            high = scheduler.submit("high", CasePriority.HIGH, None, order.append, "high")
+
+            release.set()
+            low.result(5)
+            high.result(5)
+
+            assert order == ["low", "high"]
+        finally:
+            scheduler.shutdown()
+
+    def test_failures_reach_the_caller_and_metrics(self, scheduler):
+        """Test job exceptions are set on the future and counted"""
+        future = scheduler.submit("case", CasePriority.HIGH, None, Mock(side_effect=RuntimeError("quota")))
+
+        with pytest.raises(RuntimeError, match="quota"):
+            future.result(5)
+
+        assert scheduler.submit("case", CasePriority.HIGH, None, lambda: 1).result(5) == 1
+        metrics = scheduler.metrics()
+        assert metrics["failed"] == 1
+        assert metrics["completed"] == 1
+        assert metrics["queue_depth"] == 0
+        assert metrics["wait_seconds"]["High"]["count"] == 2
+
+    def test_submit_analysis_costs_one_request_per_candidate(self, scheduler):
+        """Test the quota cost is the number of candidate videos"""
+        service = Mock()
+        service.resolve_candidate_uris.return_value = ["a.mp4", "b.mp4", "c.mp4"]
+        service.analyze_videos.return_value = ([], {"total_analyzed": 3})
+        case = Mock(id="case-1", priority=CasePriority.HIGH, last_seen_date=None)
+        request = Mock(case_id="case-1")
+
+        tokens_before = scheduler.rate_limiter.available
+        result = scheduler.submit_analysis(case, service, request, {"name": "Jane"}).result(5)
+
+        assert result == ([], {"total_analyzed": 3})
+        service.analyze_videos.assert_called_once_with(request, {"name": "Jane"})
+        assert scheduler.rate_limiter.available <= tokens_before - 3 + 0.5
+
+    def test_default_burst_is_a_minute_of_quota(self):
+        """Test a batch of one minute's quota is charged in full, not clamped to one second's"""
+        scheduler = AnalysisScheduler(max_concurrency=1, requests_per_minute=600)
+        try:
+            assert scheduler.rate_limiter.capacity == 600
+            scheduler.submit("case", CasePriority.HIGH, None, lambda: None, cost=500).result(5)
+            assert scheduler.rate_limiter.available < 110
+        finally:
+            scheduler.shutdown()
+
+    def test_ring_runner_queues_each_ring(self, scheduler):
+        """Test nearest-first rings run as scheduler jobs costing one request per video"""
+        case = Mock(id="case-1", priority=CasePriority.HIGH, last_seen_date=None)
+        ring = Mock(uris=["a.mp4", "b.mp4"])
+
+        tokens_before = scheduler.rate_limiter.available
+        result = scheduler.ring_runner(case)(ring, lambda: ([], {"total_analyzed": 2}))
+
+        assert result == ([], {"total_analyzed": 2})
+        assert scheduler.metrics()["completed"] == 1
+        assert scheduler.rate_limiter.available <= tokens_before - 2 + 0.5
+
+    def test_shutdown_cancels_pending_jobs(self, scheduler):
+        """Test queued jobs are cancelled on shutdown"""
+        release = self._block(scheduler)
+        pending = scheduler.submit("case", CasePriority.HIGH, None, lambda: None)
+
+        release.set()
+        scheduler.shutdown(wait=True, cancel_pending=True)
+
+        assert pending.cancelled() or pending.done()
+        with pytest.raises(RuntimeError):
+            scheduler.submit("case", CasePriority.HIGH, None, lambda: None)
@@ -0,0 +1,241 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from homeward.config import DataSource
+from homeward.services.gcs_service import (
+    METADATA_TTL_SECONDS,
+    MISSING_METADATA_TTL_SECONDS,
+    PARALLEL_UPLOAD_MIN_BYTES,
+    PREFIX_LISTING_MIN_OBJECTS,
+    RESUMABLE_CHUNK_SIZE,
+    SIGNED_URL_EXPIRATION_SECONDS,
+    SIGNED_URL_SAFETY_MARGIN_SECONDS,
+    GCSService,
+    parse_gcs_url,
+)
+from homeward.services.mock_gcs_service import MockGCSService
+from homeward.services.service_factory import create_gcs_service
+
+VIDEO_URL = "gs://test-processed/proxies/CAM-01_20250922093000_38.1334_13.3487_CCTV_854x480.mp4"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def gcs_service(test_config, clock):
+    """Create a GCS service with a mocked client and no service account key"""
+    test_config.service_account_key_path = None
+    with patch("homeward.services.gcs_service.storage.Client"), patch.dict("os.environ", {}, clear=True):
+        service = GCSService(test_config, clock=clock)
+    service.client = MagicMock()
+    blob = service.client.bucket.return_value.blob.return_value
+    blob.generate_signed_url.side_effect = lambda **kwargs: f"https://signed/{blob.generate_signed_url.call_count}"
+    service.client.bucket.return_value.get_blob.side_effect = lambda name: SimpleNamespace(
+        name=name, size=1024, content_type="video/mp4", generation=1,
+        time_created=datetime(2025, 9, 22), updated=datetime(2025, 9, 22),
+    )
+    return service
+
+
+class TestGCSUrls:
+    """Test cases for parsing gs:// URLs"""
+
+    def test_parse_gcs_url(self):
+        """Test bucket and object are split and malformed URLs rejected"""
+        assert parse_gcs_url("gs://bucket/path/file.mp4") == ("bucket", "path/file.mp4")
+        assert parse_gcs_url("https://bucket/file.mp4") is None
+        assert parse_gcs_url("gs://bucket") is None
+
+
+class TestGCSClient:
+    """Test cases for creating the storage client"""
+
+    def test_client_is_created_on_first_use(self, test_config):
+        """Test building the service needs no credentials until GCS is called"""
+        with patch("homeward.services.gcs_service.storage.Client") as client_class:
+            service = GCSService(test_config)
+            client_class.assert_not_called()
+
+            assert service.client is service.client
+            client_class.assert_called_once_with(project=test_config.bigquery_project_id)
+
+    def test_mock_mode_reads_no_bucket(self, test_config):
+        """Test the mock data source gets a GCS service that never creates a client"""
+        test_config.data_source = DataSource.MOCK
+        with patch("homeward.services.gcs_service.storage.Client") as client_class:
+            service = create_gcs_service(test_config)
+
+            assert isinstance(service, MockGCSService)
+            assert service.get_file_info(VIDEO_URL) is None
+            assert service.prefetch_metadata([VIDEO_URL]) == 0
+            client_class.assert_not_called()
+
+
+class TestSignedUrlCache:
+    """Test cases for the signed URL and object metadata caches"""
+
+    def test_signed_url_is_reused_until_the_safety_margin(self, gcs_service, clock):
+        """Test a URL is signed once and re-signed shortly before it expires"""
+        first = gcs_service.get_signed_url("test-processed", "a.mp4")
+        clock.now += SIGNED_URL_EXPIRATION_SECONDS - SIGNED_URL_SAFETY_MARGIN_SECONDS - 1
+        assert gcs_service.get_signed_url("test-processed", "a.mp4") == first
+
+        clock.now += 2
+        assert gcs_service.get_signed_url("test-processed", "a.mp4") != first
+
+        blob = gcs_service.client.bucket.return_value.blob.return_value
+        assert blob.generate_signed_url.call_count == 2
+        assert gcs_service.cache_stats()["signed_url_hits"] == 1
+
+    def test_cache_key_includes_method_and_headers(self, gcs_service):
+        """Test URLs signed for other methods or headers are not shared"""
+        get_url = gcs_service.get_signed_url("test-processed", "a.mp4")
+        head_url = gcs_service.get_signed_url("test-processed", "a.mp4", http_method="HEAD")
+        range_url = gcs_service.get_signed_url("test-processed", "a.mp4", headers={"Range": "bytes=0-99"})
+
+        assert len({get_url, head_url, range_url}) == 3
+        assert gcs_service.get_signed_url("test-processed", "a.mp4", headers={"range": "bytes=0-99"}) == range_url
+
+    def test_metadata_is_fetched_once_per_ttl(self, gcs_service, clock):
+        """Test existence checks are answered from the cached metadata"""
+        get_blob = gcs_service.client.bucket.return_value.get_blob
+
+        assert gcs_service.get_file_info(VIDEO_URL)["size"] == 1024
+        assert gcs_service.get_file_info(VIDEO_URL)["content_type"] == "video/mp4"
+        assert get_blob.call_count == 1
+
+        clock.now += METADATA_TTL_SECONDS
+        gcs_service.get_file_info(VIDEO_URL)
+        assert get_blob.call_count == 2
+
+    def test_missing_objects_are_checked_again_sooner(self, gcs_service, clock):
+        """Test a missing object is cached briefly, since it may still be uploading"""
+        get_blob = gcs_service.client.bucket.return_value.get_blob
+        get_blob.side_effect = None
+        get_blob.return_value = None
+
+        assert gcs_service.get_file_info(VIDEO_URL) is None
+        assert gcs_service.get_file_info(VIDEO_URL) is None
+        assert get_blob.call_count == 1
+
+        clock.now += MISSING_METADATA_TTL_SECONDS
+        gcs_service.get_file_info(VIDEO_URL)
+        assert get_blob.call_count == 2
+
+    @patch("homeward.services.gcs_service.ui")
+    def test_repeated_downloads_skip_head_and_signing(self, mock_ui, gcs_service):
+        """Test clicking a download link again reuses the metadata and the signed URL"""
+        gcs_service.download_video_file(VIDEO_URL)
+        gcs_service.download_video_file(VIDEO_URL)
+
+        assert gcs_service.client.bucket.return_value.get_blob.call_count == 1
+        assert gcs_service.client.bucket.return_value.blob.return_value.generate_signed_url.call_count == 1
+        assert mock_ui.download.call_count == 2
+        assert mock_ui.download.call_args_list[0] == mock_ui.download.call_args_list[1]
+
+
+class TestMetadataPrefetch:
+    """Test cases for the batched object metadata prefetch"""
+
+    def _blob(self, name, generation=1):
+        return SimpleNamespace(
+            name=name, size=2048, content_type="video/mp4", generation=generation,
+            time_created=datetime(2025, 9, 22), updated=datetime(2025, 9, 22),
+        )
+
+    def test_folders_are_listed_once(self, gcs_service):
+        """Test many objects of one folder are read with a single listing"""
+        names = [f"proxies/CAM-{i:02d}.mp4" for i in range(PREFIX_LISTING_MIN_OBJECTS)]
+        gcs_service.client.list_blobs.return_value = [self._blob(name) for name in names[1:]] + [
+            self._blob("proxies/unrelated.mp4")
+        ]
+
+        fetched = gcs_service.prefetch_metadata([f"gs://test-processed/{name}" for name in names])
+
+        assert fetched == len(names)
+        gcs_service.client.list_blobs.assert_called_once_with("test-processed", prefix="proxies/")
+        assert gcs_service.get_file_info(f"gs://test-processed/{names[1]}")["generation"] == 1
+        assert gcs_service.get_file_info(f"gs://test-processed/{names[0]}") is None
+        gcs_service.client.bucket.return_value.get_blob.assert_not_called()
+
+    def test_scattered_objects_use_batch_requests(self, gcs_service):
+        """Test objects in small folders are reloaded in batches of at most 100"""
+        urls = [f"gs://test-processed/camera-{i}/clip.mp4" for i in range(150)]
+        generations = iter(range(1, 150))
+
+        def make_blob(name):
+            blob = Mock()
+            blob.name = name
+            blob.generation = None
+            blob.reload.side_effect = lambda blob=blob: setattr(blob, "generation", next(generations, None))
+            return blob
+
+        gcs_service.client.bucket.return_value.blob.side_effect = make_blob
+
+        fetched = gcs_service.prefetch_metadata(urls + urls[:10])
+
+        assert gcs_service.client.batch.call_count == 2
+        gcs_service.client.batch.assert_called_with(raise_exception=False)
+        # The object whose sub-request failed is left to a per-file lookup
+        assert fetched == 149
+        assert gcs_service.prefetch_metadata(urls) == 0
+
+    def test_background_prefetch(self, gcs_service):
+        """Test the prefetch can run without blocking the caller"""
+        gcs_service.client.bucket.return_value.blob.side_effect = lambda name: SimpleNamespace(
+            name=name, generation=None, reload=Mock()
+        )
+
+        gcs_service.prefetch_metadata_in_background([VIDEO_URL]).join(timeout=5)
+
+        gcs_service.client.batch.assert_called_once()
+
+
+class TestUploads:
+    """Test cases for resumable and parallel uploads"""
+
+    def test_small_files_use_resumable_chunks(self, gcs_service, tmp_path):
+        """Test files below the parallel threshold are uploaded resumably and cached"""
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"\0" * 1024)
+        blob = gcs_service.client.bucket.return_value.blob.return_value
+        blob.configure_mock(name="clip.mp4", size=1024, generation=3)
+
+        uploaded = gcs_service.upload_file(str(path), "test-ingestion", "clip.mp4", metadata={"camera-id": "CAM-01"})
+
+        blob.upload_from_filename.assert_called_once_with(str(path), content_type="video/mp4")
+        assert blob.chunk_size == RESUMABLE_CHUNK_SIZE
+        assert blob.metadata == {"camera-id": "CAM-01"}
+        assert uploaded["generation"] == 3
+        assert gcs_service.get_object_metadata("test-ingestion", "clip.mp4") == uploaded
+        gcs_service.client.bucket.return_value.get_blob.assert_not_called()
+
+    def test_large_files_upload_parts_in_parallel(self, gcs_service, tmp_path):
+        """Test files above the threshold go through parallel part uploads"""
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"\0" * 1024)
+        blob = gcs_service.client.bucket.return_value.blob.return_value
+        blob.configure_mock(name="clip.mp4", size=1024, generation=4)
+
+        with patch("homeward.services.gcs_service.os.path.getsize", return_value=PARALLEL_UPLOAD_MIN_BYTES), \
+                patch("homeward.services.gcs_service.transfer_manager.upload_chunks_concurrently") as upload_parts:
+            gcs_service.upload_file(str(path), "test-ingestion", "clip.mp4", part_workers=4)
+
+        upload_parts.assert_called_once()
+        assert upload_parts.call_args.kwargs["max_workers"] == 4
+        blob.upload_from_filename.assert_not_called()
+        blob.reload.assert_called_once()
@@ -0,0 +1,438 @@
+import random
+import threading
+from unittest.mock import Mock, patch
+
+import googlemaps
+import pytest
+
+from homeward.models.case import Location
+from homeward.services.geocoding_service import (
+    BackgroundGeocoder,
+    GeocodingResult,
+    GeocodingService,
+    is_transient_maps_error,
+)
+from homeward.utils.gazetteer import Gazetteer, KDTree, normalize_place_name
+from homeward.utils.geo_utils import haversine_km
+from homeward.utils.geocoding_cache import (
+    DEFAULT_NEGATIVE_TTL_SECONDS,
+    DEFAULT_TTL_SECONDS,
+    GeocodingCache,
+    coordinates_key,
+    normalize_address,
+)
+
+STATION_RESPONSE = [{
+    "geometry": {"location": {"lat": 38.1097, "lng": 13.3697}, "location_type": "ROOFTOP"},
+    "formatted_address": "Piazza Giulio Cesare, 90127 Palermo PA, Italy",
+    "place_id": "station",
+}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "geocoding.sqlite3")
+
+
+# GeoNames postal code rows: country, postal code, place, admin1 name, admin1 code, admin2..3, lat, lon, accuracy
+GEONAMES_ROWS = [
+    "IT\t90133\tPalermo\tSicilia\t15\tPalermo\tPA\t\t\t38.1157\t13.3615\t4",
+    "IT\t90127\tPalermo\tSicilia\t15\tPalermo\tPA\t\t\t38.1097\t13.3697\t4",
+    "IT\t20121\tMilano\tLombardia\t09\tMilano\tMI\t\t\t45.4722\t9.1922\t4",
+    "CA\tM5V\tToronto\tOntario\tON\t\t\t\t\t43.6432\t-79.3957\t4",
+    "CA\tH2X\tMontréal\tQuebec\tQC\t\t\t\t\t45.5121\t-73.5668\t4",
+    "US\t62701\tSpringfield\tIllinois\tIL\t\t\t\t\t39.8017\t-89.6436\t4",
+    "US\t01101\tSpringfield\tMassachusetts\tMA\t\t\t\t\t42.1015\t-72.5898\t4",
+    "US\t20001\tWashington\tDistrict of Columbia\tDC\t\t\t\t\t38.9122\t-77.0177\t4",
+]
+COUNTRY_INFO = "#ISO\tISO3\tISO-Numeric\tfips\tCountry\nIT\tITA\t380\tIT\tItaly\nCA\tCAN\t124\tCA\tCanada\nUS\tUSA\t840\tUS\tUnited States\n"
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    directory = tmp_path / "gazetteer"
+    directory.mkdir()
+    (directory / "allCountries.txt").write_text("\n".join(GEONAMES_ROWS) + "\n", encoding="utf-8")
+    (directory / "countryInfo.txt").write_text(COUNTRY_INFO, encoding="utf-8")
+    return Gazetteer.from_geonames(str(directory))
+
+
+def create_service(test_config, cache: GeocodingCache) -> GeocodingService:
+    """Geocoding service with a mocked Google Maps client"""
+    service = GeocodingService(test_config, cache=cache)
+    service.client = Mock()
+    service.client.geocode.return_value = STATION_RESPONSE
+    service.client.reverse_geocode.return_value = STATION_RESPONSE
+    return service
+
+
+class TestAddressNormalization:
+    """Test cases for geocoding cache keys"""
+
+    def test_equivalent_addresses_share_a_key(self):
+        """Test case, whitespace, abbreviation dots and comma spacing do not change the key"""
+        assert normalize_address("Piazza  Giulio Cesare,Palermo") == "piazza giulio cesare, palermo"
+        assert normalize_address("1 Main St., Toronto") == normalize_address("1 main st ,  TORONTO")
+        assert normalize_address("Via Roma 12.5, Palermo") == "via roma 12.5, palermo"
+
+    def test_nearby_coordinates_share_a_key(self):
+        """Test reverse geocoding keys round coordinates to about 11 m"""
+        assert coordinates_key(38.10971, 13.36968) == coordinates_key(38.10968, 13.36972)
+        assert coordinates_key(38.1097, 13.3697) != coordinates_key(38.1107, 13.3697)
+
+
+class TestGeocodingCache:
+    """Test cases for the two-tier geocoding cache"""
+
+    def test_address_is_geocoded_once(self, test_config, cache_path, clock):
+        """Test repeated and equivalent addresses are served from memory"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+
+        first = service.geocode_address("Piazza Giulio Cesare", city="Palermo")
+        second = service.geocode_address("piazza giulio cesare ", city="PALERMO")
+
+        assert first == second
+        assert first.place_id == "station"
+        service.client.geocode.assert_called_once()
+        assert service.cache_stats()["memory_hits"] == 1
+        assert service.cache_stats()["hit_rate"] == 0.5
+
+    def test_results_survive_restarts(self, test_config, cache_path, clock):
+        """Test a new cache on the same file serves earlier results from disk"""
+        create_service(test_config, GeocodingCache(cache_path, clock=clock)).geocode_address("Piazza Giulio Cesare")
+
+        restarted = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+        result = restarted.geocode_address("Piazza Giulio Cesare")
+
+        assert result.latitude == 38.1097
+        restarted.client.geocode.assert_not_called()
+        assert restarted.cache_stats()["disk_hits"] == 1
+
+    def test_entries_expire(self, test_config, cache_path, clock):
+        """Test results are geocoded again after the TTL"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+        service.geocode_address("Piazza Giulio Cesare")
+
+        clock.now += DEFAULT_TTL_SECONDS
+        service.geocode_address("Piazza Giulio Cesare")
+
+        assert service.client.geocode.call_count == 2
+
+    def test_not_found_is_cached_for_less_time(self, test_config, cache_path, clock):
+        """Test addresses without results are cached, and retried after the negative TTL"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+        service.client.geocode.return_value = []
+
+        assert service.geocode_address("Nowhere 1") is None
+        assert service.geocode_address("Nowhere 1") is None
+        assert service.client.geocode.call_count == 1
+        assert service.cache_stats()["negative_hits"] == 1
+
+        clock.now += DEFAULT_NEGATIVE_TTL_SECONDS
+        service.geocode_address("Nowhere 1")
+        assert service.client.geocode.call_count == 2
+
+    def test_api_errors_are_not_cached(self, test_config, cache_path, clock):
+        """Test quota and transport errors are retried on the next call"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+        service.client.geocode.side_effect = [googlemaps.exceptions.Timeout(), STATION_RESPONSE]
+
+        assert service.geocode_address("Piazza Giulio Cesare") is None
+        assert service.geocode_address("Piazza Giulio Cesare").place_id == "station"
+
+    def test_reverse_geocoding_reuses_nearby_results(self, test_config, cache_path, clock):
+        """Test coordinates a few metres apart share the address and keep their own coordinates"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+
+        service.reverse_geocode(38.10971, 13.36968)
+        nearby = service.reverse_geocode(38.10968, 13.36972)
+
+        service.client.reverse_geocode.assert_called_once()
+        assert (nearby.latitude, nearby.longitude) == (38.10968, 13.36972)
+        assert nearby.formatted_address == STATION_RESPONSE[0]["formatted_address"]
+
+    def test_purge_expired(self, cache_path, clock):
+        """Test expired found and not found entries are removed from disk"""
+        cache = GeocodingCache(cache_path, clock=clock)
+        cache.put("address:found", {"latitude": 1.0})
+        cache.put("address:missing", None)
+
+        clock.now += DEFAULT_NEGATIVE_TTL_SECONDS
+        assert cache.purge_expired() == 1
+        clock.now += DEFAULT_TTL_SECONDS
+        assert cache.purge_expired() == 1
+
+
+class TestBatchGeocoding:
+    """Test cases for concurrent batch geocoding"""
+
+    @pytest.fixture(autouse=True)
+    def no_retry_delay(self):
+        with patch("homeward.services.geocoding_service.GEOCODE_RETRY_BASE_DELAY_SECONDS", 0.0):
+            yield
+
+    def test_duplicates_are_geocoded_once(self, test_config, cache_path, clock):
+        """Test equivalent addresses share one API call and every index gets a result"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+        addresses = [
+            "Piazza Giulio Cesare, Palermo",
+            {"address": "piazza giulio cesare", "city": "PALERMO"},
+            "Via Roma 1, Palermo",
+            "",
+        ]
+
+        results = dict(service.geocode_batch(addresses))
+
+        assert sorted(results) == [0, 1, 2, 3]
+        assert results[0] == results[1]
+        assert results[3] is None
+        assert service.client.geocode.call_count == 2
+
+    def test_cached_addresses_skip_the_api(self, test_config, cache_path, clock):
+        """Test addresses geocoded before are yielded from the cache"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+        service.geocode_address("Piazza Giulio Cesare")
+        service.client.geocode.reset_mock()
+
+        assert list(service.geocode_batch(["Piazza Giulio Cesare"]))[0][1].place_id == "station"
+        service.client.geocode.assert_not_called()
+
+    def test_transient_errors_are_retried(self, test_config, cache_path, clock):
+        """Test quota errors are retried within the rate limit, invalid requests are not"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+        service.rate_limiter = Mock()
+        busy_calls = []
+
+        def geocode(address):
+            if address == "Invalid":
+                raise googlemaps.exceptions.ApiError("INVALID_REQUEST")
+            if len(busy_calls) < 2:
+                busy_calls.append(address)
+                raise googlemaps.exceptions.ApiError("OVER_QUERY_LIMIT")
+            return STATION_RESPONSE
+
+        service.client.geocode.side_effect = geocode
+
+        results = dict(service.geocode_batch(["Busy", "Invalid"], max_workers=1))
+
+        assert results[0].place_id == "station"
+        assert results[1] is None
+        # Two rate-limited attempts and one success for "Busy", one attempt for "Invalid"
+        assert service.rate_limiter.acquire.call_count == 4
+        # Errors are not cached, successes are
+        assert service.cache.get("address:invalid") is None
+        assert service.cache.get("address:busy") is not None
+
+    def test_results_are_streamed_as_they_complete(self, test_config, cache_path, clock):
+        """Test a fast address is yielded while a slow one is still in flight"""
+        service = create_service(test_config, GeocodingCache(cache_path, clock=clock))
+        release = threading.Event()
+
+        def geocode(address):
+            if address == "Slow":
+                release.wait(5)
+            return STATION_RESPONSE
+
+        service.client.geocode.side_effect = geocode
+
+        results = service.geocode_batch(["Slow", "Fast"], max_workers=2)
+        assert next(results)[0] == 1
+        release.set()
+        assert next(results)[0] == 0
+
+    def test_transient_error_classification(self):
+        """Test which Maps failures are worth retrying"""
+        assert is_transient_maps_error(googlemaps.exceptions.ApiError("OVER_QUERY_LIMIT"))
+        assert is_transient_maps_error(googlemaps.exceptions.HTTPError(503))
+        assert is_transient_maps_error(googlemaps.exceptions.Timeout())
+        assert not is_transient_maps_error(googlemaps.exceptions.ApiError("REQUEST_DENIED"))
+        assert not is_transient_maps_error(googlemaps.exceptions.HTTPError(400))
+
+
+class TestGazetteer:
+    """Test cases for the offline gazetteer"""
+
+    def test_postal_codes_match_by_longest_prefix(self, gazetteer):
+        """Test a full postal code resolves to its indexed area, with spacing and case ignored"""
+        assert gazetteer.lookup(postal_code="90133").latitude == 38.1157
+        assert gazetteer.lookup(postal_code="m5v 3a8").name == "Toronto"
+        assert gazetteer.lookup(postal_code="20001-1234", country="USA").name == "Washington"
+        assert gazetteer.lookup(postal_code="99") is None
+
+    def test_city_postal_codes_merge_into_one_place(self, gazetteer):
+        """Test a city with several postal codes resolves to their centre"""
+        place = gazetteer.lookup(city="PALERMO", country="Italy")
+
+        assert place.latitude == pytest.approx(38.1127)
+        assert place.label == "Palermo, Sicilia, IT"
+
+    def test_scattered_and_unknown_places_have_no_answer(self, gazetteer):
+        """Test names far apart are ambiguous unless the postal code or admin area settles them"""
+        assert gazetteer.lookup(city="Springfield") is None
+        assert gazetteer.lookup(city="Springfield", postal_code="62701").admin_name == "Illinois"
+        assert gazetteer.lookup(city="Palermo", country="Canada") is None
+        assert gazetteer.lookup(city="Atlantis") is None
+
+    def test_names_ignore_accents_and_punctuation(self, gazetteer):
+        """Test normalized names match across spellings"""
+        assert normalize_place_name("Saint-Jérôme") == "saint jerome"
+        assert gazetteer.lookup(city="montreal", country="CA").name == "Montréal"
+
+    def test_free_text_search(self, gazetteer):
+        """Test free-text addresses resolve through their town or postal code"""
+        assert gazetteer.search("Via Roma 1, Milano, Italy").name == "Milano"
+        assert gazetteer.search("Piazza Giulio Cesare, 90127").postal_code == "90127"
+        assert gazetteer.search("Nowhere Street") is None
+
+    def test_prefix_completion(self, gazetteer):
+        """Test place names are completed from a prefix within a country"""
+        assert gazetteer.complete("mil") == ["Milano"]
+        assert gazetteer.complete("s", country="US") == ["Springfield"]
+
+    def test_nearest_place(self, gazetteer):
+        """Test reverse lookups name the closest place within range"""
+        assert gazetteer.nearest(38.9, -77.03).name == "Washington"
+        assert gazetteer.nearest(0.0, -30.0) is None
+
+    def test_kd_tree_matches_linear_scan(self):
+        """Test nearest neighbours agree with a brute-force search, across the antimeridian too"""
+        rng = random.Random(7)
+        points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(500)]
+        tree = KDTree(points)
+
+        for latitude, longitude in [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(50)] + [(0, 179.99)]:
+            expected = min(range(len(points)), key=lambda i: haversine_km(latitude, longitude, *points[i]))
+            position, distance = tree.nearest(latitude, longitude)
+            assert position == expected
+            assert distance == pytest.approx(haversine_km(latitude, longitude, *points[expected]), rel=1e-6)
+
+
+class TestOfflineGeocoding:
+    """Test cases for geocoding with the gazetteer"""
+
+    def test_towns_and_postal_codes_skip_the_api(self, test_config, gazetteer):
+        """Test addresses without a street are answered offline"""
+        service = create_service(test_config, GeocodingCache(None))
+        service.gazetteer = gazetteer
+
+        result = service.geocode_address("", city="Palermo", country="Italy", postal_code="90133")
+
+        assert (result.latitude, result.longitude) == (38.1157, 13.3615)
+        assert result.place_id == "gazetteer:IT:90133"
+        assert result.accuracy == "APPROXIMATE"
+        service.client.geocode.assert_not_called()
+
+    def test_streets_use_the_api(self, test_config, gazetteer):
+        """Test street addresses are still geocoded online"""
+        service = create_service(test_config, GeocodingCache(None))
+        service.gazetteer = gazetteer
+
+        assert service.geocode_address("Piazza Giulio Cesare", city="Palermo").place_id == "station"
+
+    def test_gazetteer_answers_without_the_api(self, test_config, gazetteer):
+        """Test cases keep approximate coordinates without an API key, or when the API fails"""
+        offline = GeocodingService(test_config, cache=GeocodingCache(None), gazetteer=gazetteer)
+        assert offline.geocode_address("Via Roma 1", city="Milano", country="IT").latitude == 45.4722
+        assert offline.geocode_address("Via Roma 1, Milano").latitude == 45.4722
+        assert offline.reverse_geocode(38.9, -77.03).formatted_address == "20001 Washington, District of Columbia, US"
+
+        failing = create_service(test_config, GeocodingCache(None))
+        failing.gazetteer = gazetteer
+        failing.client.geocode.side_effect = googlemaps.exceptions.Timeout()
+        assert failing.geocode_address("Via Roma 1", city="Palermo").latitude == pytest.approx(38.1127)
+
+    def test_batch_uses_the_gazetteer(self, test_config, gazetteer):
+        """Test batch geocoding answers towns offline and falls back on addresses not found"""
+        service = create_service(test_config, GeocodingCache(None))
+        service.gazetteer = gazetteer
+        service.client.geocode.return_value = []
+
+        results = dict(service.geocode_batch([{"city": "Toronto"}, {"address": "Via Roma 1", "city": "Milano"}]))
+
+        assert results[0].formatted_address == "Toronto, Ontario, CA"
+        assert results[1].latitude == 45.4722
+        service.client.geocode.assert_called_once()
+
+    def test_missing_gazetteer_is_ignored(self, test_config, tmp_path):
+        """Test an unreadable gazetteer path leaves geocoding online only"""
+        test_config.gazetteer_path = str(tmp_path / "missing.txt")
+
+        assert GeocodingService(test_config, cache=GeocodingCache(None)).gazetteer is None
+
+    def test_corrupt_gazetteer_is_ignored(self, test_config, tmp_path):
+        """Test a gazetteer that cannot be parsed leaves geocoding online only"""
+        corrupt = tmp_path / "corrupt.txt"
+        corrupt.write_bytes(b"IT\t00118\tRoma\xff\xfe\n")
+        test_config.gazetteer_path = str(corrupt)
+
+        assert GeocodingService(test_config, cache=GeocodingCache(None)).gazetteer is None
+
+
+class TestBackgroundGeocoder:
+    """Test cases for geocoding submitted locations off the request path"""
+
+    @pytest.fixture
+    def location(self):
+        return Location(address="Piazza Giulio Cesare", city="Palermo", country="Italy", postal_code=None)
+
+    def test_save_waits_for_the_lookup(self, location):
+        """Test the coordinates of a slow lookup are saved once it finishes"""
+        release = threading.Event()
+        geocoding_service = Mock()
+        geocoding_service.geocode_address.side_effect = lambda *args: release.wait(5) and GeocodingResult(
+            38.1097, 13.3697, "Piazza Giulio Cesare"
+        )
+        geocoder = BackgroundGeocoder(geocoding_service)
+        save = Mock(return_value=True)
+
+        lookup = geocoder.start(location)
+        assert not geocoder.apply_if_ready(lookup, location, timeout=0)
+        saved = geocoder.save_when_ready(lookup, save, "case 1")
+        release.set()
+
+        assert saved.result(5)
+        save.assert_called_once_with(38.1097, 13.3697)
+        geocoding_service.geocode_address.assert_called_once_with("Piazza Giulio Cesare", "Palermo", "Italy", None)
+
+    def test_pending_saves_do_not_hold_workers(self, location):
+        """Test a save waiting on a slow lookup leaves the other workers free for new lookups"""
+        release = threading.Event()
+        slow_result = GeocodingResult(38.1097, 13.3697, "Piazza Giulio Cesare")
+        geocoding_service = Mock()
+        calls = iter([lambda: release.wait(5) and slow_result, lambda: GeocodingResult(45.4642, 9.19, "Milano")])
+        geocoding_service.geocode_address.side_effect = lambda *args: next(calls)()
+        geocoder = BackgroundGeocoder(geocoding_service, max_workers=2)
+        save = Mock(return_value=True)
+
+        saved = geocoder.save_when_ready(geocoder.start(location), save, "case 1")
+        assert geocoder.start(location).result(5).formatted_address == "Milano"
+        release.set()
+
+        assert saved.result(5)
+        save.assert_called_once_with(38.1097, 13.3697)
+
+    def test_failures_are_not_saved(self, location):
+        """Test lookups without result or raising leave the record alone"""
+        geocoding_service = Mock()
+        geocoding_service.geocode_address.side_effect = [None, RuntimeError("quota")]
+        geocoder = BackgroundGeocoder(geocoding_service, max_workers=1)
+        save = Mock(return_value=True)
+
+        assert not geocoder.save_when_ready(geocoder.start(location), save, "case 1").result(5)
+        failed = geocoder.start(location)
+        assert not geocoder.apply_if_ready(failed, location)
+        assert not geocoder.save_when_ready(failed, save, "case 2").result(5)
+        save.assert_not_called()
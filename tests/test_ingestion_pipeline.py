@@ -0,0 +1,187 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from homeward.services.ingestion_pipeline import (
+    CameraInfo,
+    VideoIngestionPipeline,
+    export_timestamp,
+    ingestion_filename,
+    load_camera_manifest,
+)
+from homeward.utils.video_utils import format_video_filename, parse_video_filename
+
+CONVENTION_NAME = "CUSTOM-RED_20250922093000_38.133391_13.348721_PHONE_1920x1080.mp4"
+CAMERAS = {"lobby": CameraInfo("LOBBY-1", 38.1157, 13.3615, "CCTV", "1280x720")}
+
+
+@pytest.fixture
+def export_dir(tmp_path):
+    """A camera export with a clip following the convention, a raw clip and a clip of an unknown camera"""
+    source = tmp_path / "export"
+    (source / "lobby").mkdir(parents=True)
+    (source / "garage").mkdir()
+    (source / CONVENTION_NAME).write_bytes(b"\0" * 10)
+    (source / "lobby" / "rec_2025-09-22_18-30-00.mp4").write_bytes(b"\0" * 20)
+    (source / "garage" / "rec_2025-09-22_18-30-00.mp4").write_bytes(b"\0" * 30)
+    (source / "lobby" / "notes.txt").write_text("not a video")
+    return source
+
+
+@pytest.fixture
+def gcs_service():
+    service = Mock()
+    service.upload_file.side_effect = lambda path, bucket, name, metadata=None: {
+        "name": name, "size": Path(path).stat().st_size, "updated": datetime(2025, 9, 23, 8, 0),
+    }
+    return service
+
+
+@pytest.fixture
+def catalog():
+    catalog = Mock()
+    catalog.register_videos.side_effect = lambda videos: {
+        "success": True, "rows_modified": len(videos), "message": "registered"
+    }
+    catalog.refresh_video_catalog.return_value = {"success": True, "rows_modified": 0, "message": "refreshed"}
+    catalog.refresh_video_people_inventory.return_value = {"success": True, "rows_modified": 3, "message": "inventoried"}
+    return catalog
+
+
+@pytest.fixture
+def pipeline(test_config, gcs_service, catalog, tmp_path):
+    return VideoIngestionPipeline(
+        test_config, gcs_service, catalog, str(tmp_path / "checkpoint.jsonl"), max_workers=2
+    )
+
+
+class TestIngestionNaming:
+    """Test cases for renaming camera exports to the naming convention"""
+
+    def test_format_is_the_inverse_of_parse(self):
+        """Test a formatted filename parses back to its fields, with separators removed from text fields"""
+        name = format_video_filename("CAM 01_B", datetime(2025, 9, 22, 9, 30), 38.1, 13.3, "CCTV", "1920x1080")
+        video = parse_video_filename(name)
+
+        assert name == "CAM-01-B_20250922093000_38.100000_13.300000_CCTV_1920x1080.mp4"
+        assert (video.camera_id, video.timestamp, video.latitude) == ("CAM-01-B", datetime(2025, 9, 22, 9, 30), 38.1)
+
+    def test_invalid_coordinates_are_rejected(self):
+        """Test coordinates outside the globe cannot be encoded"""
+        with pytest.raises(ValueError):
+            format_video_filename("CAM", datetime(2025, 9, 22), 123.0, 13.3, "CCTV", "1920x1080")
+
+    def test_clips_take_their_camera_from_the_folder(self, export_dir):
+        """Test raw clips are named from the manifest camera of their folder and the time in their name"""
+        name = ingestion_filename(export_dir / "lobby" / "rec_2025-09-22_18-30-00.mp4", CAMERAS)
+
+        assert name == "LOBBY-1_20250922183000_38.115700_13.361500_CCTV_1280x720.mp4"
+        assert ingestion_filename(export_dir / CONVENTION_NAME, {}) == CONVENTION_NAME
+        with pytest.raises(ValueError):
+            ingestion_filename(export_dir / "garage" / "rec_2025-09-22_18-30-00.mp4", CAMERAS)
+
+    def test_resolution_is_probed_when_not_in_the_manifest(self, export_dir):
+        """Test ffprobe fills in the resolution missing from the manifest"""
+        cameras = {"lobby": CameraInfo("LOBBY-1", 38.1157, 13.3615, "CCTV")}
+        with patch("homeward.services.ingestion_pipeline.probe_resolution", return_value="640x360"):
+            name = ingestion_filename(export_dir / "lobby" / "rec_2025-09-22_18-30-00.mp4", cameras)
+
+        assert name.endswith("_CCTV_640x360.mp4")
+
+    def test_timestamp_falls_back_to_modification_time(self, tmp_path):
+        """Test clips without a time in their name use their modification time"""
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"")
+
+        assert export_timestamp(path) == datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+
+    def test_load_camera_manifest(self, tmp_path):
+        """Test the manifest CSV is read with an optional resolution"""
+        manifest = tmp_path / "cameras.csv"
+        manifest.write_text("camera_id,latitude,longitude,camera_type,resolution\nlobby,38.1,13.3,CCTV,\n")
+
+        assert load_camera_manifest(str(manifest)) == {"lobby": CameraInfo("lobby", 38.1, 13.3, "CCTV")}
+
+
+class TestVideoIngestionPipeline:
+    """Test cases for uploading, checkpointing and cataloging clips"""
+
+    def test_run_uploads_renamed_clips_with_metadata(self, pipeline, export_dir, gcs_service, catalog):
+        """Test valid clips are uploaded under their convention name and registered in the catalog"""
+        result = pipeline.run(str(export_dir), CAMERAS)
+
+        assert result["rows_modified"] == 2
+        assert result["success"]
+        assert "1 skipped" in result["message"]
+
+        names = {call.args[2]: call.kwargs["metadata"] for call in gcs_service.upload_file.call_args_list}
+        assert set(names) == {CONVENTION_NAME, "LOBBY-1_20250922183000_38.115700_13.361500_CCTV_1280x720.mp4"}
+        assert names[CONVENTION_NAME]["camera-id"] == "CUSTOM-RED"
+
+        registered = catalog.register_videos.call_args.args[0]
+        assert {video["uri"] for video in registered} == {f"gs://test-ingestion/{name}" for name in names}
+        assert registered[0]["updated"] == datetime(2025, 9, 23, 8, 0)
+
+    def test_interrupted_runs_resume_from_the_checkpoint(self, test_config, export_dir, gcs_service, catalog, tmp_path):
+        """Test a new run skips the clips already uploaded, and uploads them again when they change"""
+        checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+        VideoIngestionPipeline(test_config, gcs_service, catalog, checkpoint_path).run(str(export_dir), CAMERAS, limit=1)
+        assert gcs_service.upload_file.call_count == 1
+
+        resumed = VideoIngestionPipeline(test_config, gcs_service, catalog, checkpoint_path)
+        assert resumed.run(str(export_dir), CAMERAS)["rows_modified"] == 1
+        assert resumed.run(str(export_dir), CAMERAS)["rows_modified"] == 0
+
+        (export_dir / CONVENTION_NAME).write_bytes(b"\0" * 11)
+        assert resumed.run(str(export_dir), CAMERAS)["rows_modified"] == 1
+
+    def test_failed_registrations_are_retried_by_the_next_run(
+        self, test_config, export_dir, gcs_service, catalog, tmp_path
+    ):
+        """Test clips uploaded while the catalog was unavailable are registered later"""
+        checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+        catalog.register_videos.side_effect = None
+        catalog.register_videos.return_value = {"success": False, "rows_modified": 0, "message": "quota exceeded"}
+        assert not VideoIngestionPipeline(test_config, gcs_service, catalog, checkpoint_path).run(
+            str(export_dir), CAMERAS
+        )["success"]
+
+        catalog.register_videos.return_value = {"success": True, "rows_modified": 2, "message": "registered"}
+        result = VideoIngestionPipeline(test_config, gcs_service, catalog, checkpoint_path).run(str(export_dir), CAMERAS)
+
+        assert result["success"] and result["rows_modified"] == 0
+        assert len(catalog.register_videos.call_args.args[0]) == 2
+        last_entries = {}
+        for line in Path(checkpoint_path).read_text().splitlines():
+            entry = json.loads(line)
+            last_entries[entry["source"]] = entry
+        assert all(entry["cataloged"] for entry in last_entries.values())
+
+    def test_uploads_refresh_the_catalog_and_people_inventory(self, pipeline, export_dir, catalog):
+        """Test new clips are indexed after the upload, and runs without uploads skip the refresh"""
+        catalog.refresh_video_people_inventory.return_value = {
+            "success": False, "rows_modified": 0, "message": "inventory quota exceeded"
+        }
+
+        result = pipeline.run(str(export_dir), CAMERAS)
+
+        catalog.refresh_video_catalog.assert_called_once()
+        catalog.refresh_video_people_inventory.assert_called_once()
+        assert not result["success"]
+        assert "inventory quota exceeded" in result["message"]
+
+        pipeline.run(str(export_dir), CAMERAS)
+        catalog.refresh_video_catalog.assert_called_once()
+
+    def test_upload_failures_are_reported(self, pipeline, export_dir, gcs_service):
+        """Test a failing upload does not stop the others and fails the run"""
+        gcs_service.upload_file.side_effect = [RuntimeError("connection reset"), {"size": 10, "updated": None}]
+
+        result = pipeline.run(str(export_dir), CAMERAS)
+
+        assert not result["success"]
+        assert result["rows_modified"] == 1
+        assert "1 failed" in result["message"]
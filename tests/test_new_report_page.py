@@ -1,6 +1,25 @@
+import threading
 from unittest.mock import Mock, patch
 
 from homeward.models.case import CasePriority, Location
+from homeward.services.geocoding_service import BackgroundGeocoder, GeocodingResult
+from homeward.services.mock_data_service import MockDataService
+
+REPORT_FORM = {
+    "name": "John",
+    "surname": "Doe",
+    "date_of_birth": "1994-01-15",
+    "gender": "Male",
+    "last_seen_address": "123 Main St",
+    "city": "Toronto",
+    "country": "Canada",
+    "circumstances": "Left for work and never returned",
+    "reporter_name": "Jane Doe",
+    "reporter_phone": "416-555-0123",
+    "relationship": "Sister",
+    "case_number": "MP-GEO-1",
+}
+TORONTO = GeocodingResult(latitude=43.6426, longitude=-79.3871, formatted_address="123 Main St, Toronto")
 
 
 class TestNewReportPage:
@@ -96,6 +115,44 @@ class TestNewReportPage:
         assert "Error submitting report:" in call_args[0][0]
         assert call_args[1]["type"] == "negative"
 
+    @patch("homeward.ui.pages.new_report.ui")
+    def test_quick_geocoding_is_saved_with_the_case(self, mock_ui, test_config):
+        """Test coordinates known before the write are part of it, with no follow-up update"""
+        from homeward.ui.pages.new_report import handle_form_submission
+
+        data_service = MockDataService()
+        geocoding_service = Mock()
+        geocoding_service.geocode_address.return_value = TORONTO
+        geocoder = BackgroundGeocoder(geocoding_service)
+
+        with patch.object(data_service, "update_case_coordinates") as update:
+            handle_form_submission(dict(REPORT_FORM), data_service, test_config, None, None, geocoder)
+            geocoder.pool.shutdown(wait=True)
+
+        assert data_service.get_case_by_id("MP-GEO-1").last_seen_location.latitude == 43.6426
+        update.assert_not_called()
+
+    @patch("homeward.ui.pages.new_report.ui")
+    def test_slow_geocoding_does_not_delay_the_write(self, mock_ui, test_config):
+        """Test the case is stored before the address is geocoded, and its coordinates are patched in afterwards"""
+        from homeward.ui.pages.new_report import handle_form_submission
+
+        data_service = MockDataService()
+        release = threading.Event()
+        geocoding_service = Mock()
+        geocoding_service.geocode_address.side_effect = lambda *args: release.wait(5) and TORONTO
+        geocoder = BackgroundGeocoder(geocoding_service)
+
+        handle_form_submission(dict(REPORT_FORM), data_service, test_config, None, None, geocoder)
+
+        case = data_service.get_case_by_id("MP-GEO-1")
+        assert not case.last_seen_location.has_coordinates()
+        mock_ui.notify.assert_called_with("Missing person report submitted successfully!", type="positive")
+
+        release.set()
+        geocoder.pool.shutdown(wait=True)
+        assert (case.last_seen_location.latitude, case.last_seen_location.longitude) == (43.6426, -79.3871)
+
     def test_case_creation_from_form_data(self):
         """Test that MissingPersonCase is created correctly from form data"""
 
@@ -0,0 +1,150 @@
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from homeward.models.video_analysis import VideoAnalysisRequest
+from homeward.services.bigquery_video_analysis_service import (
+    BigQueryVideoAnalysisService,
+)
+from homeward.services.proxy_pipeline import ProxyTranscodingPipeline
+from homeward.utils.ffmpeg_utils import PROXY_TIERS, build_proxy_command, proxy_filename
+from homeward.utils.video_utils import parse_video_filename
+
+SOURCE_NAME = "CUSTOM-RED_20250922093000_38.133391_13.348721_PHONE_1920x1080.mp4"
+
+
+class TestProxyNaming:
+    """Test cases for proxy filenames and ffmpeg commands"""
+
+    def test_proxy_keeps_the_naming_convention(self):
+        """Test only the resolution field of the filename changes"""
+        proxy_name = proxy_filename(SOURCE_NAME, PROXY_TIERS["480p"])
+
+        assert proxy_name == "CUSTOM-RED_20250922093000_38.133391_13.348721_PHONE_854x480.mp4"
+        original, proxy = parse_video_filename(SOURCE_NAME), parse_video_filename(proxy_name)
+        assert (proxy.camera_id, proxy.timestamp, proxy.latitude) == (original.camera_id, original.timestamp, original.latitude)
+
+    def test_proxy_never_upscales(self):
+        """Test sources below the tier height keep their resolution"""
+        name = "CAM_20250922093000_38.1_13.3_CCTV_640x360.mp4"
+
+        assert proxy_filename(name, PROXY_TIERS["720p"]).endswith("_640x360.mp4")
+
+    def test_invalid_filename_is_rejected(self):
+        """Test videos without encoded metadata cannot be proxied"""
+        with pytest.raises(ValueError):
+            proxy_filename("holiday.mp4", PROXY_TIERS["480p"])
+
+    def test_command_downscales_and_drops_audio(self):
+        """Test the ffmpeg command applies the tier height and frame rate"""
+        command = build_proxy_command("in.mp4", "out.mp4", PROXY_TIERS["360p"])
+
+        assert command[command.index("-vf") + 1] == "scale=-2:'min(360,ih)',fps=1"
+        assert "-an" in command
+        assert command[-1] == "out.mp4"
+
+
+class TestProxyTranscodingPipeline:
+    """Test cases for the ingestion to processed bucket proxy pipeline"""
+
+    @pytest.fixture
+    def pipeline(self, test_config):
+        test_config.gcs_bucket_ingestion = "ingestion"
+        test_config.gcs_bucket_processed = "processed"
+        with patch("homeward.services.proxy_pipeline.storage.Client"):
+            pipeline = ProxyTranscodingPipeline(test_config, PROXY_TIERS["480p"], max_processes=0)
+        pipeline.client = Mock()
+        return pipeline
+
+    def _listings(self, pipeline, ingestion, processed):
+        def list_blobs(bucket):
+            names = ingestion if bucket == "ingestion" else processed
+            return [SimpleNamespace(name=name) for name in names]
+
+        pipeline.client.bucket.side_effect = lambda name: name
+        pipeline.client.list_blobs.side_effect = list_blobs
+
+    def test_pending_skips_existing_proxies(self, pipeline):
+        """Test only videos without a proxy of the tier are pending"""
+        other = "CUSTOM-GREEN_20250922093000_38.133391_13.348721_PHONE_1920x1080.mp4"
+        self._listings(
+            pipeline,
+            [SOURCE_NAME, other, "notes.txt", "holiday.mp4"],
+            [proxy_filename(other, PROXY_TIERS["480p"])],
+        )
+
+        assert pipeline.pending_videos() == [(SOURCE_NAME, proxy_filename(SOURCE_NAME, PROXY_TIERS["480p"]))]
+
+    def test_run_uploads_proxy_with_metadata(self, pipeline):
+        """Test each proxy is uploaded with the filename metadata the object table filters use"""
+        proxy_name = proxy_filename(SOURCE_NAME, PROXY_TIERS["480p"])
+        pipeline.pending_videos = Mock(return_value=[(SOURCE_NAME, proxy_name)])
+
+        source_blob = Mock(metadata={"video-id": "v1"})
+        source_blob.name = SOURCE_NAME
+        proxy_blob = Mock()
+        buckets = {"ingestion": Mock(), "processed": Mock()}
+        buckets["ingestion"].blob.return_value = source_blob
+        buckets["processed"].blob.return_value = proxy_blob
+        pipeline.client.bucket.side_effect = buckets.get
+        source_blob.download_to_filename.side_effect = lambda path: Path(path).write_bytes(b"original")
+
+        def fake_transcode(source_path, output_path, tier, ffmpeg_binary):
+            Path(output_path).write_bytes(b"proxy")
+            return output_path
+
+        with patch("homeward.services.proxy_pipeline.transcode_proxy", side_effect=fake_transcode):
+            result = pipeline.run()
+
+        assert result["success"] is True
+        assert result["rows_modified"] == 1
+        buckets["processed"].blob.assert_called_once_with(proxy_name)
+        assert proxy_blob.metadata["resolution"] == "854x480"
+        assert proxy_blob.metadata["timestamp"] == "20250922093000"
+        assert proxy_blob.metadata["video-id"] == "v1"
+        assert proxy_blob.metadata["source-uri"] == f"gs://ingestion/{SOURCE_NAME}"
+        proxy_blob.upload_from_filename.assert_called_once()
+
+    def test_run_reports_failures(self, pipeline):
+        """Test a failed transcode is reported without stopping the other videos"""
+        pipeline.pending_videos = Mock(return_value=[(SOURCE_NAME, proxy_filename(SOURCE_NAME, PROXY_TIERS["480p"]))])
+
+        with patch("homeward.services.proxy_pipeline.transcode_proxy", side_effect=RuntimeError("ffmpeg failed")):
+            result = pipeline.run()
+
+        assert result["success"] is False
+        assert "1 failed" in result["message"]
+
+
+class TestProxyObjectTable:
+    """Test cases for analyzing the proxies through their own object table"""
+
+    def test_queries_use_the_configured_video_table(self, test_config):
+        """Test analysis can point at a proxy object table through the configuration"""
+        test_config.bigquery_video_table = "video_proxies"
+        with patch("homeward.services.bigquery_video_analysis_service.bigquery.Client"):
+            service = BigQueryVideoAnalysisService(test_config)
+        request = VideoAnalysisRequest(
+            case_id="MP001",
+            start_date=datetime(2025, 9, 22),
+            end_date=datetime(2025, 9, 22),
+            time_range="All Day",
+            search_radius_km=5.0,
+            last_seen_latitude=38.133391,
+            last_seen_longitude=13.348721,
+        )
+
+        query = service._build_video_analysis_query(request, "prompt")
+
+        assert ".video_proxies`" in query
+        assert "video_objects" not in query
+
+    def test_object_table_ddl_reads_the_processed_bucket(self):
+        """Test the proxy object table is defined over the processed bucket"""
+        ddl = (Path(__file__).parents[1] / "sql" / "proxies" / "create_video_proxies_object_table.sql").read_text()
+
+        assert "CREATE EXTERNAL TABLE IF NOT EXISTS `<DATASET>.video_proxies`" in ddl
+        assert "gs://<PROCESSED_BUCKET>/*.mp4" in ddl
@@ -0,0 +1,162 @@
+import threading
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from homeward.services.thumbnail_service import ThumbnailService
+from homeward.ui.components.video_thumbnail import (
+    register_thumbnail_route,
+    thumbnail_url,
+)
+from homeward.utils.ffmpeg_utils import build_thumbnail_command, extract_thumbnail
+
+VIDEO_URL = "gs://test-processed/proxies/CAM-01_20250922093000_38.1334_13.3487_CCTV_854x480.mp4"
+JPEG_BYTES = b"\xff\xd8\xff\xe0thumbnail\xff\xd9"
+
+
+def fake_extract(source, output_path, offset_seconds=0, width=320, ffmpeg_binary="ffmpeg"):
+    Path(output_path).write_bytes(JPEG_BYTES)
+    return output_path
+
+
+@pytest.fixture
+def gcs_service():
+    """Mocked GCS service whose processed bucket has no thumbnails yet"""
+    service = Mock()
+    service.get_signed_url.return_value = "https://storage.googleapis.com/signed"
+    service.client.bucket.return_value.get_blob.return_value = None
+    return service
+
+
+@pytest.fixture
+def thumbnail_service(gcs_service, tmp_path):
+    config = Mock(gcs_bucket_processed="test-processed")
+    service = ThumbnailService(
+        config, gcs_service, str(tmp_path), allowed_buckets={"test-processed"}, max_processes=0
+    )
+    yield service
+    service.shutdown()
+
+
+class TestThumbnailCommand:
+    """Test cases for the ffmpeg thumbnail command"""
+
+    def test_seeks_before_the_input(self):
+        """Test the seek precedes -i, so ffmpeg jumps to the keyframe instead of decoding from the start"""
+        command = build_thumbnail_command("https://signed", "out.jpg", 95, width=240)
+
+        assert command.index("-ss") < command.index("-i")
+        assert command[command.index("-ss") + 1] == "95"
+        assert command[command.index("-frames:v") + 1] == "1"
+        assert "scale=240:-2" in command
+
+
+    def test_offsets_past_the_end_are_clamped(self, tmp_path):
+        """Test a detection offset beyond the clip seeks to its last second instead of writing no frame"""
+        output_path = tmp_path / "out.jpg"
+
+        def run(command, **kwargs):
+            output_path.write_bytes(JPEG_BYTES)
+            return Mock(returncode=0, stderr="")
+
+        with patch("homeward.utils.ffmpeg_utils.probe_duration", return_value=30.0), \
+                patch("homeward.utils.ffmpeg_utils.subprocess.run", side_effect=run) as run_ffmpeg:
+            extract_thumbnail("https://signed", str(output_path), offset_seconds=95)
+
+        command = run_ffmpeg.call_args[0][0]
+        assert command[command.index("-ss") + 1] == "29"
+
+
+class TestThumbnailService:
+    """Test cases for thumbnail extraction and caching"""
+
+    def test_extracts_uploads_and_caches(self, thumbnail_service, gcs_service):
+        """Test a new thumbnail is extracted from a signed URL, uploaded and served from disk afterwards"""
+        with patch("homeward.services.thumbnail_service.extract_thumbnail", side_effect=fake_extract) as extract:
+            path = thumbnail_service.get(VIDEO_URL, 95)
+            assert thumbnail_service.get(VIDEO_URL, 95) == path
+
+        assert Path(path).read_bytes() == JPEG_BYTES
+        extract.assert_called_once()
+        assert extract.call_args.args[0] == "https://storage.googleapis.com/signed"
+        assert extract.call_args.args[2] == 95
+
+        uploaded = gcs_service.client.bucket.return_value.blob
+        assert uploaded.call_args.args[0] == thumbnail_service.thumbnail_name(VIDEO_URL, 95)
+        uploaded.return_value.upload_from_filename.assert_called_once()
+        assert uploaded.return_value.metadata["source-uri"] == VIDEO_URL
+
+    def test_reuses_thumbnails_in_the_processed_bucket(self, thumbnail_service, gcs_service):
+        """Test a thumbnail already in the processed bucket is downloaded, not extracted again"""
+        stored = Mock()
+        stored.download_to_filename.side_effect = lambda path: Path(path).write_bytes(JPEG_BYTES)
+        gcs_service.client.bucket.return_value.get_blob.return_value = stored
+
+        with patch("homeward.services.thumbnail_service.extract_thumbnail") as extract:
+            path = thumbnail_service.get(VIDEO_URL)
+
+        assert Path(path).read_bytes() == JPEG_BYTES
+        extract.assert_not_called()
+
+    def test_concurrent_requests_share_one_extraction(self, thumbnail_service):
+        """Test requests for a thumbnail being extracted wait for it instead of starting another"""
+        release = threading.Event()
+
+        def slow_extract(*args):
+            release.wait(5)
+            return fake_extract(*args)
+
+        with patch("homeward.services.thumbnail_service.extract_thumbnail", side_effect=slow_extract) as extract:
+            futures = [thumbnail_service.request(VIDEO_URL, 10) for _ in range(3)]
+            release.set()
+            paths = {future.result(5) for future in futures}
+
+        assert len(paths) == 1
+        extract.assert_called_once()
+
+    def test_disk_cache_is_pruned(self, thumbnail_service):
+        """Test the oldest thumbnails are deleted beyond the cache size"""
+        thumbnail_service.max_cached_files = 2
+        with patch("homeward.services.thumbnail_service.extract_thumbnail", side_effect=fake_extract):
+            for offset in range(4):
+                thumbnail_service.get(VIDEO_URL, offset)
+
+        assert len(list(Path(thumbnail_service.cache_dir).glob("*.jpg"))) == 2
+
+    def test_empty_extractions_are_not_uploaded_or_cached(self, thumbnail_service, gcs_service):
+        """Test an ffmpeg run writing no frame fails instead of storing an empty JPEG"""
+        with patch("homeward.services.thumbnail_service.extract_thumbnail", return_value=None) as extract:
+            assert thumbnail_service.get(VIDEO_URL, 95) is None
+            assert thumbnail_service.get(VIDEO_URL, 95) is None
+
+        assert extract.call_count == 2
+        gcs_service.client.bucket.return_value.blob.return_value.upload_from_filename.assert_not_called()
+        assert not list(Path(thumbnail_service.cache_dir).glob("*.jpg"))
+
+    def test_failures_and_other_buckets_return_none(self, thumbnail_service):
+        """Test videos that cannot be thumbnailed do not raise"""
+        with patch("homeward.services.thumbnail_service.extract_thumbnail", side_effect=RuntimeError("no frame")):
+            assert thumbnail_service.get(VIDEO_URL, 9999) is None
+        assert thumbnail_service.get("gs://other-bucket/video.mp4") is None
+        assert not list(Path(thumbnail_service.cache_dir).glob("*.jpg"))
+
+
+class TestThumbnailRoute:
+    """Test cases for the thumbnail endpoint"""
+
+    def test_serves_jpeg_or_404(self, thumbnail_service):
+        """Test the route returns the JPEG, and 404 when no thumbnail can be produced"""
+        app = FastAPI()
+        register_thumbnail_route(app, thumbnail_service)
+        client = TestClient(app)
+
+        with patch("homeward.services.thumbnail_service.extract_thumbnail", side_effect=fake_extract):
+            response = client.get(thumbnail_url(VIDEO_URL, 95))
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/jpeg"
+        assert response.content == JPEG_BYTES
+
+        assert client.get(thumbnail_url("gs://other-bucket/video.mp4")).status_code == 404
@@ -0,0 +1,1138 @@
+import hashlib
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import Mock, call, patch
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from homeward.models.video_analysis import (
+    SweepCase,
+    TravelMode,
+    VideoAnalysisRequest,
+    VideoAnalysisResult,
+    VideoSweepRequest,
+)
+from homeward.services.bigquery_video_analysis_service import (
+    BigQueryVideoAnalysisService,
+)
+from homeward.services.mock_video_analysis_service import MockVideoAnalysisService
+from homeward.services.simulated_video_analysis_service import (
+    LatencyDistribution,
+    SimulatedVideoAnalysisService,
+    SimulationProfile,
+)
+from homeward.utils.camera_index import CameraIndex, partition_rings, shard_videos
+from homeward.utils.geo_utils import haversine_km, reachable_radius_km
+from homeward.utils.geohash import cell_ranges, covering_cells, encode, prune_filter
+from homeward.utils.model_routing import ModelRoute, parse_model_routes, route_videos
+from homeward.utils.prompt_registry import default_prompt_registry, person_attributes
+from homeward.utils.rate_limit import retry_with_backoff
+from homeward.utils.track_utils import aggregate_confidence, build_tracks, track_result
+from homeward.utils.video_utils import VIDEO_RESULT_ID_SQL, video_result_id
+
+VIDEO_URI = "gs://test-ingestion/CUSTOM-RED_20250922093000_38.133391_13.348721_PHONE_1920x1080.mp4"
+
+
+@pytest.fixture
+def bigquery_video_service(test_config):
+    """Create a BigQuery video analysis service with a mocked client"""
+    with patch("homeward.services.bigquery_video_analysis_service.bigquery.Client"):
+        service = BigQueryVideoAnalysisService(test_config)
+    service.client = Mock()
+    return service
+
+
+@pytest.fixture
+def analysis_request():
+    """Create a one-day analysis request around the last seen location of a case"""
+    return VideoAnalysisRequest(
+        case_id="MP001",
+        start_date=datetime(2025, 9, 22),
+        end_date=datetime(2025, 9, 22),
+        time_range="All Day",
+        search_radius_km=5.0,
+        last_seen_latitude=38.1334,
+        last_seen_longitude=13.3487,
+    )
+
+
+@pytest.fixture
+def sweep_request():
+    """Create a sweep request covering two cases"""
+    return VideoSweepRequest(
+        cases=[
+            SweepCase("MP001", 38.1334, 13.3487, {"gender": "Male", "age": 30}),
+            SweepCase("MP002", 38.1300, 13.3500, {"gender": "Female", "hair_color": "Red"}),
+        ],
+        start_date=datetime(2025, 9, 22),
+        end_date=datetime(2025, 9, 22),
+        time_range="All Day",
+        search_radius_km=5.0,
+        center_latitude=38.1334,
+        center_longitude=13.3487,
+    )
+
+
+class TestVideoSweep:
+    """Test cases for multi-case video sweeps"""
+
+    def test_sweep_prompt_lists_every_case(self, bigquery_video_service, sweep_request):
+        """Test the sweep prompt describes each case once"""
+        prompt = bigquery_video_service._build_sweep_prompt(sweep_request)
+
+        assert prompt.count("## CASE ID:") == 2
+        assert "`MP001`" in prompt
+        assert "`MP002`" in prompt
+        assert "`Red`" in prompt
+
+    def test_sweep_query_uses_verdict_array_schema(self, bigquery_video_service, sweep_request):
+        """Test the sweep query asks for one verdict per case"""
+        prompt = bigquery_video_service._build_sweep_prompt(sweep_request)
+        query = bigquery_video_service._build_sweep_query(sweep_request, prompt)
+
+        assert query.count("AI.GENERATE") == 1
+        assert "verdicts ARRAY<STRUCT<caseId STRING" in query
+        assert "ST_DWITHIN" in query
+
+    def test_sweep_splits_verdicts_per_case(self, bigquery_video_service, sweep_request):
+        """Test a single query result is split into per-case results"""
+        row = SimpleNamespace(
+            uri=VIDEO_URI,
+            result={
+                "verdicts": [
+                    {"caseId": "MP001", "personFound": True, "confidenceScore": 0.9,
+                     "matchJustification": "Match", "summaryOfFindings": "Seen walking"},
+                    {"caseId": "MP002", "personFound": False, "confidenceScore": None,
+                     "matchJustification": "No match", "summaryOfFindings": None},
+                ]
+            },
+        )
+        bigquery_video_service.client.query.return_value.result.return_value = [row]
+        bigquery_video_service.get_camera_index = Mock(return_value=CameraIndex.from_uris([VIDEO_URI]))
+
+        results_by_case, stats = bigquery_video_service.analyze_videos_sweep(sweep_request)
+
+        bigquery_video_service.client.query.assert_called_once()
+        assert len(results_by_case["MP001"]) == 1
+        assert results_by_case["MP001"][0].camera_id == "CUSTOM-RED"
+        assert results_by_case["MP002"] == []
+        assert stats["total_analyzed"] == 1
+        assert stats["cases"]["MP001"]["matches_found"] == 1
+        assert stats["cases"]["MP002"]["no_person_found"] == 1
+
+    def test_sweep_over_explicit_videos_skips_resolution(self, bigquery_video_service, sweep_request):
+        """Test a sweep over given URIs, e.g. new footage, does not query the camera index"""
+        sweep_request.candidate_uris = [VIDEO_URI]
+        bigquery_video_service.client.query.return_value.result.return_value = []
+        bigquery_video_service.get_camera_index = Mock()
+
+        bigquery_video_service.analyze_videos_sweep(sweep_request)
+
+        bigquery_video_service.get_camera_index.assert_not_called()
+        query = bigquery_video_service.client.query.call_args[0][0]
+        assert "UNNEST(@uris)" in query
+
+    def test_list_new_videos_reads_the_object_table(self, bigquery_video_service):
+        """Test new footage is listed incrementally from the object table"""
+        since = datetime(2025, 9, 22, 10, 0)
+        bigquery_video_service.client.query.return_value.result.return_value = [
+            SimpleNamespace(uri=VIDEO_URI, updated=since + timedelta(minutes=1))
+        ]
+
+        assert bigquery_video_service.list_new_videos(since) == [(VIDEO_URI, since + timedelta(minutes=1))]
+
+        query = bigquery_video_service.client.query.call_args[0][0]
+        assert "updated > @since OR (updated = @since AND uri > @after_uri)" in query
+        assert "ORDER BY updated" in query
+
+    def test_default_sweep_fans_out_per_case(self, sweep_request):
+        """Test backends without a native sweep analyze each case separately"""
+        service = MockVideoAnalysisService()
+
+        results_by_case, stats = service.analyze_videos_sweep(sweep_request)
+
+        assert set(results_by_case) == {"MP001", "MP002"}
+        assert all(results for results in results_by_case.values())
+        assert stats["cases"]["MP001"]["matches_found"] == len(results_by_case["MP001"])
+        assert {"total_analyzed", "errors", "cases"} <= set(stats)
+
+    def test_default_sweep_passes_person_data(self, sweep_request):
+        """Test each case is analyzed with its own description"""
+        service = MockVideoAnalysisService()
+        service.analyze_videos = Mock(
+            return_value=([], {"total_analyzed": 4, "matches_found": 0, "no_person_found": 4, "errors": 0})
+        )
+
+        results_by_case, stats = service.analyze_videos_sweep(sweep_request)
+
+        person_data = [call.args[1] for call in service.analyze_videos.call_args_list]
+        assert person_data == [sweep_case.missing_person_data for sweep_case in sweep_request.cases]
+        assert stats["total_analyzed"] == 4
+        assert stats["cases"]["MP002"] == {"matches_found": 0, "no_person_found": 4}
+
+
+class TestEvidenceBatch:
+    """Test cases for bulk evidence persistence"""
+
+    def _result(self, result_id, confidence=0.9):
+        return VideoAnalysisResult(
+            id=result_id,
+            timestamp=datetime(2025, 9, 22, 9, 30),
+            latitude=38.133391,
+            longitude=13.348721,
+            address="Camera CUSTOM-RED Location",
+            distance_from_last_seen=0.1,
+            video_url=VIDEO_URI,
+            confidence_score=confidence,
+            ai_description="Seen walking",
+            camera_id="CUSTOM-RED",
+            camera_type="PHONE",
+        )
+
+    def test_batch_uses_single_load_job(self, bigquery_video_service):
+        """Test new results are written with one load job and no DML insert"""
+        bigquery_video_service.client.query.return_value.result.return_value = [
+            SimpleNamespace(id="video_b")
+        ]
+        results = [self._result("video_a"), self._result("video_a"), self._result("video_b")]
+
+        added = bigquery_video_service.add_to_evidence_batch(results, "MP001")
+
+        assert added == 1
+        bigquery_video_service.client.load_table_from_json.assert_called_once()
+        rows = bigquery_video_service.client.load_table_from_json.call_args[0][0]
+        assert [row["id"] for row in rows] == ["video_a"]
+        assert rows[0]["case_id"] == "MP001"
+        assert "INSERT" not in bigquery_video_service.client.query.call_args[0][0]
+
+    def test_batch_skips_load_when_everything_exists(self, bigquery_video_service):
+        """Test no load job runs when all results are already evidence"""
+        bigquery_video_service.client.query.return_value.result.return_value = [
+            SimpleNamespace(id="video_a")
+        ]
+
+        added = bigquery_video_service.add_to_evidence_batch([self._result("video_a")], "MP001")
+
+        assert added == 0
+        bigquery_video_service.client.load_table_from_json.assert_not_called()
+
+    def test_mock_batch_deduplicates(self):
+        """Test the mock backend only counts new evidence"""
+        service = MockVideoAnalysisService()
+
+        assert service.add_to_evidence_batch([self._result("a"), self._result("b")], "MP001") == 2
+        assert service.add_to_evidence_batch([self._result("a")], "MP001") == 0
+
+
+class TestVideoResultIds:
+    """Test cases for deterministic video result IDs and URI lookup"""
+
+    def test_result_id_is_content_derived(self):
+        """Test the result ID is the SHA-256 prefix used by the SQL expression"""
+        assert video_result_id("gs://bucket/video.mp4") == "video_" + hashlib.sha256(
+            b"gs://bucket/video.mp4"
+        ).hexdigest()[:16]
+        assert video_result_id(VIDEO_URI) == video_result_id(VIDEO_URI)
+        assert "SHA256(uri)" in VIDEO_RESULT_ID_SQL
+
+    def test_get_video_url_uses_cache_after_analysis(self, bigquery_video_service):
+        """Test URIs of analyzed videos resolve without querying BigQuery"""
+        result = bigquery_video_service._build_result(
+            VIDEO_URI,
+            {"confidenceScore": 0.8, "summaryOfFindings": "Seen"},
+            38.13,
+            13.34,
+            datetime(2025, 9, 22),
+        )
+
+        assert result.id == video_result_id(VIDEO_URI)
+        assert bigquery_video_service.get_video_url(result.id) == VIDEO_URI
+        bigquery_video_service.client.query.assert_not_called()
+
+    def test_get_video_url_point_lookup_on_catalog(self, bigquery_video_service):
+        """Test unknown IDs are resolved with a keyed catalog lookup"""
+        bigquery_video_service.client.query.return_value.result.return_value = [
+            SimpleNamespace(uri=VIDEO_URI)
+        ]
+
+        assert bigquery_video_service.get_video_url("video_0123456789abcdef") == VIDEO_URI
+
+        query = bigquery_video_service.client.query.call_args[0][0]
+        assert "video_catalog" in query
+        assert "WHERE video_id = @result_id" in query
+        assert "FARM_FINGERPRINT" not in query
+
+    def test_video_uri_cache_is_bounded(self, bigquery_video_service):
+        """Test the least recently used URIs are evicted beyond the cache size"""
+        with patch("homeward.services.bigquery_video_analysis_service.VIDEO_URI_CACHE_SIZE", 2):
+            bigquery_video_service._remember_video_uri("video_a", "gs://b/a.mp4")
+            bigquery_video_service._remember_video_uri("video_b", "gs://b/b.mp4")
+            assert bigquery_video_service.get_video_url("video_a") == "gs://b/a.mp4"
+            bigquery_video_service._remember_video_uri("video_c", "gs://b/c.mp4")
+
+        assert list(bigquery_video_service._video_uri_cache) == ["video_a", "video_c"]
+
+
+class TestCameraIndex:
+    """Test cases for candidate video pre-selection with the camera index"""
+
+    URIS = [
+        VIDEO_URI,
+        "gs://test-ingestion/CUSTOM-RED_20250922183000_38.133391_13.348721_PHONE_1920x1080.mp4",
+        "gs://test-ingestion/CUSTOM-GREEN_20250923093000_38.133391_13.348721_PHONE_1920x1080.mp4",
+        "gs://test-ingestion/FAR-AWAY_20250922093000_45.464211_9.191383_CCTV_1280x720.mp4",
+        "gs://test-ingestion/not-a-camera-video.mp4",
+    ]
+
+    def _request(self, **overrides):
+        fields = {
+            "case_id": "MP001",
+            "start_date": datetime(2025, 9, 22),
+            "end_date": datetime(2025, 9, 22),
+            "time_range": "All Day",
+            "search_radius_km": 5.0,
+            "last_seen_latitude": 38.1334,
+            "last_seen_longitude": 13.3487,
+        }
+        fields.update(overrides)
+        return VideoAnalysisRequest(**fields)
+
+    def test_query_applies_date_time_and_radius(self):
+        """Test the index uses the same filters as the object-table query"""
+        index = CameraIndex.from_uris(self.URIS)
+
+        assert len(index) == 4
+        assert [video.uri for video in index.query(datetime(2025, 9, 22), datetime(2025, 9, 22), "All Day", 38.1334, 13.3487, 5.0)] == self.URIS[:2]
+        assert [video.uri for video in index.query(datetime(2025, 9, 22), datetime(2025, 9, 23), "Morning", 38.1334, 13.3487, 5.0)] == [self.URIS[0], self.URIS[2]]
+        assert len(index.query(datetime(2025, 9, 22), datetime(2025, 9, 22))) == 3
+
+    def test_query_spans_neighbouring_cells(self):
+        """Test videos just across a grid cell boundary are still found"""
+        index = CameraIndex.from_uris(
+            ["gs://b/CAM_20250922093000_38.149999_13.349999_CCTV_1280x720.mp4",
+             "gs://b/CAM_20250922093000_38.150001_13.350001_CCTV_1280x720.mp4"],
+            cell_size_deg=0.05,
+        )
+
+        assert len(index.query(latitude=38.15, longitude=13.35, search_radius_km=0.5)) == 2
+
+    def test_analysis_query_uses_candidate_uris(self, bigquery_video_service):
+        """Test the analysis query is restricted to the URIs resolved from the index"""
+        bigquery_video_service.client.query.return_value.result.return_value = [
+            SimpleNamespace(uri=uri) for uri in self.URIS
+        ]
+        bigquery_video_service.get_camera_index()
+        bigquery_video_service.client.query.return_value.result.return_value = []
+
+        bigquery_video_service.analyze_videos(self._request())
+
+        query = bigquery_video_service.client.query.call_args[0][0]
+        job_config = bigquery_video_service.client.query.call_args[1]["job_config"]
+        assert "uri IN UNNEST(@uris)" in query
+        assert "ST_DWITHIN" not in query
+        assert job_config.query_parameters[0].values == self.URIS[:2]
+
+    def test_analysis_skips_query_without_candidates(self, bigquery_video_service):
+        """Test no AI query runs when no video matches the search window"""
+        bigquery_video_service.get_camera_index = Mock(return_value=CameraIndex.from_uris(self.URIS))
+
+        results, stats = bigquery_video_service.analyze_videos(self._request(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 1)))
+
+        assert results == []
+        assert stats["total_analyzed"] == 0
+        bigquery_video_service.client.query.assert_not_called()
+
+    def test_falls_back_to_metadata_filters(self, bigquery_video_service):
+        """Test the SQL metadata filters are used when no listing can be loaded"""
+        bigquery_video_service.client.query.side_effect = [
+            Exception("listing unavailable"),
+            Exception("catalog unavailable"),
+            Mock(result=Mock(return_value=[])),
+        ]
+
+        assert bigquery_video_service.resolve_candidate_uris(self._request()) is None
+
+        bigquery_video_service.get_camera_index = Mock(return_value=None)
+        bigquery_video_service.analyze_videos(self._request())
+
+        query = bigquery_video_service.client.query.call_args[0][0]
+        assert "ST_DWITHIN" in query
+        assert "UNNEST(@uris)" not in query
+
+    def test_failed_index_load_is_not_retried_at_once(self, bigquery_video_service):
+        """Test a failed listing is remembered, instead of re-queried on every search"""
+        bigquery_video_service.client.query.side_effect = Exception("listing unavailable")
+
+        assert bigquery_video_service.get_camera_index() is None
+        assert bigquery_video_service.get_camera_index() is None
+        assert bigquery_video_service.client.query.call_count == 2
+
+        bigquery_video_service.get_camera_index(refresh=True)
+        assert bigquery_video_service.client.query.call_count == 4
+
+
+class TestGeohashCells:
+    """Test cases for pruning location searches with geohash cells"""
+
+    def test_encode_matches_reference(self):
+        """Test points are encoded like the reference geohash implementation"""
+        assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+        assert encode(38.133391, 13.348721, 9).startswith(encode(38.133391, 13.348721, 5))
+
+    def test_covering_cells_contain_points_in_radius(self):
+        """Test every point within the radius falls in one of the covering cells"""
+        random.seed(3)
+        cells = covering_cells(38.1334, 13.3487, 5.0)
+
+        assert 0 < len(cells) <= 32
+        for _ in range(500):
+            latitude, longitude = 38.1334 + random.uniform(-0.05, 0.05), 13.3487 + random.uniform(-0.07, 0.07)
+            if haversine_km(38.1334, 13.3487, latitude, longitude) <= 5.0:
+                assert any(encode(latitude, longitude).startswith(cell) for cell in cells)
+
+    def test_adjacent_cells_merge_into_ranges(self):
+        """Test cells following each other in geohash order become one range"""
+        assert cell_ranges(["sq2", "sq0", "sq1", "sq9"]) == [("sq0", "sq3"), ("sq9", "sqb")]
+        assert cell_ranges(["zz"]) == [("zz", "~")]
+
+    def test_prune_filter_keeps_rows_without_cells(self):
+        """Test the condition binds the ranges and keeps rows not backfilled yet"""
+        condition, parameters = prune_filter("video_geohash", 38.1334, 13.3487, 5.0)
+
+        assert condition.startswith("(video_geohash IS NULL OR ")
+        assert "video_geohash >= @cell_0_start AND video_geohash < @cell_0_end" in condition
+        assert len(parameters) % 2 == 0 and parameters["cell_0_start"] < parameters["cell_0_end"]
+
+    def test_no_pruning_at_poles_or_antimeridian(self):
+        """Test circles that cannot be covered fall back to the distance filter alone"""
+        assert covering_cells(89.99, 0.0, 5.0) is None
+        assert covering_cells(0.0, 179.99, 5.0) is None
+        assert prune_filter("video_geohash", 0.0, 179.99, 5.0) == ("TRUE", {})
+
+    def test_inventory_search_prunes_by_cells(self, bigquery_video_service, analysis_request):
+        """Test the inventory search window is pruned by cells before ST_DWITHIN"""
+        bigquery_video_service.resolve_candidate_uris = Mock(return_value=None)
+        bigquery_video_service.client.query.side_effect = [
+            Mock(result=Mock(return_value=[])),
+            Mock(result=Mock(return_value=[])),
+        ]
+
+        bigquery_video_service.analyze_videos_indexed(analysis_request, None, 5, None)
+
+        search_call = bigquery_video_service.client.query.call_args_list[0]
+        assert "video_geohash >= @cell_0_start" in search_call[0][0]
+        search_parameters = {p.name: p for p in search_call[1]["job_config"].query_parameters}
+        _, cell_parameters = prune_filter("video_geohash", 38.1334, 13.3487, 5.0)
+        assert {name: search_parameters[name].value for name in cell_parameters} == cell_parameters
+
+
+class TestReachabilityCone:
+    """Test cases for filtering footage by the reachability cone"""
+
+    LAST_SEEN = datetime(2025, 9, 22, 9, 0)
+    # Same camera position, about 2.4 km from the last seen location
+    URIS = [
+        "gs://b/CAM_20250922091000_38.155000_13.348721_CCTV_1280x720.mp4",
+        "gs://b/CAM_20250922120000_38.155000_13.348721_CCTV_1280x720.mp4",
+    ]
+
+    def test_radius_grows_with_elapsed_time(self):
+        """Test the reachable radius depends on travel mode and elapsed time"""
+        assert reachable_radius_km(3600, TravelMode.WALKING, 50) == pytest.approx(5.5)
+        assert reachable_radius_km(-3600, TravelMode.WALKING, 50) == pytest.approx(5.5)
+        assert reachable_radius_km(3600, TravelMode.CAR, 50) == 50
+        assert reachable_radius_km(3600, None, 5) == 5
+
+    def test_index_drops_videos_outside_the_cone(self):
+        """Test footage too early to be reachable is not selected"""
+        index = CameraIndex.from_uris(self.URIS)
+
+        walking = index.query(
+            datetime(2025, 9, 22), datetime(2025, 9, 22), "All Day",
+            38.133391, 13.348721, 10.0, self.LAST_SEEN, TravelMode.WALKING,
+        )
+        fixed = index.query(datetime(2025, 9, 22), datetime(2025, 9, 22), "All Day", 38.133391, 13.348721, 10.0)
+
+        assert [video.uri for video in walking] == self.URIS[1:]
+        assert len(fixed) == 2
+
+    def test_query_filters_on_the_cone(self, bigquery_video_service):
+        """Test the SQL fallback encodes the time-dependent radius"""
+        request = VideoAnalysisRequest(
+            case_id="MP001",
+            start_date=datetime(2025, 9, 22),
+            end_date=datetime(2025, 9, 22),
+            time_range="All Day",
+            search_radius_km=10.0,
+            last_seen_latitude=38.133391,
+            last_seen_longitude=13.348721,
+            last_seen_date=self.LAST_SEEN,
+            travel_mode=TravelMode.TRANSIT,
+        )
+
+        query = bigquery_video_service._build_video_analysis_query(request, "prompt")
+
+        assert "DATETIME('2025-09-22 09:00:00')" in query
+        assert "Transit reachability" in query
+        assert query.count("AND ST_DWITHIN(") == 2
+
+
+class TestProgressiveRingSearch:
+    """Test cases for nearest-first ring search with early termination"""
+
+    LAST_SEEN = datetime(2025, 9, 22, 9, 0)
+
+    def _request(self):
+        return VideoAnalysisRequest(
+            case_id="MP001",
+            start_date=datetime(2025, 9, 22),
+            end_date=datetime(2025, 9, 22),
+            time_range="All Day",
+            search_radius_km=5.0,
+            last_seen_latitude=38.133391,
+            last_seen_longitude=13.348721,
+            last_seen_date=self.LAST_SEEN,
+        )
+
+    def _service(self):
+        profile = SimulationProfile(
+            model_latency=LatencyDistribution(kind="constant", mean=0.0),
+            evidence_latency=LatencyDistribution(kind="constant", mean=0.0),
+            failure_rate=0.0,
+            match_rate=1.0,
+            seed=1,
+        )
+        return SimulatedVideoAnalysisService(profile=profile)
+
+    def test_partition_orders_rings_by_distance_and_time(self):
+        """Test rings grow outward in both distance and time, skipping empty rings"""
+        index = CameraIndex.from_uris([
+            "gs://b/NEAR-LATE_20250922190000_38.133391_13.348721_CCTV_1280x720.mp4",
+            "gs://b/NEAR_20250922093000_38.133391_13.348721_CCTV_1280x720.mp4",
+            "gs://b/FAR_20250922093000_38.160000_13.348721_CCTV_1280x720.mp4",
+        ])
+
+        rings = partition_rings(index.query(), 38.133391, 13.348721, self.LAST_SEEN, 1.0, 6.0)
+
+        assert [[uri.split("/")[-1].split("_")[0] for uri in ring.uris] for ring in rings] == [
+            ["NEAR"], ["NEAR-LATE"], ["FAR"],
+        ]
+        assert [ring.index for ring in rings] == [0, 1, 2]
+        assert rings[2].is_last and rings[2].max_distance_km == 3.0
+
+    def test_stops_after_confident_match(self):
+        """Test the search ends on the first ring with a confident match"""
+        service = self._service()
+
+        steps = list(service.analyze_videos_progressive(self._request(), stop_confidence=0.5))
+
+        assert len(steps) == 1
+        ring, results, stats = steps[0]
+        assert ring.total_rings == 2
+        assert stats["total_analyzed"] == 2
+        assert all(result.timestamp.hour == 9 for result in results)
+
+    def test_continues_outward_on_request(self):
+        """Test the next ring can be analyzed after an early stop"""
+        service = self._service()
+
+        steps = list(service.analyze_videos_progressive(self._request(), stop_confidence=0.5, start_ring=1))
+        all_steps = list(service.analyze_videos_progressive(self._request(), stop_confidence=None))
+
+        assert [ring.index for ring, _, _ in steps] == [1]
+        assert all(result.timestamp.hour == 18 for result in steps[0][1])
+        assert len(all_steps) == 2
+
+    def test_rings_run_through_the_given_runner(self):
+        """Test each ring's analysis is handed to run_ring, e.g. the analysis scheduler"""
+        service = self._service()
+        runs = []
+
+        def run_ring(ring, analyze):
+            runs.append(len(ring.uris))
+            return analyze()
+
+        steps = list(service.analyze_videos_progressive(self._request(), stop_confidence=None, run_ring=run_ring))
+
+        assert runs == [len(ring.uris) for ring, _, _ in steps] and len(runs) == 2
+
+    def test_single_ring_without_candidate_listing(self):
+        """Test backends without candidate resolution analyze everything at once"""
+        service = MockVideoAnalysisService()
+
+        steps = list(service.analyze_videos_progressive(self._request()))
+
+        assert len(steps) == 1
+        assert steps[0][0].is_last
+
+    def test_default_candidate_analysis_keeps_listed_videos(self):
+        """Test backends without a native candidate analysis filter the window results by URI"""
+        service = MockVideoAnalysisService()
+        window_results = service.analyze_videos(self._request())
+        service.analyze_videos = Mock(return_value=window_results)
+        listed = window_results[0].video_url
+
+        results, stats = service._analyze_candidate_uris(self._request(), [listed], {"gender": "Male"})
+
+        assert [result.video_url for result in results] == [listed]
+        assert stats["matches_found"] == 1
+        service.analyze_videos.assert_called_once_with(self._request(), {"gender": "Male"})
+        assert service._analyze_candidate_uris(self._request(), [])[0] == []
+
+
+class TestPeopleInventory:
+    """Test cases for matching cases against the per-video people inventory"""
+
+    OTHER_URI = "gs://test-ingestion/CUSTOM-GREEN_20250922093000_38.133391_13.348721_PHONE_1920x1080.mp4"
+
+    def _request(self):
+        return VideoAnalysisRequest(
+            case_id="MP001",
+            start_date=datetime(2025, 9, 22),
+            end_date=datetime(2025, 9, 22),
+            time_range="All Day",
+            search_radius_km=5.0,
+            last_seen_latitude=38.133391,
+            last_seen_longitude=13.348721,
+        )
+
+    def test_only_inventory_matches_are_verified(self, bigquery_video_service):
+        """Test the full prompt only runs on the videos returned by the vector search"""
+        bigquery_video_service.client.query.side_effect = [
+            Mock(result=Mock(return_value=[SimpleNamespace(uri=VIDEO_URI)])),
+            Mock(result=Mock(return_value=[])),
+        ]
+
+        results, stats = bigquery_video_service.analyze_videos_indexed(
+            self._request(), {"gender": "Female"}, 5, [VIDEO_URI, self.OTHER_URI]
+        )
+
+        search_call, verify_call = bigquery_video_service.client.query.call_args_list
+        assert "VECTOR_SEARCH" in search_call[0][0]
+        assert "UNION ALL" in search_call[0][0]
+        search_parameters = {p.name: p for p in search_call[1]["job_config"].query_parameters}
+        assert search_parameters["gender"].value == "Female"
+        assert search_parameters["top_k_videos"].value == 5
+        assert "AI.GENERATE" in verify_call[0][0]
+        assert verify_call[1]["job_config"].query_parameters[0].values == [VIDEO_URI]
+        assert stats["inventory_candidates"] == 1
+
+    def test_window_search_verifies_videos_without_inventory(self, bigquery_video_service):
+        """Test videos of the window without a complete inventory are verified, not dropped"""
+        query = bigquery_video_service._build_inventory_search_query(self._request(), None)
+
+        assert "UNION ALL" in query
+        assert ".video_objects`\n        WHERE uri NOT IN (" in query
+        assert ".video_people_inventory_status`\n          WHERE status = 'complete'" in query
+        assert "ST_GEOGPOINT(13.348721, 38.133391)" in query
+
+    def test_videos_without_people_are_not_extracted_again(self, bigquery_video_service):
+        """Test a video listed with nobody in it is marked complete and skipped by the next refresh"""
+        statuses = {}
+        generated_uris = []
+
+        def query(sql, job_config=None):
+            parameters = {p.name: p for p in job_config.query_parameters} if job_config else {}
+            if "AI.GENERATE" in sql:
+                # Nobody is visible: no inventory rows, only the status rows merged from every generation
+                assert "IFNULL(ARRAY_LENGTH(result.people), 0)" in sql
+                generated_uris.append(parameters["uris"].values)
+                statuses.update({uri: "complete" for uri in parameters["uris"].values})
+                rows = [SimpleNamespace(status="complete", videos=len(parameters["uris"].values), people=0)]
+            elif "video_people_inventory_status" in sql:
+                assert parameters["max_attempts"].value == 3
+                rows = [SimpleNamespace(uri=uri) for uri in [VIDEO_URI, self.OTHER_URI] if statuses.get(uri) != "complete"]
+            else:
+                rows = []
+            return Mock(result=Mock(return_value=rows), num_dml_affected_rows=0)
+
+        bigquery_video_service.client.query.side_effect = query
+
+        first = bigquery_video_service.refresh_video_people_inventory()
+        second = bigquery_video_service.refresh_video_people_inventory()
+
+        assert generated_uris == [[VIDEO_URI, self.OTHER_URI]]
+        assert first["success"] and first["message"].startswith("Inventoried 0 people in 2 videos")
+        assert second["success"] and second["message"].startswith("Inventoried 0 people in 0 videos")
+
+    def test_falls_back_to_full_analysis(self, bigquery_video_service):
+        """Test every candidate video is analyzed when the inventory is unavailable"""
+        bigquery_video_service.client.query.side_effect = [
+            Exception("Not found: Table video_people_inventory"),
+            Mock(result=Mock(return_value=[])),
+        ]
+
+        results, stats = bigquery_video_service.analyze_videos_indexed(
+            self._request(), None, 5, [VIDEO_URI, self.OTHER_URI]
+        )
+
+        verify_call = bigquery_video_service.client.query.call_args_list[1]
+        assert verify_call[1]["job_config"].query_parameters[0].values == [VIDEO_URI, self.OTHER_URI]
+        assert "inventory_candidates" not in stats
+
+    def test_analyze_videos_uses_inventory_when_configured(self, bigquery_video_service):
+        """Test the inventory prefilter is opt-in through the configuration"""
+        bigquery_video_service.config.video_inventory_top_k = 3
+        bigquery_video_service.get_camera_index = Mock(return_value=CameraIndex.from_uris([VIDEO_URI]))
+        bigquery_video_service.analyze_videos_indexed = Mock(return_value=([], {}))
+
+        bigquery_video_service.analyze_videos(self._request())
+
+        bigquery_video_service.analyze_videos_indexed.assert_called_once_with(
+            self._request(), None, 3, [VIDEO_URI]
+        )
+
+    def test_person_description_skips_unknown_attributes(self, bigquery_video_service):
+        """Test the embedded case description only contains known attributes"""
+        description = bigquery_video_service._build_person_description(
+            {"gender": "Male", "hair_color": "Brown"}
+        )
+
+        assert description == "Gender: Male. Hair: Brown"
+        assert bigquery_video_service._build_person_description(None) == "Unknown person"
+
+
+class TestShardedAnalysis:
+    """Test cases for splitting large analyses into concurrent BigQuery jobs"""
+
+    def _uris(self, cameras, per_camera):
+        return [
+            f"gs://bucket/{camera}_202509220{minute}0000_38.1334_13.3487_CCTV_1280x720.mp4"
+            for camera in cameras
+            for minute in range(per_camera)
+        ]
+
+    def _request(self):
+        return VideoAnalysisRequest(
+            case_id="MP001",
+            start_date=datetime(2025, 9, 22),
+            end_date=datetime(2025, 9, 22),
+            time_range="All Day",
+            search_radius_km=5.0,
+            last_seen_latitude=38.1334,
+            last_seen_longitude=13.3487,
+        )
+
+    def test_shards_keep_cameras_together_and_balance(self):
+        """Test cameras are not split across shards unless larger than a shard"""
+        uris = self._uris(["CAM-A", "CAM-B", "CAM-C"], 2) + self._uris(["CAM-D"], 5)
+        videos = CameraIndex.from_uris(uris).query()
+
+        shards = shard_videos(videos, max_shard_size=4)
+
+        assert sorted(uri for shard in shards for uri in shard) == sorted(uris)
+        assert all(len(shard) <= 4 for shard in shards)
+        assert len(shards) == 3
+        for camera in ("CAM-A", "CAM-B", "CAM-C"):
+            assert sum(any(camera in uri for uri in shard) for shard in shards) == 1
+
+    def test_shards_by_time_bucket(self):
+        """Test sharding by time groups videos of the same hour"""
+        videos = CameraIndex.from_uris(self._uris(["CAM-A", "CAM-B"], 3)).query()
+
+        shards = shard_videos(videos, max_shard_size=2, shard_by="time")
+
+        assert [len(shard) for shard in shards] == [2, 2, 2]
+        assert all(len({uri.split("_")[1] for uri in shard}) == 1 for shard in shards)
+
+    def test_retry_with_backoff(self):
+        """Test failures are retried with growing delays and the last error is raised"""
+        sleeps = []
+        flaky = Mock(side_effect=[RuntimeError("quota"), RuntimeError("quota"), "ok"])
+
+        assert retry_with_backoff(flaky, attempts=3, base_delay=1.0, sleep=sleeps.append) == "ok"
+        assert len(sleeps) == 2
+        assert sleeps[0] <= 1.0 and sleeps[1] <= 2.0
+
+        with pytest.raises(RuntimeError):
+            retry_with_backoff(Mock(side_effect=RuntimeError("down")), attempts=2, sleep=sleeps.append)
+
+    def test_large_requests_run_as_merged_shards(self, bigquery_video_service):
+        """Test shard results are merged, sorted and failed shards counted as errors"""
+        bigquery_video_service.config.analysis_shard_size = 2
+        bigquery_video_service.config.analysis_max_shards = 4
+        uris = self._uris(["CAM-A", "CAM-B", "CAM-C"], 2)
+
+        def run_shard(request, shard_uris, missing_person_data, route=None):
+            if "CAM-C" in shard_uris[0]:
+                raise TimeoutError("shard timed out")
+            result = Mock(confidence_score=0.9 if "CAM-B" in shard_uris[0] else 0.4)
+            return [result], {'total_analyzed': len(shard_uris), 'matches_found': 1, 'no_person_found': 1, 'errors': 0}
+
+        bigquery_video_service._run_video_analysis_query = Mock(side_effect=run_shard)
+        with patch("homeward.services.bigquery_video_analysis_service.SHARD_RETRY_BASE_DELAY_SECONDS", 0):
+            results, stats = bigquery_video_service._analyze_candidate_uris(self._request(), uris)
+
+        assert [result.confidence_score for result in results] == [0.9, 0.4]
+        assert {key: stats[key] for key in ('total_analyzed', 'matches_found', 'no_person_found', 'errors')} == {
+            'total_analyzed': 6, 'matches_found': 2, 'no_person_found': 2, 'errors': 2,
+        }
+        assert (stats['shards'], stats['failed_shards']) == (3, 1)
+        # The failing shard was retried
+        assert bigquery_video_service._run_video_analysis_query.call_count == 2 + 3
+
+    def test_only_transient_shard_errors_are_retried(self, bigquery_video_service):
+        """Test bad queries fail at once while quota errors are retried against the shared quota"""
+        bigquery_video_service.config.analysis_shard_size = 2
+        bigquery_video_service.rate_limiter = Mock()
+        uris = self._uris(["CAM-A", "CAM-B"], 2)
+
+        def run_shard(request, shard_uris, missing_person_data, route=None):
+            if "CAM-A" in shard_uris[0]:
+                raise google_exceptions.BadRequest("Syntax error")
+            raise google_exceptions.Forbidden("Quota", errors=[{"reason": "rateLimitExceeded"}])
+
+        bigquery_video_service._run_video_analysis_query = Mock(side_effect=run_shard)
+        with patch("homeward.services.bigquery_video_analysis_service.SHARD_RETRY_BASE_DELAY_SECONDS", 0):
+            with pytest.raises(google_exceptions.GoogleAPICallError):
+                bigquery_video_service._analyze_candidate_uris(self._request(), uris)
+
+        assert bigquery_video_service._run_video_analysis_query.call_count == 1 + 3
+        assert bigquery_video_service.rate_limiter.acquire.call_args_list == [call(2), call(2)]
+
+    def test_small_requests_run_as_one_job(self, bigquery_video_service):
+        """Test requests within the shard size are not split"""
+        bigquery_video_service._run_video_analysis_query = Mock(return_value=([], {}))
+
+        bigquery_video_service._analyze_candidate_uris(self._request(), self._uris(["CAM-A"], 3))
+
+        bigquery_video_service._run_video_analysis_query.assert_called_once()
+
+
+class TestModelRouting:
+    """Test cases for routing videos to model endpoints by camera type and resolution"""
+
+    PHONE_480 = "gs://bucket/CUSTOM-RED_20250922093000_38.1334_13.3487_PHONE_854x480.mp4"
+    CCTV_1080 = "gs://bucket/CAM-01_20250922093000_38.1334_13.3487_CCTV_1920x1080.mp4"
+    VIRAT_720 = "gs://bucket/VIRAT-01_20250922093000_38.1334_13.3487_VIRAT_OPENDATA_1280x720.mp4"
+
+    ROUTES = [
+        {"name": "cheap", "endpoint": "gemini-2.5-flash-lite", "camera_types": ["phone"], "max_height": 480,
+         "cost_per_million_tokens": 0.1},
+        {"name": "strong", "endpoint": "gemini-2.5-pro", "min_height": 1080,
+         "model_params": {"generation_config": {"temperature": 0.1}}},
+    ]
+
+    def _request(self):
+        return VideoAnalysisRequest(
+            case_id="MP001",
+            start_date=datetime(2025, 9, 22),
+            end_date=datetime(2025, 9, 22),
+            time_range="All Day",
+            search_radius_km=5.0,
+            last_seen_latitude=38.1334,
+            last_seen_longitude=13.3487,
+        )
+
+    def test_first_matching_route_wins(self):
+        """Test videos take the first route matching their camera type and resolution"""
+        routes = parse_model_routes({"routes": self.ROUTES})
+
+        grouped = route_videos([self.CCTV_1080, self.PHONE_480, self.VIRAT_720], routes)
+
+        assert [(route.name if route else None, uris) for route, uris in grouped] == [
+            ("cheap", [self.PHONE_480]),
+            ("strong", [self.CCTV_1080]),
+            (None, [self.VIRAT_720]),
+        ]
+
+    def test_routes_need_an_endpoint(self):
+        """Test invalid routing tables are rejected"""
+        with pytest.raises(ValueError):
+            parse_model_routes([{"name": "broken"}])
+
+    def test_query_uses_route_endpoint_and_params(self, bigquery_video_service):
+        """Test the AI.GENERATE call is built for the route's model"""
+        route = ModelRoute(name="strong", endpoint="gemini-2.5-pro", model_params={"generation_config": {"temperature": 0.1}})
+
+        query = bigquery_video_service._build_video_analysis_query(self._request(), "prompt", [self.CCTV_1080], route)
+
+        assert "endpoint => 'gemini-2.5-pro'" in query
+        assert '"temperature": 0.1' in query
+
+    def test_stats_break_down_latency_and_cost_per_route(self, bigquery_video_service):
+        """Test each route runs its own job and reports videos, tokens and cost"""
+        bigquery_video_service.model_routes = parse_model_routes(self.ROUTES)
+
+        def query_rows(query, job_config=None):
+            uri = self.PHONE_480 if "flash-lite" in query else self.CCTV_1080
+            result = {
+                "personFound": "flash-lite" in query,
+                "confidenceScore": 0.7,
+                "matchJustification": "",
+                "summaryOfFindings": "Seen",
+                "full_response": '{"usage_metadata": {"total_token_count": 2000000}}',
+            }
+            return Mock(result=Mock(return_value=[SimpleNamespace(uri=uri, result=result)]))
+
+        bigquery_video_service.client.query.side_effect = query_rows
+
+        results, stats = bigquery_video_service._analyze_candidate_uris(
+            self._request(), [self.PHONE_480, self.CCTV_1080]
+        )
+
+        assert len(results) == 1
+        assert stats['total_analyzed'] == 2
+        assert stats['routes']['cheap']['matches'] == 1
+        assert stats['routes']['cheap']['tokens'] == 2000000
+        assert stats['routes']['cheap']['estimated_cost'] == pytest.approx(0.2)
+        assert stats['routes']['strong']['videos'] == 1
+        assert stats['routes']['strong']['jobs'] == 1
+
+
+class TestPromptRegistry:
+    """Test cases for the versioned analysis prompts and the verdict cache"""
+
+    PERSON = {"gender": "Female", "age": 28, "clothing_description": "Red jacket"}
+
+    def _request(self):
+        return VideoAnalysisRequest(
+            case_id="MP001",
+            start_date=datetime(2025, 9, 22),
+            end_date=datetime(2025, 9, 22),
+            time_range="All Day",
+            search_radius_km=5.0,
+            last_seen_latitude=38.1334,
+            last_seen_longitude=13.3487,
+        )
+
+    def _query_rows(self, uris):
+        rows = [
+            SimpleNamespace(uri=uri, result={
+                "personFound": True,
+                "confidenceScore": 0.8,
+                "matchJustification": "",
+                "summaryOfFindings": "Seen",
+                "full_response": None,
+            })
+            for uri in uris
+        ]
+        return Mock(result=Mock(return_value=rows))
+
+    def test_v1_prompt_keeps_the_original_attribute_lines(self):
+        """Test v1 renders the same attribute block as before the registry"""
+        registry = default_prompt_registry()
+
+        prompt = registry.render_person_prompt("video_analysis", person_attributes(self.PERSON))
+
+        assert prompt.template_key == "video_analysis@v1"
+        assert "Lower Clothing" not in prompt.text
+        assert (
+            "Every detail is crucial.\n\n"
+            "- **Gender:** `Female`\n"
+            "- **Approximate Age:** `28`\n"
+            "- **Build - Height:** `Unknown`\n"
+            "- **Hair Color and Style:** `Unknown`\n"
+            "- **Clothing:** `Red jacket`\n"
+            "- **Footwear:** `Unknown`\n"
+            "- **Accessories:** `None`\n"
+            "- **Distinguishing Features:** `None`\n"
+            "\n# ANALYSIS INSTRUCTIONS"
+        ) in prompt.text
+        assert prompt.text.endswith("0.0 to 1.0\n\n")
+
+    def test_empty_fields_are_not_rendered_as_none(self):
+        """Test fields left empty in the case record fall back to the placeholders"""
+        attributes = person_attributes({"gender": None, "age": None, "height": None, "weight": 60})
+
+        assert attributes["gender"] == "Unknown"
+        assert attributes["age"] == "Unknown"
+        assert attributes["build_height"] == "Unknown"
+
+    def test_compact_prompt_drops_unknown_attributes(self):
+        """Test compact variants omit placeholders and cost fewer tokens"""
+        registry = default_prompt_registry()
+        attributes = person_attributes(self.PERSON)
+
+        full = registry.render_person_prompt("video_analysis", attributes, "v1")
+        compact = registry.render_person_prompt("video_analysis", attributes, "v2-compact")
+
+        assert "`Red jacket`" in compact.text
+        assert "Unknown" not in compact.text
+        assert "Accessories" not in compact.text
+        assert compact.token_count < full.token_count
+        assert registry.token_stats()["video_analysis@v2-compact"]["renders"] == 1
+
+    def test_unknown_version_is_rejected(self):
+        """Test a misconfigured prompt version fails early"""
+        with pytest.raises(KeyError):
+            default_prompt_registry("v9")
+
+    def test_verdicts_are_reused_for_the_same_prompt_version(self, bigquery_video_service):
+        """Test repeated analyses only query the videos without a cached verdict"""
+        other_uri = VIDEO_URI.replace("093000", "094500")
+        bigquery_video_service.client.query.side_effect = lambda query, job_config=None: self._query_rows(
+            job_config.query_parameters[0].values
+        )
+
+        bigquery_video_service._run_video_analysis_query(self._request(), [VIDEO_URI], self.PERSON)
+        results, stats = bigquery_video_service._run_video_analysis_query(
+            self._request(), [VIDEO_URI, other_uri], self.PERSON
+        )
+
+        assert bigquery_video_service.client.query.call_count == 2
+        assert bigquery_video_service.client.query.call_args.kwargs["job_config"].query_parameters[0].values == [other_uri]
+        assert len(results) == 2
+        assert stats['cached'] == 1
+        assert stats['prompt_version'] == "video_analysis@v1"
+
+    def test_prompt_version_is_part_of_the_cache_key(self, bigquery_video_service):
+        """Test switching the prompt version re-queries the videos"""
+        bigquery_video_service.client.query.side_effect = lambda query, job_config=None: self._query_rows([VIDEO_URI])
+
+        bigquery_video_service._run_video_analysis_query(self._request(), [VIDEO_URI], self.PERSON)
+        bigquery_video_service.prompt_registry = default_prompt_registry("v2-compact")
+        _, stats = bigquery_video_service._run_video_analysis_query(self._request(), [VIDEO_URI], self.PERSON)
+
+        assert bigquery_video_service.client.query.call_count == 2
+        assert stats['cached'] == 0
+        assert stats['prompt_version'] == "video_analysis@v2-compact"
+
+
+class TestVideoTracks:
+    """Test cases for grouping detections of the same person into tracks"""
+
+    START = datetime(2025, 9, 22, 9, 30)
+
+    def _detection(self, camera_id, minutes, latitude=38.1300, longitude=13.3400, confidence=0.7):
+        return VideoAnalysisResult(
+            id=f"{camera_id}-{minutes}",
+            timestamp=self.START + timedelta(minutes=minutes),
+            latitude=latitude,
+            longitude=longitude,
+            address="",
+            distance_from_last_seen=0.5,
+            video_url=f"gs://bucket/{camera_id}-{minutes}.mp4",
+            confidence_score=confidence,
+            ai_description="Person in red top",
+            camera_id=camera_id,
+            camera_type="CCTV",
+        )
+
+    def test_consecutive_clips_and_adjacent_cameras_form_one_track(self):
+        """Test back-to-back clips and a walk to the next corner are merged"""
+        detections = [
+            self._detection("CAM-A", 0, confidence=0.6),
+            self._detection("CAM-A", 5, confidence=0.9),
+            # About 450 m away, reachable on foot in 10 minutes
+            self._detection("CAM-B", 15, latitude=38.1340, confidence=0.5),
+        ]
+
+        tracks = build_tracks(detections)
+
+        assert len(tracks) == 1
+        assert tracks[0].representative.id == "CAM-A-5"
+        assert tracks[0].camera_ids == ["CAM-A", "CAM-B"]
+        assert tracks[0].confidence_score == pytest.approx(aggregate_confidence(detections))
+
+    def test_implausible_walks_and_long_gaps_split_tracks(self):
+        """Test detections too far apart in space or time stay separate"""
+        detections = [
+            self._detection("CAM-A", 0),
+            # 5 km away two minutes later cannot be the same walk
+            self._detection("CAM-C", 2, latitude=38.1750),
+            # Same camera, but an hour later
+            self._detection("CAM-A", 60),
+        ]
+
+        assert len(build_tracks(detections)) == 3
+
+    def test_aggregate_confidence_is_the_best_detection(self):
+        """Test many weak detections do not add up to a confident track"""
+        detections = [self._detection("CAM-A", minutes, confidence=0.5) for minutes in range(0, 30, 5)]
+
+        assert aggregate_confidence(detections) == pytest.approx(0.5)
+
+    def test_track_result_summarizes_the_track(self):
+        """Test a track is shown and stored as its representative with the aggregate confidence"""
+        single, *pair = [
+            self._detection("CAM-Z", 0, latitude=38.2),
+            self._detection("CAM-A", 0, confidence=0.8),
+            self._detection("CAM-A", 5, confidence=0.5),
+        ]
+        tracks = build_tracks([single, *pair])
+
+        results = [track_result(track) for track in tracks]
+
+        assert results[0].id == "CAM-A-0"
+        assert results[0].confidence_score == pytest.approx(0.8)
+        assert "Track of 2 detections on CAM-A" in results[0].ai_description
+        assert results[1] is single
+
+
+class TestSimulatedVideoAnalysisService:
+    """Test cases for the offline simulated analysis backend"""
+
+    def _request(self, radius_km=5.0):
+        return VideoAnalysisRequest(
+            case_id="MP001",
+            start_date=datetime(2025, 9, 22),
+            end_date=datetime(2025, 9, 22),
+            time_range="All Day",
+            search_radius_km=radius_km,
+            last_seen_latitude=38.133391,
+            last_seen_longitude=13.348721,
+        )
+
+    def _service(self, **profile_kwargs):
+        profile = SimulationProfile(
+            model_latency=LatencyDistribution(kind="constant", mean=0.01),
+            evidence_latency=LatencyDistribution(kind="constant", mean=0.0),
+            seed=1,
+            **profile_kwargs,
+        )
+        return SimulatedVideoAnalysisService(profile=profile)
+
+    def test_parses_demo_media_filenames(self):
+        """Test the demo media folder is loaded through the filename convention"""
+        service = self._service()
+
+        assert len(service._videos) == 4
+        assert {video.camera_id for video in service._videos} == {"CUSTOM-RED", "CUSTOM-GREEN"}
+
+    def test_filters_by_time_range(self):
+        """Test time range filters match the analysis query semantics"""
+        service = self._service(match_rate=1.0, failure_rate=0.0)
+
+        results, stats = service.analyze_videos(
+            VideoAnalysisRequest(**{**self._request().__dict__, "time_range": "Evening"})
+        )
+
+        assert stats["total_analyzed"] == 2
+        assert all(result.timestamp.hour == 18 for result in results)
+        assert stats["first_match_seconds"] is not None
+
+    def test_failures_and_concurrency_limit(self):
+        """Test failures are counted and concurrent model calls stay under the limit"""
+        service = self._service(failure_rate=1.0, max_concurrency=2)
+        active = []
+        peak = []
+        original_sleep = service._sleep
+
+        def tracking_sleep(distribution):
+            active.append(1)
+            peak.append(len(active))
+            original_sleep(distribution)
+            active.pop()
+
+        service._sleep = tracking_sleep
+
+        results, stats = service.analyze_videos(self._request())
+
+        assert results == []
+        assert stats["errors"] == 4
+        assert max(peak) <= 2
+
+    def test_latency_distribution_means(self):
+        """Test latency distributions are centred on the configured mean"""
+        rng = random.Random(0)
+        lognormal = LatencyDistribution(kind="lognormal", mean=4.0, spread=0.5)
+
+        samples = [lognormal.sample(rng) for _ in range(5000)]
+
+        assert abs(sum(samples) / len(samples) - 4.0) < 0.2
+        assert LatencyDistribution(kind="constant", mean=2.0).sample(rng) == 2.0
+        with pytest.raises(ValueError):
+            LatencyDistribution(kind="pareto").sample(rng)
@@ -0,0 +1,120 @@
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from homeward.services.video_stream_service import (
+    ByteRange,
+    RangeNotSatisfiable,
+    VideoStreamService,
+    parse_range_header,
+)
+from homeward.ui.components.video_player import register_video_stream_route, stream_url
+from homeward.utils.video_utils import detection_offset_seconds
+
+VIDEO_URL = "gs://test-processed/proxies/CAM-01_20250922093000_38.1334_13.3487_CCTV_854x480.mp4"
+VIDEO_BYTES = bytes(range(256)) * 40  # 10240 bytes
+BLOCK_SIZE = 1024
+
+
+@pytest.fixture
+def gcs_service():
+    """Mocked GCS service holding a single video"""
+    service = Mock()
+    service.get_object_metadata.side_effect = lambda bucket, name: (
+        {"size": len(VIDEO_BYTES), "content_type": "video/mp4", "generation": 7}
+        if f"gs://{bucket}/{name}" == VIDEO_URL else None
+    )
+    blob = service.client.bucket.return_value.blob.return_value
+    blob.download_as_bytes.side_effect = lambda start, end: VIDEO_BYTES[start:end + 1]
+    return service
+
+
+@pytest.fixture
+def stream_service(gcs_service):
+    return VideoStreamService(gcs_service, allowed_buckets={"test-processed"}, block_size=BLOCK_SIZE, cache_blocks=4)
+
+
+@pytest.fixture
+def client(stream_service):
+    app = FastAPI()
+    register_video_stream_route(app, stream_service)
+    return TestClient(app)
+
+
+class TestRangeHeader:
+    """Test cases for parsing HTTP Range headers"""
+
+    def test_explicit_open_and_suffix_ranges(self):
+        """Test the supported single-range forms are clamped to the object"""
+        assert parse_range_header("bytes=100-199", 1000) == ByteRange(100, 199)
+        assert parse_range_header("bytes=900-5000", 1000) == ByteRange(900, 999)
+        assert parse_range_header("bytes=100-", 1000, max_open_range=50) == ByteRange(100, 149)
+        assert parse_range_header("bytes=-200", 1000) == ByteRange(800, 999)
+
+    def test_missing_or_unsupported_headers_serve_everything(self):
+        """Test absent, malformed and multi-range headers fall back to the whole object"""
+        assert parse_range_header(None, 1000) is None
+        assert parse_range_header("bytes=a-b", 1000) is None
+        assert parse_range_header("bytes=0-1,5-6", 1000) is None
+
+    def test_unsatisfiable_range(self):
+        """Test ranges starting past the end are rejected"""
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=1000-", 1000)
+
+
+class TestVideoStreaming:
+    """Test cases for the range-request streaming endpoint"""
+
+    def test_range_request_returns_partial_content(self, client):
+        """Test a seek returns only the requested bytes"""
+        response = client.get(stream_url(VIDEO_URL), headers={"Range": "bytes=1000-2099"})
+
+        assert response.status_code == 206
+        assert response.content == VIDEO_BYTES[1000:2100]
+        assert response.headers["content-range"] == f"bytes 1000-2099/{len(VIDEO_BYTES)}"
+        assert response.headers["accept-ranges"] == "bytes"
+
+    def test_repeated_seeks_reuse_cached_blocks(self, client, stream_service, gcs_service):
+        """Test seeking back into the same blocks does not read from GCS again"""
+        client.get(stream_url(VIDEO_URL), headers={"Range": "bytes=1000-2099"})
+        client.get(stream_url(VIDEO_URL), headers={"Range": "bytes=1500-1600"})
+
+        download = gcs_service.client.bucket.return_value.blob.return_value.download_as_bytes
+        assert download.call_count == 3
+        download.assert_any_call(start=1024, end=2047)
+        assert stream_service.cache_stats()["block_hits"] == 1
+
+    def test_whole_file_without_range(self, client):
+        """Test a plain GET streams the whole video"""
+        response = client.get(stream_url(VIDEO_URL))
+
+        assert response.status_code == 200
+        assert response.content == VIDEO_BYTES
+
+    def test_unknown_videos_and_buckets_are_not_served(self, client, gcs_service):
+        """Test the endpoint only serves existing videos in the allowed buckets"""
+        assert client.get(stream_url("gs://other-bucket/secret.mp4")).status_code == 404
+        assert client.get(stream_url("gs://test-processed/missing.mp4")).status_code == 404
+        assert client.get(stream_url(VIDEO_URL), headers={"Range": "bytes=99999-"}).status_code == 416
+
+    def test_player_url_starts_at_the_detection(self):
+        """Test the player seeks to the first offset marked in the AI description"""
+        offset = detection_offset_seconds("Person in red jacket enters at 00:01:23 into the clip and leaves at 00:01:30")
+
+        assert offset == 83
+        assert stream_url(VIDEO_URL, offset).endswith("#t=81")
+        assert detection_offset_seconds("Video time 0:45, person turns north") == 45
+        assert detection_offset_seconds("No timestamp reported") is None
+
+    def test_wall_clock_times_are_not_offsets(self):
+        """Test unmarked times are ignored and marked offsets are clamped to the clip"""
+        assert detection_offset_seconds("Seen at 14:30 near the station entrance") is None
+        assert detection_offset_seconds("Appears at 0:45 into the clip", duration_seconds=30) == 29
+
+    def test_only_allowed_buckets_are_streamed_by_default(self, gcs_service):
+        """Test a streamer without an allow-list refuses every bucket"""
+        assert VideoStreamService(gcs_service).open(VIDEO_URL) is None
+        gcs_service.get_object_metadata.assert_not_called()
@@ -0,0 +1,195 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from homeward.models.case import CasePriority, Location
+from homeward.models.video_analysis import VideoAnalysisResult
+from homeward.services.analysis_scheduler import AnalysisScheduler
+from homeward.services.mock_video_analysis_service import MockVideoAnalysisService
+from homeward.services.watchlist_service import WatchlistService
+
+ADDED_AT = datetime(2025, 9, 22, 10, 0, tzinfo=timezone.utc)
+
+
+def video_uri(camera_id, when, latitude=45.4654, longitude=9.1859):
+    return f"gs://ingestion/{camera_id}_{when:%Y%m%d%H%M%S}_{latitude}_{longitude}_CCTV_1280x720.mp4"
+
+
+def analysis_result(uri, confidence, latitude=45.4654, longitude=9.1859, timestamp=None):
+    return VideoAnalysisResult(
+        id=f"video_{abs(hash(uri))}",
+        timestamp=timestamp or datetime.now(),
+        latitude=latitude,
+        longitude=longitude,
+        address="",
+        distance_from_last_seen=0.1,
+        video_url=uri,
+        confidence_score=confidence,
+        ai_description="Person matching the description",
+        camera_id="CAM-01",
+        camera_type="CCTV",
+    )
+
+
+class TestWatchlistService:
+    """Test cases for incremental watchlist monitoring of new footage"""
+
+    @pytest.fixture
+    def data_service(self, sample_case):
+        data_service = Mock()
+        low_priority = replace(sample_case, id="MP002", priority=CasePriority.LOW)
+        data_service.get_cases.return_value = ([sample_case, low_priority], 2)
+        return data_service
+
+    @pytest.fixture
+    def video_service(self):
+        video_service = Mock()
+        video_service.add_to_evidence_batch.side_effect = lambda results, case_id: len(results)
+        return video_service
+
+    def _new_videos(self, count, when=None):
+        when = when or datetime.now()
+        return [
+            (video_uri(f"CAM-{i:02d}", when), ADDED_AT + timedelta(seconds=i))
+            for i in range(count)
+        ]
+
+    def test_new_videos_are_swept_in_micro_batches(self, data_service, video_service):
+        """Test new footage is batched and swept once per batch against the watched cases"""
+        new_videos = self._new_videos(5)
+        video_service.list_new_videos.return_value = new_videos
+        video_service.analyze_videos_sweep.side_effect = lambda request: (
+            {sweep_case.case_id: [] for sweep_case in request.cases}, {}
+        )
+        watchlist = WatchlistService(data_service, video_service, batch_size=2, since=ADDED_AT - timedelta(hours=1))
+
+        stats = watchlist.poll_once()
+
+        assert stats["batches"] == 3
+        requests = [call.args[0] for call in video_service.analyze_videos_sweep.call_args_list]
+        assert [len(request.candidate_uris) for request in requests] == [2, 2, 1]
+        # Only the active high-priority case is watched
+        assert all([sweep_case.case_id for sweep_case in request.cases] == ["MP001"] for request in requests)
+        assert watchlist.watermark == new_videos[-1][1]
+
+    def test_confident_hits_are_stored_and_notified(self, data_service, video_service):
+        """Test hits above the threshold are written as evidence and raise notifications"""
+        uri = video_uri("CAM-01", datetime.now())
+        video_service.list_new_videos.return_value = [(uri, ADDED_AT)]
+        confident, weak = analysis_result(uri, 0.9), analysis_result(uri + "?", 0.3)
+        video_service.analyze_videos_sweep.return_value = ({"MP001": [confident, weak]}, {})
+        notifier = Mock()
+        watchlist = WatchlistService(data_service, video_service, since=ADDED_AT - timedelta(hours=1), notifiers=[notifier])
+
+        stats = watchlist.poll_once()
+
+        video_service.add_to_evidence_batch.assert_called_once_with([confident], "MP001")
+        assert stats["hits"] == 1
+        assert stats["evidence_added"] == 1
+        hit = notifier.call_args[0][0]
+        assert (hit.case_id, hit.result) == ("MP001", confident)
+        assert list(watchlist.recent_hits) == [hit]
+
+    def test_sweeps_go_through_the_scheduler(self, data_service, video_service):
+        """Test sweeps are queued in the analysis scheduler, costing one request per new video"""
+        video_service.list_new_videos.return_value = self._new_videos(3)
+        video_service.analyze_videos_sweep.return_value = ({"MP001": []}, {})
+        scheduler = AnalysisScheduler(max_concurrency=1, requests_per_minute=60000)
+        watchlist = WatchlistService(
+            data_service, video_service, since=ADDED_AT - timedelta(hours=1), analysis_scheduler=scheduler
+        )
+
+        try:
+            tokens_before = scheduler.rate_limiter.available
+            stats = watchlist.poll_once()
+
+            assert stats["batches"] == 1
+            assert scheduler.metrics()["completed"] == 1
+            assert scheduler.rate_limiter.available <= tokens_before - 3 + 0.5
+        finally:
+            scheduler.shutdown()
+
+    def test_mock_backend_sweeps_the_new_videos(self, data_service):
+        """Test the mock backend handles sweeps restricted to the new videos"""
+        video_service = MockVideoAnalysisService()
+        video_service.list_new_videos = Mock(return_value=self._new_videos(2))
+        watchlist = WatchlistService(data_service, video_service, since=ADDED_AT - timedelta(hours=1))
+
+        stats = watchlist.poll_once()
+
+        assert (stats["batches"], stats["errors"]) == (1, 0)
+
+    def test_far_or_older_footage_skips_the_sweep(self, data_service, video_service):
+        """Test footage far from the last sighting or from before the disappearance is not analyzed"""
+        video_service.list_new_videos.return_value = [
+            (video_uri("FAR", datetime.now(), latitude=41.9028, longitude=12.4964), ADDED_AT),
+            (video_uri("OLD", datetime.now() - timedelta(days=30)), ADDED_AT + timedelta(seconds=1)),
+        ]
+        watchlist = WatchlistService(data_service, video_service, since=ADDED_AT - timedelta(hours=1))
+
+        stats = watchlist.poll_once()
+
+        video_service.analyze_videos_sweep.assert_not_called()
+        assert stats["batches"] == 1
+        assert watchlist.watermark == ADDED_AT + timedelta(seconds=1)
+
+    def test_cases_only_get_evidence_from_their_own_footage(self, data_service, video_service, sample_case):
+        """Test a batch shared by far-apart cases only adds footage near and after each last sighting"""
+        rome = Location("Piazza Venezia", "Roma", "Italy", "00186", latitude=41.8955, longitude=12.4823)
+        rome_case = replace(sample_case, id="MP003", last_seen_location=rome)
+        data_service.get_cases.return_value = ([sample_case, rome_case], 2)
+        now = datetime.now()
+        milan_uri = video_uri("MILAN", now)
+        rome_uri = video_uri("ROME", now, latitude=41.8955, longitude=12.4823)
+        old_uri = video_uri("OLD", now - timedelta(days=10))
+        video_service.list_new_videos.return_value = [
+            (milan_uri, ADDED_AT), (rome_uri, ADDED_AT + timedelta(seconds=1)), (old_uri, ADDED_AT + timedelta(seconds=2)),
+        ]
+        milan = analysis_result(milan_uri, 0.9)
+        rome_result = analysis_result(rome_uri, 0.9, latitude=41.8955, longitude=12.4823)
+        old = analysis_result(old_uri, 0.9, timestamp=now - timedelta(days=10))
+        # The sweep pairs every case with every video of the batch
+        video_service.analyze_videos_sweep.side_effect = lambda request: (
+            {sweep_case.case_id: [milan, rome_result, old] for sweep_case in request.cases}, {}
+        )
+        watchlist = WatchlistService(data_service, video_service, since=ADDED_AT - timedelta(hours=1))
+
+        stats = watchlist.poll_once()
+
+        request = video_service.analyze_videos_sweep.call_args[0][0]
+        assert request.candidate_uris == [milan_uri, rome_uri]
+        evidence = {call.args[1]: call.args[0] for call in video_service.add_to_evidence_batch.call_args_list}
+        assert evidence == {"MP001": [milan], "MP003": [rome_result]}
+        assert stats["hits"] == 2
+
+    def test_failed_batch_keeps_the_watermark(self, data_service, video_service, tmp_path):
+        """Test a failing batch is retried on the next poll, and the watermark survives restarts"""
+        new_videos = self._new_videos(4)
+        video_service.list_new_videos.return_value = new_videos
+        video_service.analyze_videos_sweep.side_effect = [({"MP001": []}, {}), RuntimeError("quota exceeded")]
+        state_path = str(tmp_path / "watchlist.json")
+        watchlist = WatchlistService(
+            data_service, video_service, batch_size=2, since=ADDED_AT - timedelta(hours=1), state_path=state_path
+        )
+
+        stats = watchlist.poll_once()
+
+        assert (stats["batches"], stats["errors"]) == (1, 1)
+        assert (watchlist.watermark, watchlist.watermark_uri) == (new_videos[1][1], new_videos[1][0])
+        restarted = WatchlistService(data_service, video_service, state_path=state_path)
+        assert (restarted.watermark, restarted.watermark_uri) == (new_videos[1][1], new_videos[1][0])
+
+    def test_watermark_splits_videos_added_in_the_same_instant(self, data_service, video_service):
+        """Test a failed batch sharing its timestamp with the processed one is listed again by URI"""
+        new_videos = [(video_uri(f"CAM-{i:02d}", datetime.now()), ADDED_AT) for i in range(4)]
+        video_service.list_new_videos.return_value = new_videos
+        video_service.analyze_videos_sweep.side_effect = [({"MP001": []}, {}), RuntimeError("quota exceeded")]
+        watchlist = WatchlistService(data_service, video_service, batch_size=2, since=ADDED_AT - timedelta(hours=1))
+
+        watchlist.poll_once()
+        video_service.list_new_videos.reset_mock()
+        watchlist.poll_once()
+
+        video_service.list_new_videos.assert_called_once_with(ADDED_AT, after_uri=new_videos[1][0])